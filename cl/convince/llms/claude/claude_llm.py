@@ -17,6 +17,7 @@ from typing import ClassVar
 from anthropic import Anthropic
 from cl.runtime.context.context_util import ContextUtil
 from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.perf.usage_counters import UsageCounters
 from cl.convince.llms.llm import Llm
 from cl.convince.settings.anthropic_settings import AnthropicSettings
 
@@ -52,6 +53,7 @@ class ClaudeLlm(Llm):
         if len(response.content) != 1:
             raise RuntimeError(f"More than one response message received for query: {query}: {str(response)}")
         result = response.content[0].text
+        UsageCounters.add_llm_tokens(response.usage.input_tokens + response.usage.output_tokens)
         return result
 
     @classmethod
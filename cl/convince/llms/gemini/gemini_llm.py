@@ -16,6 +16,7 @@ from dataclasses import dataclass
 import google.generativeai as gemini  # noqa
 from cl.runtime.context.context_util import ContextUtil
 from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.perf.usage_counters import UsageCounters
 from cl.convince.llms.llm import Llm
 from cl.convince.settings.google_settings import GoogleSettings
 
@@ -46,6 +47,7 @@ class GeminiLlm(Llm):
         response = model.generate_content(query)
 
         result = response.text
+        UsageCounters.add_llm_tokens(response.usage_metadata.total_token_count)
         return result
 
     @classmethod
@@ -17,6 +17,7 @@ from typing import ClassVar
 from openai import OpenAI
 from cl.runtime.context.context_util import ContextUtil
 from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.perf.usage_counters import UsageCounters
 from cl.runtime.primitive.float_util import FloatUtil
 from cl.convince.llms.llm import Llm
 from cl.convince.settings.openai_settings import OpenaiSettings
@@ -77,6 +78,7 @@ class GptLlm(Llm):
         )
 
         result = response.choices[0].message.content
+        UsageCounters.add_llm_tokens(response.usage.total_tokens if response.usage is not None else None)
         return result
 
     @classmethod
@@ -16,6 +16,7 @@ from dataclasses import dataclass
 import fireworks.client  # noqa
 from cl.runtime.context.context_util import ContextUtil
 from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.perf.usage_counters import UsageCounters
 from cl.convince.llms.llama.llama_llm import LlamaLlm
 from cl.convince.settings.fireworks_settings import FireworksSettings
 
@@ -53,4 +54,5 @@ class FireworksLlamaLlm(LlamaLlm):
             model=f"accounts/fireworks/models/{model_name}", prompt=prompt, max_tokens=self.max_tokens
         )
         result = response.choices[0].text
+        UsageCounters.add_llm_tokens(response.usage.total_tokens if response.usage is not None else None)
         return result
@@ -1,11 +1,16 @@
-from cl.runtime.records.class_info import ClassInfo
-from cl.runtime.records.key_util import KeyUtil
-from cl.runtime.records.record_mixin import RecordMixin
-from cl.runtime.db.db import Db
-from cl.runtime.context.protocols import ContextProtocol
-from cl.runtime.context.context import Context
-from cl.runtime.db.local.local_cache import LocalCache
-from cl.runtime.views.view import View
-from cl.runtime.views.record_view import RecordView
-from cl.runtime.views.record_list_view import RecordListView
-from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.perf.startup_profiler import StartupProfiler
+
+# Start profiling before other imports when enabled by envvar or command line flag
+StartupProfiler.start_if_enabled()
+
+from cl.runtime.records.class_info import ClassInfo  # noqa: E402
+from cl.runtime.records.key_util import KeyUtil  # noqa: E402
+from cl.runtime.records.record_mixin import RecordMixin  # noqa: E402
+from cl.runtime.db.db import Db  # noqa: E402
+from cl.runtime.context.protocols import ContextProtocol  # noqa: E402
+from cl.runtime.context.context import Context  # noqa: E402
+from cl.runtime.db.local.local_cache import LocalCache  # noqa: E402
+from cl.runtime.views.view import View  # noqa: E402
+from cl.runtime.views.record_view import RecordView  # noqa: E402
+from cl.runtime.views.record_list_view import RecordListView  # noqa: E402
+from cl.runtime.db.sql.sqlite_db import SqliteDb  # noqa: E402
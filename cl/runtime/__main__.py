@@ -27,14 +27,17 @@ from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.log.log_entry import LogEntry
 from cl.runtime.log.log_entry_level_enum import LogEntryLevelEnum
 from cl.runtime.log.user_log_entry import UserLogEntry
+from cl.runtime.perf.startup_profiler import StartupProfiler
 from cl.runtime.routers.app import app_router
 from cl.runtime.routers.auth import auth_router
+from cl.runtime.routers.compression_middleware import CompressionMiddleware
 from cl.runtime.routers.context_middleware import ContextMiddleware
 from cl.runtime.routers.entity import entity_router
 from cl.runtime.routers.health import health_router
 from cl.runtime.routers.schema import schema_router
 from cl.runtime.routers.storage import storage_router
 from cl.runtime.routers.tasks import tasks_router
+from cl.runtime.routers.tracing_middleware import TracingMiddleware
 from cl.runtime.settings.api_settings import ApiSettings
 from cl.runtime.settings.preload_settings import PreloadSettings
 from cl.runtime.settings.project_settings import ProjectSettings
@@ -112,6 +115,13 @@ server_app.add_middleware(
 # Middleware for executing each API call in isolated context
 server_app.add_middleware(ContextMiddleware)
 
+# Middleware for compressing responses, added last to compress the final response body
+if api_settings.compression_min_size is not None:
+    server_app.add_middleware(CompressionMiddleware, minimum_size=api_settings.compression_min_size)
+
+# Middleware for recording request spans, added last to include context setup and compression time
+server_app.add_middleware(TracingMiddleware, trace_path=api_settings.request_trace_path)
+
 # Routers
 server_app.include_router(app_router.router, prefix="", tags=["App"])
 server_app.include_router(health_router.router, prefix="", tags=["Health Check"])
@@ -127,11 +137,13 @@ if __name__ == "__main__":
         celery_delete_existing_tasks()
 
         # Start Celery workers (will exit when the current process exits)
-        log_dir = os.path.join(ProjectSettings.get_project_root(), "logs")  # TODO: Make unique
-        celery_start_queue(log_dir=log_dir)
+        with StartupProfiler.phase("Main: start Celery queue"):
+            log_dir = os.path.join(ProjectSettings.get_project_root(), "logs")  # TODO: Make unique
+            celery_start_queue(log_dir=log_dir)
 
         # Save records from preload directory to DB and execute run_configure on all preloaded Config records
-        PreloadSettings.instance().save_and_configure()
+        with StartupProfiler.phase("Main: save preloads and configure"):
+            PreloadSettings.instance().save_and_configure()
 
         # Find wwwroot directory, error if not found
         wwwroot_dir = ProjectSettings.get_wwwroot()
@@ -143,6 +155,10 @@ if __name__ == "__main__":
         # It will switch to https if cert is present.
         webbrowser.open_new_tab(f"http://{api_settings.hostname}:{api_settings.port}")
 
+        # Write startup profile report and trace if enabled, startup is complete at this point
+        if (startup_profiler := StartupProfiler.current()) is not None:
+            startup_profiler.finish()
+
         # Run Uvicorn using hostname and port specified by Dynaconf
         api_settings = ApiSettings.instance()
         uvicorn.run(server_app, host=api_settings.hostname, port=api_settings.port)
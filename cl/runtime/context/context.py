@@ -12,13 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
 import logging
 from contextvars import ContextVar
 from dataclasses import dataclass
+from typing import Any
 from typing import Dict
 from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from cl.runtime.backend.core.user_key import UserKey
 from cl.runtime.context.context_key import ContextKey
@@ -30,9 +35,13 @@ from cl.runtime.log.log_entry import LogEntry
 from cl.runtime.log.log_entry_level_enum import LogEntryLevelEnum
 from cl.runtime.log.log_key import LogKey
 from cl.runtime.log.user_log_entry import UserLogEntry
+from cl.runtime.perf.request_tracer import RequestTracer
+from cl.runtime.records.class_info import ClassInfo
 from cl.runtime.records.dataclasses_extensions import missing
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.protocols import TDataDict
+from cl.runtime.records.protocols import TQuery
 from cl.runtime.records.protocols import is_key
 from cl.runtime.records.record_mixin import RecordMixin
 from cl.runtime.settings.context_settings import ContextSettings
@@ -43,11 +52,56 @@ The following root context types can be used in the outermost 'with' clause:
     - TestingContext: Context for running unit tests
 """
 
-context_stack_var: ContextVar[Optional[List["Context"]]] = ContextVar("context_stack_var", default=None)
+context_stack_var: ContextVar[Optional[Tuple["Context", ...]]] = ContextVar("context_stack_var", default=None)
 """
 Context adds self to the stack on __enter__ and removes self on __exit__.
 Each asynchronous context has its own stack.
+
+Notes:
+    The stack is an immutable tuple that is replaced rather than modified on __enter__ and __exit__,
+    so a copy of contextvars.Context (e.g. for a new asyncio task or request) can share the stack
+    without copying it and without affecting the stack of its parent.
+"""
+
+RESOLVED_DB_CACHE_MAX_SIZE = 100
+"""The cache of database records resolved from keys is cleared when it reaches this size."""
+
+_resolved_db_dict: Dict[str, Any] = {}
 """
+Database records loaded from storage for 'db' field specified as a key, indexed by db_id.
+The entry is removed when a database record with the same db_id is saved or deleted using Context.
+"""
+
+
+def _invalidate_resolved_db(records_or_keys: Iterable[Any]) -> None:
+    """Remove cached database records for those of the saved records or deleted keys that are databases."""
+    if _resolved_db_dict:
+        for record_or_key in records_or_keys:
+            if isinstance(record_or_key, DbKey):
+                _resolved_db_dict.pop(record_or_key.db_id, None)
+
+
+def _context_serializer():
+    """Serializer for records inside the compact context dictionary, imported on first use to avoid cyclic import."""
+    from cl.runtime.serialization.dict_serializer import DictSerializer
+
+    global _compact_dict_serializer
+    if _compact_dict_serializer is None:
+        _compact_dict_serializer = DictSerializer()
+    return _compact_dict_serializer
+
+
+_compact_dict_serializer = None
+"""Serializer for records inside the compact context dictionary, created on first use."""
+
+_compact_dict_record_fields = ("log", "db")
+"""Context fields stored as serialized records inside the compact context dictionary."""
+
+COMPACT_DICT_CACHE_MAX_SIZE = 1000
+"""The cache of deserialized compact dictionaries is cleared when it reaches this size."""
+
+_compact_dict_cache: Dict[str, Tuple[Type, Dict[str, Any]]] = {}
+"""Context type and constructor fields deserialized from the compact dictionary, indexed by its reference."""
 
 
 @dataclass(slots=True, kw_only=True)
@@ -77,24 +131,38 @@ class Context(ContextKey, RecordMixin[ContextKey]):
 
         # Do not execute this code on deserialized context instances (e.g. when they are passed to a task queue)
         if not self.is_deserialized:
-            # Set fields that are not specified to their values from 'Context.current()'
-            if self.user is None:
-                self._root_context_field_not_set_error("user")
-                self.user = Context.current().user
-            if self.log is None:
-                self._root_context_field_not_set_error("log")
-                self.log = Context.current().log
-            if self.db is None:
-                self._root_context_field_not_set_error("db")
-                self.db = Context.current().db
-            if self.dataset is None:
-                self._root_context_field_not_set_error("dataset")
-                self.dataset = Context.current().dataset
+            if self.user is None or self.log is None or self.db is None or self.dataset is None:
+                # Check that fields are set for a root context before looking up the current context
+                if self.user is None:
+                    self._root_context_field_not_set_error("user")
+                if self.log is None:
+                    self._root_context_field_not_set_error("log")
+                if self.db is None:
+                    self._root_context_field_not_set_error("db")
+                if self.dataset is None:
+                    self._root_context_field_not_set_error("dataset")
+
+                # Fields that are not specified share the objects of the current context by reference,
+                # look up the current context once for all of them
+                parent = Context.current()
+                if self.user is None:
+                    self.user = parent.user
+                if self.log is None:
+                    self.log = parent.log
+                if self.db is None:
+                    self.db = parent.db
+                if self.dataset is None:
+                    self.dataset = parent.dataset
 
         # Replace fields that are set as keys by records from storage
-        # First, load 'db' field of this context using 'Context.current()'
+        # First, load 'db' field of this context using 'Context.current()', the result is cached by db_id
         if is_key(self.db):
-            self.db = Context.current().load_one(DbKey, self.db)
+            if (db := _resolved_db_dict.get(self.db.db_id, None)) is None:
+                db = Context.current().load_one(DbKey, self.db)
+                if len(_resolved_db_dict) >= RESOLVED_DB_CACHE_MAX_SIZE:
+                    _resolved_db_dict.clear()
+                _resolved_db_dict[self.db.db_id] = db
+            self.db = db
 
         # After this all remaining fields can be loaded using database from this context
         if is_key(self.log):
@@ -108,8 +176,7 @@ class Context(ContextKey, RecordMixin[ContextKey]):
         """Return the current context or None if not set."""
 
         # Get context stack for the current asynchronous environment
-        context_stack = context_stack_var.get()
-        if context_stack and len(context_stack) > 0:
+        if context_stack := context_stack_var.get():
             return context_stack[-1]
         else:
             raise RuntimeError(
@@ -123,16 +190,15 @@ class Context(ContextKey, RecordMixin[ContextKey]):
         # Get context stack for the current asynchronous environment
         context_stack = context_stack_var.get()
         if context_stack is None:
-            # Context activated without middleware, create a new context stack
-            context_stack = []
-            context_stack_var.set(context_stack)
+            # Context activated without middleware, start a new context stack
+            context_stack = ()
 
         # Check if self is already the current context
         if context_stack and context_stack[-1] is self:
             raise RuntimeError("The context activated using 'with' operator is already current.")
 
-        # Set current context on entering 'with Context(...)' clause
-        context_stack.append(self)
+        # Set current context on entering 'with Context(...)' clause by replacing the stack with a longer one
+        context_stack_var.set(context_stack + (self,))
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -161,13 +227,13 @@ class Context(ContextKey, RecordMixin[ContextKey]):
         # Get context stack for the current asynchronous environment
         context_stack = context_stack_var.get()
 
-        if context_stack is None or not bool(context_stack):
+        if not context_stack:
             raise RuntimeError("Current context must not be cleared inside 'with Context(...)' clause.")
 
         # Restore the previous current context on exiting from 'with Context(...)' clause
-        current_context = context_stack.pop()
-        if current_context is not self:
+        if context_stack[-1] is not self:
             raise RuntimeError("Current context must only be modified by 'with Context(...)' clause.")
+        context_stack_var.set(context_stack[:-1])
 
         # TODO: Support resource disposal for the database
         if self.db is not None:
@@ -177,6 +243,58 @@ class Context(ContextKey, RecordMixin[ContextKey]):
         # Return False to propagate exception to the caller
         return False
 
+    def to_compact_dict(self) -> TDataDict:
+        """
+        Serialize to a compact dictionary for passing the context to another process, see 'from_compact_dict'.
+
+        Notes:
+            - Context type is stored as module.ClassName, user as username, and fields that are None are omitted
+            - Database and log are serialized with their fields so they can be used without a DB lookup
+        """
+        result = {"_type": ClassInfo.get_class_path(type(self))}
+        for field_name in self.__dataclass_fields__:  # noqa
+            if field_name == "is_deserialized" or (value := getattr(self, field_name)) is None:
+                continue
+            if field_name == "user":
+                result[field_name] = value.username
+            elif field_name in _compact_dict_record_fields:
+                result[field_name] = _context_serializer().serialize_data(value)
+            else:
+                result[field_name] = value
+        return result
+
+    @classmethod
+    def get_compact_ref(cls, data: TDataDict) -> str:
+        """Return reference to the compact dictionary in 'context_id:version' format, version is a hash of data."""
+        version = hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        return f"{data.get('context_id')}:{version}"
+
+    @classmethod
+    def from_compact_dict(cls, data: TDataDict, *, compact_ref: str | None = None) -> "Context":
+        """
+        Deserialize from the compact dictionary created by 'to_compact_dict', the result is not entered.
+
+        Args:
+            data: Compact dictionary created by 'to_compact_dict'
+            compact_ref: Reference returned by 'get_compact_ref', if specified deserialized fields are cached
+                by reference and 'data' is not deserialized again when the same reference is passed
+        """
+        if compact_ref is None or (cached := _compact_dict_cache.get(compact_ref, None)) is None:
+            context_type = ClassInfo.get_class_type(data["_type"])
+            fields = {k: v for k, v in data.items() if k != "_type"}
+            if (username := fields.get("user", None)) is not None:
+                fields["user"] = UserKey(username=username)
+            for field_name in _compact_dict_record_fields:
+                if (value := fields.get(field_name, None)) is not None:
+                    fields[field_name] = _context_serializer().deserialize_data(value)
+            if compact_ref is not None:
+                if len(_compact_dict_cache) >= COMPACT_DICT_CACHE_MAX_SIZE:
+                    _compact_dict_cache.clear()
+                _compact_dict_cache[compact_ref] = (context_type, fields)
+        else:
+            context_type, fields = cached
+        return context_type(**fields, is_deserialized=True)
+
     def get_logger(self, name: str) -> logging.Logger:
         """Get logger for the specified name, invoke with __name__ as the argument."""
         return self.log.get_logger(name)  # noqa
@@ -202,14 +320,18 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             is_key_optional: If True, return None when key is none found instead of an error
             is_record_optional: If True, return None when record is not found instead of an error
         """
-        return self.db.load_one(  # noqa
-            record_type,
-            record_or_key,
-            dataset=dataset,
-            identity=identity,
-            is_key_optional=is_key_optional,
-            is_record_optional=is_record_optional,
-        )
+        with RequestTracer.span("db", operation="load_one", type=record_type.__name__) as span:
+            result = self.db.load_one(  # noqa
+                record_type,
+                record_or_key,
+                dataset=dataset,
+                identity=identity,
+                is_key_optional=is_key_optional,
+                is_record_optional=is_record_optional,
+            )
+        if span is not None:
+            span.attributes["rows"] = int(result is not None)
+        return result
 
     def load_many(
         self,
@@ -229,12 +351,14 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
         """
-        return self.db.load_many(  # noqa
-            record_type,
-            records_or_keys,
-            dataset=dataset,
-            identity=identity,
-        )
+        with RequestTracer.span("db", operation="load_many", type=record_type.__name__) as span:
+            result = self.db.load_many(  # noqa
+                record_type,
+                records_or_keys,
+                dataset=dataset,
+                identity=identity,
+            )
+        return span.count_rows(result) if span is not None else result
 
     def load_all(
         self,
@@ -251,11 +375,13 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
         """
-        return self.db.load_all(  # noqa
-            record_type,
-            dataset=dataset,
-            identity=identity,
-        )
+        with RequestTracer.span("db", operation="load_all", type=record_type.__name__) as span:
+            result = self.db.load_all(  # noqa
+                record_type,
+                dataset=dataset,
+                identity=identity,
+            )
+        return span.count_rows(result) if span is not None else result
 
     def load_filter(
         self,
@@ -274,12 +400,136 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
         """
-        return self.db.load_filter(  # noqa
-            record_type,
-            filter_obj,
+        with RequestTracer.span("db", operation="load_filter", type=record_type.__name__) as span:
+            result = self.db.load_filter(  # noqa
+                record_type,
+                filter_obj,
+                dataset=dataset,
+                identity=identity,
+            )
+        return span.count_rows(result) if span is not None else result
+
+    def load_query(
+        self,
+        query: TQuery,
+        *,
+        limit: int | None = None,
+        skip: int | None = None,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord]:
+        """
+        Load records of the query type and its subtypes where fields match the query conditions, in query order.
+
+        Args:
+            query: Tuple of query type, conditions in MongoDB format, and order in MongoDB format
+            limit: Maximum number of records to return if specified
+            skip: Number of records to skip from the beginning of the query result if specified
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        with RequestTracer.span("db", operation="load_query", type=query[0].__name__) as span:
+            result = self.db.load_query(  # noqa
+                query,
+                limit=limit,
+                skip=skip,
+                dataset=dataset,
+                identity=identity,
+            )
+        return span.count_rows(result) if span is not None else result
+
+    def load_query_batches(
+        self,
+        query: TQuery,
+        *,
+        batch_size: int,
+        limit: int | None = None,
+        skip: int | None = None,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterator[List[TRecord]]:
+        """
+        Load the same records as 'load_query' and return them in batches of up to 'batch_size' records,
+        close the iterator to release the database cursor if it is not exhausted.
+
+        Args:
+            query: Tuple of query type, conditions in MongoDB format, and order in MongoDB format
+            batch_size: Maximum number of records in each batch
+            limit: Maximum number of records to return if specified
+            skip: Number of records to skip from the beginning of the query result if specified
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        batches = self.db.load_query_batches(  # noqa
+            query,
+            batch_size=batch_size,
+            limit=limit,
+            skip=skip,
             dataset=dataset,
             identity=identity,
         )
+        try:
+            while True:
+                # Each batch is a separate span because batches are read while the previous batch is processed
+                with RequestTracer.span("db", operation="load_query_batches", type=query[0].__name__) as span:
+                    batch = next(batches, None)
+                if batch is None:
+                    return
+                if span is not None:
+                    span.set_row_count(batch)
+                yield batch
+        finally:
+            batches.close()
+
+    def count_query(
+        self,
+        query: TQuery,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """
+        Return the number of records that 'load_query' would return for the query without limit.
+
+        Args:
+            query: Tuple of query type, conditions in MongoDB format, and order in MongoDB format (order is ignored)
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        with RequestTracer.span("db", operation="count_query", type=query[0].__name__):
+            result = self.db.count_query(  # noqa
+                query,
+                dataset=dataset,
+                identity=identity,
+            )
+        return result
+
+    def load_content_hash(
+        self,
+        record_type: Type[TRecord],
+        key: KeyProtocol,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> str | None:
+        """
+        Return a hash of the stored record data that changes whenever the record is saved with different data,
+        or None if the record is not found.
+
+        Args:
+            record_type: Record type to load, used to determine the database table
+            key: Key of the record
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        with RequestTracer.span("db", operation="load_content_hash", type=record_type.__name__):
+            result = self.db.load_content_hash(  # noqa
+                record_type,
+                key,
+                dataset=dataset,
+                identity=identity,
+            )
+        return result
 
     def save_one(
         self,
@@ -296,11 +546,14 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: Target dataset as a delimited string, list of levels, or None
             identity: Identity token for database access and row-level security
         """
-        self.db.save_one(  # noqa
-            record,
-            dataset=dataset,
-            identity=identity,
-        )
+        with RequestTracer.span("db", operation="save_one", type=type(record).__name__):
+            self.db.save_one(  # noqa
+                record,
+                dataset=dataset,
+                identity=identity,
+            )
+        _invalidate_resolved_db((record,))
+        self.db.register_dataset(dataset)
 
     def save_many(
         self,
@@ -317,11 +570,47 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: Target dataset as a delimited string, list of levels, or None
             identity: Identity token for database access and row-level security
         """
-        self.db.save_many(  # noqa
-            records,
-            dataset=dataset,
-            identity=identity,
-        )
+        # Materialize the iterable because it is used again after saving
+        records = list(records)
+        with RequestTracer.span("db", operation="save_many") as span:
+            self.db.save_many(  # noqa
+                records,
+                dataset=dataset,
+                identity=identity,
+            )
+        if span is not None:
+            span.set_row_count(records)
+        _invalidate_resolved_db(records)
+        self.db.register_dataset(dataset)
+
+    def compare_and_save_one(
+        self,
+        record: RecordProtocol,
+        expected: Dict[str, Any],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> bool:
+        """
+        Save record only if the stored record with the same key exists and its fields have the expected values,
+        return True if the record was saved and False otherwise.
+
+        Args:
+            record: Record to save
+            expected: Dictionary of field name and the expected value of this field in the stored record
+            dataset: Target dataset as a delimited string, list of levels, or None
+            identity: Identity token for database access and row-level security
+        """
+        with RequestTracer.span("db", operation="compare_and_save_one", type=type(record).__name__):
+            result = self.db.compare_and_save_one(  # noqa
+                record,
+                expected,
+                dataset=dataset,
+                identity=identity,
+            )
+        if result:
+            _invalidate_resolved_db((record,))
+        return result
 
     def delete_one(
         self,
@@ -340,12 +629,16 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
         """
-        self.db.delete_one(  # noqa
-            key_type,
-            key,
-            dataset=dataset,
-            identity=identity,
-        )
+        with RequestTracer.span("db", operation="delete_one", type=key_type.__name__):
+            self.db.delete_one(  # noqa
+                key_type,
+                key,
+                dataset=dataset,
+                identity=identity,
+            )
+        if issubclass(key_type, DbKey):
+            # Key may be specified as a tuple or string, remove all cached database records
+            _resolved_db_dict.clear()
 
     def delete_many(
         self,
@@ -362,11 +655,18 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: Target dataset as a delimited string, list of levels, or None
             identity: Identity token for database access and row-level security
         """
-        self.db.delete_many(  # noqa
-            keys,
-            dataset=dataset,
-            identity=identity,
-        )
+        # Materialize the iterable because it is used again after deleting
+        keys = list(keys) if keys is not None else None
+        with RequestTracer.span("db", operation="delete_many") as span:
+            self.db.delete_many(  # noqa
+                keys,
+                dataset=dataset,
+                identity=identity,
+            )
+        if span is not None:
+            span.set_row_count(keys)
+        if keys is not None:
+            _invalidate_resolved_db(keys)
 
     def delete_all_and_drop_db(self) -> None:
         """
@@ -12,8 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import inspect
 import os
+import sys
 from typing import cast
 from cl.runtime.primitive.case_util import CaseUtil
 
@@ -21,10 +21,19 @@ from cl.runtime.primitive.case_util import CaseUtil
 class EnvUtil:
     """Helper methods for environment selection."""
 
+    _is_inside_test: bool | None = None
+    """Result of 'is_inside_test' is determined on first call and cached for the lifetime of the process."""
+
     @classmethod
     def is_inside_test(cls, *, test_module_pattern: str | None = None) -> bool:
         """
-        Return True if invoked from a test, detection is based on test module pattern.
+        Return True if invoked from a test, the result is determined on first call and cached.
+
+        Notes:
+            - Under pytest, detected using PYTEST_VERSION envvar set by pytest for the duration of the session
+              (also inherited by child processes started by the test)
+            - Otherwise detected by the presence of a test module in the stack, found by walking frames
+              without loading source context (unlike 'inspect.stack()' which is slow)
 
         Args:
             test_module_pattern: Glob pattern to identify the test module, defaults to 'test_*.py'
@@ -33,13 +42,21 @@ class EnvUtil:
         if test_module_pattern is not None:
             # TODO: test_module_pattern custom patterns
             raise RuntimeError("Custom test module patterns are not yet supported.")
-        test_module_pattern = "test_"
 
-        stack = inspect.stack()
-        for frame_info in stack:
-            filename = os.path.basename(frame_info.filename)
-            if filename.startswith(test_module_pattern) and filename.endswith(".py"):
+        if (result := cls._is_inside_test) is None:
+            result = "PYTEST_VERSION" in os.environ or cls._is_test_module_in_stack("test_")
+            cls._is_inside_test = result
+        return result
+
+    @classmethod
+    def _is_test_module_in_stack(cls, test_module_prefix: str) -> bool:
+        """Return True if the filename of any frame in the current stack starts from the prefix and ends with .py."""
+        frame = sys._getframe(1)  # noqa
+        while frame is not None:
+            filename = os.path.basename(frame.f_code.co_filename)
+            if filename.startswith(test_module_prefix) and filename.endswith(".py"):
                 return True
+            frame = frame.f_back
         return False
 
     @classmethod
@@ -126,13 +143,14 @@ class EnvUtil:
             raise RuntimeError("Custom test function or method name patterns are not yet supported.")
         test_function_pattern = "test_"
 
-        stack = inspect.stack()
-        for frame_info in stack:
-            if frame_info.function.startswith(test_function_pattern):
-                frame_globals = frame_info.frame.f_globals
+        # Walk the frames directly because 'inspect.stack()' is slow as it loads source context for every frame
+        frame = sys._getframe(1)  # noqa
+        while frame is not None:
+            if frame.f_code.co_name.startswith(test_function_pattern):
+                frame_globals = frame.f_globals
                 module_file = frame_globals["__file__"]
-                test_name = frame_info.function
-                cls_instance = frame_info.frame.f_locals.get("self", None)
+                test_name = frame.f_code.co_name
+                cls_instance = frame.f_locals.get("self", None)
                 class_name = cast(type, cls_instance).__class__.__name__ if cls_instance else None
 
                 if module_file.endswith(".py"):
@@ -169,6 +187,7 @@ class EnvUtil:
                 if not is_name:
                     result = os.path.join(module_dir, result)
                 return result
+            frame = frame.f_back
 
         # Not inside test, return None
         return None
@@ -14,6 +14,8 @@
 
 from dataclasses import dataclass
 from getpass import getuser
+from typing import Any
+from typing import Tuple
 from cl.runtime.backend.core.user_key import UserKey
 from cl.runtime.context.context import Context
 from cl.runtime.context.testing_context import TestingContext
@@ -22,6 +24,9 @@ from cl.runtime.records.class_info import ClassInfo
 from cl.runtime.settings.context_settings import ContextSettings
 from cl.runtime.settings.settings import Settings
 
+_process_root_fields: Tuple[UserKey, Any] | None = None
+"""User and database of the root process context created from settings on first use, shared by all process contexts."""
+
 
 @dataclass(slots=True, kw_only=True)
 class ProcessContext(Context):
@@ -33,34 +38,50 @@ class ProcessContext(Context):
         # Do not execute this code on deserialized context instances (e.g. when they are passed to a task queue)
         if not self.is_deserialized:
             # Confirm we are not inside a test, error otherwise
-            if Settings.is_inside_test:
+            if Settings.get_is_inside_test():
                 raise RuntimeError(
                     f"'{type(self).__name__}' is used inside a test, " f"use '{TestingContext.__name__}' instead."
                 )
 
-            # Get context settings
-            context_settings = ContextSettings.instance()
-
-            # Use db_id from settings for context_id unless specified by the caller
-            if context_settings.context_id is not None:
-                self.context_id = context_settings.context_id
-            else:
-                self.context_id = Settings.process_timestamp
+            # Use context_id from settings, otherwise process timestamp, unless specified by the caller
+            if self.context_id is None:
+                if (settings_context_id := ContextSettings.instance().context_id) is not None:
+                    self.context_id = settings_context_id
+                else:
+                    self.context_id = Settings.get_process_timestamp()
 
-            # Set user
-            # TODO: Set in based on auth for enterprise cloud deployments
-            # TODO: Use LastName, FirstName format for enterprise if possible
-            self.user = UserKey(username=getuser())
+            # User and database are created once per process and shared by reference by all process contexts
+            global _process_root_fields
+            if _process_root_fields is None:
+                _process_root_fields = self._create_root_fields()
+            self.user, self.db = _process_root_fields
 
             # Create the log class specified in settings
-            log_type = ClassInfo.get_class_type(context_settings.log_class)
+            log_type = ClassInfo.get_class_type(ContextSettings.instance().log_class)
             self.log = log_type(log_id=self.context_id)
 
-            # Create the database class specified in settings
-            db_type = ClassInfo.get_class_type(context_settings.db_class)
-
-            # Use context_id as db_id
-            self.db = db_type(db_id=self.context_id)
-
             # Root dataset
             self.dataset = DatasetUtil.root()
+
+    @classmethod
+    def _create_root_fields(cls) -> Tuple[UserKey, Any]:
+        """Create user and db from settings."""
+
+        # Get context settings
+        context_settings = ContextSettings.instance()
+
+        # Use context_id from settings for db_id if specified, otherwise use the same timestamp for the process
+        if context_settings.context_id is not None:
+            db_id = context_settings.context_id
+        else:
+            db_id = Settings.get_process_timestamp()
+
+        # Set user
+        # TODO: Set in based on auth for enterprise cloud deployments
+        # TODO: Use LastName, FirstName format for enterprise if possible
+        user = UserKey(username=getuser())
+
+        # Create the database class specified in settings
+        db_type = ClassInfo.get_class_type(context_settings.db_class)
+        db = db_type(db_id=db_id)
+        return user, db
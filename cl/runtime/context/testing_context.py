@@ -41,7 +41,7 @@ class TestingContext(Context):
         # Do not execute this code on deserialized context instances (e.g. when they are passed to a task queue)
         if not self.is_deserialized:
             # Confirm we are inside a test, error otherwise
-            if not Settings.is_inside_test:
+            if not Settings.get_is_inside_test():
                 raise RuntimeError(f"TestingContext created outside a test.")
 
             # Get test name in 'module.test_function' or 'module.TestClass.test_method' format inside a test
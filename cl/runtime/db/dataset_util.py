@@ -104,6 +104,12 @@ class DatasetUtil:
         result = cls._sep + cls._sep.join(all_levels)
         return result
 
+    @classmethod
+    def get_parent(cls, dataset: str) -> str | None:
+        """Return parent of a dataset in string format or None for the root dataset."""
+        levels = cls.to_levels(dataset)
+        return cls.combine(*levels[:-1]) if levels else None
+
     @classmethod
     def _normalize_str(cls, dataset: str) -> str:
         """
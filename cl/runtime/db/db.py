@@ -13,22 +13,57 @@
 # limitations under the License.
 
 from __future__ import annotations
+import hashlib
+import operator
+import threading
 from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
+from typing import Any
+from typing import Callable
 from typing import ClassVar
+from typing import Dict
 from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Set
+from typing import Tuple
 from typing import Type
+from cl.runtime.db.dataset_util import DatasetUtil
 from cl.runtime.db.db_key import DbKey
 from cl.runtime.records.class_info import ClassInfo
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
 from cl.runtime.records.protocols import TKey
+from cl.runtime.records.protocols import TPrimitive
 from cl.runtime.records.protocols import TQuery
 from cl.runtime.records.protocols import TRecord
 from cl.runtime.records.record_mixin import RecordMixin
 from cl.runtime.settings.context_settings import ContextSettings
 
+_compare_and_save_lock = threading.Lock()
+"""Lock used by the default implementation of 'compare_and_save_one'."""
+
+RANGE_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "$lt": operator.lt,
+    "$lte": operator.le,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+}
+"""Range operators supported in query conditions in MongoDB format and the corresponding comparison functions."""
+
+_dataset_registry: Dict[str, Set[str]] = {}
+"""Datasets other than root where records were saved by this process and their parents for each db_id."""
+
+_registered_dataset_args: Set[Tuple[str, str]] = set()
+"""Tuples of db_id and dataset string as passed to 'register_dataset' that are already in the registry."""
+
+_dataset_registry_version: int = 0
+"""Incremented each time a dataset is added to the registry of any database."""
+
+_dataset_registry_lock = threading.Lock()
+"""Protects the dataset registry."""
+
 
 @dataclass(slots=True, kw_only=True)
 class Db(DbKey, RecordMixin[DbKey], ABC):
@@ -119,6 +154,195 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
             identity: Identity token for database access and row-level security
         """
 
+    def load_query(
+        self,
+        query: TQuery,
+        *,
+        limit: int | None = None,
+        skip: int | None = None,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord]:
+        """
+        Load records of the query type and its subtypes where fields match the query conditions, in query order.
+
+        Notes:
+            - Conditions support equality {field: value}, membership {field: {"$in": [value, ...]}} and range
+              {field: {"$lt": value}} using operators $lt, $lte, $gt, $gte which may be combined for the same field
+            - Range conditions are not met when field value is None
+            - Records are sorted by key when query order is empty
+            - The default implementation filters the result of 'load_all', databases that support queries
+              override this method to run an indexed query
+
+        Args:
+            query: Tuple of query type, conditions in MongoDB format, and order in MongoDB format
+            limit: Maximum number of records to return if specified
+            skip: Number of records to skip from the beginning of the query result if specified
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        query_type, conditions, order = query
+        condition_values = self._get_condition_values(conditions)
+        result = [
+            record
+            for record in self.load_all(query_type, dataset=dataset, identity=identity)
+            if record is not None
+            and all(self._is_condition_met(getattr(record, k), op, v) for k, op, v in condition_values)
+        ]
+
+        # Sort by each order field starting from the last, 'load_all' result is already sorted by key,
+        # None values come first in ascending order as in SQL and MongoDB
+        for field_name, direction in reversed(order.items()):
+            result.sort(
+                key=lambda x: ((value := getattr(x, field_name)) is not None, value),
+                reverse=direction == -1,
+            )
+        result = result[skip:] if skip else result
+        return result[:limit] if limit is not None else result
+
+    def load_query_batches(
+        self,
+        query: TQuery,
+        *,
+        batch_size: int,
+        limit: int | None = None,
+        skip: int | None = None,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterator[List[TRecord]]:
+        """
+        Load the same records as 'load_query' and return them in batches of up to 'batch_size' records,
+        close the iterator to release the database cursor if it is not exhausted.
+
+        Notes:
+            - All batches are read from one query result, so unlike 'load_query' calls with increasing 'skip'
+              the time to read each batch does not depend on its position in the result
+            - The default implementation splits the result of 'load_query', databases that support queries
+              override this method to read each batch from a cursor held open between batches
+
+        Args:
+            query: Tuple of query type, conditions in MongoDB format, and order in MongoDB format
+            batch_size: Maximum number of records in each batch
+            limit: Maximum number of records to return if specified
+            skip: Number of records to skip from the beginning of the query result if specified
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        records = list(self.load_query(query, limit=limit, skip=skip, dataset=dataset, identity=identity))
+        for batch_start in range(0, len(records), batch_size):
+            yield records[batch_start : batch_start + batch_size]
+
+    def count_query(
+        self,
+        query: TQuery,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """
+        Return the number of records that 'load_query' would return for the query without limit.
+
+        Notes:
+            - The default implementation counts the result of 'load_query', databases that support queries
+              override this method to count on the database side
+
+        Args:
+            query: Tuple of query type, conditions in MongoDB format, and order in MongoDB format (order is ignored)
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        return sum(1 for _ in self.load_query(query, dataset=dataset, identity=identity))
+
+    def load_content_hash(
+        self,
+        record_type: Type[TRecord],
+        key: KeyProtocol,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> str | None:
+        """
+        Return a hash of the stored record data that changes whenever the record is saved with different data,
+        or None if the record is not found.
+
+        Notes:
+            - Used as HTTP ETag to skip loading and serializing records that did not change since the last request
+            - The default implementation hashes the loaded record, databases override this method to hash
+              the stored data without deserializing it
+
+        Args:
+            record_type: Record type to load, used to determine the database table
+            key: Key of the record
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        record = self.load_one(record_type, key, dataset=dataset, identity=identity, is_record_optional=True)
+        return hashlib.sha1(repr(record).encode()).hexdigest() if record is not None else None
+
+    def register_dataset(self, dataset: TPrimitive | Iterable[TPrimitive] | None) -> None:
+        """
+        Add the dataset and its parents to the registry of datasets where records were saved by this process,
+        called by the context on save. Registering a dataset string already in the registry costs one set lookup.
+        """
+        global _dataset_registry_version
+        if dataset is None or (isinstance(dataset, str) and (self.db_id, dataset) in _registered_dataset_args):
+            return
+
+        # The registry stores datasets in string format, root dataset is always present
+        datasets = DatasetUtil.to_lookup_list(DatasetUtil.combine(dataset))[:-1]
+        with _dataset_registry_lock:
+            registered = _dataset_registry.setdefault(self.db_id, set())
+            if any(x not in registered for x in datasets):
+                registered.update(datasets)
+                _dataset_registry_version += 1
+            if isinstance(dataset, str):
+                _registered_dataset_args.add((self.db_id, dataset))
+
+    def get_registered_datasets(self) -> Tuple[int, List[str]]:
+        """
+        Return registry version and sorted datasets where records were saved by this process starting from
+        the root dataset, datasets saved by other processes or before the process started are not included.
+        """
+        with _dataset_registry_lock:
+            return _dataset_registry_version, [DatasetUtil.root(), *sorted(_dataset_registry.get(self.db_id, ()))]
+
+    @classmethod
+    def clear_dataset_registry(cls) -> None:
+        """Remove all datasets from the registry except the root dataset."""
+        global _dataset_registry_version
+        with _dataset_registry_lock:
+            _dataset_registry.clear()
+            _registered_dataset_args.clear()
+            _dataset_registry_version += 1
+
+    @classmethod
+    def _get_condition_values(cls, conditions: Dict[str, Any]) -> List[Tuple[str, str, Any]]:
+        """
+        Convert query conditions to a list of field name, operator and operand, error if condition is not supported.
+        Equality is converted to '$in' operator, its operand is the list of allowed values.
+        """
+        result = []
+        for field_name, condition in conditions.items():
+            if isinstance(condition, dict):
+                if not condition or any(x != "$in" and x not in RANGE_OPERATORS for x in condition.keys()):
+                    raise RuntimeError(
+                        f"Query condition for field '{field_name}' is not supported, only equality, '$in' "
+                        f"and range conditions using {', '.join(RANGE_OPERATORS)} can be used."
+                    )
+                for operator_name, operand in condition.items():
+                    result.append((field_name, operator_name, list(operand) if operator_name == "$in" else operand))
+            else:
+                result.append((field_name, "$in", [condition]))
+        return result
+
+    @classmethod
+    def _is_condition_met(cls, value: Any, operator_name: str, operand: Any) -> bool:
+        """Check the field value against one condition returned by '_get_condition_values'."""
+        if operator_name == "$in":
+            return value in operand
+        else:
+            return value is not None and RANGE_OPERATORS[operator_name](value, operand)
+
     @abstractmethod
     def save_one(
         self,
@@ -153,6 +377,37 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
             identity: Identity token for database access and row-level security
         """
 
+    def compare_and_save_one(
+        self,
+        record: RecordProtocol,
+        expected: Dict[str, Any],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> bool:
+        """
+        Save record only if the stored record with the same key exists and its fields have the expected values,
+        return True if the record was saved and False otherwise.
+
+        Notes:
+            The default implementation is atomic only within the current process, databases that support
+            conditional updates override this method to make it atomic across processes.
+
+        Args:
+            record: Record to save
+            expected: Dictionary of field name and the expected value of this field in the stored record
+            dataset: Target dataset as a delimited string, list of levels, or None
+            identity: Identity token for database access and row-level security
+        """
+        with _compare_and_save_lock:
+            stored_record = self.load_one(
+                type(record), record.get_key(), dataset=dataset, identity=identity, is_record_optional=True
+            )
+            if stored_record is None or any(getattr(stored_record, k) != v for k, v in expected.items()):
+                return False
+            self.save_one(record, dataset=dataset, identity=identity)
+            return True
+
     @abstractmethod
     def delete_one(
         self,
@@ -199,6 +454,9 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
             specified using Dynaconf and stored in 'DbSettings' class
         """
 
+    def open_connection(self) -> None:
+        """Open database connection in advance, otherwise it is opened on first use (does nothing by default)."""
+
     @abstractmethod
     def close_connection(self) -> None:
         """Close database connection to releasing resource locks."""
@@ -12,13 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import dataclasses
+import hashlib
+import itertools
 import re
 from dataclasses import dataclass
+from typing import Any
 from typing import Dict
 from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Set
+from typing import Tuple
 from typing import Type
 from typing import cast
 from pymongo import MongoClient
+from pymongo.collection import Collection
+from pymongo.cursor import Cursor
 from pymongo.database import Database
 from cl.runtime.context.context import Context
 from cl.runtime.db.db import Db
@@ -26,8 +36,10 @@ from cl.runtime.db.mongo.mongo_filter_serializer import MongoFilterSerializer
 from cl.runtime.db.protocols import TKey
 from cl.runtime.db.protocols import TRecord
 from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.perf.usage_counters import UsageCounters
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.protocols import TQuery
 from cl.runtime.records.record_util import RecordUtil
 from cl.runtime.schema.schema import Schema
 from cl.runtime.serialization.dict_serializer import DictSerializer
@@ -51,6 +63,9 @@ _client_dict: Dict[str, MongoClient] = {}
 _db_dict: Dict[str, Database] = {}
 """Dict of database instances with client_uri.database_name key stored outside the class to avoid serializing them."""
 
+_index_set: Set[str] = set()
+"""Set of client_uri.database_name.collection_name.fields for indexes created by 'load_query' in this process."""
+
 
 @dataclass(slots=True, kw_only=True)
 class BasicMongoDb(Db):
@@ -94,6 +109,7 @@ class BasicMongoDb(Db):
 
             serialized_key = key_serializer.serialize_key(record_or_key)
             serialized_record = collection.find_one({"_key": serialized_key})
+            UsageCounters.add_db_call()
             if serialized_record is not None:
                 del serialized_record["_id"]
                 del serialized_record["_key"]
@@ -150,6 +166,7 @@ class BasicMongoDb(Db):
 
         subtype_names = list(t.__name__ for t in Schema.get_type_successors(record_type))
         serialized_records = collection.find({"_type": {"$in": subtype_names}})
+        UsageCounters.add_db_call()
         result = []
         for serialized_record in serialized_records:
             del serialized_record["_id"]
@@ -184,6 +201,7 @@ class BasicMongoDb(Db):
         filter_dict = filter_serializer.serialize_filter(filter_obj)
 
         serialized_records = collection.find(filter_dict)  # TODO: Filter by derived type
+        UsageCounters.add_db_call()
         result = []
         for serialized_record in serialized_records:
             del serialized_record["_id"]
@@ -194,6 +212,143 @@ class BasicMongoDb(Db):
             result.append(record)
         return result
 
+    def load_query(
+        self,
+        query: TQuery,
+        *,
+        limit: int | None = None,
+        skip: int | None = None,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord]:
+        serialized_records = self._find_query(query, limit=limit, skip=skip, dataset=dataset, identity=identity)
+        UsageCounters.add_db_call()
+        return [self._deserialize_record(serialized_record) for serialized_record in serialized_records]
+
+    def load_query_batches(
+        self,
+        query: TQuery,
+        *,
+        batch_size: int,
+        limit: int | None = None,
+        skip: int | None = None,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterator[List[TRecord]]:
+        # The cursor fetches documents from the server in batches of the same size as the result
+        cursor = self._find_query(query, limit=limit, skip=skip, dataset=dataset, identity=identity)
+        cursor.batch_size(batch_size)
+        try:
+            while batch := [self._deserialize_record(x) for x in itertools.islice(cursor, batch_size)]:
+                UsageCounters.add_db_call()
+                yield batch
+                if len(batch) < batch_size:
+                    break
+        finally:
+            cursor.close()
+
+    def _find_query(
+        self,
+        query: TQuery,
+        *,
+        limit: int | None,
+        skip: int | None,
+        dataset: str | None,
+        identity: str | None,
+    ) -> Cursor:
+        """Return cursor for the query, creating the indexes declared by query type if needed."""
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        # Key, get collection name from key type by removing Key suffix if present
+        query_type, conditions, order = query
+        collection, filter_dict = self._get_query_filter(query_type, conditions)
+
+        # Sort by key after the specified order so that the order of records with equal values is stable
+        # between queries, this is required for paging using skip
+        sort_list = [*order.items(), ("_key", 1)]
+
+        # Create indexes declared by the query type, indexes are not created for other queries
+        if (get_query_indexes := getattr(query_type, "get_query_indexes", None)) is not None:
+            for index_fields in get_query_indexes():
+                index_name = f"{self.client_uri}.{collection.database.name}.{collection.name}." + ".".join(index_fields)
+                if index_name not in _index_set:
+                    collection.create_index([(field_name, 1) for field_name in index_fields])
+                    _index_set.add(index_name)
+
+        return collection.find(filter_dict, sort=sort_list, limit=limit if limit is not None else 0, skip=skip or 0)
+
+    @classmethod
+    def _deserialize_record(cls, serialized_record: Dict[str, Any]) -> RecordProtocol:
+        """Deserialize a document returned by the query."""
+        del serialized_record["_id"]
+        del serialized_record["_key"]
+        return data_serializer.deserialize_data(serialized_record)
+
+    def count_query(
+        self,
+        query: TQuery,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        query_type, conditions, _ = query
+        collection, filter_dict = self._get_query_filter(query_type, conditions)
+        result = collection.count_documents(filter_dict)
+        UsageCounters.add_db_call()
+        return result
+
+    def load_content_hash(
+        self,
+        record_type: Type[TRecord],
+        key: KeyProtocol,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> str | None:
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        collection_name = key.get_key_type().__name__  # TODO: Decision on short alias
+        collection = self._get_db()[collection_name]
+
+        # Hash the stored document without deserializing it, field order is preserved by MongoDB
+        serialized_record = collection.find_one({"_key": key_serializer.serialize_key(key)}, {"_id": 0})
+        UsageCounters.add_db_call()
+        return hashlib.sha1(repr(serialized_record).encode()).hexdigest() if serialized_record is not None else None
+
+    def _get_query_filter(self, query_type: Type, conditions: Dict[str, Any]) -> Tuple[Collection, Dict[str, Any]]:
+        """Return collection for the query type and filter matching its subtypes and the query conditions."""
+        key_type = query_type.get_key_type()
+        collection_name = key_type.__name__  # TODO: Decision on short alias
+        collection = self._get_db()[collection_name]
+
+        # Serialize condition values the same way as record fields
+        subtype_names = list(t.__name__ for t in Schema.get_type_successors(query_type))
+        filter_dict = {"_type": {"$in": subtype_names}}
+        for field_name, operator_name, operand in self._get_condition_values(conditions):
+            if operator_name == "$in":
+                serialized_values = [
+                    data_serializer.serialize_data(value) if value is not None else None for value in operand
+                ]
+                field_filter = {"$in": serialized_values}
+            else:
+                field_filter = {operator_name: data_serializer.serialize_data(operand)}
+            filter_dict.setdefault(field_name, {}).update(field_filter)
+        return collection, filter_dict
+
     def save_one(
         self,
         record: RecordProtocol | None,
@@ -232,6 +387,7 @@ class BasicMongoDb(Db):
         # TODO (Roman): update_one does not affect fields not presented in record. Changed to replace_one
         serialized_record["_key"] = serialized_key
         collection.replace_one({"_key": serialized_key}, serialized_record, upsert=True)
+        UsageCounters.add_db_call()
 
     def save_many(
         self,
@@ -244,6 +400,42 @@ class BasicMongoDb(Db):
         [self.save_one(x, dataset=dataset, identity=identity) for x in records]
         return
 
+    def compare_and_save_one(
+        self,
+        record: RecordProtocol,
+        expected: Dict[str, Any],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> bool:
+        # Call on_save if defined
+        if hasattr(record, "on_save"):
+            record.on_save()  # TODO: Refactor on_save
+
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        # Get collection name from key type by removing Key suffix if present
+        key_type = record.get_key_type()
+        collection_name = key_type.__name__  # TODO: Decision on short alias
+        db = self._get_db()
+        collection = db[collection_name]
+
+        # Serialize expected values the same way as record fields by serializing a copy with these values
+        serialized_record = data_serializer.serialize_data(record)
+        serialized_expected = data_serializer.serialize_data(dataclasses.replace(record, **expected))
+        serialized_key = key_serializer.serialize_key(record)
+        serialized_record["_key"] = serialized_key
+
+        # Replace without upsert conditional on the expected values, which is atomic in MongoDB
+        filter_ = {"_key": serialized_key, **{k: serialized_expected.get(k, None) for k in expected.keys()}}
+        result = collection.replace_one(filter_, serialized_record)
+        UsageCounters.add_db_call()
+        return result.matched_count == 1
+
     def delete_one(
         self,
         key_type: Type[TKey],
@@ -267,6 +459,7 @@ class BasicMongoDb(Db):
 
         delete_filter = {"_key": serialized_key}
         collection.delete_one(delete_filter)
+        UsageCounters.add_db_call()
 
     def delete_many(
         self,
@@ -289,6 +482,9 @@ class BasicMongoDb(Db):
         client = self._get_client()
         client.drop_database(db_name)
 
+    def open_connection(self) -> None:
+        self._get_db()
+
     def close_connection(self) -> None:
         if (client := _client_dict.get(self.client_uri, None)) is not None:
             # Close connection
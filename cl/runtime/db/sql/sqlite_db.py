@@ -12,14 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import dataclasses
+import hashlib
 import os
 import sqlite3
+import threading
 from collections import defaultdict
 from dataclasses import dataclass
 from itertools import groupby
 from typing import Any
 from typing import Dict
 from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Set
 from typing import Tuple
 from typing import Type
 from cl.runtime.context.context import Context
@@ -29,8 +35,10 @@ from cl.runtime.db.protocols import TRecord
 from cl.runtime.db.sql.sqlite_schema_manager import SqliteSchemaManager
 from cl.runtime.file.file_util import FileUtil
 from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.perf.usage_counters import UsageCounters
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.protocols import TQuery
 from cl.runtime.records.protocols import is_key
 from cl.runtime.records.record_util import RecordUtil
 from cl.runtime.schema.schema import Schema
@@ -43,6 +51,27 @@ _connection_dict: Dict[str, sqlite3.Connection] = {}
 _schema_manager_dict: Dict[str, SqliteSchemaManager] = {}
 """Dict of SqliteSchemaManager instances with db_id key key stored outside the class to avoid serialization."""
 
+_index_dict: Dict[str, Set[str]] = {}
+"""Dict of index names created by this process with db_id key, used to skip index creation for subsequent queries."""
+
+_connection_lock = threading.RLock()
+"""Serializes the use of connections shared by threads of this process, sqlite3 connections are not thread-safe."""
+
+_SQL_RANGE_OPERATORS: Dict[str, str] = {"$lt": "<", "$lte": "<=", "$gt": ">", "$gte": ">="}
+"""SQL comparison operators for range operators in query conditions."""
+
+
+def _clear_connections_after_fork() -> None:
+    """Do not use connections inherited from the parent process, new connections are opened on first use."""
+    _connection_dict.clear()
+    _schema_manager_dict.clear()
+    _index_dict.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    # Sqlite connections must not be shared between processes, not available on Windows where fork is not used
+    os.register_at_fork(after_in_child=_clear_connections_after_fork)
+
 
 def dict_factory(cursor, row):
     """sqlite3 row factory to return result as dictionary."""
@@ -151,7 +180,8 @@ class SqliteDb(Db):
                     keys_group = tuple(keys_group)
 
                 # return None for all keys in group if table doesn't exist
-                existing_tables = schema_manager.existing_tables()
+                with _connection_lock:
+                    existing_tables = schema_manager.existing_tables()
                 if table_name not in existing_tables:
                     yield from (None for _ in range(len(keys_group)))
                     continue
@@ -169,8 +199,11 @@ class SqliteDb(Db):
                 # serialize keys to tuple
                 query_values = self._serialize_keys_to_flat_tuple(keys_group, key_fields, serializer)
 
-                cursor = self._get_connection().cursor()
-                cursor.execute(sql_statement, query_values)
+                with _connection_lock:
+                    cursor = self._get_connection().cursor()
+                    cursor.execute(sql_statement, query_values)
+                    rows = cursor.fetchall()
+                UsageCounters.add_db_call(value for row in rows for value in row.values())
 
                 reversed_columns_mapping = {v: k for k, v in columns_mapping.items()}
 
@@ -178,7 +211,7 @@ class SqliteDb(Db):
                 # bulk load from db returns records in any order so we need to check all records in group before return
                 # collect db result to dictionary to return it according to input keys order
                 result = {}
-                for data in cursor.fetchall():
+                for data in rows:
                     # TODO (Roman): select only needed columns on db side.
                     data = {reversed_columns_mapping[k]: v for k, v in data.items() if v is not None}
                     deserialized_data = serializer.deserialize_data(data)
@@ -203,8 +236,9 @@ class SqliteDb(Db):
         table_name: str = schema_manager.table_name_for_type(record_type)
 
         # if table doesn't exist return empty list
-        if table_name not in schema_manager.existing_tables():
-            return list()
+        with _connection_lock:
+            if table_name not in schema_manager.existing_tables():
+                return list()
 
         # get subtypes for record_type and use them in match condition
         subtype_names = tuple(t.__name__ for t in Schema.get_type_successors(record_type))
@@ -215,12 +249,15 @@ class SqliteDb(Db):
             v: k for k, v in schema_manager.get_columns_mapping(record_type.get_key_type()).items()
         }
 
-        cursor = self._get_connection().cursor()
-        cursor.execute(sql_statement, subtype_names)
+        with _connection_lock:
+            cursor = self._get_connection().cursor()
+            cursor.execute(sql_statement, subtype_names)
+            rows = cursor.fetchall()
+        UsageCounters.add_db_call(value for row in rows for value in row.values())
 
         # TODO: Implement sort in query and restore yield to support large collections
         result = []
-        for data in cursor.fetchall():
+        for data in rows:
             # TODO (Roman): Select only needed columns on db side.
             data = {reversed_columns_mapping[k]: v for k, v in data.items() if v is not None}
             result.append(serializer.deserialize_data(data))
@@ -237,6 +274,216 @@ class SqliteDb(Db):
     ) -> Iterable[TRecord]:
         raise NotImplementedError()
 
+    def load_query(
+        self,
+        query: TQuery,
+        *,
+        limit: int | None = None,
+        skip: int | None = None,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord]:
+        # if table doesn't exist return empty list
+        if (statement := self._get_query_statement(query, limit=limit, skip=skip)) is None:
+            return list()
+        sql_statement, sql_values, reversed_columns_mapping = statement
+
+        with _connection_lock:
+            cursor = self._get_connection().cursor()
+            cursor.execute(sql_statement, sql_values)
+            rows = cursor.fetchall()
+        UsageCounters.add_db_call(value for row in rows for value in row.values())
+        return self._deserialize_rows(rows, reversed_columns_mapping)
+
+    def load_query_batches(
+        self,
+        query: TQuery,
+        *,
+        batch_size: int,
+        limit: int | None = None,
+        skip: int | None = None,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterator[List[TRecord]]:
+        # if table doesn't exist there are no batches
+        if (statement := self._get_query_statement(query, limit=limit, skip=skip)) is None:
+            return
+        sql_statement, sql_values, reversed_columns_mapping = statement
+
+        # The cursor is held open between batches and may be advanced by different threads, one at a time
+        with _connection_lock:
+            cursor = self._get_connection().cursor()
+            cursor.execute(sql_statement, sql_values)
+        try:
+            while True:
+                with _connection_lock:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                UsageCounters.add_db_call(value for row in rows for value in row.values())
+                yield self._deserialize_rows(rows, reversed_columns_mapping)
+                if len(rows) < batch_size:
+                    break
+        finally:
+            with _connection_lock:
+                cursor.close()
+
+    def _get_query_statement(
+        self,
+        query: TQuery,
+        *,
+        limit: int | None,
+        skip: int | None,
+    ) -> Tuple[str, List[Any], Dict[str, str]] | None:
+        """Return SQL statement, its values and mapping from column to field name, or None if table does not exist."""
+        query_type, conditions, order = query
+        schema_manager = self._get_schema_manager()
+
+        table_name: str = schema_manager.table_name_for_type(query_type)
+        with _connection_lock:
+            if table_name not in schema_manager.existing_tables():
+                return None
+
+        key_type = query_type.get_key_type()
+        columns_mapping = schema_manager.get_columns_mapping(key_type)
+
+        # Order by key fields after the specified order so that the order of records with equal values is stable
+        # between queries, this is required for paging using skip
+        order = {**order, **{k: 1 for k in schema_manager.get_primary_keys(key_type) if k not in order}}
+
+        where_str, sql_values = self._get_where_clause(table_name, query_type, conditions, order, columns_mapping)
+        order_str = ", ".join(
+            f'"{columns_mapping[field_name]}" {"DESC" if direction == -1 else "ASC"}'
+            for field_name, direction in order.items()
+        )
+        sql_statement = f'SELECT * FROM "{table_name}" WHERE {where_str} ORDER BY {order_str}'
+        if limit is not None or skip:
+            # Negative limit means no limit in sqlite, OFFSET requires LIMIT
+            sql_statement += " LIMIT ?"
+            sql_values.append(limit if limit is not None else -1)
+        if skip:
+            sql_statement += " OFFSET ?"
+            sql_values.append(skip)
+        sql_statement += ";"
+        return sql_statement, sql_values, {v: k for k, v in columns_mapping.items()}
+
+    @classmethod
+    def _deserialize_rows(cls, rows: List[Dict[str, Any]], reversed_columns_mapping: Dict[str, str]) -> List[TRecord]:
+        """Deserialize rows returned by the query statement."""
+        serializer = FlatDictSerializer()
+        result = []
+        for data in rows:
+            # TODO (Roman): Select only needed columns on db side.
+            data = {reversed_columns_mapping[k]: v for k, v in data.items() if v is not None}
+            result.append(serializer.deserialize_data(data))
+        return result
+
+    def count_query(
+        self,
+        query: TQuery,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        query_type, conditions, _ = query
+        schema_manager = self._get_schema_manager()
+
+        # if table doesn't exist there are no records
+        table_name: str = schema_manager.table_name_for_type(query_type)
+        with _connection_lock:
+            if table_name not in schema_manager.existing_tables():
+                return 0
+
+        columns_mapping = schema_manager.get_columns_mapping(query_type.get_key_type())
+        where_str, sql_values = self._get_where_clause(table_name, query_type, conditions, {}, columns_mapping)
+        sql_statement = f'SELECT COUNT(*) AS "count" FROM "{table_name}" WHERE {where_str};'
+
+        with _connection_lock:
+            cursor = self._get_connection().cursor()
+            cursor.execute(sql_statement, sql_values)
+            result = cursor.fetchone()["count"]
+        UsageCounters.add_db_call(sql_values)
+        return result
+
+    def load_content_hash(
+        self,
+        record_type: Type[TRecord],
+        key: KeyProtocol,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> str | None:
+        serializer = FlatDictSerializer()
+        schema_manager = self._get_schema_manager()
+        key_type = key.get_key_type()
+
+        # if table doesn't exist the record is not found
+        table_name = schema_manager.table_name_for_type(key_type)
+        with _connection_lock:
+            if table_name not in schema_manager.existing_tables():
+                return None
+
+        key_fields = schema_manager.get_primary_keys(key_type)
+        columns_mapping = schema_manager.get_columns_mapping(key_type)
+        sql_statement = self._add_where_keys_in_clause(f'SELECT * FROM "{table_name}"', key_fields, columns_mapping, 1)
+        sql_statement += ";"
+        query_values = self._serialize_keys_to_flat_tuple([key], key_fields, serializer)
+
+        with _connection_lock:
+            cursor = self._get_connection().cursor()
+            cursor.execute(sql_statement, query_values)
+            row = cursor.fetchone()
+        UsageCounters.add_db_call(query_values)
+
+        # Hash the stored row without deserializing it, REPLACE INTO rewrites all columns on save
+        if row is None:
+            return None
+        return hashlib.sha1(repr(sorted(row.items())).encode()).hexdigest()
+
+    def _get_where_clause(
+        self,
+        table_name: str,
+        query_type: Type,
+        conditions: Dict[str, Any],
+        order: Dict[str, int],
+        columns_mapping: Dict[str, str],
+    ) -> Tuple[str, List[Any]]:
+        """Return WHERE clause and its values for the query, creating the indexes declared by query type if needed."""
+        serializer = FlatDictSerializer()
+
+        # Check that query and order fields are present in the table
+        for field_name in (*conditions.keys(), *order.keys()):
+            if field_name not in columns_mapping:
+                raise RuntimeError(f"Field '{field_name}' in query for table '{table_name}' is not a record field.")
+
+        # Create indexes declared by the query type, indexes are not created for other queries
+        self._create_query_indexes(table_name, query_type, columns_mapping)
+
+        condition_values = self._get_condition_values(conditions)
+
+        # get subtypes for query_type and use them in match condition
+        subtype_names = tuple(t.__name__ for t in Schema.get_type_successors(query_type))
+        where_clauses = [f'_type IN ({", ".join(["?"] * len(subtype_names))})']
+        sql_values = list(subtype_names)
+        for field_name, operator_name, operand in condition_values:
+            column_name = columns_mapping[field_name]
+            if operator_name != "$in":
+                # Range condition is not met for NULL because comparison with NULL is not true in SQL
+                where_clauses.append(f'"{column_name}" {_SQL_RANGE_OPERATORS[operator_name]} ?')
+                sql_values.append(serializer.serialize_data(operand))
+                continue
+
+            serialized_values = [serializer.serialize_data(value) if value is not None else None for value in operand]
+            if None in serialized_values:
+                # Use IS for None because NULL is not equal to itself in SQL
+                where_clauses.append(
+                    f'("{column_name}" IS NULL OR "{column_name}" IN ({", ".join(["?"] * len(serialized_values))}))'
+                )
+            else:
+                where_clauses.append(f'"{column_name}" IN ({", ".join(["?"] * len(serialized_values))})')
+            sql_values.extend(serialized_values)
+        return " AND ".join(where_clauses), sql_values
+
     def save_one(
         self,
         record: RecordProtocol | None,
@@ -295,25 +542,72 @@ class SqliteDb(Db):
 
             primary_keys = [columns_mapping[primary_key] for primary_key in schema_manager.get_primary_keys(key_type)]
 
-            schema_manager.create_table(
-                table_name, columns_mapping.values(), if_not_exists=True, primary_keys=primary_keys
-            )
-
             sql_statement = f'REPLACE INTO "{table_name}" ({columns_str}) VALUES {value_placeholders};'
 
-            if not primary_keys:
-                # TODO (Roman): this is a workaround for handling singleton records.
-                #  Since they don't have primary keys, we can't automatically replace existing records.
-                #  So this code just deletes the existing records before saving.
-                #  As a possible solution, we can introduce some mandatory primary key that isn't based on the
-                #  key fields.
-                self.delete_many((rec.get_key() for rec in records_group))
+            with _connection_lock:
+                schema_manager.create_table(
+                    table_name, columns_mapping.values(), if_not_exists=True, primary_keys=primary_keys
+                )
+
+                if not primary_keys:
+                    # TODO (Roman): this is a workaround for handling singleton records.
+                    #  Since they don't have primary keys, we can't automatically replace existing records.
+                    #  So this code just deletes the existing records before saving.
+                    #  As a possible solution, we can introduce some mandatory primary key that isn't based on the
+                    #  key fields.
+                    self.delete_many((rec.get_key() for rec in records_group))
+
+                connection = self._get_connection()
+                cursor = connection.cursor()
+                cursor.execute(sql_statement, sql_values)
+                UsageCounters.add_db_call(sql_values)
+
+                connection.commit()
+
+    def compare_and_save_one(
+        self,
+        record: RecordProtocol,
+        expected: Dict[str, Any],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> bool:
+        # Call on_save if defined
+        if hasattr(record, "on_save"):
+            record.on_save()  # TODO: Refactor on_save
+
+        serializer = FlatDictSerializer()
+        schema_manager = self._get_schema_manager()
 
+        # Record cannot match if the table does not exist
+        key_type = record.get_key_type()
+        table_name = schema_manager.table_name_for_type(key_type)
+        with _connection_lock:
+            if table_name not in schema_manager.existing_tables():
+                return False
+
+        # Serialize expected values the same way as record fields by serializing a copy with these values
+        serialized_record = serializer.serialize_data(record, is_root=True)
+        serialized_expected = serializer.serialize_data(dataclasses.replace(record, **expected), is_root=True)
+
+        # Replace all columns in a single UPDATE conditional on the key and expected values, which is atomic in sqlite
+        columns_mapping = schema_manager.get_columns_mapping(key_type)
+        where_fields = [*schema_manager.get_primary_keys(key_type), *expected.keys()]
+        set_str = ", ".join(f'"{column}" = ?' for column in columns_mapping.values())
+        where_str = " AND ".join(f'"{columns_mapping[field]}" IS ?' for field in where_fields)
+        sql_statement = f'UPDATE "{table_name}" SET {set_str} WHERE {where_str};'
+        sql_values = (
+            *(serialized_record.get(field) for field in columns_mapping.keys()),
+            *(serialized_expected.get(field) for field in where_fields),
+        )
+
+        with _connection_lock:
             connection = self._get_connection()
             cursor = connection.cursor()
             cursor.execute(sql_statement, sql_values)
-
+            UsageCounters.add_db_call(sql_values)
             connection.commit()
+            return cursor.rowcount == 1
 
     def delete_one(
         self,
@@ -344,7 +638,8 @@ class SqliteDb(Db):
         for key_type, keys_group in grouped_keys.items():
             table_name = schema_manager.table_name_for_type(key_type)
 
-            existing_tables = schema_manager.existing_tables()
+            with _connection_lock:
+                existing_tables = schema_manager.existing_tables()
             if table_name not in existing_tables:
                 continue
 
@@ -364,10 +659,12 @@ class SqliteDb(Db):
             query_values = self._serialize_keys_to_flat_tuple(keys_group, key_fields, serializer)
 
             # perform delete query
-            connection = self._get_connection()
-            cursor = connection.cursor()
-            cursor.execute(sql_statement, query_values)
-            connection.commit()
+            with _connection_lock:
+                connection = self._get_connection()
+                cursor = connection.cursor()
+                cursor.execute(sql_statement, query_values)
+                UsageCounters.add_db_call(query_values)
+                connection.commit()
 
     def delete_all_and_drop_db(self) -> None:
         # Check that db_id matches temp_db_prefix
@@ -387,6 +684,9 @@ class SqliteDb(Db):
         if os.path.exists(db_file_path):
             os.remove(db_file_path)
 
+    def open_connection(self) -> None:
+        self._get_connection()
+
     def close_connection(self) -> None:
         if (connection := _connection_dict.get(self.db_id, None)) is not None:
             # Close connection
@@ -394,17 +694,19 @@ class SqliteDb(Db):
             # Remove from dictionary so connection can be reopened on next access
             del _connection_dict[self.db_id]
             del _schema_manager_dict[self.db_id]
+            _index_dict.pop(self.db_id, None)
             pass
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get PyMongo database object."""
-        if (connection := _connection_dict.get(self.db_id, None)) is None:
-            # TODO: Implement dispose logic
-            db_file = self._get_db_file()
-            connection = sqlite3.connect(db_file, check_same_thread=False)
-            connection.row_factory = dict_factory
-            _connection_dict[self.db_id] = connection
-        return connection
+        with _connection_lock:
+            if (connection := _connection_dict.get(self.db_id, None)) is None:
+                # TODO: Implement dispose logic
+                db_file = self._get_db_file()
+                connection = sqlite3.connect(db_file, check_same_thread=False)
+                connection.row_factory = dict_factory
+                _connection_dict[self.db_id] = connection
+            return connection
 
     def _get_schema_manager(self) -> SqliteSchemaManager:
         """Get PyMongo database object."""
@@ -415,6 +717,23 @@ class SqliteDb(Db):
             _schema_manager_dict[self.db_id] = result
         return result
 
+    def _create_query_indexes(self, table_name: str, query_type: Type, columns_mapping: Dict[str, str]) -> None:
+        """Create indexes returned by 'get_query_indexes' method of the query type if it is defined."""
+        if (get_query_indexes := getattr(query_type, "get_query_indexes", None)) is not None:
+            for index_fields in get_query_indexes():
+                self._create_index(table_name, [columns_mapping[x] for x in index_fields])
+
+    def _create_index(self, table_name: str, column_names: Iterable[str]) -> None:
+        """Create index on the specified columns if it has not been created by this process."""
+        index_name = f"{table_name}.{'.'.join(column_names)}"
+        if index_name not in (created_indexes := _index_dict.setdefault(self.db_id, set())):
+            columns_str = ", ".join(f'"{column_name}"' for column_name in column_names)
+            with _connection_lock:
+                connection = self._get_connection()
+                connection.execute(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({columns_str});')
+                connection.commit()
+            created_indexes.add(index_name)
+
     def _get_db_file(self) -> str:
         """Get database file path from db_id, applying the appropriate formatting conventions."""
 
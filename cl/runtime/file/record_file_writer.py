@@ -0,0 +1,205 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import csv
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any
+from typing import Iterable
+from typing import List
+from typing import TextIO
+from typing import Type
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.protocols import is_key
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots  # TODO: Move to ClassInfo
+from cl.runtime.serialization.flat_dict_serializer import FlatDictSerializer
+from cl.runtime.serialization.string_serializer import StringSerializer
+
+serializer = FlatDictSerializer()
+"""Serializer for records."""
+
+key_serializer = StringSerializer()
+"""Serializer for embedded keys."""
+
+RECORD_FILE_FORMATS = ("csv", "parquet")
+"""Supported file formats, also used as file extensions."""
+
+
+def _get_default_file_mode() -> int:
+    """Return permissions of a new file created by 'open' under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+_default_file_mode = _get_default_file_mode()
+"""Permissions set on the temporary file before it replaces the target file, 'mkstemp' creates it with 0600."""
+
+
+@dataclass(slots=True, kw_only=True)
+class RecordFileWriter:
+    """
+    Write records of a single type to a CSV or Parquet file in batches without holding all records in memory.
+
+    Notes:
+        - The file has one column per field in the order of declaration from base to derived, in the format
+          read by CsvFileReader (field names in snake_case, None as an empty value, no _type column)
+        - Records are written to a temporary file in the same directory which replaces the target file
+          on 'commit', so the target file is never left partially written
+        - Parquet requires the optional 'pyarrow' package, values are stored as strings in the same format as CSV
+    """
+
+    file_path: str
+    """Path to the target file including extension."""
+
+    record_type: Type
+    """Type of records in the file, records of other types including subtypes are not accepted."""
+
+    file_format: str = "csv"
+    """File format, one of RECORD_FILE_FORMATS."""
+
+    record_count: int = 0
+    """Number of records written so far."""
+
+    _columns: List[str] | None = None
+    """Field names in the order of declaration."""
+
+    _temp_path: str | None = None
+    """Path to the temporary file while writing."""
+
+    _csv_file: TextIO | None = None
+    """Temporary CSV file while writing."""
+
+    _csv_writer: Any = None
+    """CSV writer for the temporary file."""
+
+    _parquet_writer: Any = None
+    """Parquet writer for the temporary file."""
+
+    def __enter__(self) -> RecordFileWriter:
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+    def open(self) -> None:
+        """Create the temporary file and write the header."""
+
+        if self.file_format not in RECORD_FILE_FORMATS:
+            raise RuntimeError(
+                f"File format {self.file_format} is not supported, supported formats are {RECORD_FILE_FORMATS}."
+            )
+        if self._temp_path is not None:
+            raise RuntimeError(f"File {self.file_path} is already open.")
+
+        self._columns = [x for x in _get_class_hierarchy_slots(self.record_type) if not x.startswith("_")]
+        dir_path = os.path.dirname(os.path.abspath(self.file_path))
+        os.makedirs(dir_path, exist_ok=True)
+        temp_fd, self._temp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self.file_path)}.", suffix=".tmp", dir=dir_path
+        )
+
+        if self.file_format == "csv":
+            self._csv_file = os.fdopen(temp_fd, mode="w", encoding="utf-8", newline="")
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(self._columns)
+        else:
+            os.close(temp_fd)
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                self.abort()
+                raise RuntimeError("Package 'pyarrow' is required to write records in Parquet format.")
+            schema = pa.schema([(x, pa.string()) for x in self._columns])
+            self._parquet_writer = pq.ParquetWriter(self._temp_path, schema)
+
+    def write_records(self, records: Iterable[RecordProtocol]) -> None:
+        """Serialize and write a batch of records."""
+
+        if self._temp_path is None:
+            raise RuntimeError(f"File {self.file_path} is not open.")
+
+        rows = []
+        for record in records:
+            if type(record) is not self.record_type:
+                raise RuntimeError(
+                    f"Record of type {type(record).__name__} cannot be written to file {self.file_path} "
+                    f"for type {self.record_type.__name__}."
+                )
+            # Use StringSerializer for embedded keys
+            serialized_record = serializer.serialize_data(record, is_root=True)
+            rows.append(
+                [
+                    (
+                        key_serializer.serialize_key(v)
+                        if is_key(v := getattr(record, x))
+                        else self._to_str(serialized_record.get(x))
+                    )
+                    for x in self._columns
+                ]
+            )
+
+        if self._csv_writer is not None:
+            self._csv_writer.writerows(rows)
+        elif rows:
+            import pyarrow as pa
+
+            columns = [[row[i] for row in rows] for i in range(len(self._columns))]
+            self._parquet_writer.write_table(pa.Table.from_arrays(columns, schema=self._parquet_writer.schema))
+        self.record_count += len(rows)
+
+    def commit(self) -> None:
+        """Close the temporary file and replace the target file with it."""
+        if self._temp_path is None:
+            raise RuntimeError(f"File {self.file_path} is not open.")
+        self._close()
+        os.chmod(self._temp_path, _default_file_mode)
+        os.replace(self._temp_path, self.file_path)
+        self._temp_path = None
+
+    def abort(self) -> None:
+        """Close and delete the temporary file, the target file is not modified."""
+        if self._temp_path is None:
+            return
+        try:
+            self._close()
+        finally:
+            if os.path.exists(self._temp_path):
+                os.remove(self._temp_path)
+            self._temp_path = None
+
+    def _close(self) -> None:
+        """Close the temporary file."""
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    @classmethod
+    def _to_str(cls, value: Any) -> str | None:
+        """Convert serialized value to string, None is written as an empty CSV value or Parquet null."""
+        if value is None or isinstance(value, str):
+            return value
+        return str(value)
@@ -15,6 +15,7 @@
 import logging
 import os
 from dataclasses import dataclass
+from dataclasses import field
 from typing import Iterable
 from concurrent_log_handler import ConcurrentRotatingFileHandler
 from cl.runtime.log.log import Log
@@ -22,9 +23,17 @@ from cl.runtime.primitive.datetime_util import DatetimeUtil
 from cl.runtime.settings.log_settings import LogSettings
 from cl.runtime.settings.project_settings import ProjectSettings
 
+_log_filename: str | None = None
+"""Log filename is generated on first use and used throughout the session."""
+
 
 def _get_log_filename() -> str:
-    """Generate log filename during import and use it throughout the session."""
+    """Generate log filename on first call and use it throughout the session."""
+
+    # Return the cached value if already generated
+    global _log_filename
+    if _log_filename is not None:
+        return _log_filename
 
     # TODO: Refactor to use a unique directory name instead
     # Generate log file name
@@ -57,19 +66,16 @@ def _get_log_filename() -> str:
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
 
+    _log_filename = result
     return result
 
 
-log_filename = _get_log_filename()
-"""Generate log filename during import and use it throughout the session."""
-
-
 @dataclass(slots=True, kw_only=True)
 class FileLog(Log):
     """File log with concurrency multiprocess write capability."""
 
-    filename: str = log_filename
-    """Log filename with extension is generated on import."""
+    filename: str = field(default_factory=_get_log_filename)
+    """Log filename with extension is generated on first use."""
 
     def get_log_handlers(self) -> Iterable[logging.Handler]:
         """Return an iterable of log handlers to be added to the logger."""
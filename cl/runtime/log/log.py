@@ -16,6 +16,7 @@ import logging
 from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
+from dataclasses import field
 from typing import ClassVar
 from typing import Iterable
 from typing_extensions import Self
@@ -34,7 +35,7 @@ class Log(LogKey, RecordMixin[LogKey], ABC):
     # TODO: Do not store here, instead get from settings once during the initial Context construction
     __default: ClassVar[Self | None] = None
 
-    level: str = LogSettings.instance().level
+    level: str = field(default_factory=lambda: LogSettings.instance().level)
     """Log level using logging module conventions (lower, upper or mixed case can be used)."""
 
     def get_key(self) -> LogKey:
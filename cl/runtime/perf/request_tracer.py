@@ -0,0 +1,352 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from collections import deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from contextvars import Token
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import ContextManager
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import TypeVar
+
+T = TypeVar("T")
+"""Item type of the iterable returned by a traced database call."""
+
+REQUEST_TRACE_SAMPLE_COUNT = 1000
+"""Number of most recent request durations per route used to compute percentiles."""
+
+_request_trace_var: ContextVar[RequestTrace | None] = ContextVar("request_trace_var", default=None)
+"""Trace of the request handled in the current asynchronous context, None outside of a traced request."""
+
+_null_span = nullcontext()
+"""Reused when no request is traced so that 'RequestTracer.span' costs one context variable lookup."""
+
+_route_durations: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=REQUEST_TRACE_SAMPLE_COUNT))
+"""Most recent request durations in milliseconds for each route."""
+
+_route_counts: Dict[str, int] = defaultdict(int)
+"""Total number of requests for each route since process start or the last 'clear_summary' call."""
+
+_lock = threading.Lock()
+"""Protects route statistics and the trace file."""
+
+
+@dataclass(slots=True, kw_only=True)
+class RequestSpan:
+    """Wall-clock time of one operation inside a request such as a database call or serialization."""
+
+    name: str
+    """Span name, durations of spans with the same name are added up in Server-Timing header."""
+
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    """Span attributes such as database operation, record type and row count."""
+
+    span_id: str = field(default_factory=lambda: os.urandom(8).hex())
+    """Span identifier in OpenTelemetry format (16 hex characters)."""
+
+    start_time_ns: int = 0
+    """Start time in nanoseconds since epoch."""
+
+    duration_ns: int = 0
+    """Duration in nanoseconds."""
+
+    _trace: RequestTrace | None = None
+    """Trace where the span is recorded on exit."""
+
+    _start_ns: int = 0
+    """Start time from the performance counter, used to measure duration."""
+
+    def __enter__(self) -> RequestSpan:
+        self.start_time_ns = time.time_ns()
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.duration_ns = time.perf_counter_ns() - self._start_ns
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        # Appending to a list is atomic, spans may be recorded by several threads running work for the same request
+        self._trace.spans.append(self)
+        return False
+
+    def set_row_count(self, values: Any) -> None:
+        """Record the number of rows if the values have length, lazy iterables are not counted."""
+        if hasattr(values, "__len__"):
+            self.attributes["rows"] = len(values)
+
+    def count_rows(self, result: Iterable[T] | None) -> Iterable[T] | None:
+        """
+        Record the number of rows in the result of a completed span and return the result, a lazy iterable
+        is wrapped so that the time spent producing each row is added to the span duration.
+        """
+        if result is None or hasattr(result, "__len__"):
+            self.set_row_count(result)
+            return result
+        return self._iterate_and_count(result)
+
+    def _iterate_and_count(self, result: Iterable[T]) -> Iterator[T]:
+        """Yield from the result adding the time spent in the iterator to duration, record row count on exit."""
+        iterator = iter(result)
+        row_count = 0
+        try:
+            while True:
+                start_ns = time.perf_counter_ns()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    self.duration_ns += time.perf_counter_ns() - start_ns
+                row_count += 1
+                yield item
+        finally:
+            self.attributes["rows"] = row_count
+
+
+@dataclass(slots=True, kw_only=True)
+class RequestTrace:
+    """
+    Spans recorded during one HTTP request, active inside 'with RequestTrace(...)' clause.
+
+    Notes:
+        - Spans may run concurrently (e.g. database calls for several panels), in which case the total
+          duration of spans with the same name may exceed the duration of the request
+    """
+
+    method: str
+    """HTTP method."""
+
+    path: str
+    """URL path of the request."""
+
+    route: str | None = None
+    """Path template of the matched route, None if no route is matched."""
+
+    status: int | None = None
+    """HTTP status code of the response."""
+
+    trace_id: str = field(default_factory=lambda: os.urandom(16).hex())
+    """Trace identifier in OpenTelemetry format (32 hex characters)."""
+
+    span_id: str = field(default_factory=lambda: os.urandom(8).hex())
+    """Identifier of the request span which is the parent of all other spans."""
+
+    start_time_ns: int = field(default_factory=time.time_ns)
+    """Start time in nanoseconds since epoch."""
+
+    duration_ns: int = 0
+    """Duration of the request in nanoseconds."""
+
+    spans: List[RequestSpan] = field(default_factory=list)
+    """Completed spans in the order of completion."""
+
+    _start_ns: int = field(default_factory=time.perf_counter_ns)
+    """Start time from the performance counter, used to measure duration."""
+
+    _token: Token | None = None
+    """Token for restoring the previous trace on exit."""
+
+    def __enter__(self) -> RequestTrace:
+        self._token = _request_trace_var.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _request_trace_var.reset(self._token)
+        self._token = None
+        self.duration_ns = self.get_elapsed_ns()
+        return False
+
+    def get_elapsed_ns(self) -> int:
+        """Nanoseconds since the start of the request."""
+        return time.perf_counter_ns() - self._start_ns
+
+    def get_route_name(self) -> str:
+        """Method and route template used to group requests in the summary."""
+        return f"{self.method} {self.route if self.route is not None else '(unmatched)'}"
+
+    def get_server_timing(self) -> str:
+        """
+        Return Server-Timing header value with the total duration of spans completed so far grouped by name,
+        followed by 'total' entry with the time elapsed since the start of the request.
+        """
+        durations = {}
+        counts = {}
+        rows = {}
+        for span in list(self.spans):
+            durations[span.name] = durations.get(span.name, 0) + span.duration_ns
+            counts[span.name] = counts.get(span.name, 0) + 1
+            if (row_count := span.attributes.get("rows")) is not None:
+                rows[span.name] = rows.get(span.name, 0) + row_count
+        entries = []
+        for name, duration_ns in durations.items():
+            desc = f"{counts[name]} calls" + (f", {rows[name]} rows" if name in rows else "")
+            entries.append(f'{name};dur={duration_ns / 1e6:.2f};desc="{desc}"')
+        entries.append(f"total;dur={self.get_elapsed_ns() / 1e6:.2f}")
+        return ", ".join(entries)
+
+    def to_otel_dict(self) -> Dict[str, Any]:
+        """Return the request and its spans in OpenTelemetry protocol JSON format (one ResourceSpans message)."""
+        root_attributes = {
+            "http.request.method": self.method,
+            "url.path": self.path,
+            "http.route": self.route,
+            "http.response.status_code": self.status,
+        }
+        root_span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.get_route_name(),
+            "kind": 2,  # SPAN_KIND_SERVER
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.start_time_ns + self.duration_ns),
+            "attributes": self._to_otel_attributes(root_attributes),
+            "status": {"code": 2 if self.status is not None and self.status >= 500 else 0},
+        }
+        child_spans = [
+            {
+                "traceId": self.trace_id,
+                "spanId": x.span_id,
+                "parentSpanId": self.span_id,
+                "name": x.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(x.start_time_ns),
+                "endTimeUnixNano": str(x.start_time_ns + x.duration_ns),
+                "attributes": self._to_otel_attributes(x.attributes),
+                "status": {"code": 2 if "error" in x.attributes else 0},
+            }
+            for x in self.spans
+        ]
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": self._to_otel_attributes(
+                            {"service.name": "cl.runtime", "process.pid": os.getpid()}
+                        )
+                    },
+                    "scopeSpans": [{"scope": {"name": __name__}, "spans": [root_span, *child_spans]}],
+                }
+            ]
+        }
+
+    @classmethod
+    def _to_otel_attributes(cls, attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert attributes to OpenTelemetry key-value list, None values are skipped."""
+        result = []
+        for key, value in attributes.items():
+            if value is None:
+                continue
+            elif isinstance(value, bool):
+                otel_value = {"boolValue": value}
+            elif isinstance(value, int):
+                # 64-bit integers are strings in OpenTelemetry JSON format
+                otel_value = {"intValue": str(value)}
+            elif isinstance(value, float):
+                otel_value = {"doubleValue": value}
+            else:
+                otel_value = {"stringValue": str(value)}
+            result.append({"key": key, "value": otel_value})
+        return result
+
+
+class RequestTracer:
+    """
+    Records spans for the request handled in the current asynchronous context and keeps per-route statistics.
+
+    Notes:
+        - The trace is started by TracingMiddleware, when no request is traced 'span' returns a shared no-op
+          context manager so that instrumented code can be called outside of a request at no cost
+        - Spans from database executor threads are recorded because each call runs in a copy of the caller's
+          contextvars.Context
+    """
+
+    @classmethod
+    def current(cls) -> RequestTrace | None:
+        """Return the trace of the current request or None if no request is traced."""
+        return _request_trace_var.get()
+
+    @classmethod
+    def span(cls, name: str, **attributes: Any) -> ContextManager[RequestSpan | None]:
+        """Context manager recording a span in the current request, returns None on enter if no request is traced."""
+        if (trace := _request_trace_var.get()) is None:
+            return _null_span
+        return RequestSpan(name=name, attributes=attributes, _trace=trace)
+
+    @classmethod
+    def record(cls, trace: RequestTrace) -> None:
+        """Add the duration of a completed request to the statistics of its route."""
+        route_name = trace.get_route_name()
+        with _lock:
+            _route_durations[route_name].append(trace.duration_ns / 1e6)
+            _route_counts[route_name] += 1
+
+    @classmethod
+    def get_summary(cls) -> Dict[str, Dict[str, float]]:
+        """
+        Return request count and latency percentiles in milliseconds for each route, percentiles are computed
+        from the most recent 'REQUEST_TRACE_SAMPLE_COUNT' requests.
+        """
+        with _lock:
+            samples = {k: (_route_counts[k], sorted(v)) for k, v in _route_durations.items()}
+        return {
+            route_name: {
+                "count": count,
+                "mean": sum(durations) / len(durations),
+                "p50": cls._get_percentile(durations, 50),
+                "p90": cls._get_percentile(durations, 90),
+                "p99": cls._get_percentile(durations, 99),
+                "max": durations[-1],
+            }
+            for route_name, (count, durations) in sorted(samples.items())
+        }
+
+    @classmethod
+    def clear_summary(cls) -> None:
+        """Remove the statistics of all routes."""
+        with _lock:
+            _route_durations.clear()
+            _route_counts.clear()
+
+    @classmethod
+    def write_trace(cls, trace: RequestTrace, file_path: str) -> None:
+        """
+        Append the trace to a file in OpenTelemetry JSON lines format (the format of OpenTelemetry Collector
+        file exporter), '{pid}' in the path is replaced by process id and the directory is created if necessary.
+        """
+        file_path = file_path.replace("{pid}", str(os.getpid()))
+        line = json.dumps(trace.to_otel_dict(), separators=(",", ":")) + "\n"
+        with _lock:
+            if dir_path := os.path.dirname(file_path):
+                os.makedirs(dir_path, exist_ok=True)
+            with open(file_path, "a") as trace_file:
+                trace_file.write(line)
+
+    @classmethod
+    def _get_percentile(cls, sorted_values: List[float], percentile: int) -> float:
+        """Return percentile of sorted values using the nearest-rank method."""
+        rank = max(1, -(-percentile * len(sorted_values) // 100))
+        return sorted_values[rank - 1]
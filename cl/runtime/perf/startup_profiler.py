@@ -0,0 +1,321 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from dataclasses import field
+from importlib.abc import MetaPathFinder
+from typing import ContextManager
+from typing import Dict
+from typing import List
+from typing import TextIO
+
+# IMPORTANT: This module is imported before everything else in 'cl.runtime' when profiling is enabled
+# and must only depend on the standard library
+
+STARTUP_PROFILE_ENVVAR = "CL_STARTUP_PROFILE"
+"""Set to a non-empty value other than '0' or 'false' to print the startup report to stderr on exit."""
+
+STARTUP_TRACE_ENVVAR = "CL_STARTUP_TRACE"
+"""Path to the Chrome trace JSON file written on exit, '{pid}' in the path is replaced by process id."""
+
+STARTUP_PROFILE_FLAG = "--startup-profile"
+"""Command line flag equivalent to setting 'CL_STARTUP_PROFILE' envvar."""
+
+STARTUP_TRACE_FLAG = "--startup-trace"
+"""Command line flag followed by path, equivalent to setting 'CL_STARTUP_TRACE' envvar."""
+
+_profiler: StartupProfiler | None = None
+"""Active profiler or None if profiling is not enabled for this process."""
+
+_null_phase = nullcontext()
+"""Reused when profiling is disabled so that 'StartupProfiler.phase' costs one global lookup."""
+
+
+@dataclass(slots=True, kw_only=True)
+class StartupSpan:
+    """Wall-clock time of one startup phase or module import."""
+
+    name: str
+    """Phase name or dot-delimited module name."""
+
+    category: str
+    """Either 'phase' or 'import'."""
+
+    start_ns: int
+    """Start time in nanoseconds relative to the start of profiling."""
+
+    duration_ns: int = 0
+    """Inclusive duration in nanoseconds."""
+
+    self_ns: int = 0
+    """Duration in nanoseconds excluding nested imports (equal to duration_ns for phases)."""
+
+    thread_id: int = 0
+    """Identifier of the thread where the span was recorded."""
+
+
+@dataclass(slots=True, kw_only=True)
+class _ActiveImport:
+    """Import in progress, used to subtract nested import time from the parent."""
+
+    span: StartupSpan
+    """Span to be completed when the import exits."""
+
+    children_ns: int = 0
+    """Total inclusive duration of nested imports."""
+
+
+class _ImportTimingFinder(MetaPathFinder):
+    """Meta path finder that delegates to other finders and wraps the loader to time module execution."""
+
+    def __init__(self, profiler: StartupProfiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        # Delegate to the remaining finders in the order they appear in sys.meta_path
+        for finder in sys.meta_path:
+            if finder is self or (find_spec := getattr(finder, "find_spec", None)) is None:
+                continue
+            if (spec := find_spec(fullname, path, target)) is None:
+                continue
+
+            # Wrap per-module loader instances only, builtin and frozen importers are classes shared by all modules
+            loader = spec.loader
+            if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+                try:
+                    loader.exec_module = self._profiler._wrap_exec_module(fullname, loader.exec_module)
+                except (AttributeError, TypeError):
+                    # Loaders that do not accept attribute assignment are not timed
+                    pass
+            return spec
+        return None
+
+
+@dataclass(slots=True, kw_only=True)
+class StartupProfiler:
+    """
+    Records wall-clock time per startup phase and per imported module.
+
+    Notes:
+        - Enable using 'CL_STARTUP_PROFILE' or 'CL_STARTUP_TRACE' envvars, or '--startup-profile'
+          and '--startup-trace <path>' command line flags (envvars are inherited by child processes)
+        - When disabled, 'StartupProfiler.phase' returns a shared no-op context manager
+        - The report and trace are written by 'finish' or on process exit, whichever comes first
+    """
+
+    report_enabled: bool = False
+    """Print the sorted report to stderr on finish."""
+
+    trace_path: str | None = None
+    """Path to Chrome trace JSON file written on finish, '{pid}' is replaced by process id."""
+
+    spans: List[StartupSpan] = field(default_factory=list)
+    """Completed spans in the order of completion."""
+
+    _origin_ns: int = field(default_factory=time.perf_counter_ns)
+    """Start of profiling, span times are relative to this value."""
+
+    _import_stacks: Dict[int, List[_ActiveImport]] = field(default_factory=dict)
+    """Stack of imports in progress for each thread."""
+
+    _finder: _ImportTimingFinder | None = None
+    """Import hook if installed."""
+
+    _is_finished: bool = False
+    """True after the report and trace have been written."""
+
+    @classmethod
+    def start_if_enabled(cls, argv: List[str] | None = None) -> StartupProfiler | None:
+        """Start profiling if enabled by envvar or command line flag, return the profiler or None if not enabled."""
+
+        if _profiler is not None:
+            return _profiler
+
+        argv = sys.argv if argv is None else argv
+        report_enabled = os.environ.get(STARTUP_PROFILE_ENVVAR, "").lower() not in ("", "0", "false")
+        trace_path = os.environ.get(STARTUP_TRACE_ENVVAR) or None
+        if STARTUP_PROFILE_FLAG in argv:
+            report_enabled = True
+        if STARTUP_TRACE_FLAG in argv:
+            flag_index = argv.index(STARTUP_TRACE_FLAG)
+            if flag_index + 1 >= len(argv):
+                raise RuntimeError(f"Command line flag '{STARTUP_TRACE_FLAG}' must be followed by a file path.")
+            trace_path = argv[flag_index + 1]
+
+        if not report_enabled and trace_path is None:
+            return None
+
+        # Propagate to child processes such as Celery workers so their startup is profiled too
+        if report_enabled:
+            os.environ[STARTUP_PROFILE_ENVVAR] = "1"
+        if trace_path is not None:
+            os.environ[STARTUP_TRACE_ENVVAR] = trace_path
+
+        result = cls.start(report_enabled=report_enabled, trace_path=trace_path)
+        atexit.register(result.finish)
+        return result
+
+    @classmethod
+    def start(cls, *, report_enabled: bool = False, trace_path: str | None = None) -> StartupProfiler:
+        """Start profiling unconditionally and install the import hook, error if already started."""
+
+        global _profiler
+        if _profiler is not None:
+            raise RuntimeError("Startup profiler has already been started in this process.")
+        result = StartupProfiler(report_enabled=report_enabled, trace_path=trace_path)
+        result._finder = _ImportTimingFinder(result)
+        sys.meta_path.insert(0, result._finder)
+        _profiler = result
+        return result
+
+    @classmethod
+    def current(cls) -> StartupProfiler | None:
+        """Return the active profiler or None if profiling is not enabled."""
+        return _profiler
+
+    @classmethod
+    def phase(cls, name: str) -> ContextManager:
+        """Context manager recording wall-clock time of a startup phase, no-op if profiling is not enabled."""
+        if _profiler is None or _profiler._is_finished:
+            return _null_phase
+        return _StartupPhase(profiler=_profiler, name=name)
+
+    def stop(self) -> None:
+        """Remove the import hook and deactivate this profiler without writing the report or trace."""
+        global _profiler
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+        if _profiler is self:
+            _profiler = None
+
+    def finish(self) -> None:
+        """Stop profiling and write the report and trace if enabled, subsequent calls are ignored."""
+        if self._is_finished:
+            return
+        self._is_finished = True
+        self.stop()
+        if self.report_enabled:
+            self.write_report(sys.stderr)
+        if self.trace_path is not None:
+            self.write_trace(self.trace_path.replace("{pid}", str(os.getpid())))
+
+    def get_report(self, *, limit: int = 30) -> str:
+        """Return phases in the order of start followed by the slowest imports sorted by self time."""
+
+        phases = sorted((x for x in self.spans if x.category == "phase"), key=lambda x: x.start_ns)
+        imports = sorted((x for x in self.spans if x.category == "import"), key=lambda x: -x.self_ns)
+        total_import_ns = sum(x.self_ns for x in imports)
+
+        lines = [f"Startup profile for process {os.getpid()}:", "  Phases (ms, inclusive):"]
+        lines.extend(f"    {x.duration_ns / 1e6:10.2f}  {x.name}" for x in phases)
+        lines.append(f"  Imports ({len(imports)} modules, {total_import_ns / 1e6:.2f} ms total self time):")
+        lines.append("    self (ms)  incl (ms)  module")
+        lines.extend(f"    {x.self_ns / 1e6:9.2f}  {x.duration_ns / 1e6:9.2f}  {x.name}" for x in imports[:limit])
+        return "\n".join(lines)
+
+    def write_report(self, stream: TextIO) -> None:
+        """Write the report returned by 'get_report' to a text stream."""
+        stream.write(self.get_report() + "\n")
+        stream.flush()
+
+    def get_trace(self) -> Dict:
+        """Return spans in Chrome trace event format (load in chrome://tracing or Perfetto)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": x.name,
+                "cat": x.category,
+                "ph": "X",
+                "ts": x.start_ns / 1000.0,
+                "dur": x.duration_ns / 1000.0,
+                "pid": pid,
+                "tid": x.thread_id,
+                "args": {"self_ms": x.self_ns / 1e6},
+            }
+            for x in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, file_path: str) -> None:
+        """Write the trace returned by 'get_trace' to a JSON file, creating the directory if necessary."""
+        if dir_path := os.path.dirname(file_path):
+            os.makedirs(dir_path, exist_ok=True)
+        with open(file_path, "w") as trace_file:
+            json.dump(self.get_trace(), trace_file)
+
+    def _wrap_exec_module(self, module_name: str, exec_module):
+        """Return a replacement for loader.exec_module that records an import span."""
+
+        def timed_exec_module(module):
+            thread_id = threading.get_ident()
+            import_stack = self._import_stacks.setdefault(thread_id, [])
+            start_ns = time.perf_counter_ns()
+            active = _ActiveImport(
+                span=StartupSpan(
+                    name=module_name, category="import", start_ns=start_ns - self._origin_ns, thread_id=thread_id
+                )
+            )
+            import_stack.append(active)
+            try:
+                exec_module(module)
+            finally:
+                duration_ns = time.perf_counter_ns() - start_ns
+                import_stack.pop()
+                active.span.duration_ns = duration_ns
+                active.span.self_ns = duration_ns - active.children_ns
+                if import_stack:
+                    import_stack[-1].children_ns += duration_ns
+                self.spans.append(active.span)
+
+        return timed_exec_module
+
+
+@dataclass(slots=True, kw_only=True)
+class _StartupPhase:
+    """Context manager returned by 'StartupProfiler.phase' when profiling is enabled."""
+
+    profiler: StartupProfiler
+    """Profiler where the span is recorded."""
+
+    name: str
+    """Phase name."""
+
+    _start_ns: int = 0
+    """Absolute start time in nanoseconds."""
+
+    def __enter__(self):
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration_ns = time.perf_counter_ns() - self._start_ns
+        span = StartupSpan(
+            name=self.name,
+            category="phase",
+            start_ns=self._start_ns - self.profiler._origin_ns,
+            duration_ns=duration_ns,
+            self_ns=duration_ns,
+            thread_id=threading.get_ident(),
+        )
+        self.profiler.spans.append(span)
+        return False
@@ -0,0 +1,95 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import sys
+from contextvars import ContextVar
+from contextvars import Token
+from dataclasses import dataclass
+from typing import Any
+from typing import Iterable
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, peak memory is not reported
+    resource = None
+
+_usage_counters_var: ContextVar[UsageCounters | None] = ContextVar("usage_counters_var", default=None)
+"""Counters active in the current thread or asynchronous context, None if usage is not being counted."""
+
+
+@dataclass(slots=True, kw_only=True)
+class UsageCounters:
+    """
+    Counts database calls, database bytes and LLM tokens used by the code inside 'with UsageCounters()' clause.
+
+    Notes:
+        - Counters are per thread or asynchronous context, usage by other threads is not counted
+        - When nested, usage counted by the inner counters is added to the outer counters on exit
+        - When no counters are active, the 'add_*' methods cost one context variable lookup
+    """
+
+    db_calls: int = 0
+    """Number of database calls (queries and commands)."""
+
+    db_bytes: int = 0
+    """Approximate size of data sent to or received from the database in bytes."""
+
+    llm_tokens: int = 0
+    """Number of LLM tokens in queries and responses, excluding responses returned from the completion cache."""
+
+    _token: Token | None = None
+    """Token for restoring the previous counters on exit."""
+
+    def __enter__(self) -> UsageCounters:
+        self._token = _usage_counters_var.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _usage_counters_var.reset(self._token)
+        self._token = None
+        if (outer := _usage_counters_var.get()) is not None:
+            outer.db_calls += self.db_calls
+            outer.db_bytes += self.db_bytes
+            outer.llm_tokens += self.llm_tokens
+        return False
+
+    @classmethod
+    def current(cls) -> UsageCounters | None:
+        """Return the active counters or None if usage is not being counted."""
+        return _usage_counters_var.get()
+
+    @classmethod
+    def add_db_call(cls, values: Iterable[Any] | None = None) -> None:
+        """Count one database call and the approximate size of its parameters or results if specified."""
+        if (counters := _usage_counters_var.get()) is not None:
+            counters.db_calls += 1
+            if values is not None:
+                counters.db_bytes += sum(len(x) if isinstance(x, (str, bytes)) else 8 for x in values if x is not None)
+
+    @classmethod
+    def add_llm_tokens(cls, token_count: int | None) -> None:
+        """Count LLM tokens, None is ignored for providers that do not report usage."""
+        if token_count is not None and (counters := _usage_counters_var.get()) is not None:
+            counters.llm_tokens += token_count
+
+    @classmethod
+    def get_peak_rss_mb(cls) -> float | None:
+        """Peak resident memory of the current process in MB, None if not available on this platform."""
+        if resource is None:
+            return None
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Reported in bytes on macOS and in kilobytes on Linux
+        return max_rss / (1024.0 * 1024.0) if sys.platform == "darwin" else max_rss / 1024.0
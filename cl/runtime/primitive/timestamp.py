@@ -95,6 +95,17 @@ class Timestamp:
         result = f"{datetime_str}-{remaining_uuid}"
         return result
 
+    @classmethod
+    def from_datetime(cls, value: dt.datetime) -> str:
+        """
+        Return the smallest timestamp for the millisecond of the specified datetime, it is less than timestamps
+        created at or after that millisecond and greater than those created earlier (for range conditions).
+        """
+        if value.tzinfo is not None:
+            value = value.astimezone(dt.timezone.utc)
+        datetime_str = value.strftime("%Y-%m-%d-%H-%M-%S-%f")[:-3]
+        return f"{datetime_str}-7{'0' * 19}"
+
     @classmethod
     def to_datetime(
         cls,
@@ -15,10 +15,26 @@
 import sys
 from abc import ABC
 from importlib import import_module
+from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Tuple
 from typing import Type
-from memoization import cached  # TODO: Replace cached package by custom caching for better performance
+
+CLASS_INFO_CACHE_MAX_SIZE = 100_000
+"""Maximum number of entries in each ClassInfo cache, lookups are not cached after it is reached."""
+
+_class_type_cache: Dict[str, Type] = {}
+"""Class types indexed by class path in module.ClassName format."""
+
+_inheritance_chain_cache: Dict[str, List[str]] = {}
+"""Inheritance chains indexed by class path in module.ClassName format."""
+
+_class_type_miss_count: int = 0
+"""Number of 'get_class_type' calls not found in cache."""
+
+_inheritance_chain_miss_count: int = 0
+"""Number of 'get_inheritance_chain' calls not found in cache."""
 
 
 class ClassInfo(ABC):
@@ -47,7 +63,6 @@ class ClassInfo(ABC):
         return result[0], result[1]
 
     @classmethod
-    @cached
     def get_class_type(cls, class_path: str) -> Type:
         """
         Get class type from string in 'module.ClassName' format, importing the module if necessary.
@@ -58,6 +73,19 @@ class ClassInfo(ABC):
         Args:
             class_path: String in module.ClassName format.
         """
+        if (result := _class_type_cache.get(class_path, None)) is not None:
+            return result
+
+        global _class_type_miss_count
+        _class_type_miss_count += 1
+        result = cls._import_class_type(class_path)
+        if len(_class_type_cache) < CLASS_INFO_CACHE_MAX_SIZE:
+            _class_type_cache[class_path] = result
+        return result
+
+    @classmethod
+    def _import_class_type(cls, class_path: str) -> Type:
+        """Get class type from string in 'module.ClassName' format without caching."""
 
         module_name, class_name = cls.split_class_path(class_path)
 
@@ -82,13 +110,56 @@ class ClassInfo(ABC):
             raise RuntimeError(f"Module {module_name} does not contain top-level class {class_name}.")
 
     @classmethod
-    @cached(custom_key_maker=lambda cls, record_type: f"{record_type.__module__}.{record_type.__name__}")
     def get_inheritance_chain(cls, record_type: Type) -> List[str]:
         """
         Returns the list of fully qualified class names in MRO order starting from this class
         and ending with the class that has suffix Key. Exactly one class with suffix Key should
         be present in MRO, error otherwise.
+
+        Notes:
+            Return value is cached to increase performance, do not modify the returned list.
         """
+        class_path = f"{record_type.__module__}.{record_type.__name__}"
+        if (result := _inheritance_chain_cache.get(class_path, None)) is not None:
+            return result
+
+        global _inheritance_chain_miss_count
+        _inheritance_chain_miss_count += 1
+        result = cls._build_inheritance_chain(record_type)
+        if len(_inheritance_chain_cache) < CLASS_INFO_CACHE_MAX_SIZE:
+            _inheritance_chain_cache[class_path] = result
+        return result
+
+    @classmethod
+    def warm_up(cls, types: Iterable[Type]) -> None:
+        """Populate the class type cache for the specified types, e.g. those returned by 'Schema.get_types()'."""
+        for type_ in types:
+            if len(_class_type_cache) >= CLASS_INFO_CACHE_MAX_SIZE:
+                break
+            _class_type_cache.setdefault(f"{type_.__module__}.{type_.__name__}", type_)
+
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, int]:
+        """Return the number of entries and the number of misses for each cache."""
+        return {
+            "class_type_size": len(_class_type_cache),
+            "class_type_misses": _class_type_miss_count,
+            "inheritance_chain_size": len(_inheritance_chain_cache),
+            "inheritance_chain_misses": _inheritance_chain_miss_count,
+        }
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Clear cached lookups and reset miss counters."""
+        global _class_type_miss_count, _inheritance_chain_miss_count
+        _class_type_cache.clear()
+        _inheritance_chain_cache.clear()
+        _class_type_miss_count = 0
+        _inheritance_chain_miss_count = 0
+
+    @classmethod
+    def _build_inheritance_chain(cls, record_type: Type) -> List[str]:
+        """Build the inheritance chain returned by 'get_inheritance_chain' without caching."""
 
         # Get the list of classes in MRO
         fully_qualified_names = [
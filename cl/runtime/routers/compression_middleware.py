@@ -0,0 +1,280 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import asyncio
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Final
+from typing import List
+from typing import Tuple
+from starlette.datastructures import Headers
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+from cl.runtime.perf.request_tracer import RequestTracer
+
+try:
+    import brotli
+except ImportError:
+    # Optional dependency, br encoding is not offered if not installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    # Optional dependency, zstd encoding is not offered if not installed
+    zstandard = None
+
+GZIP_LEVEL: Final[int] = 6
+"""Compression level for gzip encoding (1 is fastest, 9 is smallest)."""
+
+BROTLI_QUALITY: Final[int] = 4
+"""Compression quality for br encoding, values above 5 are much slower for a small size benefit."""
+
+ZSTD_LEVEL: Final[int] = 3
+"""Compression level for zstd encoding."""
+
+COMPRESSION_CACHE_MAX_BYTES: Final[int] = 64 * 1024 * 1024
+"""Maximum total size of compressed bodies cached by ETag, least recently used bodies are evicted first."""
+
+COMPRESSION_THREAD_MIN_SIZE: Final[int] = 256 * 1024
+"""Bodies of this size or larger are compressed in a worker thread so that the event loop is not blocked."""
+
+_supported_encodings: Tuple[str, ...] = tuple(
+    encoding
+    for encoding, is_available in (("zstd", zstandard is not None), ("br", brotli is not None), ("gzip", True))
+    if is_available
+)
+"""Supported encodings in the order of server preference."""
+
+_compressible_media_types = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+"""Media types that are compressed in addition to text/* except text/event-stream."""
+
+_cache: OrderedDict[Tuple[str, str], bytes] = OrderedDict()
+"""Compressed bodies with (encoding, ETag) key in the order of use."""
+
+_cache_size: int = 0
+"""Total size of the cached compressed bodies in bytes."""
+
+_cache_lock = threading.Lock()
+"""Lock for the cache of compressed bodies."""
+
+
+class _Compressor:
+    """Incremental compressor for one of the supported encodings."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=BROTLI_QUALITY)
+        elif encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        else:
+            raise RuntimeError(f"Encoding {encoding} is not supported.")
+
+    def compress(self, data: bytes, *, is_final: bool) -> bytes:
+        """Compress a chunk and flush it so that the client can decode it, finish the stream if is_final."""
+        if self.encoding == "gzip":
+            return self._obj.compress(data) + self._obj.flush(zlib.Z_FINISH if is_final else zlib.Z_SYNC_FLUSH)
+        elif self.encoding == "br":
+            return self._obj.process(data) + (self._obj.finish() if is_final else self._obj.flush())
+        else:
+            flush_mode = zstandard.COMPRESSOBJ_FLUSH_FINISH if is_final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            return self._obj.compress(data) + self._obj.flush(flush_mode)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses using the encoding negotiated with Accept-Encoding header (zstd, br or gzip).
+
+    Notes:
+        - br and zstd encodings are offered only if the optional 'brotli' and 'zstandard' packages are installed
+        - Complete bodies smaller than 'minimum_size' and media types other than text and JSON are not compressed
+        - Streaming responses are compressed chunk by chunk, except Server-Sent Events which are not compressed
+        - Compressed bodies of responses with ETag are cached by (encoding, ETag) because ETag identifies content,
+          so immutable payloads such as type declarations and rendered plots are compressed once
+        - ETag of a compressed response is made weak because the compressed representation differs
+    """
+
+    def __init__(self, app: ASGIApp, *, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.select_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send=send, encoding=encoding, minimum_size=self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+    @classmethod
+    def select_encoding(cls, accept_encoding: str | None) -> str | None:
+        """Return the supported encoding with the highest q-value in Accept-Encoding header or None."""
+        if not accept_encoding:
+            return None
+
+        # Parse q-values, encodings with q=0 are not acceptable
+        q_values = {}
+        for item in accept_encoding.split(","):
+            name, *params = [x.strip() for x in item.split(";")]
+            q_value = 1.0
+            for param in params:
+                if param.startswith("q="):
+                    try:
+                        q_value = float(param[2:])
+                    except ValueError:
+                        q_value = 0.0
+            q_values[name.lower()] = q_value
+
+        # Use server preference order to break ties, '*' applies to encodings that are not listed
+        wildcard_q_value = q_values.get("*", 0.0)
+        candidates = [(q_values.get(x, wildcard_q_value), -i, x) for i, x in enumerate(_supported_encodings)]
+        q_value, _, encoding = max(candidates)
+        return encoding if q_value > 0 else None
+
+    @classmethod
+    def get_cache_size(cls) -> int:
+        """Return the total size of cached compressed bodies in bytes."""
+        return _cache_size
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Remove all cached compressed bodies."""
+        global _cache_size
+        with _cache_lock:
+            _cache.clear()
+            _cache_size = 0
+
+
+class _CompressionResponder:
+    """Wraps ASGI send to compress the response body of a single request."""
+
+    def __init__(self, *, send: Send, encoding: str, minimum_size: int):
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._start_message: Message | None = None
+        self._compressor: _Compressor | None = None
+        self._is_passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Wait for the first body message to decide if the response is compressed
+            self._start_message = message
+            return
+        if message_type != "http.response.body" or self._is_passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._start_message is not None:
+            start_message, self._start_message = self._start_message, None
+            headers = MutableHeaders(scope=start_message)
+            if not self._is_compressible(start_message["status"], headers) or (
+                not more_body and len(body) < self._minimum_size
+            ):
+                self._is_passthrough = True
+                await self._send(start_message)
+                await self._send(message)
+                return
+
+            headers["Content-Encoding"] = self._encoding
+            headers.add_vary_header("Accept-Encoding")
+            if (etag := headers.get("ETag")) is not None and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+
+            if not more_body:
+                # Complete body, compress at once using the cache if ETag is present
+                body = await self._compress_complete(body, etag)
+                headers["Content-Length"] = str(len(body))
+                await self._send(start_message)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+
+            # Streaming body, compress chunk by chunk
+            del headers["Content-Length"]
+            self._compressor = _Compressor(self._encoding)
+            await self._send(start_message)
+
+        await self._send(
+            {
+                "type": "http.response.body",
+                "body": self._compressor.compress(body, is_final=not more_body),
+                "more_body": more_body,
+            }
+        )
+
+    async def _compress_complete(self, body: bytes, etag: str | None) -> bytes:
+        """Compress complete body, use and update the cache if ETag is specified."""
+        global _cache_size
+        cache_key = (self._encoding, etag.removeprefix("W/")) if etag is not None else None
+        if cache_key is not None:
+            with _cache_lock:
+                if (result := _cache.get(cache_key)) is not None:
+                    _cache.move_to_end(cache_key)
+                    return result
+
+        compressor = _Compressor(self._encoding)
+        with RequestTracer.span("encode", encoding=self._encoding, bytes=len(body)):
+            if len(body) >= COMPRESSION_THREAD_MIN_SIZE:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(None, lambda: compressor.compress(body, is_final=True))
+            else:
+                result = compressor.compress(body, is_final=True)
+
+        if cache_key is not None and len(result) <= COMPRESSION_CACHE_MAX_BYTES:
+            with _cache_lock:
+                if cache_key not in _cache:
+                    _cache[cache_key] = result
+                    _cache_size += len(result)
+                while _cache_size > COMPRESSION_CACHE_MAX_BYTES:
+                    _, evicted = _cache.popitem(last=False)
+                    _cache_size -= len(evicted)
+        return result
+
+    @classmethod
+    def _is_compressible(cls, status: int, headers: MutableHeaders) -> bool:
+        """Return True if the response has a body with compressible media type and is not already encoded."""
+        if status < 200 or status in (204, 304) or "Content-Encoding" in headers:
+            return False
+        media_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if media_type == "text/event-stream":
+            return False
+        return (
+            media_type.startswith("text/")
+            or media_type in _compressible_media_types
+            or media_type.endswith("+json")
+            or media_type.endswith("+xml")
+        )
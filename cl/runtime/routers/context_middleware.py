@@ -16,8 +16,8 @@ import asyncio
 import contextvars
 from starlette.requests import Request
 from starlette.types import ASGIApp
-from cl.runtime.context.context import context_stack_var
 from cl.runtime.context.process_context import ProcessContext
+from cl.runtime.perf.request_tracer import RequestTracer
 
 
 class ContextMiddleware:
@@ -25,7 +25,7 @@ class ContextMiddleware:
     Middleware to create an isolated context environment for API calls.
 
     - Create an isolated contextvars.Context as a copy of the current contextvars context.
-    - Create an isolated runtime context stack.
+    - Share the immutable runtime context stack of the current context without copying it.
     - Execute with the request-specific runtime Context.
     """
 
@@ -37,24 +37,10 @@ class ContextMiddleware:
             await self.app(scope, receive, send)
             return
 
-        # Copy contextvars.Context
+        # Copy contextvars.Context, the runtime context stack is an immutable tuple so it does not need to be copied
+        # because entering a context in the copy replaces the stack only inside the copy
         ctx = contextvars.copy_context()
 
-        def init_context_stack():
-            """Create isolated runtime contex stack as copy of current context stack."""
-
-            # Get the current context stack value
-            current_context_stack = context_stack_var.get()
-
-            # Create a copy if the current context stack is not None
-            new_context_stack = None if current_context_stack is None else [x for x in current_context_stack]
-
-            # Set the copy as the new stack for the current asynchronous environment
-            context_stack_var.set(new_context_stack)
-
-        # Replace current context stack with a copy to avoid sharing the same context stack across requests
-        ctx.run(init_context_stack)
-
         def call_in_event_loop():
             """A non-coroutine that we will run with contextvars.Context.run"""
 
@@ -64,7 +50,9 @@ class ContextMiddleware:
 
                 # Create context with user-defined secrets
                 secrets = {k: v for k, v in request.headers.items()}
-                with ProcessContext(secrets=secrets):
+                with RequestTracer.span("context"):
+                    process_context = ProcessContext(secrets=secrets)
+                with process_context:
                     await self.app(scope, receive, send)
 
             loop = asyncio.get_running_loop()
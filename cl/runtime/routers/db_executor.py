@@ -0,0 +1,144 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import asyncio
+import contextvars
+import dataclasses
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import TypeVar
+from cl.runtime.settings.api_settings import ApiSettings
+
+T = TypeVar("T")
+"""Result type of the function run by the executor."""
+
+_executor: ThreadPoolExecutor | None = None
+"""Thread pool created on first use, stored outside the class to avoid serialization."""
+
+_lock = threading.Lock()
+"""Protects the executor and statistics."""
+
+
+@dataclass(slots=True, kw_only=True)
+class DbExecutorStats:
+    """Cumulative statistics of the database executor since process start."""
+
+    max_workers: int = 0
+    """Maximum number of threads in the pool."""
+
+    submitted: int = 0
+    """Number of calls submitted to the pool."""
+
+    running: int = 0
+    """Number of calls currently running in the pool."""
+
+    completed: int = 0
+    """Number of calls completed including those that raised an exception."""
+
+    failed: int = 0
+    """Number of calls that raised an exception."""
+
+    total_wait_sec: float = 0.0
+    """Total time in seconds from submission to the start of each call."""
+
+    max_wait_sec: float = 0.0
+    """Maximum time in seconds from submission to the start of a call."""
+
+    total_run_sec: float = 0.0
+    """Total time in seconds from the start to the end of each call."""
+
+    def get_queued(self) -> int:
+        """Number of calls waiting for a free thread."""
+        return self.submitted - self.running - self.completed
+
+
+_stats = DbExecutorStats()
+"""Statistics of the executor in this process."""
+
+
+class DbExecutor:
+    """
+    Runs database-bound route work on a bounded thread pool so that a slow query does not stall the event loop.
+
+    Notes:
+        - Each call runs in a copy of the caller's contextvars.Context so that 'Context.current()' inside
+          the call returns the request context set by ContextMiddleware
+        - The pool size is specified by 'ApiSettings.db_executor_max_workers', calls wait in the order
+          of submission when all threads are busy
+    """
+
+    @classmethod
+    async def run(cls, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run func(*args, **kwargs) in the pool and return its result, exceptions are propagated to the caller."""
+        executor = cls._get_executor()
+        submitted_at = time.perf_counter()
+        with _lock:
+            _stats.submitted += 1
+        context = contextvars.copy_context()
+        future = executor.submit(context.run, cls._run_and_record, submitted_at, func, args, kwargs)
+        return await asyncio.wrap_future(future)
+
+    @classmethod
+    def get_stats(cls) -> DbExecutorStats:
+        """Return a copy of the executor statistics."""
+        with _lock:
+            return dataclasses.replace(_stats)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Wait for running calls to complete and release the threads, the pool is created again on next use."""
+        global _executor
+        with _lock:
+            executor, _executor = _executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """Create the pool on first use."""
+        global _executor
+        if (result := _executor) is None:
+            with _lock:
+                if (result := _executor) is None:
+                    max_workers = ApiSettings.instance().db_executor_max_workers
+                    result = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db_executor")
+                    _stats.max_workers = max_workers
+                    _executor = result
+        return result
+
+    @classmethod
+    def _run_and_record(cls, submitted_at: float, func: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        """Run the function in a pool thread and record the wait and run time."""
+        started_at = time.perf_counter()
+        wait_sec = started_at - submitted_at
+        with _lock:
+            _stats.running += 1
+            _stats.total_wait_sec += wait_sec
+            _stats.max_wait_sec = max(_stats.max_wait_sec, wait_sec)
+        is_failed = True
+        try:
+            result = func(*args, **kwargs)
+            is_failed = False
+            return result
+        finally:
+            with _lock:
+                _stats.running -= 1
+                _stats.completed += 1
+                _stats.failed += int(is_failed)
+                _stats.total_run_sec += time.perf_counter() - started_at
@@ -12,30 +12,53 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import List
 from pydantic import BaseModel
 from cl.runtime import Context
+from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.primitive.case_util import CaseUtil
 from cl.runtime.routers.entity.delete_request import DeleteRequest
+from cl.runtime.routers.entity.entity_error_response_item import EntityErrorResponseItem
 from cl.runtime.serialization.dict_serializer import get_type_dict
 from cl.runtime.serialization.string_serializer import StringSerializer
-from cl.runtime.serialization.ui_dict_serializer import UiDictSerializer
 
-data_serializer = UiDictSerializer()
 key_serializer = StringSerializer()
 
 
 class DeleteResponse(BaseModel):
     """Data type for the /entity/delete_many response."""
 
+    errors: List[EntityErrorResponseItem] | None = None
+    """Errors for the keys that were not deleted, None if all keys were deleted."""
+
+    class Config:
+        alias_generator = CaseUtil.snake_to_pascal_case
+        populate_by_name = True
+
     @staticmethod
     def delete_many(request: DeleteRequest) -> "DeleteResponse":
-        """Delete entities."""
+        """Delete entities, keys that cannot be deserialized are reported in errors and the rest are deleted."""
         context = Context.current()
         type_dict = get_type_dict()
 
-        record_key_dicts = [key.model_dump() for key in request.record_keys]
-        deserialized_record_keys = [
-            key_serializer.deserialize_key(key["_key"], type_dict[key["_t"]].get_key_type()) for key in record_key_dicts
-        ]
-        context.delete_many(deserialized_record_keys, dataset=request.dataset)
+        # Deserialize all keys in one pass, looking up key type once for each type name
+        key_types = {}
+        deserialized_record_keys = []
+        errors = []
+        for index, key in enumerate(request.record_keys):
+            key_dict = key.model_dump()
+            try:
+                type_name = key_dict.get("_t")
+                if (key_type := key_types.get(type_name)) is None:
+                    if (record_type := type_dict.get(type_name)) is None:
+                        raise UserError(f"Type {type_name} is not found.")
+                    key_type = key_types[type_name] = record_type.get_key_type()
+                deserialized_record_keys.append(key_serializer.deserialize_key(key_dict.get("_key"), key_type))
+            except Exception as e:  # noqa
+                errors.append(EntityErrorResponseItem(index=index, message=str(e)))
+
+        # Delete in one call, records are grouped by table in the database
+        if deserialized_record_keys:
+            context.delete_many(deserialized_record_keys, dataset=request.dataset)
 
-        return DeleteResponse()
+        return DeleteResponse(errors=errors or None)
@@ -0,0 +1,30 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pydantic import BaseModel
+from cl.runtime.primitive.case_util import CaseUtil
+
+
+class EntityErrorResponseItem(BaseModel):
+    """Error for a single item of a bulk request to the /entity/save_many or /entity/delete_many routes."""
+
+    index: int
+    """Index of the item in the request list."""
+
+    message: str
+    """Message of the exception."""
+
+    class Config:
+        alias_generator = CaseUtil.snake_to_pascal_case
+        populate_by_name = True
@@ -19,18 +19,28 @@ from fastapi import APIRouter
 from fastapi import Body
 from fastapi import Header
 from fastapi import Query
+from fastapi import Response
+from cl.runtime.routers.db_executor import DbExecutor
 from cl.runtime.routers.entity.delete_request import DeleteRequest
 from cl.runtime.routers.entity.delete_response import DeleteResponse
 from cl.runtime.routers.entity.list_panels_request import ListPanelsRequest
 from cl.runtime.routers.entity.list_panels_response_item import ListPanelsResponseItem
 from cl.runtime.routers.entity.panel_request import PanelRequest
 from cl.runtime.routers.entity.panel_response_util import PanelResponseUtil
+from cl.runtime.routers.entity.panels_request import PanelsRequest
+from cl.runtime.routers.entity.panels_response_item import PanelsResponseItem
+from cl.runtime.routers.entity.save_many_request import SaveManyItem
+from cl.runtime.routers.entity.save_many_request import SaveManyRequest
+from cl.runtime.routers.entity.save_many_response import SaveManyResponse
 from cl.runtime.routers.entity.save_request import SaveRequest
 from cl.runtime.routers.entity.save_response import SaveResponse
+from cl.runtime.routers.http_cache_util import PANEL_CACHE_CONTROL
+from cl.runtime.routers.http_cache_util import HttpCacheUtil
 
 ListPanelsResponse = List[ListPanelsResponseItem]
 PanelResponseDataItem = Dict[str, Any]
 PanelResponse = Dict[str, PanelResponseDataItem | List[PanelResponseDataItem] | None]
+PanelsResponse = List[PanelsResponseItem]
 
 router = APIRouter()
 
@@ -44,18 +54,47 @@ async def get_list_panels(
     user: str = Header(None, description="User identifier or identity token"),
 ) -> ListPanelsResponse:
     """List of panels for the specified record."""
-    return ListPanelsResponseItem.list_panels(ListPanelsRequest(type=type, key=key, dataset=dataset, user=user))
+    return await DbExecutor.run(
+        ListPanelsResponseItem.list_panels, ListPanelsRequest(type=type, key=key, dataset=dataset, user=user)
+    )
 
 
 @router.get("/panel", response_model=PanelResponse)
 async def get_panel(
+    response: Response,
     type: str = Query(..., description="Class name"),  # noqa Suppress report about shadowed built-in type
     panel_id: str = Query(..., description="View name"),
     key: str = Query(None, description="Primary key fields in semicolon-delimited format"),
     dataset: str = Query(None, description="Dataset string"),
+    if_none_match: str = Header(None, description="ETag of the cached response if available"),
 ):
     """Return panel content by its displayed name."""
-    return PanelResponseUtil.get_content(PanelRequest(type=type, panel_id=panel_id, key=key, dataset=dataset))
+    result = await DbExecutor.run(
+        PanelResponseUtil.get_content, PanelRequest(type=type, panel_id=panel_id, key=key, dataset=dataset)
+    )
+
+    # Viewers may depend on other records, ETag is computed from the content to skip sending unchanged content
+    etag = PanelResponseUtil.get_etag(result)
+    headers = HttpCacheUtil.get_headers(etag, PANEL_CACHE_CONTROL)
+    if HttpCacheUtil.is_not_modified(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return result
+
+
+@router.get("/panels", response_model=PanelsResponse)
+async def get_panels(
+    type: str = Query(..., description="Class name"),  # noqa Suppress report about shadowed built-in type
+    key: str = Query(None, description="Primary key fields in semicolon-delimited format"),
+    dataset: str = Query(None, description="Dataset string"),
+    panel_ids: List[str] = Query(None, description="View names, all views of the record if not specified"),
+    user: str = Header(None, description="User identifier or identity token"),
+) -> PanelsResponse:
+    """Return the list and content of panels for the specified record in one request."""
+    return await PanelsResponseItem.get_panels(
+        PanelsRequest(type=type, key=key, dataset=dataset, panel_ids=panel_ids, user=user)
+    )
 
 
 @router.post("/save", response_model=SaveResponse)
@@ -67,7 +106,8 @@ async def save(
 ) -> SaveResponse:
     """Save panel content."""
 
-    return SaveResponse.save_entity(
+    return await DbExecutor.run(
+        SaveResponse.save_entity,
         SaveRequest(
             record_dict=record_in_dict,
             old_record_key=old_record_key,
@@ -77,7 +117,25 @@ async def save(
     )
 
 
-@router.post("/delete_many", response_model=DeleteResponse)
+@router.post("/save_many", response_model=SaveManyResponse, response_model_exclude_none=True)
+async def save_many(
+    items: List[SaveManyItem] = Body(..., description="Records to be saved/updated with optional old keys."),
+    dataset: str = Query(None, description="Dataset string"),
+    user: str = Header(None, description="User identifier or identity token"),
+) -> SaveManyResponse:
+    """Save or update multiple entities in one request, errors are reported for each item."""
+
+    return await DbExecutor.run(
+        SaveManyResponse.save_many,
+        SaveManyRequest(
+            items=items,
+            dataset=dataset,
+            user=user,
+        ),
+    )
+
+
+@router.post("/delete_many", response_model=DeleteResponse, response_model_exclude_none=True)
 async def delete_many(
     record_keys: List[Dict] = Body(..., description="The list of keys to delete."),
     dataset: str = Query(None, description="Dataset string"),
@@ -85,7 +143,8 @@ async def delete_many(
 ) -> DeleteResponse:
     """Delete entities."""
 
-    return DeleteResponse.delete_many(
+    return await DbExecutor.run(
+        DeleteResponse.delete_many,
         DeleteRequest(
             record_keys=record_keys,
             dataset=dataset,
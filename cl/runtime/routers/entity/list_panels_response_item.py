@@ -18,7 +18,7 @@ from pydantic import BaseModel
 from cl.runtime import Context
 from cl.runtime.primitive.case_util import CaseUtil
 from cl.runtime.routers.entity.list_panels_request import ListPanelsRequest
-from cl.runtime.schema.handler_declare_block_decl import HandlerDeclareBlockDecl
+from cl.runtime.routers.entity.panel_response_util import PanelResponseUtil
 from cl.runtime.schema.handler_declare_decl import HandlerDeclareDecl
 from cl.runtime.schema.schema import Schema
 from cl.runtime.serialization.string_serializer import StringSerializer
@@ -57,15 +57,10 @@ class ListPanelsResponseItem(BaseModel):
         else:
             actual_type = request_type
 
-        handlers_block = HandlerDeclareBlockDecl.get_type_methods(actual_type, inherit=True).handlers
-
-        if handlers_block is not None and handlers_block:
-            return [
-                ListPanelsResponseItem(name=handler.label, type=cls.get_type(handler))
-                for handler in handlers_block
-                if handler.type_ == "Viewer"
-            ]
-        return []
+        return [
+            ListPanelsResponseItem(name=handler.label, type=cls.get_type(handler))
+            for handler in PanelResponseUtil.get_viewers(actual_type)
+        ]
 
     @classmethod
     def get_type(cls, handler: HandlerDeclareDecl) -> str | None:
@@ -16,16 +16,25 @@ import ast
 import base64
 import dataclasses
 import io
+from collections import defaultdict
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Tuple
+from typing import Type
+import orjson
 from pydantic import BaseModel
 from cl.runtime.context.context import Context
+from cl.runtime.perf.request_tracer import RequestTracer
 from cl.runtime.plots.plot_key import PlotKey
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.protocols import is_key
 from cl.runtime.routers.entity.panel_request import PanelRequest
+from cl.runtime.routers.http_cache_util import HttpCacheUtil
 from cl.runtime.routers.response_util import to_legacy_dict
 from cl.runtime.routers.response_util import to_record_dict
 from cl.runtime.schema.handler_declare_block_decl import HandlerDeclareBlockDecl
+from cl.runtime.schema.handler_declare_decl import HandlerDeclareDecl
 from cl.runtime.schema.schema import Schema
 from cl.runtime.serialization.string_serializer import StringSerializer
 from cl.runtime.serialization.ui_dict_serializer import UiDictSerializer
@@ -55,51 +64,101 @@ class PanelResponseUtil(BaseModel):
     def get_content(cls, request: PanelRequest) -> Dict[str, PanelResponseData]:
         """Implements /entity/panel route."""
 
-        # Get type of the record
-        type_ = Schema.get_type_by_short_name(request.type)
-
-        # Deserialize key from string to object
-        serializer = StringSerializer()
-        key_obj = serializer.deserialize_key(data=request.key, type_=type_.get_key_type())
-
-        # Get database from the current context
-        db = Context.current().db
-
         # Load record from the database
-        record = db.load_one(type_, key_obj, dataset=request.dataset)
-        record_type = type(record)
-        if record is None:
-            raise RuntimeError(
-                f"Record with type {request.type} and key {request.key} is not found in dataset {request.dataset}."
-            )
+        record = cls.load_record(request.type, request.key, request.dataset)
 
         # Check if the selected type has the needed viewer and get its name (only viewer's label is provided)
-        handlers = HandlerDeclareBlockDecl.get_type_methods(record_type, inherit=True).handlers
-        if (
-            handlers is not None
-            and handlers
-            and (found_viewers := [h.name for h in handlers if h.label == request.panel_id and h.type_ == "Viewer"])
-        ):
+        record_type = type(record)
+        if found_viewers := [x.name for x in cls.get_viewers(record_type) if x.label == request.panel_id]:
             viewer_name: str = found_viewers[0]
         else:
             raise Exception(f"Type {record_type.__name__} has no view with the name {request.panel_id}.")
 
         # Call the viewer and get the result
-        viewer = getattr(record, viewer_name)
-        result_view = viewer()
+        result_view = cls.call_viewer(record, viewer_name)
 
         # Apply legacy dict conventions
         # TODO (Ina): Optimize speed using dacite or similar library
-        if isinstance(result_view, list):
-            view_dict = [PanelResponseUtil._get_view_dict(item) for item in result_view]
-        else:
-            view_dict = PanelResponseUtil._get_view_dict(result_view)
+        return {"ViewOf": cls.render_views([result_view])[0]}
+
+    @classmethod
+    def load_record(cls, type_name: str, key: str | None, dataset: str | None) -> RecordProtocol:
+        """Load record for the short type name and key in semicolon-delimited format, error if not found."""
 
-        return {"ViewOf": view_dict}
+        # Get type of the record
+        type_ = Schema.get_type_by_short_name(type_name)
+
+        # Deserialize key from string to object
+        serializer = StringSerializer()
+        key_obj = serializer.deserialize_key(data=key, type_=type_.get_key_type())
+
+        # Load record from the database
+        record = Context.current().db.load_one(type_, key_obj, dataset=dataset)
+        if record is None:
+            raise RuntimeError(f"Record with type {type_name} and key {key} is not found in dataset {dataset}.")
+        return record
+
+    @classmethod
+    def get_viewers(cls, record_type: Type) -> List[HandlerDeclareDecl]:
+        """Return declarations of viewer methods for the record type including inherited viewers."""
+        handlers = HandlerDeclareBlockDecl.get_type_methods(record_type, inherit=True).handlers
+        return [x for x in handlers if x.type_ == "Viewer"] if handlers else []
+
+    @classmethod
+    def call_viewer(cls, record: RecordProtocol, viewer_name: str) -> Any:
+        """Call the viewer method of the record and return the view, which may be a list of views."""
+        return getattr(record, viewer_name)()
 
     @classmethod
-    def _get_view_dict(cls, view: Any) -> Dict[str, Any] | None:
-        """Convert value to dict format."""
+    def render_views(cls, views: List[Any]) -> List[PanelResponseData]:
+        """
+        Convert views returned by viewers to dict format, a view may be a list of views.
+
+        Notes:
+            Records referenced by PlotView and KeyView in all of the views are loaded in advance using
+            one 'load_many' call per type rather than one 'load_one' call per view.
+        """
+        flat_views = [x for view in views for x in (view if isinstance(view, list) else [view])]
+        prefetched = cls._prefetch_records(flat_views)
+        with RequestTracer.span("render", views=len(flat_views)):
+            return [
+                (
+                    [cls._get_view_dict(item, prefetched) for item in view]
+                    if isinstance(view, list)
+                    else cls._get_view_dict(view, prefetched)
+                )
+                for view in views
+            ]
+
+    @classmethod
+    def get_etag(cls, content: Dict[str, PanelResponseData]) -> str:
+        """Return ETag for the content returned by 'get_content'."""
+        return HttpCacheUtil.get_etag((orjson.dumps(content, option=orjson.OPT_SORT_KEYS, default=str),))
+
+    @classmethod
+    def _prefetch_records(cls, views: List[Any]) -> Dict[Tuple[Type, str], RecordProtocol]:
+        """Load records referenced by PlotView and KeyView using one 'load_many' call per type."""
+
+        # Collect keys grouped by the record type to load, records are used directly and not collected
+        keys_by_type = defaultdict(list)
+        for view in views:
+            if isinstance(view, PlotView) and is_key(view.plot):
+                keys_by_type[PlotKey].append(view.plot)
+            elif isinstance(view, KeyView) and is_key(view.key):
+                keys_by_type[type(view.key)].append(view.key)
+
+        result = {}
+        context = Context.current()
+        for record_type, keys in keys_by_type.items():
+            records = context.load_many(record_type, keys)
+            result.update({(record_type, str(key)): record for key, record in zip(keys, records)})
+        return result
+
+    @classmethod
+    def _get_view_dict(
+        cls, view: Any, prefetched: Dict[Tuple[Type, str], RecordProtocol] | None = None
+    ) -> Dict[str, Any] | None:
+        """Convert value to dict format, records referenced by views are taken from prefetched if present."""
 
         # Return None if view is None
         if view is None:
@@ -107,7 +166,7 @@ class PanelResponseUtil(BaseModel):
 
         if isinstance(view, PlotView):
             # Load plot for view if it is key
-            plot = Context.current().load_one(PlotKey, view.plot)
+            plot = cls._get_record(PlotKey, view.plot, prefetched)
             if plot is None:
                 raise RuntimeError(f"Not found plot for key {view.plot}.")
 
@@ -116,7 +175,7 @@ class PanelResponseUtil(BaseModel):
 
         elif isinstance(view, KeyView):
             # Load record for view
-            record = Context.current().load_one(type(view.key), view.key)
+            record = cls._get_record(type(view.key), view.key, prefetched)
             if record is None:
                 raise RuntimeError(f"Not found record for key {view.key}.")
 
@@ -170,3 +229,12 @@ class PanelResponseUtil(BaseModel):
                 return view_dict
             else:
                 return to_legacy_dict(to_record_dict(view))
+
+    @classmethod
+    def _get_record(
+        cls, record_type: Type, record_or_key: Any, prefetched: Dict[Tuple[Type, str], RecordProtocol] | None
+    ) -> RecordProtocol | None:
+        """Return prefetched record for the key if present, otherwise load it."""
+        if prefetched is not None and (record := prefetched.get((record_type, str(record_or_key)))) is not None:
+            return record
+        return Context.current().load_one(record_type, record_or_key)
@@ -0,0 +1,32 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List
+from cl.runtime.routers.user_request import UserRequest
+
+
+class PanelsRequest(UserRequest):
+    """Request data type for the /entity/panels route."""
+
+    type: str
+    """Class name."""
+
+    key: str | None = None
+    """Primary key fields in semicolon-delimited format."""
+
+    dataset: str | None = None
+    """Dataset string."""
+
+    panel_ids: List[str] | None = None
+    """View names in the order of the response, all views of the record type in declaration order if not specified."""
@@ -0,0 +1,71 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import asyncio
+from typing import List
+from pydantic import BaseModel
+from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.routers.db_executor import DbExecutor
+from cl.runtime.routers.entity.list_panels_response_item import ListPanelsResponseItem
+from cl.runtime.routers.entity.panel_response_util import PanelResponseData
+from cl.runtime.routers.entity.panel_response_util import PanelResponseUtil
+from cl.runtime.routers.entity.panels_request import PanelsRequest
+
+
+class PanelsResponseItem(BaseModel):
+    """Data type for a single item in the response list for the /entity/panels route."""
+
+    name: str | None
+    """Name of the panel."""
+
+    type: str | None
+    """Type of the panel, e.g. Primary."""
+
+    view_of: PanelResponseData
+    """Panel content in the same format as the /entity/panel route."""
+
+    class Config:
+        alias_generator = CaseUtil.snake_to_pascal_case
+        populate_by_name = True
+
+    @classmethod
+    async def get_panels(cls, request: PanelsRequest) -> List[PanelsResponseItem]:
+        """
+        Implements /entity/panels route.
+
+        Notes:
+            - The record is loaded once for all panels rather than once for listing panels and once per panel
+            - Viewers are called concurrently on the database executor
+            - Records referenced by the views of all panels are loaded together by 'PanelResponseUtil.render_views'
+        """
+
+        # Load record and select viewers
+        record = await DbExecutor.run(PanelResponseUtil.load_record, request.type, request.key, request.dataset)
+        record_type = type(record)
+        viewers = PanelResponseUtil.get_viewers(record_type)
+        if request.panel_ids is not None:
+            viewers_dict = {x.label: x for x in viewers}
+            if missing_panel_ids := [x for x in request.panel_ids if x not in viewers_dict]:
+                raise RuntimeError(f"Type {record_type.__name__} has no views with the names {missing_panel_ids}.")
+            viewers = [viewers_dict[x] for x in request.panel_ids]
+
+        # Call viewers concurrently, then render all views together
+        views = await asyncio.gather(*(DbExecutor.run(PanelResponseUtil.call_viewer, record, x.name) for x in viewers))
+        view_dicts = await DbExecutor.run(PanelResponseUtil.render_views, list(views))
+
+        return [
+            PanelsResponseItem(name=viewer.label, type=ListPanelsResponseItem.get_type(viewer), view_of=view_dict)
+            for viewer, view_dict in zip(viewers, view_dicts)
+        ]
@@ -0,0 +1,45 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List
+from pydantic import BaseModel
+from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.routers.entity.save_request import RecordDict
+
+
+class SaveManyItem(BaseModel):
+    """Single item of the request for the /entity/save_many route."""
+
+    record: RecordDict
+    """Dict representation of the record to be saved/updated."""
+
+    old_record_key: str | None = None
+    """Optional key of the record to be updated."""
+
+    class Config:
+        alias_generator = CaseUtil.snake_to_pascal_case
+        populate_by_name = True
+
+
+class SaveManyRequest(BaseModel):
+    """Request data type for the /entity/save_many route."""
+
+    items: List[SaveManyItem]
+    """Records to be saved/updated."""
+
+    dataset: str | None = None
+    """Dataset string."""
+
+    user: str | None = None
+    """User identifier or identity token."""
@@ -0,0 +1,114 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import defaultdict
+from typing import Dict
+from typing import List
+from pydantic import BaseModel
+from cl.runtime import Context
+from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.routers.entity.entity_error_response_item import EntityErrorResponseItem
+from cl.runtime.routers.entity.save_many_request import SaveManyRequest
+from cl.runtime.routers.entity.save_response import SaveResponse
+from cl.runtime.serialization.string_serializer import StringSerializer
+
+key_serializer = StringSerializer()
+
+
+class SaveManyResponse(BaseModel):
+    """Data type for the /entity/save_many response."""
+
+    keys: List[str | None]
+    """String representation of the key for each saved record, None if the item was not saved."""
+
+    errors: List[EntityErrorResponseItem] | None = None
+    """Errors for the items that were not saved, None if all items were saved."""
+
+    class Config:
+        alias_generator = CaseUtil.snake_to_pascal_case
+        populate_by_name = True
+
+    @staticmethod
+    def save_many(request: SaveManyRequest) -> "SaveManyResponse":
+        """
+        Save entities in bulk with the same rules as /entity/save for each item.
+
+        Notes:
+            - Items that fail validation are reported in errors and the remaining items are saved
+            - Existence of new records is checked using one 'load_many' call per key type
+            - Old keys of renamed records are deleted in one call and all records are saved in one call
+        """
+        context = Context.current()
+        errors = []
+
+        # Deserialize all items in one pass
+        records: Dict[int, RecordProtocol] = {}
+        for index, item in enumerate(request.items):
+            try:
+                record = SaveResponse.deserialize_record(item.record.model_dump())
+            except Exception as e:  # noqa
+                errors.append(EntityErrorResponseItem(index=index, message=str(e)))
+                continue
+            if record is not None:
+                records[index] = record
+
+        # Serialize keys once, error if the same record is saved more than once
+        serialized_keys: Dict[int, str] = {}
+        indices_by_key = {}
+        for index, record in list(records.items()):
+            serialized_keys[index] = key_serializer.serialize_key(record)
+            key_type = record.get_key_type()
+            if (key_type, serialized_keys[index]) in indices_by_key:
+                errors.append(EntityErrorResponseItem(index=index, message=f"Record with key {record} is repeated."))
+                del records[index]
+            else:
+                indices_by_key[(key_type, serialized_keys[index])] = index
+
+        # Check that new records do not exist using one call per key type
+        new_indices_by_key_type = defaultdict(list)
+        for index, record in records.items():
+            if request.items[index].old_record_key is None:
+                new_indices_by_key_type[record.get_key_type()].append(index)
+        for indices in new_indices_by_key_type.values():
+            existing_records = context.load_many(
+                type(records[indices[0]]), [records[x].get_key() for x in indices], dataset=request.dataset
+            )
+            for index, existing_record in zip(indices, existing_records):
+                if existing_record is not None:
+                    message = f"Record with key {records[index]} already exists."
+                    errors.append(EntityErrorResponseItem(index=index, message=message))
+                    del records[index]
+
+        # Deserialize old keys of renamed records
+        old_keys = []
+        for index, record in list(records.items()):
+            old_record_key = request.items[index].old_record_key
+            if old_record_key is not None and old_record_key != serialized_keys[index]:
+                try:
+                    old_keys.append(key_serializer.deserialize_key(old_record_key, record.get_key_type()))
+                except Exception as e:  # noqa
+                    errors.append(EntityErrorResponseItem(index=index, message=str(e)))
+                    del records[index]
+
+        # Delete old keys and save records in one batch each
+        if old_keys:
+            context.delete_many(old_keys, dataset=request.dataset)
+        if records:
+            context.save_many(list(records.values()), dataset=request.dataset)
+
+        return SaveManyResponse(
+            keys=[serialized_keys.get(index) if index in records else None for index in range(len(request.items))],
+            errors=sorted(errors, key=lambda x: x.index) or None,
+        )
@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Any
+from typing import Dict
 from pydantic import BaseModel
 from cl.runtime import Context
 from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.records.protocols import RecordProtocol
 from cl.runtime.routers.entity.save_request import SaveRequest
 from cl.runtime.serialization.string_serializer import StringSerializer
 from cl.runtime.serialization.ui_dict_serializer import UiDictSerializer
@@ -37,8 +40,31 @@ class SaveResponse(BaseModel):
         """Save entity."""
         context = Context.current()
 
-        # Get ui record and apply ui conversion
-        ui_record = request.record_dict.model_dump()
+        # Deserialize record, skip saving if None is returned
+        record = SaveResponse.deserialize_record(request.record_dict.model_dump())
+        if record is None:
+            return SaveResponse(key=None)
+
+        if request.old_record_key is None:
+            existing_record = context.load_one(
+                record_type=type(record),
+                record_or_key=record.get_key(),
+                dataset=request.dataset,
+                is_record_optional=True,
+            )
+            if existing_record is not None:
+                raise UserError(f"Record with key {str(record)} already exists.")
+
+        if request.old_record_key is not None and request.old_record_key != key_serializer.serialize_key(record):
+            old_record_key_obj = key_serializer.deserialize_key(request.old_record_key, type(record.get_key()))
+            context.delete_one(key_type=type(record.get_key()), key=old_record_key_obj, dataset=request.dataset)
+        context.save_one(record, dataset=request.dataset)
+
+        return SaveResponse(key=key_serializer.serialize_key(record))
+
+    @staticmethod
+    def deserialize_record(ui_record: Dict[str, Any]) -> RecordProtocol | None:
+        """Apply ui conversion and deserialize record, return None if the record type is not saved from ui."""
 
         # TODO (Roman): fix on ui
         # Workaround for UiAppState request. Ui send OpenedTabs without _t
@@ -56,26 +82,9 @@ class SaveResponse(BaseModel):
         # TODO (Roman): align UiTypeState data model and UiTypeState dict from ui
         # Skip saving UiTypeState object
         if ui_record.get("_t") == "UiTypeState":
-            return SaveResponse(key=None)
+            return None
 
         prepared_serialized_record = data_serializer.apply_ui_conversion(ui_record)
 
         # Deserialize record
-        record = data_serializer.deserialize_data(prepared_serialized_record)
-
-        if request.old_record_key is None:
-            existing_record = context.load_one(
-                record_type=type(record),
-                record_or_key=record.get_key(),
-                dataset=request.dataset,
-                is_record_optional=True,
-            )
-            if existing_record is not None:
-                raise UserError(f"Record with key {str(record)} already exists.")
-
-        if request.old_record_key is not None and request.old_record_key != key_serializer.serialize_key(record):
-            old_record_key_obj = key_serializer.deserialize_key(request.old_record_key, type(record.get_key()))
-            context.delete_one(key_type=type(record.get_key()), key=old_record_key_obj, dataset=request.dataset)
-        context.save_one(record, dataset=request.dataset)
-
-        return SaveResponse(key=key_serializer.serialize_key(record))
+        return data_serializer.deserialize_data(prepared_serialized_record)
@@ -15,6 +15,7 @@
 from fastapi import APIRouter
 from fastapi import Header
 from cl.runtime.routers.health.health_response import HealthResponse
+from cl.runtime.routers.health.perf_response import PerfResponse
 from cl.runtime.routers.user_request import UserRequest
 
 router = APIRouter()
@@ -24,3 +25,9 @@ router = APIRouter()
 async def get_health(user: str = Header(None, description="User identifier or identity token")) -> HealthResponse:
     """Information about system health."""
     return HealthResponse.get_health(UserRequest(user=user))
+
+
+@router.get("/health/perf", response_model=PerfResponse)
+async def get_health_perf() -> PerfResponse:
+    """Request latency percentiles per route and database executor load in this process."""
+    return PerfResponse.get_perf()
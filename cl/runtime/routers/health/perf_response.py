@@ -0,0 +1,83 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from typing import Dict
+from typing import List
+from pydantic import BaseModel
+from cl.runtime.perf.request_tracer import RequestTracer
+from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.routers.db_executor import DbExecutor
+
+
+class RoutePerfResponseItem(BaseModel):
+    """Request count and latency percentiles for one route."""
+
+    route: str
+    """HTTP method followed by the path template of the route."""
+
+    count: int
+    """Number of requests since process start."""
+
+    latency_ms: Dict[str, float]
+    """Latency in milliseconds of the most recent requests with keys Mean, P50, P90, P99 and Max."""
+
+    class Config:
+        alias_generator = CaseUtil.snake_to_pascal_case
+        populate_by_name = True
+
+
+class PerfResponse(BaseModel):
+    """Response data type for the /health/perf route."""
+
+    routes: List[RoutePerfResponseItem]
+    """Latency statistics for each route sorted by route."""
+
+    db_executor_running: int
+    """Number of database calls currently running in the executor."""
+
+    db_executor_queued: int
+    """Number of database calls waiting for a free executor thread."""
+
+    db_executor_max_wait_ms: float
+    """Maximum time from submission to the start of a database call."""
+
+    class Config:
+        alias_generator = CaseUtil.snake_to_pascal_case
+        populate_by_name = True
+
+    @classmethod
+    def get_perf(cls) -> PerfResponse:
+        """Implements /health/perf route."""
+        routes = [
+            RoutePerfResponseItem(
+                route=route_name,
+                count=stats["count"],
+                latency_ms={
+                    "Mean": stats["mean"],
+                    "P50": stats["p50"],
+                    "P90": stats["p90"],
+                    "P99": stats["p99"],
+                    "Max": stats["max"],
+                },
+            )
+            for route_name, stats in RequestTracer.get_summary().items()
+        ]
+        db_executor_stats = DbExecutor.get_stats()
+        return PerfResponse(
+            routes=routes,
+            db_executor_running=db_executor_stats.running,
+            db_executor_queued=db_executor_stats.get_queued(),
+            db_executor_max_wait_ms=db_executor_stats.max_wait_sec * 1000.0,
+        )
@@ -0,0 +1,63 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import hashlib
+from typing import Dict
+from typing import Iterable
+
+RECORD_CACHE_CONTROL = "private, no-cache"
+"""Cache-Control for /storage/record, the client may keep the response but must revalidate it using ETag."""
+
+PANEL_CACHE_CONTROL = "private, no-cache"
+"""Cache-Control for /entity/panel, the client may keep the response but must revalidate it using ETag."""
+
+SCHEMA_CACHE_CONTROL = "private, no-cache"
+"""Cache-Control for /schema/typeV2, the client may keep the response but must revalidate it using ETag."""
+
+LISTING_CACHE_CONTROL = "private, no-cache"
+"""Cache-Control for /storage/get_envs and /storage/get_datasets, the client must revalidate using ETag."""
+
+
+class HttpCacheUtil:
+    """Helper methods for ETag and Cache-Control headers and conditional GET requests."""
+
+    @classmethod
+    def get_etag(cls, parts: Iterable[str | bytes | None]) -> str:
+        """Return quoted strong ETag computed as a hash of the parts, None parts are included as empty."""
+        hasher = hashlib.sha1()
+        for part in parts:
+            part_bytes = part if isinstance(part, bytes) else (part or "").encode()
+            # Prefix each part with its length so that moving characters between parts changes the hash
+            hasher.update(f"{len(part_bytes)}:".encode())
+            hasher.update(part_bytes)
+        return f'"{hasher.hexdigest()}"'
+
+    @classmethod
+    def is_not_modified(cls, if_none_match: str | None, etag: str | None) -> bool:
+        """Return True if If-None-Match header value matches the ETag using weak comparison (RFC 9110)."""
+        if not if_none_match or etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        etag = etag.removeprefix("W/")
+        return any(x.strip().removeprefix("W/") == etag for x in if_none_match.split(","))
+
+    @classmethod
+    def get_headers(cls, etag: str | None, cache_control: str) -> Dict[str, str]:
+        """Return ETag (if specified) and Cache-Control response headers."""
+        if etag is None:
+            return {"Cache-Control": cache_control}
+        else:
+            return {"ETag": etag, "Cache-Control": cache_control}
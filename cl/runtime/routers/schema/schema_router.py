@@ -17,7 +17,10 @@ from typing import List
 from fastapi import APIRouter
 from fastapi import Header
 from fastapi import Query
+from fastapi import Response
 from starlette.requests import Request
+from cl.runtime.routers.http_cache_util import SCHEMA_CACHE_CONTROL
+from cl.runtime.routers.http_cache_util import HttpCacheUtil
 from cl.runtime.routers.schema.type_hierarchy_request import TypeHierarchyRequest
 from cl.runtime.routers.schema.type_hierarchy_response_item import TypeHierarchyResponseItem
 from cl.runtime.routers.schema.type_request import TypeRequest
@@ -41,12 +44,23 @@ async def get_types(user: str = Header(None, description="User identifier or ide
 
 @router.get("/typeV2", response_model=TypeResponse)
 async def get_type(
+    response: Response,
     name: str = Query(..., description="Class name"),  # noqa Suppress report about shadowed built-in type
     module: str = Query(None, description="Dot-delimited module string"),
     user: str = Header(None, description="User identifier or identity token"),
-) -> TypeResponse:
+    if_none_match: str = Header(None, description="ETag of the cached response if available"),
+):
     """Schema for the specified type and its dependencies."""
-    return TypeResponseUtil.get_type(TypeRequest(name=name, module=module, user=user))
+    result = TypeResponseUtil.get_type(TypeRequest(name=name, module=module, user=user))
+
+    # ETag also identifies the compressed body cached by CompressionMiddleware
+    etag = TypeResponseUtil.get_etag(result)
+    headers = HttpCacheUtil.get_headers(etag, SCHEMA_CACHE_CONTROL)
+    if HttpCacheUtil.is_not_modified(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return result
 
 
 @router.get("/type-hierarchy", response_model=TypeHierarchyResponse)
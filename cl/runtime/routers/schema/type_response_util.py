@@ -14,6 +14,8 @@
 
 from __future__ import annotations
 from typing import Dict
+import orjson
+from cl.runtime.routers.http_cache_util import HttpCacheUtil
 from cl.runtime.routers.schema.type_request import TypeRequest
 from cl.runtime.schema.schema import Schema
 
@@ -38,3 +40,8 @@ class TypeResponseUtil:
                     result[decl_name]["Implement"] = {"Handlers": implement_block}
 
         return result
+
+    @classmethod
+    def get_etag(cls, content: Dict[str, Dict]) -> str:
+        """Return ETag for the content returned by 'get_type'."""
+        return HttpCacheUtil.get_etag((orjson.dumps(content, option=orjson.OPT_SORT_KEYS, default=str),))
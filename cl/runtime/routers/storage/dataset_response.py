@@ -14,10 +14,18 @@
 
 from __future__ import annotations
 from typing import List
+from typing import Tuple
+import orjson
 from pydantic import BaseModel
+from cl.runtime.context.context import Context
+from cl.runtime.db.dataset_util import DatasetUtil
 from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.routers.http_cache_util import HttpCacheUtil
 from cl.runtime.routers.user_request import UserRequest
 
+_datasets_cache: Tuple[str, int, List[DatasetResponse], str] | None = None
+"""Database identifier, dataset registry version, response and its ETag, rebuilt when the registry changes."""
+
 
 class DatasetResponse(BaseModel):
     """Response data type for the /storage/get_datasets route."""
@@ -35,10 +43,29 @@ class DatasetResponse(BaseModel):
     @classmethod
     def get_datasets(cls, request: UserRequest) -> List[DatasetResponse]:
         """Implements /storage/get_datasets route."""
+        return list(cls._get_cached()[0])
 
-        # Default response when running locally without authorization
-        result_dict = {
-            "name": None,
-        }
+    @classmethod
+    def get_etag(cls) -> str:
+        """Return ETag for the response returned by 'get_datasets'."""
+        return cls._get_cached()[1]
 
-        return [DatasetResponse(**result_dict)]
+    @classmethod
+    def _get_cached(cls) -> Tuple[List[DatasetResponse], str]:
+        """Return response and ETag from memory, rebuild if datasets were added to the registry since last call."""
+        global _datasets_cache
+        db = Context.current().db
+        version, datasets = db.get_registered_datasets()
+        if (cached := _datasets_cache) is None or cached[0] != db.db_id or cached[1] != version:
+            # Name and parent are None for the root dataset
+            root = DatasetUtil.root()
+            result = [
+                DatasetResponse(
+                    name=dataset if dataset != root else None,
+                    parent=parent if (parent := DatasetUtil.get_parent(dataset)) != root else None,
+                )
+                for dataset in datasets
+            ]
+            etag = HttpCacheUtil.get_etag((orjson.dumps([x.model_dump(by_alias=True) for x in result]),))
+            cached = _datasets_cache = (db.db_id, version, result, etag)
+        return cached[2], cached[3]
@@ -14,10 +14,16 @@
 
 from __future__ import annotations
 from typing import List
+from typing import Tuple
+import orjson
 from pydantic import BaseModel
 from pydantic import Field
+from cl.runtime.routers.http_cache_util import HttpCacheUtil
 from cl.runtime.routers.user_request import UserRequest
 
+_envs_cache: Tuple[List[EnvResponse], str] | None = None
+"""Response and its ETag, created on first use."""
+
 
 class EnvResponse(BaseModel):
     """Response data type for the /storage/get_envs route."""
@@ -31,11 +37,24 @@ class EnvResponse(BaseModel):
     @classmethod
     def get_envs(cls, request: UserRequest) -> List[EnvResponse]:
         """Implements /storage/get_envs route."""
+        return list(cls._get_cached()[0])
 
-        # Default response when running locally without authorization
-        result_dict = {
-            "Name": "Dev;Runtime;V2",
-            "Parent": "",  # TODO: Check if None is also accepted
-        }
+    @classmethod
+    def get_etag(cls) -> str:
+        """Return ETag for the response returned by 'get_envs'."""
+        return cls._get_cached()[1]
 
-        return [EnvResponse(**result_dict)]
+    @classmethod
+    def _get_cached(cls) -> Tuple[List[EnvResponse], str]:
+        """Return response and ETag from memory, the environments do not change while the process is running."""
+        global _envs_cache
+        if (cached := _envs_cache) is None:
+            # Default response when running locally without authorization
+            result_dict = {
+                "Name": "Dev;Runtime;V2",
+                "Parent": "",  # TODO: Check if None is also accepted
+            }
+            result = [EnvResponse(**result_dict)]
+            etag = HttpCacheUtil.get_etag((orjson.dumps([x.model_dump(by_alias=True) for x in result]),))
+            cached = _envs_cache = (result, etag)
+        return cached
@@ -14,9 +14,13 @@
 
 from __future__ import annotations
 import dataclasses
+import hashlib
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Tuple
+from typing import Type
+import orjson
 from pydantic import BaseModel
 from pydantic import Field
 from cl.runtime import Context
@@ -25,8 +29,11 @@ from cl.runtime.backend.core.ui_app_state_key import UiAppStateKey
 from cl.runtime.backend.core.ui_type_state import UiTypeState
 from cl.runtime.backend.core.ui_type_state_key import UiTypeStateKey
 from cl.runtime.backend.core.user_key import UserKey
+from cl.runtime.perf.request_tracer import RequestTracer
 from cl.runtime.primitive.case_util import CaseUtil
 from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.routers.http_cache_util import HttpCacheUtil
 from cl.runtime.routers.schema.type_request import TypeRequest
 from cl.runtime.routers.schema.type_response_util import TypeResponseUtil
 from cl.runtime.routers.storage.record_request import RecordRequest
@@ -40,6 +47,9 @@ from cl.runtime.serialization.ui_dict_serializer import UiDictSerializer
 RecordResponseSchema = Dict[str, Any]
 RecordResponseData = Dict[str, Any]
 
+_schema_hash_dict: Dict[Type, str] = {}
+"""Dict of declarations hash with record type key, declarations only change when the code is redeployed."""
+
 
 def to_record_dict(node):  # TODO: Apply type hints
     """Recursively apply record dictionary conventions to the argument dictionary."""
@@ -111,51 +121,42 @@ class RecordResponse(BaseModel):
     """Data field of the response data type for the /storage/record route."""
 
     @classmethod
-    def get_record(cls, request: RecordRequest) -> RecordResponse:
-        """Implements /storage/record route."""
+    def get_etag(cls, request: RecordRequest) -> str | None:
+        """Return ETag for /storage/record route without loading the record, or None if the record is not found."""
 
-        if True:  # TODO: ";" not in request.key:
-            # TODO: Use after module is specified
-            record_type = Schema.get_type_by_short_name(request.type)
-        else:
-            key_tokens = request.key.split(";")
-            key_module = CaseUtil.pascal_to_snake_case(key_tokens[0])
-            key_class = key_tokens[1]
+        record_type, deserialized_key = cls._get_record_type_and_key(request)
 
-            # record_type = Schema.get_type_by_short_name(request.type)
-            # TODO: Use after module is specified
-            record_type = ClassInfo.get_class_type(f"{key_module}.{key_class}")
+        # Hash of the stored data changes when the record is saved with different data including its type
+        content_hash = Context.current().db.load_content_hash(record_type, deserialized_key)
+        if content_hash is None:
+            return None
 
-        # Get database from the current context
-        db = Context.current().db
+        # Include schema hash so that the response is not reused after declarations change
+        return HttpCacheUtil.get_etag(
+            (
+                request.type,
+                request.module,
+                request.key,
+                request.dataset,
+                content_hash,
+                cls._get_schema_hash(record_type),
+            )
+        )
 
-        # Load record from storage
-        key_serializer = StringSerializer()
+    @classmethod
+    def get_record(cls, request: RecordRequest) -> RecordResponse:
+        """Implements /storage/record route."""
 
-        # TODO (Roman): UiAppState record request from FE should have key in proper format where user is embedded key
-        if record_type == UiAppState and "KEY" not in request.key:
-            # TODO: Ensure user is specified in all deployment scenarios instead of using default value
-            deserialized_key = UiAppStateKey(user=UserKey(username=request.key or "root"))
-        elif record_type == UiTypeState and "KEY" not in request.key:
-            # Construct the UiTypeStateKey by parsing the key value
-            splitted_key = request.key.split(";")
-            type_state_record_module, type_state_record_type_name, *_ = splitted_key
-            username = splitted_key[-1] if len(splitted_key) == 3 else None
+        record_type, deserialized_key = cls._get_record_type_and_key(request)
 
-            deserialized_key = UiTypeStateKey(
-                user=UserKey(username=username or "root"),
-                type_=TypeDeclKey(
-                    name=type_state_record_type_name, module=ModuleDeclKey(module_name=type_state_record_module)
-                ),
-            )
-        else:
-            deserialized_key = key_serializer.deserialize_key(request.key, record_type.get_key_type())
+        # Get database from the current context
+        db = Context.current().db
 
         # TODO: Review the use of is_record_optional flag here
         record = db.load_one(record_type, deserialized_key, is_record_optional=True)
         if not record and record_type == UiTypeState:
             # TODO (Yauheni): remove temporary workaround of pinning handlers for all requested types
-            type_state_record_type = Schema.get_type_by_short_name(type_state_record_type_name)
+            type_state_record_type = Schema.get_type_by_short_name(deserialized_key.type_.name)
             type_state_record_type_schema = Schema.for_type(type_state_record_type)
 
             # Iterate over type declarations to get all handlers
@@ -200,7 +201,57 @@ class RecordResponse(BaseModel):
 
         ui_serializer = UiDictSerializer()
         # serialize record to ui format
-        record_dict_in_legacy_format = ui_serializer.serialize_data(record)
+        with RequestTracer.span("serialize"):
+            record_dict_in_legacy_format = ui_serializer.serialize_data(record)
 
         # TODO: Update to return record_dict after legacy dict format is removed
         return RecordResponse(schema=type_decl_dict, data=record_dict_in_legacy_format)
+
+    @classmethod
+    def _get_record_type_and_key(cls, request: RecordRequest) -> Tuple[Type, KeyProtocol]:
+        """Return record type and deserialized key for the request."""
+
+        if True:  # TODO: ";" not in request.key:
+            # TODO: Use after module is specified
+            record_type = Schema.get_type_by_short_name(request.type)
+        else:
+            key_tokens = request.key.split(";")
+            key_module = CaseUtil.pascal_to_snake_case(key_tokens[0])
+            key_class = key_tokens[1]
+
+            # record_type = Schema.get_type_by_short_name(request.type)
+            # TODO: Use after module is specified
+            record_type = ClassInfo.get_class_type(f"{key_module}.{key_class}")
+
+        # Deserialize key
+        key_serializer = StringSerializer()
+
+        # TODO (Roman): UiAppState record request from FE should have key in proper format where user is embedded key
+        if record_type == UiAppState and "KEY" not in request.key:
+            # TODO: Ensure user is specified in all deployment scenarios instead of using default value
+            deserialized_key = UiAppStateKey(user=UserKey(username=request.key or "root"))
+        elif record_type == UiTypeState and "KEY" not in request.key:
+            # Construct the UiTypeStateKey by parsing the key value
+            splitted_key = request.key.split(";")
+            type_state_record_module, type_state_record_type_name, *_ = splitted_key
+            username = splitted_key[-1] if len(splitted_key) == 3 else None
+
+            deserialized_key = UiTypeStateKey(
+                user=UserKey(username=username or "root"),
+                type_=TypeDeclKey(
+                    name=type_state_record_type_name, module=ModuleDeclKey(module_name=type_state_record_module)
+                ),
+            )
+        else:
+            deserialized_key = key_serializer.deserialize_key(request.key, record_type.get_key_type())
+
+        return record_type, deserialized_key
+
+    @classmethod
+    def _get_schema_hash(cls, record_type: Type) -> str:
+        """Return hash of declarations for the record type, cached for each type."""
+        if (result := _schema_hash_dict.get(record_type)) is None:
+            type_decl_dict = TypeResponseUtil.get_type(TypeRequest(name=record_type.__name__, user="root"))
+            result = hashlib.sha1(orjson.dumps(type_decl_dict, option=orjson.OPT_SORT_KEYS, default=str)).hexdigest()
+            _schema_hash_dict[record_type] = result
+        return result
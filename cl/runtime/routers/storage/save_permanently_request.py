@@ -29,3 +29,6 @@ class SavePermanentlyRequest(BaseModel):
 
     with_dependencies: bool = False
     """Flag that indicated whether to include nested dependencies for Dag objects."""
+
+    file_format: str = "csv"
+    """File format and extension, either 'csv' or 'parquet'."""
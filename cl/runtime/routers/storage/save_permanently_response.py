@@ -12,31 +12,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
 from pathlib import Path
-from typing import DefaultDict
+from typing import Dict
+from typing import Final
 from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import Type
-from urllib import parse
-import pandas as pd
 from pydantic import BaseModel
 from cl.runtime import Context
 from cl.runtime.db.protocols import TRecord
 from cl.runtime.file.file_util import FileUtil
+from cl.runtime.file.record_file_writer import RecordFileWriter
 from cl.runtime.routers.storage.save_permanently_request import SavePermanentlyRequest
 from cl.runtime.schema.schema import Schema
-from cl.runtime.serialization.flat_dict_serializer import FlatDictSerializer
 from cl.runtime.serialization.string_serializer import StringSerializer
 
+SAVE_PERMANENTLY_BATCH_SIZE: Final[int] = 1000
+"""Number of records loaded from the database and written to files at a time."""
 
-def get_type_to_records_map(request: SavePermanentlyRequest) -> DefaultDict[Type, TRecord]:
-    """Fetch records from the database and return them."""
+SAVE_PERMANENTLY_MAX_WORKERS: Final[int] = 8
+"""Maximum number of record types written to files in parallel."""
+
+
+def iterate_type_to_records_batches(request: SavePermanentlyRequest) -> Iterator[Dict[Type, List[TRecord]]]:
+    """Load records from the database in batches and yield records in each batch grouped by their type."""
 
     request_type = Schema.get_type_by_short_name(request.type)
     key_serializer = StringSerializer()
-
-    key_objs = [key_serializer.deserialize_key(key, request_type.get_key_type()) for key in request.keys]
-    records = Context.current().load_many(key_objs, ignore_not_found=True)
+    key_type = request_type.get_key_type()
+    context = Context.current()
 
     # TODO (Bohdan): Implement with_dependencies logic.
     # if request.with_dependencies:
@@ -48,23 +56,22 @@ def get_type_to_records_map(request: SavePermanentlyRequest) -> DefaultDict[Type
     #     ]
     #     records = context.load_many(key_objs, ignore_not_found=True)
 
-    type_to_records_map = defaultdict(list)
-    for record in records:
-        if record:
-            type_to_records_map[type(record)].append(record)
-
-    return type_to_records_map
+    keys = iter(request.keys)
+    while key_batch := list(islice(keys, SAVE_PERMANENTLY_BATCH_SIZE)):
+        key_objs = [key_serializer.deserialize_key(key, key_type) for key in key_batch]
+        type_to_records_map = {}
+        for record in context.load_many(request_type, key_objs, dataset=request.dataset):
+            if record is not None:
+                type_to_records_map.setdefault(type(record), []).append(record)
+        yield type_to_records_map
 
 
 class SavePermanentlyResponse(BaseModel):
 
     @classmethod
-    def _get_extension(cls) -> str:
+    def _get_extension(cls, request: SavePermanentlyRequest) -> str:
         """Return an extension in which records should be saved."""
-
-        # TODO (Bohdan): Check if it makes sense to have a config which format/extension to use.
-        #  If not - simplify the code.
-        return "csv"
+        return request.file_format
 
     @classmethod
     def _get_path_to_save_permanently_folder(cls) -> Path:
@@ -74,30 +81,41 @@ class SavePermanentlyResponse(BaseModel):
         return Path()
 
     @classmethod
-    def _write_records(cls, file_path: Path, records: Iterable[TRecord]) -> None:
+    def _write_records(cls, writer: RecordFileWriter, records: Iterable[TRecord]) -> None:
         """Write serialized records on the disk."""
-
-        file_extension = file_path.stem
-
-        serializer = FlatDictSerializer()  # TODO (Bohdan): Provide a proper serializer
-        serialized_records = [serializer.serialize_data(record) for record in records]
-
-        if file_extension == "csv":
-            df = pd.DataFrame([serialized_records])
-            df.to_csv(file_path, mode="w", index=False, header=True)
-        else:
-            raise ValueError(f"File extension {file_extension} is not supported.")
+        writer.write_records(records)
 
     @classmethod
     def save_permanently(cls, request: SavePermanentlyRequest) -> "SavePermanentlyResponse":
-        """Save records to the database on the disk."""
-
-        for record_type, records in get_type_to_records_map(request).items():
-            filename = f"{record_type.__name__}.{cls._get_extension()}"
-            FileUtil.check_valid_filename(filename)
-            file_path = cls._get_path_to_save_permanently_folder() / filename
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            cls._write_records(file_path, records)
+        """
+        Save records to the database on the disk.
+
+        Notes:
+            - Records are loaded in batches and streamed to one file per record type
+            - Batches of different types are written in parallel
+            - Each file is written to a temporary file and renamed when all records are written,
+              all files are left unmodified if an error occurs
+        """
+
+        writers: Dict[Type, RecordFileWriter] = {}
+        with ExitStack() as exit_stack, ThreadPoolExecutor(max_workers=SAVE_PERMANENTLY_MAX_WORKERS) as executor:
+            for type_to_records_map in iterate_type_to_records_batches(request):
+                for record_type in type_to_records_map.keys():
+                    if record_type not in writers:
+                        filename = f"{record_type.__name__}.{cls._get_extension(request)}"
+                        FileUtil.check_valid_filename(filename)
+                        file_path = cls._get_path_to_save_permanently_folder() / filename
+                        writer = RecordFileWriter(
+                            file_path=str(file_path), record_type=record_type, file_format=request.file_format
+                        )
+                        writers[record_type] = exit_stack.enter_context(writer)
+
+                # Write batch for each type in parallel and wait before loading the next batch
+                futures = [
+                    executor.submit(cls._write_records, writers[record_type], records)
+                    for record_type, records in type_to_records_map.items()
+                ]
+                for future in futures:
+                    future.result()
 
         return SavePermanentlyResponse()
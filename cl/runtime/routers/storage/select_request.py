@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from typing import Dict
+from typing import List
 from pydantic import BaseModel
 
 
@@ -36,3 +37,12 @@ class SelectRequest(BaseModel):
 
     table_format: bool = False
     """If true, response will be returned in the table format."""
+
+    continuation_token: str | None = None
+    """Token from the previous response to get the next page, overrides skip if specified."""
+
+    sort: str | None = None
+    """Field to sort by with '-' prefix for descending order, records are sorted by key if not specified."""
+
+    columns: List[str] | None = None
+    """Fields to include in the response in addition to the key and type, all fields if not specified."""
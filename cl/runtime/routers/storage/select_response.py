@@ -13,14 +13,25 @@
 # limitations under the License.
 
 from __future__ import annotations
+import base64
+import json
 from typing import Any
+from typing import AsyncIterator
 from typing import Dict
+from typing import Final
+from typing import Iterator
 from typing import List
+from typing import Tuple
+import orjson
 from pydantic import BaseModel
 from pydantic import Field
 from cl.runtime.context.context import Context
+from cl.runtime.perf.request_tracer import RequestTracer
 from cl.runtime.primitive.case_util import CaseUtil
 from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.protocols import TQuery
+from cl.runtime.routers.db_executor import DbExecutor
 from cl.runtime.routers.schema.type_request import TypeRequest
 from cl.runtime.routers.schema.type_response_util import TypeResponseUtil
 from cl.runtime.routers.storage.select_request import SelectRequest
@@ -29,6 +40,15 @@ from cl.runtime.serialization.ui_dict_serializer import UiDictSerializer
 SelectResponseSchema = Dict[str, Any]
 SelectResponseData = List[Dict[str, Any]]
 
+SELECT_STREAM_BATCH_SIZE: Final[int] = 1000
+"""Number of records read from the database cursor and serialized at a time in streaming mode."""
+
+_stream_media_types: Dict[str, str] = {"json": "application/json", "ndjson": "application/x-ndjson"}
+"""Media type for each supported stream format."""
+
+_orjson_options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+"""Same options as used by ORJSONResponse for non-streaming responses."""
+
 
 class SelectResponse(BaseModel):
     """Response data type for the /storage/select route."""
@@ -39,36 +59,166 @@ class SelectResponse(BaseModel):
     data: SelectResponseData
     """Data field of the response data type for the /storage/select route."""
 
+    total_count: int | None = None
+    """Number of records matching the filter when the first page was selected."""
+
+    continuation_token: str | None = None
+    """Pass in the next request to get the next page, None if this is the last page."""
+
     @classmethod
     def get_records(cls, request: SelectRequest) -> SelectResponse:
         """Implements /storage/select route."""
 
         # Default response when running locally without authorization
         type_decl_dict = TypeResponseUtil.get_type(TypeRequest(name=request.type_, module=request.module, user="root"))
+        query = cls._get_query(request)
+
+        # Get the position of the page and total count from the continuation token
+        context = Context.current()
+        if request.continuation_token is not None:
+            skip, total_count = cls._decode_continuation_token(request.continuation_token, request.type_)
+        else:
+            skip, total_count = request.skip, context.count_query(query)
+
+        # Load one more record than requested to determine if there is a next page
+        limit = request.threshold
+        records = list(context.load_query(query, limit=limit + 1 if limit is not None else None, skip=skip))
+        if limit is not None and len(records) > limit:
+            records = records[:limit]
+            continuation_token = cls._encode_continuation_token(request.type_, skip + limit, total_count)
+        else:
+            continuation_token = None
+
+        # Serialize only the requested columns
+        ui_serializer = UiDictSerializer()
+        select_fields = [cls._get_field_name(x) for x in request.columns] if request.columns else None
 
-        record_module = request.module
-        record_class = request.type_
-        record_type = ClassInfo.get_class_type(f"{record_module}.{record_class}")
+        # TODO (Roman): check if we are calling /select somewhere other than the main grid.
+        with RequestTracer.span("serialize", rows=len(records)):
+            serialized_records = tuple(
+                ui_serializer.serialize_record_for_table(record, select_fields=select_fields) for record in records
+            )
 
-        # Get database from the current context
-        db = Context.current().db
+        return SelectResponse(
+            schema=type_decl_dict,
+            data=serialized_records,
+            total_count=total_count,
+            continuation_token=continuation_token,
+        ).dict(by_alias=True)
 
-        # TODO (Roman): replace temporary load_all to load_filter
-        if not hasattr(db, "load_all"):
+    @classmethod
+    def get_stream_media_type(cls, stream_format: str) -> str:
+        """Return media type for the stream format, error if the format is not supported."""
+        if (result := _stream_media_types.get(stream_format)) is None:
             raise RuntimeError(
-                f"Currently database need to implement load_all() method for select records by type. "
-                f"Database {db.__class__.__name__} doesn't have load_all()."
+                f"Stream format '{stream_format}' is not supported, use one of {', '.join(_stream_media_types)}."
             )
+        return result
 
-        # load records by type
-        records = db.load_all(record_type)
-        records = list(records)
+    @classmethod
+    async def stream_records(cls, request: SelectRequest, stream_format: str) -> AsyncIterator[bytes]:
+        """
+        Implements /storage/select route in streaming mode, reading and serializing one batch of records at a time
+        from a database cursor so that server memory, time to first byte and time per record do not depend
+        on the number of records.
+
+        Notes:
+            - For 'json' format the response has the same schema and data fields as the non-streaming response
+            - For 'ndjson' format the first line has the schema field followed by one line per record
+            - Total count and continuation token are not included, limit and skip are applied
+        """
+        is_ndjson = cls.get_stream_media_type(stream_format) == _stream_media_types["ndjson"]
+        type_decl_dict, query = await DbExecutor.run(cls._get_type_decl_and_query, request)
+        schema_bytes = orjson.dumps(type_decl_dict, option=_orjson_options)
+        yield b'{"schema":' + schema_bytes + (b"}\n" if is_ndjson else b',"data":[')
+
+        select_fields = [cls._get_field_name(x) for x in request.columns] if request.columns else None
+        skip = request.skip
+        if request.continuation_token is not None:
+            skip, _ = cls._decode_continuation_token(request.continuation_token, request.type_)
+
+        # The cursor is held open between batches and closed when the stream ends or the client disconnects
+        batches = Context.current().load_query_batches(
+            query, batch_size=SELECT_STREAM_BATCH_SIZE, limit=request.threshold, skip=skip
+        )
+        try:
+            is_first_batch = True
+            while True:
+                chunk, record_count = await DbExecutor.run(
+                    cls._serialize_batch, batches, select_fields, is_ndjson, is_first_batch
+                )
+                if record_count == 0:
+                    break
+                yield chunk
+                is_first_batch = False
+        finally:
+            await DbExecutor.run(batches.close)
+
+        if not is_ndjson:
+            yield b"]}"
 
-        # TODO: Refactor the code below
+    @classmethod
+    def _get_type_decl_and_query(cls, request: SelectRequest) -> Tuple[Dict[str, Any], TQuery]:
+        """Return type declaration for the response schema and the query."""
+        type_decl_dict = TypeResponseUtil.get_type(TypeRequest(name=request.type_, module=request.module, user="root"))
+        return type_decl_dict, cls._get_query(request)
+
+    @classmethod
+    def _get_query(cls, request: SelectRequest) -> TQuery:
+        """Return query for the record type, filter and sort order in the request."""
+        record_type = ClassInfo.get_class_type(f"{request.module}.{request.type_}")
 
+        # Filter and sort on the database side, field names may be in PascalCase used by the UI
+        conditions = {cls._get_field_name(k): v for k, v in (request.query_dict or {}).items()}
+        order = {}
+        if request.sort:
+            order[cls._get_field_name(request.sort.removeprefix("-"))] = -1 if request.sort.startswith("-") else 1
+        return record_type, conditions, order
+
+    @classmethod
+    def _serialize_batch(
+        cls,
+        batches: Iterator[List[RecordProtocol]],
+        select_fields: List[str] | None,
+        is_ndjson: bool,
+        is_first_batch: bool,
+    ) -> Tuple[bytes, int]:
+        """Read and serialize the next batch of records, return the serialized chunk and the number of records."""
         ui_serializer = UiDictSerializer()
+        records = next(batches, [])
+        with RequestTracer.span("serialize", rows=len(records)):
+            serialized_records = [
+                orjson.dumps(
+                    ui_serializer.serialize_record_for_table(record, select_fields=select_fields),
+                    option=_orjson_options,
+                )
+                for record in records
+            ]
+        if is_ndjson:
+            chunk = b"".join(x + b"\n" for x in serialized_records)
+        else:
+            chunk = (b"" if is_first_batch else b",") + b",".join(serialized_records)
+        return chunk, len(records)
 
-        # TODO (Roman): check if we are calling /select somewhere other than the main grid.
-        serialized_records = tuple(ui_serializer.serialize_record_for_table(record) for record in records)
+    @classmethod
+    def _get_field_name(cls, name: str) -> str:
+        """Convert column name in PascalCase used by the UI to field name, other names are returned unchanged."""
+        return CaseUtil.pascale_to_snake_case_keep_trailing_underscore(name) if CaseUtil.is_pascal_case(name) else name
 
-        return SelectResponse(schema=type_decl_dict, data=serialized_records).dict(by_alias=True)
+    @classmethod
+    def _encode_continuation_token(cls, type_name: str, skip: int, total_count: int) -> str:
+        """Encode the position of the next page and the total count as an opaque string."""
+        token_dict = {"type": type_name, "skip": skip, "total_count": total_count}
+        return base64.urlsafe_b64encode(json.dumps(token_dict).encode()).decode()
+
+    @classmethod
+    def _decode_continuation_token(cls, token: str, type_name: str) -> tuple[int, int]:
+        """Return the position of the next page and the total count, error if the token is not for this type."""
+        try:
+            token_dict = json.loads(base64.urlsafe_b64decode(token.encode()))
+            skip, total_count, token_type_name = token_dict["skip"], token_dict["total_count"], token_dict["type"]
+        except Exception:  # noqa
+            raise RuntimeError(f"Continuation token '{token}' is not valid.")
+        if token_type_name != type_name:
+            raise RuntimeError(f"Continuation token for type {token_type_name} is used to select type {type_name}.")
+        return skip, total_count
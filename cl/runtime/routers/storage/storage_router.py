@@ -18,8 +18,14 @@ from fastapi import APIRouter
 from fastapi import Body
 from fastapi import Header
 from fastapi import Query
+from fastapi import Response
 from fastapi.responses import ORJSONResponse
+from fastapi.responses import StreamingResponse
 from starlette.requests import Request
+from cl.runtime.routers.db_executor import DbExecutor
+from cl.runtime.routers.http_cache_util import LISTING_CACHE_CONTROL
+from cl.runtime.routers.http_cache_util import RECORD_CACHE_CONTROL
+from cl.runtime.routers.http_cache_util import HttpCacheUtil
 from cl.runtime.routers.storage.dataset_response import DatasetResponse
 from cl.runtime.routers.storage.datasets_request import DatasetsRequest
 from cl.runtime.routers.storage.env_response import EnvResponse
@@ -39,24 +45,45 @@ router = APIRouter()
 
 # TODO: Consider changing to /envs for consistency
 @router.get("/get_envs", response_model=EnvsResponse)
-async def get_envs(user: str = Header(None, description="User identifier or identity token")) -> EnvsResponse:
+async def get_envs(
+    response: Response,
+    user: str = Header(None, description="User identifier or identity token"),
+    if_none_match: str = Header(None, description="ETag of the cached response if available"),
+):
     """Information about the environments."""
+
+    # Served from memory, database executor is not used
+    headers = HttpCacheUtil.get_headers(EnvResponse.get_etag(), LISTING_CACHE_CONTROL)
+    if HttpCacheUtil.is_not_modified(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
     return EnvResponse.get_envs(UserRequest(user=user))
 
 
 # TODO: Consider changing to /datasets for consistency
 @router.get("/get_datasets", response_model=DatasetsResponse)
 async def get_datasets(
+    response: Response,
     type: str = Query(..., description="Class name"),  # noqa Suppress report about shadowed built-in type
     module: str = Query(None, description="Dot-delimited module string"),
     user: str = Header(None, description="User identifier or identity token"),
-) -> DatasetsResponse:
-    """Information about the environments."""
+    if_none_match: str = Header(None, description="ETag of the cached response if available"),
+):
+    """Information about the datasets."""
+
+    # Served from the dataset registry in memory, database executor is not used
+    headers = HttpCacheUtil.get_headers(DatasetResponse.get_etag(), LISTING_CACHE_CONTROL)
+    if HttpCacheUtil.is_not_modified(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
     return DatasetResponse.get_datasets(DatasetsRequest(type=type, module=module, user=user))
 
 
 @router.get("/record", response_model=RecordResponse)
 async def get_record(
+    response: Response,
     type: str = Query(..., description="Class name"),  # noqa Suppress report about shadowed built-in type
     key: str = Query(None, description="Primary key fields in semicolon-delimited format"),
     module: str = Query(None, description="Dot-delimited module string"),
@@ -65,14 +92,22 @@ async def get_record(
         False, description="If true, empty response will be returned without error if the record is not found."
     ),
     user: str = Header(None, description="User identifier or identity token"),
-) -> RecordResponse:
+    if_none_match: str = Header(None, description="ETag of the cached response if available"),
+) -> RecordResponse | Response:
     """Schema and data for a single record specified by a key."""
-    return RecordResponse.get_record(
-        RecordRequest(
-            type=type, key=key, module=module, dataset=dataset, ignore_record_absence=ignore_record_absence, user=user
-        )
+    record_request = RecordRequest(
+        type=type, key=key, module=module, dataset=dataset, ignore_record_absence=ignore_record_absence, user=user
     )
 
+    # Return Not Modified without loading the record if stored data did not change
+    etag = await DbExecutor.run(RecordResponse.get_etag, record_request)
+    headers = HttpCacheUtil.get_headers(etag, RECORD_CACHE_CONTROL)
+    if HttpCacheUtil.is_not_modified(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return await DbExecutor.run(RecordResponse.get_record, record_request)
+
 
 @router.post(path="/select", response_class=ORJSONResponse)
 async def storage_select(
@@ -85,20 +120,36 @@ async def storage_select(
     skip: int = Query(0, description="Number of skipped records from the beginning of the list."),
     module: str = Query(None, description="Dot-delimited module string."),
     table_format: bool = Query(False, description="If true, response will be returned in the table format."),
+    continuation_token: str = Query(None, description="Token from the previous response to get the next page."),
+    sort: str = Query(None, description="Field to sort by with '-' prefix for descending order."),
+    columns: List[str] = Query(None, description="Fields to include in the response, all fields if not specified."),
+    stream: str = Query(None, description="Stream format ('json' or 'ndjson'), the response is not streamed if None."),
 ) -> SelectResponse:
     """
-    Get entities by query with schema information.
+    Get a page of entities by query with schema information, filtering, sorting and paging on the database side.
     """
 
-    return SelectResponse.get_records(
-        request=SelectRequest(
-            type_=type_, query_dict=query_dict, threshold=threshold, skip=skip, module=module, table_format=table_format
-        )
+    select_request = SelectRequest(
+        type_=type_,
+        query_dict=query_dict,
+        threshold=threshold,
+        skip=skip,
+        module=module,
+        table_format=table_format,
+        continuation_token=continuation_token,
+        sort=sort,
+        columns=columns,
     )
+    if stream is not None:
+        return StreamingResponse(
+            SelectResponse.stream_records(select_request, stream),
+            media_type=SelectResponse.get_stream_media_type(stream),
+        )
+    return await DbExecutor.run(SelectResponse.get_records, select_request)
 
 
 @router.post("/record/save_permanently", status_code=200)
 async def save_permanently(request: Request, body: SavePermanentlyRequest) -> SavePermanentlyResponse:
     """Save records to the database on the disk."""
 
-    return SavePermanentlyResponse.save_permanently(request=body)
+    return await DbExecutor.run(SavePermanentlyResponse.save_permanently, body)
@@ -18,6 +18,7 @@ from typing import List
 from pydantic import BaseModel
 from cl.runtime import Context
 from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.primitive.timestamp import Timestamp
 from cl.runtime.records.dataclasses_extensions import missing
 from cl.runtime.routers.tasks.run_error_response_item import RunErrorResponseItem
 from cl.runtime.routers.tasks.run_request import RunRequest
@@ -25,6 +26,7 @@ from cl.runtime.schema.schema import Schema
 from cl.runtime.tasks.celery.celery_queue import CeleryQueue
 from cl.runtime.tasks.instance_method_task import InstanceMethodTask
 from cl.runtime.tasks.static_method_task import StaticMethodTask
+from cl.runtime.tasks.task_priority_enum import TaskPriorityEnum
 
 # TODO: Make it possible to configure the queue to use for handler execution
 handler_queue = CeleryQueue(queue_id="Handler Queue")
@@ -39,13 +41,19 @@ class RunResponseItem(BaseModel):
     key: str | None = missing()
     """Key of the record."""
 
+    batch_id: str | None = None
+    """Identifier shared by all tasks created by the request, pass to /tasks/run/batch_status to get their status."""
+
     class Config:
         alias_generator = CaseUtil.snake_to_pascal_case
         populate_by_name = True
 
     @classmethod
     def run_tasks(cls, request: RunRequest) -> List[RunResponseItem | RunErrorResponseItem]:
-        response_items = []
+        handler_tasks = []
+
+        # All tasks created by the request share time-ordered unique batch identifier
+        batch_id = Timestamp.create()
 
         # TODO: Refactor
         # TODO (Roman): request [None] for static handlers explicitly
@@ -71,11 +79,14 @@ class RunResponseItem(BaseModel):
                     key_type_str=key_type_str,
                     key_str=serialized_key,
                     method_name=request.method,
+                    priority=TaskPriorityEnum.HIGH,
+                    user=Context.current().user,
+                    batch_id=batch_id,
                 )
             else:
                 # Key is None, this is a @classmethod or @staticmethod
                 record_type = Schema.get_type_by_short_name(request.table)
-                u = f"{record_type.__module__}.{record_type.__name__}"
+                record_type_str = f"{record_type.__module__}.{record_type.__name__}"
                 method_name_pascal_case = CaseUtil.snake_to_pascal_case(request.method)
                 label = f"{record_type.__name__};{method_name_pascal_case}"
                 handler_task = StaticMethodTask(
@@ -83,11 +94,19 @@ class RunResponseItem(BaseModel):
                     queue=handler_queue.get_key(),
                     type_str=record_type_str,
                     method_name=request.method,
+                    priority=TaskPriorityEnum.HIGH,
+                    user=Context.current().user,
+                    batch_id=batch_id,
                 )
 
-            # Save and submit task
-            Context.current().save_one(handler_task)
-            handler_queue.submit_task(handler_task)  # TODO: Rely on query instead
-            response_items.append(RunResponseItem(key=serialized_key, task_run_id=handler_task.task_id))
+            handler_tasks.append(handler_task)
+
+        # Save all tasks in one call, this also sets task_id of each task
+        Context.current().save_many(handler_tasks)
 
-        return response_items
+        # Submit all tasks at once so that context is serialized once and tasks are sent in batches
+        handler_queue.submit_tasks(handler_tasks)  # TODO: Rely on query instead
+        return [
+            RunResponseItem(key=serialized_key, task_run_id=handler_task.task_id, batch_id=batch_id)
+            for serialized_key, handler_task in zip(requested_keys, handler_tasks)
+        ]
@@ -0,0 +1,86 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from typing import Dict
+from pydantic import BaseModel
+from cl.runtime import Context
+from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.routers.tasks.task_batch_status_request import TaskBatchStatusRequest
+from cl.runtime.routers.tasks.task_status_response_item import LEGACY_TASK_STATUS_NAMES_MAP
+from cl.runtime.tasks.task import Task
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
+
+_unfinished_statuses = (
+    TaskStatusEnum.RUNNING,
+    TaskStatusEnum.AWAITING,
+    TaskStatusEnum.PENDING,
+    TaskStatusEnum.BLOCKED,
+)
+"""Aggregate status is the first of these statuses present in the batch, in the order of precedence."""
+
+_finished_statuses = (TaskStatusEnum.FAILED, TaskStatusEnum.CANCELLED, TaskStatusEnum.COMPLETED)
+"""If all tasks are finished, aggregate status is the first of these statuses present in the batch."""
+
+
+class TaskBatchStatusResponse(BaseModel):
+    """Response data type for the /tasks/run/batch_status route."""
+
+    batch_id: str
+    """Batch id from the request."""
+
+    status_code: str | None
+    """Aggregate status of the tasks in the batch, None if the batch has no tasks."""
+
+    task_count: int
+    """Total number of tasks in the batch."""
+
+    status_counts: Dict[str, int]
+    """Number of tasks for each legacy status name present in the batch."""
+
+    progress_pct: float
+    """Average progress of the tasks in the batch in percent from 0 to 100."""
+
+    class Config:
+        alias_generator = CaseUtil.snake_to_pascal_case
+        populate_by_name = True
+
+    @classmethod
+    def get_batch_status(cls, request: TaskBatchStatusRequest) -> TaskBatchStatusResponse:
+        """Get aggregate status of the tasks in the batch using one query."""
+
+        query = (Task, {"batch_id": request.batch_id}, {})
+        tasks = list(Context.current().load_query(query))
+
+        status_counts = {}
+        for task in tasks:
+            status_counts[task.status] = status_counts.get(task.status, 0) + 1
+
+        # Several statuses may have the same legacy name (e.g. Pending and Blocked), add up their counts
+        legacy_status_counts = {}
+        for task_status, count in status_counts.items():
+            legacy_name = LEGACY_TASK_STATUS_NAMES_MAP.get(task_status.name)
+            legacy_status_counts[legacy_name] = legacy_status_counts.get(legacy_name, 0) + count
+
+        # Batch is unfinished while any of its tasks are unfinished
+        status = next((x for x in _unfinished_statuses + _finished_statuses if x in status_counts), None)
+        progress_pct = sum(task.progress_pct or 0.0 for task in tasks) / len(tasks) if tasks else 0.0
+
+        return TaskBatchStatusResponse(
+            batch_id=request.batch_id,
+            status_code=LEGACY_TASK_STATUS_NAMES_MAP.get(status.name) if status is not None else None,
+            task_count=len(tasks),
+            status_counts=legacy_status_counts,
+            progress_pct=progress_pct,
+        )
@@ -0,0 +1,25 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pydantic import BaseModel
+
+
+class TaskMetricsRequest(BaseModel):
+    """Request data type for the /tasks/metrics route."""
+
+    queue_id: str | None = None
+    """Include only the tasks of this queue if specified."""
+
+    limit: int = 1000
+    """Aggregate metrics for this number of most recent completed or failed tasks."""
@@ -0,0 +1,132 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import math
+from typing import Dict
+from typing import List
+from pydantic import BaseModel
+from cl.runtime import Context
+from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.routers.tasks.task_metrics_request import TaskMetricsRequest
+from cl.runtime.tasks.task import Task
+from cl.runtime.tasks.task_queue_key import TaskQueueKey
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
+
+_metric_fields = ("queue_wait_sec", "elapsed_sec", "cpu_sec", "peak_rss_mb", "db_calls", "db_bytes", "llm_tokens")
+"""Task fields for which percentiles are reported."""
+
+
+class TaskMetricsPercentiles(BaseModel):
+    """Percentiles of one metric across the tasks of a handler (field names are not converted to PascalCase)."""
+
+    p50: float
+    """Median value."""
+
+    p90: float
+    """90th percentile."""
+
+    p99: float
+    """99th percentile."""
+
+    max: float
+    """Maximum value."""
+
+    @classmethod
+    def from_values(cls, values: List[float]) -> TaskMetricsPercentiles | None:
+        """Calculate percentiles using the nearest-rank method, return None if there are no values."""
+        if not values:
+            return None
+        values = sorted(values)
+
+        def nearest_rank(pct: float) -> float:
+            return float(values[max(math.ceil(pct / 100.0 * len(values)) - 1, 0)])
+
+        return TaskMetricsPercentiles(
+            p50=nearest_rank(50), p90=nearest_rank(90), p99=nearest_rank(99), max=float(values[-1])
+        )
+
+
+class TaskMetricsResponseItem(BaseModel):
+    """Data type for a single item in the response list for the /tasks/metrics route."""
+
+    handler: str
+    """Handler name in ClassName.method_name format, see 'Task.get_handler_name'."""
+
+    task_count: int
+    """Number of completed or failed tasks for this handler."""
+
+    failed_count: int
+    """Number of failed tasks for this handler."""
+
+    queue_wait_sec: TaskMetricsPercentiles | None = None
+    """Time from task creation to the start of the run."""
+
+    elapsed_sec: TaskMetricsPercentiles | None = None
+    """Wall-clock time of the run."""
+
+    cpu_sec: TaskMetricsPercentiles | None = None
+    """CPU time of the run."""
+
+    peak_rss_mb: TaskMetricsPercentiles | None = None
+    """Peak resident memory of the worker process at the end of the run."""
+
+    db_calls: TaskMetricsPercentiles | None = None
+    """Number of database calls during the run."""
+
+    db_bytes: TaskMetricsPercentiles | None = None
+    """Approximate size of data sent to or received from the database during the run."""
+
+    llm_tokens: TaskMetricsPercentiles | None = None
+    """Number of LLM tokens during the run."""
+
+    class Config:
+        alias_generator = CaseUtil.snake_to_pascal_case
+        populate_by_name = True
+
+    @classmethod
+    def get_task_metrics(cls, request: TaskMetricsRequest) -> List[TaskMetricsResponseItem]:
+        """Aggregate run metrics of the most recent finished tasks per handler, slowest handlers first."""
+
+        # Use indexed query for the most recent finished tasks, task_id is time-ordered
+        conditions = {"status": {"$in": [TaskStatusEnum.COMPLETED, TaskStatusEnum.FAILED]}}
+        if request.queue_id is not None:
+            conditions["queue"] = TaskQueueKey(queue_id=request.queue_id)
+        query = (Task, conditions, {"task_id": -1})
+        tasks = Context.current().load_query(query, limit=request.limit)
+
+        tasks_per_handler: Dict[str, List[Task]] = {}
+        for task in tasks:
+            tasks_per_handler.setdefault(task.get_handler_name(), []).append(task)
+
+        result = []
+        for handler, handler_tasks in tasks_per_handler.items():
+            percentiles = {
+                field_name: TaskMetricsPercentiles.from_values(
+                    [value for task in handler_tasks if (value := getattr(task, field_name)) is not None]
+                )
+                for field_name in _metric_fields
+            }
+            result.append(
+                TaskMetricsResponseItem(
+                    handler=handler,
+                    task_count=len(handler_tasks),
+                    failed_count=sum(1 for task in handler_tasks if task.status == TaskStatusEnum.FAILED),
+                    **percentiles,
+                )
+            )
+
+        # Sort by median elapsed time in descending order
+        result.sort(key=lambda x: -x.elapsed_sec.p50 if x.elapsed_sec is not None else 0.0)
+        return result
@@ -33,6 +33,7 @@ LEGACY_TASK_STATUS_NAMES_MAP: Dict[str, str] = {  # TODO: Update UI to sync the
     "COMPLETED": "Completed",
     "FAILED": "Failed",
     "CANCELLED": "Cancelled",
+    "BLOCKED": "Submitted",
 }
 """Status name to legacy status name map according to UI convention."""
 
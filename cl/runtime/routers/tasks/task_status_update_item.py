@@ -0,0 +1,127 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import time
+from typing import AsyncIterator
+from typing import Dict
+from typing import Final
+from typing import List
+from pydantic import BaseModel
+from cl.runtime import Context
+from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.routers.tasks.task_status_response_item import LEGACY_TASK_STATUS_NAMES_MAP
+from cl.runtime.routers.tasks.task_status_wait_request import TaskStatusWaitRequest
+from cl.runtime.tasks.task_subscriptions import TaskSubscriptions
+from cl.runtime.tasks.task_update import TaskUpdate
+
+TASK_EVENTS_KEEP_ALIVE_SEC: Final[float] = 15.0
+"""Interval for sending a comment line to keep the event stream open when there are no updates."""
+
+
+class TaskStatusUpdateItem(BaseModel):
+    """Data type for a single status update in /tasks/run/status/wait and /tasks/run/status/events routes."""
+
+    status_code: str
+    """Task status code."""
+
+    task_run_id: str
+    """Task run unique id."""
+
+    key: str | None
+    """Task key."""
+
+    progress_pct: float | None
+    """Task progress in percent from 0 to 100."""
+
+    remaining_sec: float | None
+    """Remaining time in seconds if available."""
+
+    user_message: str | None
+    """Optional user message."""
+
+    revision: str
+    """Pass back in the next request to receive only subsequent updates for this task."""
+
+    class Config:
+        alias_generator = CaseUtil.snake_to_pascal_case
+        populate_by_name = True
+
+    @classmethod
+    def from_update(cls, update: TaskUpdate) -> TaskStatusUpdateItem:
+        """Create from a task update."""
+        return TaskStatusUpdateItem(
+            status_code=LEGACY_TASK_STATUS_NAMES_MAP.get(update.status.name),
+            task_run_id=update.task_id,
+            key=update.task_id,
+            progress_pct=update.progress_pct,
+            remaining_sec=update.remaining_sec,
+            user_message=update.error_message,
+            revision=update.get_revision(),
+        )
+
+    @classmethod
+    async def wait_for_updates(cls, request: TaskStatusWaitRequest) -> List[TaskStatusUpdateItem]:
+        """Return as soon as any task has a revision different from the request, or an empty list on timeout."""
+        updates = await cls._wait_for_changes(request.task_run_ids, request.revisions or {}, request.timeout_sec)
+        return [cls.from_update(update) for update in updates]
+
+    @classmethod
+    async def stream_updates(cls, task_run_ids: List[str], timeout_sec: float) -> AsyncIterator[str]:
+        """Yield Server-Sent Events for each status or progress change until all tasks are finished or timeout."""
+        revisions = {}
+        latest_updates = {}
+        deadline = time.monotonic() + timeout_sec
+        while (remaining_sec := deadline - time.monotonic()) > 0:
+            updates = await cls._wait_for_changes(
+                task_run_ids, revisions, min(remaining_sec, TASK_EVENTS_KEEP_ALIVE_SEC)
+            )
+            if not updates:
+                yield ": keep-alive\n\n"
+                continue
+            for update in updates:
+                item = cls.from_update(update)
+                revisions[update.task_id] = item.revision
+                latest_updates[update.task_id] = update
+                yield f"event: status\ndata: {item.model_dump_json(by_alias=True)}\n\n"
+            if all(x in latest_updates and latest_updates[x].is_finished() for x in task_run_ids):
+                return
+
+    @classmethod
+    async def _wait_for_changes(
+        cls,
+        task_ids: List[str],
+        revisions: Dict[str, str],
+        timeout_sec: float,
+    ) -> List[TaskUpdate]:
+        """
+        Wait until the latest update for any of the tasks has a revision different from 'revisions'
+        and return such updates, or return an empty list on timeout.
+        """
+        deadline = time.monotonic() + timeout_sec
+        with TaskSubscriptions.subscribe(task_ids, context=Context.current()) as subscription:
+            while True:
+                # Clear before getting updates so that an update published after that is not missed, updates
+                # of tasks running in other processes are loaded by one polling thread for all subscribers
+                subscription.clear()
+                result = [
+                    update
+                    for task_id in task_ids
+                    if (update := TaskSubscriptions.get_update(task_id)) is not None
+                    and update.get_revision() != revisions.get(task_id)
+                ]
+                now = time.monotonic()
+                if result or now >= deadline:
+                    return result
+                await subscription.wait(deadline - now)
@@ -0,0 +1,29 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict
+from pydantic import BaseModel
+
+
+class TaskStatusWaitRequest(BaseModel):
+    """Request data type for the /tasks/run/status/wait route."""
+
+    task_run_ids: list[str]
+    """Task run ids."""
+
+    revisions: Dict[str, str] | None = None
+    """Revision of the last update received for each task run id, the response includes updates that differ."""
+
+    timeout_sec: float = 30.0
+    """Return an empty list if no task is updated within this time."""
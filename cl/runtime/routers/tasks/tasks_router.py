@@ -14,14 +14,23 @@
 
 from typing import List
 from fastapi import APIRouter
+from fastapi import Query
 from fastapi import Request
+from fastapi.responses import StreamingResponse
+from cl.runtime.routers.db_executor import DbExecutor
 from cl.runtime.routers.tasks.run_error_response_item import RunErrorResponseItem
 from cl.runtime.routers.tasks.run_request import RunRequest
 from cl.runtime.routers.tasks.run_response_item import RunResponseItem
+from cl.runtime.routers.tasks.task_batch_status_request import TaskBatchStatusRequest
+from cl.runtime.routers.tasks.task_batch_status_response import TaskBatchStatusResponse
+from cl.runtime.routers.tasks.task_metrics_request import TaskMetricsRequest
+from cl.runtime.routers.tasks.task_metrics_response_item import TaskMetricsResponseItem
 from cl.runtime.routers.tasks.task_result_request import TaskResultRequest
 from cl.runtime.routers.tasks.task_result_response_item import TaskResultResponseItem
 from cl.runtime.routers.tasks.task_status_request import TaskStatusRequest
 from cl.runtime.routers.tasks.task_status_response_item import TaskStatusResponseItem
+from cl.runtime.routers.tasks.task_status_update_item import TaskStatusUpdateItem
+from cl.runtime.routers.tasks.task_status_wait_request import TaskStatusWaitRequest
 
 router = APIRouter()
 
@@ -38,7 +47,7 @@ async def tasks_run(request: Request, payload: RunRequest):
 
     # Run tasks without blocking the process
     payload.headers = headers
-    return RunResponseItem.run_tasks(payload)
+    return await DbExecutor.run(RunResponseItem.run_tasks, payload)
 
 
 @router.post("/run/cancel")
@@ -55,9 +64,44 @@ async def tasks_cancel_all():
 
 @router.post("/run/status", response_model=List[TaskStatusResponseItem])
 async def tasks_status(payload: TaskStatusRequest):
-    return TaskStatusResponseItem.get_task_statuses(request=payload)
+    return await DbExecutor.run(TaskStatusResponseItem.get_task_statuses, payload)
+
+
+@router.post("/run/status/wait", response_model=List[TaskStatusUpdateItem])
+async def tasks_status_wait(payload: TaskStatusWaitRequest):
+    """Long-poll for status updates, returns as soon as any task differs from the revisions in the request."""
+    return await TaskStatusUpdateItem.wait_for_updates(request=payload)
+
+
+@router.get("/run/status/events")
+async def tasks_status_events(
+    task_run_ids: List[str] = Query(..., description="Task run ids"),
+    timeout_sec: float = Query(600.0, description="Close the stream after this time even if tasks are not finished"),
+):
+    """Server-Sent Events stream of status updates, closed when all tasks are finished."""
+    return StreamingResponse(
+        TaskStatusUpdateItem.stream_updates(task_run_ids, timeout_sec),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/run/batch_status", response_model=TaskBatchStatusResponse)
+async def tasks_batch_status(payload: TaskBatchStatusRequest):
+    return await DbExecutor.run(TaskBatchStatusResponse.get_batch_status, payload)
 
 
 @router.post("/run/result", response_model=List[TaskResultResponseItem])
 async def tasks_result(payload: TaskResultRequest):
-    return TaskResultResponseItem.get_task_results(request=payload)
+    return await DbExecutor.run(TaskResultResponseItem.get_task_results, payload)
+
+
+@router.get("/metrics", response_model=List[TaskMetricsResponseItem])
+async def tasks_metrics(
+    queue_id: str = Query(None, description="Include only the tasks of this queue if specified"),
+    limit: int = Query(1000, description="Number of most recent completed or failed tasks to aggregate"),
+):
+    """Percentiles of task run metrics per handler."""
+    return await DbExecutor.run(
+        TaskMetricsResponseItem.get_task_metrics, TaskMetricsRequest(queue_id=queue_id, limit=limit)
+    )
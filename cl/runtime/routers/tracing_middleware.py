@@ -0,0 +1,61 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+from cl.runtime.perf.request_tracer import RequestTrace
+from cl.runtime.perf.request_tracer import RequestTracer
+
+
+class TracingMiddleware:
+    """
+    Record spans for each HTTP request and report them without an external collector.
+
+    - Add Server-Timing header with spans completed before the response headers are sent.
+    - Add request duration to the per-route statistics returned by the /health/perf route.
+    - Append the trace to a file in OpenTelemetry JSON lines format if 'trace_path' is specified.
+    """
+
+    def __init__(self, app: ASGIApp, *, trace_path: str | None = None):
+        self.app = app
+        self.trace_path = trace_path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(method=scope["method"], path=scope["path"])
+
+        async def send_with_server_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", trace.get_server_timing())
+            await send(message)
+
+        try:
+            with trace:
+                await self.app(scope, receive, send_with_server_timing)
+        finally:
+            # Route is set in scope by the router after matching
+            trace.route = getattr(scope.get("route"), "path", None)
+            RequestTracer.record(trace)
+            if self.trace_path is not None:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, RequestTracer.write_trace, trace, self.trace_path)
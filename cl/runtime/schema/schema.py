@@ -28,6 +28,7 @@ from typing import Type
 from typing import cast
 from memoization import cached
 from typing_extensions import Self
+from cl.runtime.perf.startup_profiler import StartupProfiler
 from cl.runtime.primitive.case_util import CaseUtil
 from cl.runtime.primitive.string_util import StringUtil
 from cl.runtime.records.class_info import ClassInfo
@@ -98,47 +99,51 @@ class Schema:
         """
 
         if cls._type_dict_by_short_name is None:
-            # Load packages from Dynaconf
-            context_settings = ContextSettings.instance()
-            packages = context_settings.packages
-
-            # Get modules for the specified packages
-            modules = cls._get_modules(packages)
-
-            # Get record types by iterating over modules
-            record_types = set(
-                record_type
-                for module in modules
-                for name, record_type in inspect.getmembers(module, is_key_record_or_enum)
-            )
-
-            # Ensure names are unique
-            # TODO: Support namespace aliases to resolve conflicts
-            record_names = [record_type.__name__ for record_type in record_types]
-            record_paths = [f"{record_type.__module__}.{record_type.__name__}" for record_type in record_types]
-
-            # Check that there are no repeated names, report errors if there are
-            if len(set(record_names)) != len(record_names):
-                # Count the occurrences of each name in the list
-                record_name_counts = Counter(record_names)
-
-                # Find names that are repeated more than once
-                repeated_names = [record_name for record_name, count in record_name_counts.items() if count > 1]
-
-                # Report repeated names
-                package_names_str = ", ".join(packages)
-                repeated_names_str = ", ".join(repeated_names)
-                raise RuntimeError(
-                    f"The following class names in the list of packages {package_names_str} "
-                    f"are repeated more than once: {repeated_names_str}"
+            with StartupProfiler.phase("Schema: build type dict"):
+                # Load packages from Dynaconf
+                context_settings = ContextSettings.instance()
+                packages = context_settings.packages
+
+                # Get modules for the specified packages
+                modules = cls._get_modules(packages)
+
+                # Get record types by iterating over modules
+                record_types = set(
+                    record_type
+                    for module in modules
+                    for name, record_type in inspect.getmembers(module, is_key_record_or_enum)
                 )
 
-            # Create dictionary
-            result = dict(zip(record_names, record_types))
+                # Ensure names are unique
+                # TODO: Support namespace aliases to resolve conflicts
+                record_names = [record_type.__name__ for record_type in record_types]
+                record_paths = [f"{record_type.__module__}.{record_type.__name__}" for record_type in record_types]
+
+                # Check that there are no repeated names, report errors if there are
+                if len(set(record_names)) != len(record_names):
+                    # Count the occurrences of each name in the list
+                    record_name_counts = Counter(record_names)
+
+                    # Find names that are repeated more than once
+                    repeated_names = [record_name for record_name, count in record_name_counts.items() if count > 1]
+
+                    # Report repeated names
+                    package_names_str = ", ".join(packages)
+                    repeated_names_str = ", ".join(repeated_names)
+                    raise RuntimeError(
+                        f"The following class names in the list of packages {package_names_str} "
+                        f"are repeated more than once: {repeated_names_str}"
+                    )
+
+                # Create dictionary
+                result = dict(zip(record_names, record_types))
+
+                # Sort alphabetically by module_shortname.ClassName
+                # TODO: Support module_shortname
+                cls._type_dict_by_short_name = {key: result[key] for key in sorted(result)}
 
-            # Sort alphabetically by module_shortname.ClassName
-            # TODO: Support module_shortname
-            cls._type_dict_by_short_name = {key: result[key] for key in sorted(result)}
+                # Warm up class type cache so that deserialization of these types does not incur a cache miss
+                ClassInfo.warm_up(cls._type_dict_by_short_name.values())
 
         return cls._type_dict_by_short_name
 
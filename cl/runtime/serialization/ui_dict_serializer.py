@@ -15,6 +15,7 @@
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
+from typing import Iterable
 from typing import List
 from typing_extensions import Dict
 from cl.runtime.primitive.case_util import CaseUtil
@@ -97,14 +98,20 @@ class UiDictSerializer(DictSerializer):
         else:
             return super(UiDictSerializer, self).serialize_data(data, select_fields)
 
-    def serialize_record_for_table(self, record: RecordProtocol) -> Dict[str, Any]:
+    def serialize_record_for_table(
+        self, record: RecordProtocol, select_fields: Iterable[str] | None = None
+    ) -> Dict[str, Any]:
         """
         Serialize record to ui table format.
         Contains only fields of supported types, _key and _t will be added based on record.
+        If select_fields is specified, other fields are not serialized.
         """
 
         key_serializer = StringSerializer()
         all_slots = _get_class_hierarchy_slots(record.__class__)
+        if select_fields is not None:
+            select_fields = set(select_fields)
+            all_slots = [slot for slot in all_slots if slot in select_fields]
 
         # Get subset of slots which supported in table format
         table_slots = [
@@ -54,6 +54,15 @@ class ApiSettings(Settings):
     max_age: int | None = None
     """Maximum time in seconds for browsers to cache the CORS response."""
 
+    db_executor_max_workers: int = 32
+    """Maximum number of threads running database-bound route work outside the event loop."""
+
+    compression_min_size: int | None = 1024
+    """Minimum size in bytes of a complete response body to compress, compression is disabled if None."""
+
+    request_trace_path: str | None = None
+    """Append request traces to this file in OpenTelemetry JSON lines format, '{pid}' is replaced by process id."""
+
     def init(self) -> None:
         """Same as __init__ but can be used when field values are set both during and after construction."""
 
@@ -120,6 +129,19 @@ class ApiSettings(Settings):
         if self.max_age is not None and not isinstance(self.max_age, int):
             raise RuntimeError(f"{type(self).__name__} field 'max_age' must be an int or None.")
 
+        if not isinstance(self.db_executor_max_workers, int) or self.db_executor_max_workers < 1:
+            raise RuntimeError(f"{type(self).__name__} field 'db_executor_max_workers' must be a positive int.")
+
+        if self.compression_min_size is not None and (
+            not isinstance(self.compression_min_size, int) or self.compression_min_size < 0
+        ):
+            raise RuntimeError(
+                f"{type(self).__name__} field 'compression_min_size' must be a non-negative int or None."
+            )
+
+        if self.request_trace_path is not None and not isinstance(self.request_trace_path, str):
+            raise RuntimeError(f"{type(self).__name__} field 'request_trace_path' must be a string or None.")
+
     @classmethod
     def get_prefix(cls) -> str:
         return "runtime_api"
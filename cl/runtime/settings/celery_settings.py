@@ -0,0 +1,80 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+from cl.runtime.settings.settings import Settings
+
+
+@dataclass(slots=True, kw_only=True)
+class CelerySettings(Settings):
+    """
+    Celery worker and broker settings.
+
+    Notes:
+        - Use 'prefork' or 'threads' pool to run more than one handler at the same time
+        - Prefork pool is not supported on Windows, use 'threads' instead
+    """
+
+    pool: str = "solo"
+    """
+    Celery worker pool, the choices are:
+    - solo: One task at a time in the worker process (default)
+    - prefork: Between min_workers and max_workers child processes depending on load (autoscaling)
+    - threads: Up to max_workers threads in the worker process (Celery does not autoscale threads)
+    """
+
+    min_workers: int = 1
+    """Minimum number of child processes when using prefork pool."""
+
+    max_workers: int = 4
+    """Maximum number of child processes or threads when using prefork or threads pool."""
+
+    broker: str = "sqlite"
+    """
+    Local broker used by Celery, the choices are:
+    - sqlite: SQLite file in databases directory with busy timeout so that concurrent consumers wait for the lock
+    - filesystem: Directory of message files in databases directory with file locking for concurrent consumers
+    """
+
+    broker_timeout_sec: int = 30
+    """Time to wait for the broker lock held by another consumer before reporting an error (sqlite broker only)."""
+
+    warm_up: bool = True
+    """Load schema and open database connection in each worker before it receives the first task."""
+
+    def init(self) -> None:
+        """Same as __init__ but can be used when field values are set both during and after construction."""
+
+        # Validate choices
+        valid_pools = ["solo", "prefork", "threads"]
+        if self.pool not in valid_pools:
+            raise RuntimeError(f"Invalid Celery pool: {self.pool}, permitted values are: {', '.join(valid_pools)}.")
+        valid_brokers = ["sqlite", "filesystem"]
+        if self.broker not in valid_brokers:
+            raise RuntimeError(
+                f"Invalid Celery broker: {self.broker}, permitted values are: {', '.join(valid_brokers)}."
+            )
+
+        # Validate worker bounds
+        if not isinstance(self.min_workers, int) or not isinstance(self.max_workers, int):
+            raise RuntimeError(f"{type(self).__name__} fields 'min_workers' and 'max_workers' must be integers.")
+        if not 1 <= self.min_workers <= self.max_workers:
+            raise RuntimeError(
+                f"{type(self).__name__} fields must satisfy 1 <= min_workers <= max_workers, "
+                f"got min_workers={self.min_workers} and max_workers={self.max_workers}."
+            )
+
+    @classmethod
+    def get_prefix(cls) -> str:
+        return "runtime_celery"
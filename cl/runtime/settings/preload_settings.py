@@ -18,6 +18,7 @@ from typing import List
 from cl.runtime.configs.config import Config
 from cl.runtime.context.context import Context
 from cl.runtime.file.csv_file_reader import CsvFileReader
+from cl.runtime.perf.startup_profiler import StartupProfiler
 from cl.runtime.settings.settings import Settings
 
 
@@ -53,14 +54,16 @@ class PreloadSettings(Settings):
         context = Context.current()
 
         # Process CSV preloads
-        csv_files = self._get_files("csv")
-        [CsvFileReader(file_path=csv_file).read_and_save() for csv_file in csv_files]
+        with StartupProfiler.phase("PreloadSettings: save csv preloads"):
+            csv_files = self._get_files("csv")
+            [CsvFileReader(file_path=csv_file).read_and_save() for csv_file in csv_files]
 
         # TODO: Process YAML and JSON preloads
 
         # Execute run_config on all preloaded Config records
-        config_records = Context.current().load_all(Config)
-        tuple(config_record.run_configure() for config_record in config_records)
+        with StartupProfiler.phase("PreloadSettings: run configure"):
+            config_records = Context.current().load_all(Config)
+            tuple(config_record.run_configure() for config_record in config_records)
 
     def _get_files(self, ext: str) -> List[str]:
         # Return empty list if no dirs are specified in settings
@@ -13,95 +13,172 @@
 # limitations under the License.
 
 from __future__ import annotations
+import atexit
+import json
 import os
+import tempfile
+import threading
 from abc import ABC
 from abc import abstractmethod
 from dataclasses import MISSING
+from dataclasses import asdict
 from dataclasses import dataclass
+from typing import Any
 from typing import ClassVar
 from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Type
-from dotenv import find_dotenv
-from dotenv import load_dotenv
-from dynaconf import Dynaconf
 from typing_extensions import Self
 from cl.runtime.context.env_util import EnvUtil
+from cl.runtime.perf.startup_profiler import StartupProfiler
 from cl.runtime.primitive.timestamp import Timestamp
 from cl.runtime.records.record_util import RecordUtil
 from cl.runtime.settings.project_settings import SETTINGS_FILES_ENVVAR
 from cl.runtime.settings.project_settings import ProjectSettings
 
-# Load dotenv first (the priority order is envvars first, then dotenv, then settings.yaml and .secrets.yaml)
-load_dotenv()
+SETTINGS_SNAPSHOT_ENVVAR = "CL_SETTINGS_SNAPSHOT"
+"""Path to the settings snapshot written by the parent process, child processes load it instead of settings files."""
 
-_process_timestamp = Timestamp.create()
-"""Unique UUIDv7-based timestamp set during the Python process launch."""
+_SETTINGS_SNAPSHOT_VERSION = 1
+"""Incremented when the snapshot format changes, snapshots with a different version are ignored."""
 
-# True if we are inside a test, the result is cached in Settings for performance
-_is_inside_test = EnvUtil.is_inside_test()
 
-# Select Dynaconf test environment when invoked from the pytest or UnitTest test runner.
-# Other runners not detected automatically, in which case the Dynaconf environment must be
-# configured in settings explicitly.
-if _is_inside_test:
-    os.environ["CL_SETTINGS_ENV"] = "test"
+@dataclass(slots=True, kw_only=True)
+class SettingsSources:
+    """
+    Settings loaded from envvars, dotenv and Dynaconf files, or from a snapshot written by the parent process.
+
+    Notes:
+        - Loaded on the first call to 'Settings.instance()' rather than on import
+        - Fields are JSON serializable so that they can be saved to a snapshot file for child processes
+    """
+
+    user_settings: Dict[str, Any]
+    """
+    User settings with containers at all levels converted to dictionaries and lists and root level keys
+    converted to lowercase in case the settings are specified using envvars in uppercase format.
+    """
+
+    is_inside_test: bool
+    """True if the settings were loaded inside a test, in which case Dynaconf 'test' environment is selected."""
+
+    dynaconf_envvar_prefix: str
+    """Environment variable prefix for overriding dynaconf file settings."""
+
+    dynaconf_file_patterns: List[str]
+    """List of Dynaconf settings file patterns or file paths."""
+
+    dynaconf_loaded_files: List[str]
+    """Loaded dynaconf settings files."""
+
+    dynaconf_dir_path: str | None = None
+    """Absolute path the location of the first Dynaconf file if found, None otherwise."""
+
+    dotenv_file_path: str | None = None
+    """Absolute path to .env file if found, None otherwise."""
+
+
+_sources: SettingsSources | None = None
+"""Settings sources are loaded on first access."""
+
+_sources_lock = threading.Lock()
+"""Ensures settings sources are loaded only once when first accessed concurrently from several threads."""
+
+_snapshot_path: str | None = None
+"""Path to the snapshot file written by this process or None if not yet written."""
+
+_process_timestamp: str | None = None
+"""Unique UUIDv7-based timestamp created on first access."""
+
+
+def _load_sources_from_snapshot() -> SettingsSources | None:
+    """Load settings sources from the snapshot file specified by envvar, return None if not specified or not found."""
+
+    if not (snapshot_path := os.environ.get(SETTINGS_SNAPSHOT_ENVVAR)) or not os.path.exists(snapshot_path):
+        return None
+
+    with StartupProfiler.phase("Settings: load snapshot"):
+        with open(snapshot_path, "r") as snapshot_file:
+            snapshot_dict = json.load(snapshot_file)
+
+        # Ignore snapshot in a different format, the settings will be loaded from files instead
+        if snapshot_dict.pop("version", None) != _SETTINGS_SNAPSHOT_VERSION:
+            return None
+        return SettingsSources(**snapshot_dict)
 
-_all_settings = Dynaconf(
-    environments=True,
-    envvar_prefix="CL",
-    env_switcher="CL_SETTINGS_ENV",
-    envvar=SETTINGS_FILES_ENVVAR,
-    settings_files=[
-        # Specify the exact path to prevent uncertainty associated with searching in multiple directories
-        os.path.normpath(os.path.join(ProjectSettings.get_project_root(), "settings.yaml")),
-        os.path.normpath(os.path.join(ProjectSettings.get_project_root(), ".secrets.yaml")),
-    ],
-    dotenv_override=True,
-)
-"""
-Dynaconf settings in raw format (including system settings), some keys may be strings instead of dictionaries or lists.
-"""
 
-_user_settings = {k.lower(): v for k, v in _all_settings.as_dict().items()}
-"""
-Extract user settings only using as_dict(), then convert containers at all levels to dictionaries and lists
-and convert root level keys to lowercase in case the settings are specified using envvars in uppercase format
-"""
+def _load_sources_from_files() -> SettingsSources:
+    """Load settings sources from envvars, dotenv and Dynaconf settings files."""
 
-_dynaconf_envvar_prefix = _all_settings.envvar_prefix_for_dynaconf
-"""Environment variable prefix for overriding dynaconf file settings."""
+    with StartupProfiler.phase("Settings: load Dynaconf"):
+        # Import here rather than at the top of the module because importing these packages
+        # is a significant part of the time required to import 'cl.runtime'
+        from dotenv import find_dotenv
+        from dotenv import load_dotenv
+        from dynaconf import Dynaconf
 
-_dynaconf_file_patterns = _all_settings.settings_file
-"""List of Dynaconf settings file patterns or file paths."""
+        # Load dotenv first (the priority order is envvars first, then dotenv, then settings.yaml and .secrets.yaml)
+        load_dotenv()
 
-# Convert to list if a single string is specified
-if isinstance(_dynaconf_file_patterns, str):
-    _dynaconf_file_patterns = [_dynaconf_file_patterns]
+        # Select Dynaconf test environment when invoked from the pytest or UnitTest test runner.
+        # Other runners not detected automatically, in which case the Dynaconf environment must be
+        # configured in settings explicitly.
+        is_inside_test = EnvUtil.is_inside_test()
+        if is_inside_test:
+            os.environ["CL_SETTINGS_ENV"] = "test"
 
-_dynaconf_loaded_files = _all_settings._loaded_files  # noqa
-"""Loaded dynaconf settings files."""
+        # Dynaconf settings in raw format (including system settings), some keys may be strings
+        # instead of dictionaries or lists
+        all_settings = Dynaconf(
+            environments=True,
+            envvar_prefix="CL",
+            env_switcher="CL_SETTINGS_ENV",
+            envvar=SETTINGS_FILES_ENVVAR,
+            settings_files=[
+                # Specify the exact path to prevent uncertainty associated with searching in multiple directories
+                os.path.normpath(os.path.join(ProjectSettings.get_project_root(), "settings.yaml")),
+                os.path.normpath(os.path.join(ProjectSettings.get_project_root(), ".secrets.yaml")),
+            ],
+            dotenv_override=True,
+        )
 
-_dynaconf_dir_path = _all_settings._root_path  # noqa
-"""Absolute path the location of the first Dynaconf file if found, None otherwise."""
+        # Extract user settings only using as_dict(), then convert containers at all levels to dictionaries and lists
+        # and convert root level keys to lowercase in case the settings are specified using envvars in uppercase format
+        user_settings = {k.lower(): v for k, v in all_settings.as_dict().items()}
 
-_dotenv_file_path = find_dotenv_output if (find_dotenv_output := find_dotenv()) != "" else None
-"""Absolute path to .env file if found, None otherwise."""
+        # Convert to list if a single string is specified
+        dynaconf_file_patterns = all_settings.settings_file
+        if isinstance(dynaconf_file_patterns, str):
+            dynaconf_file_patterns = [dynaconf_file_patterns]
 
-_dotenv_dir_path = os.path.dirname(_dotenv_file_path) if _dotenv_file_path is not None else None
-"""Absolute path to .env directory if found, None otherwise."""
+        return SettingsSources(
+            user_settings=user_settings,
+            is_inside_test=is_inside_test,
+            dynaconf_envvar_prefix=all_settings.envvar_prefix_for_dynaconf,
+            dynaconf_file_patterns=list(dynaconf_file_patterns),
+            dynaconf_loaded_files=list(all_settings._loaded_files),  # noqa
+            dynaconf_dir_path=all_settings._root_path,  # noqa
+            dotenv_file_path=find_dotenv_output if (find_dotenv_output := find_dotenv()) != "" else None,
+        )
+
+
+def _delete_snapshot_on_exit(snapshot_path: str) -> None:
+    """Delete the snapshot file written by this process if it still exists."""
+    if os.path.exists(snapshot_path):
+        os.remove(snapshot_path)
 
 
 @dataclass(slots=True, kw_only=True)
 class Settings(ABC):
-    """Base class for a singleton settings object."""
-
-    process_timestamp: ClassVar[str] = _process_timestamp
-    """Unique UUIDv7-based timestamp set during the Python process launch."""
+    """
+    Base class for a singleton settings object.
 
-    is_inside_test: ClassVar[bool] = _is_inside_test
-    """True if we are inside a test."""
+    Notes:
+        - Settings files are not read on import, they are loaded on the first call to 'instance()'
+        - A process that starts child processes can call 'save_snapshot()' so that the children
+          load settings from the snapshot instead of parsing envvars, dotenv and Dynaconf files
+    """
 
     __settings_dict: ClassVar[Dict[Type, Settings]] = {}
     """Dictionary of initialized settings objects indexed by the the settings class type."""
@@ -147,16 +224,19 @@ class Settings(ABC):
                 if field_info.default is MISSING and field_info.default_factory is MISSING
             ]
 
+            # Load settings sources on first access
+            sources = cls.get_sources()
+
             # Filter user settings by 'prefix_' and create a new dictionary where prefix is removed from keys
             # This will include fields that are not specified in the settings class
             p = prefix + "_"
-            settings_dict = {k[len(p) :]: v for k, v in _user_settings.items() if k.startswith(p)}
+            settings_dict = {k[len(p) :]: v for k, v in sources.user_settings.items() if k.startswith(p)}
 
             # Check for missing required fields
             missing_fields = [k for k in required_fields if k not in settings_dict]
             if missing_fields:
                 # Combine the global Dynaconf envvar prefix with settings prefix in uppercase
-                envvar_prefix = f"{_dynaconf_envvar_prefix}_{prefix.upper()}"
+                envvar_prefix = f"{sources.dynaconf_envvar_prefix}_{prefix.upper()}"
                 dynaconf_msg = f"(in lowercase with prefix '{prefix}_')"
                 envvar_msg = f"(in uppercase with prefix '{envvar_prefix}_')"
 
@@ -164,18 +244,18 @@ class Settings(ABC):
                 sources_list = [f"Environment variables {envvar_msg}"]
 
                 # Dotenv file or message that it is not found
-                if (env_file := find_dotenv()) != "":
+                if (env_file := sources.dotenv_file_path) is not None:
                     env_file_name = env_file
                 else:
                     env_file_name = "No .env file in default search path"
                 sources_list.append(f"Dotenv file {envvar_msg}: {env_file_name}")
 
                 # Dynaconf file(s) or message that they are not found
-                if _dynaconf_loaded_files:
-                    dynaconf_file_list = _dynaconf_loaded_files
+                if sources.dynaconf_loaded_files:
+                    dynaconf_file_list = sources.dynaconf_loaded_files
                 else:
-                    _dynaconf_file_patterns_str = ", ".join(_dynaconf_file_patterns)
-                    dynaconf_file_list = [f"No {_dynaconf_file_patterns_str} file(s) in default search path"]
+                    dynaconf_file_patterns_str = ", ".join(sources.dynaconf_file_patterns)
+                    dynaconf_file_list = [f"No {dynaconf_file_patterns_str} file(s) in default search path"]
                 sources_list.extend(f"Dynaconf file {dynaconf_msg}: {x}" for x in dynaconf_file_list)
 
                 # Convert to string
@@ -206,19 +286,88 @@ class Settings(ABC):
 
         return result
 
+    @classmethod
+    def get_sources(cls) -> SettingsSources:
+        """Load settings sources on first call (from snapshot if specified by the parent process) and cache."""
+        global _sources
+        if _sources is None:
+            with _sources_lock:
+                if _sources is None:
+                    sources = _load_sources_from_snapshot()
+                    if sources is None:
+                        sources = _load_sources_from_files()
+                    elif sources.is_inside_test:
+                        # Make the settings environment selected by the parent visible to code that checks the envvar
+                        os.environ["CL_SETTINGS_ENV"] = "test"
+                    _sources = sources
+        return _sources
+
+    @classmethod
+    def get_process_timestamp(cls) -> str:
+        """Unique UUIDv7-based timestamp created on first access and reused for the lifetime of the process."""
+        global _process_timestamp
+        if _process_timestamp is None:
+            with _sources_lock:
+                if _process_timestamp is None:
+                    _process_timestamp = Timestamp.create()
+        return _process_timestamp
+
+    @classmethod
+    def get_is_inside_test(cls) -> bool:
+        """True if we are inside a test, determined when settings are loaded and cached for performance."""
+        return cls.get_sources().is_inside_test
+
+    @classmethod
+    def save_snapshot(cls) -> str | None:
+        """
+        Save settings loaded by this process to a snapshot file and set 'CL_SETTINGS_SNAPSHOT' envvar
+        so that child processes load the snapshot instead of parsing envvars, dotenv and Dynaconf files.
+
+        Notes:
+            - The file is created with owner-only permissions because settings may include secrets
+            - The file is deleted when this process exits, subsequent calls return the same path
+            - Returns None without writing the file if settings include values that are not JSON serializable
+
+        Returns:
+            Path to the snapshot file or None if the snapshot was not written
+        """
+        global _snapshot_path
+        if _snapshot_path is not None:
+            os.environ[SETTINGS_SNAPSHOT_ENVVAR] = _snapshot_path
+            return _snapshot_path
+
+        # Serialize before creating the file
+        snapshot_dict = {"version": _SETTINGS_SNAPSHOT_VERSION, **asdict(cls.get_sources())}
+        try:
+            snapshot_json = json.dumps(snapshot_dict)
+        except TypeError:
+            # Child processes will load settings from files
+            return None
+
+        # Use mkstemp which creates the file readable and writable only by the current user
+        snapshot_fd, snapshot_path = tempfile.mkstemp(prefix="cl_settings_", suffix=".json")
+        with os.fdopen(snapshot_fd, "w") as snapshot_file:
+            snapshot_file.write(snapshot_json)
+        atexit.register(_delete_snapshot_on_exit, snapshot_path)
+
+        os.environ[SETTINGS_SNAPSHOT_ENVVAR] = snapshot_path
+        _snapshot_path = snapshot_path
+        return snapshot_path
+
     @classmethod
     def get_project_root(cls) -> str:  # TODO: Merge with the version from ProjectSettings
         """
         Returns absolute path of the directory containing .env file, and if not present the directory
         containing the first Dynaconf settings file found. Error message if neither is found.
         """
-        if _dotenv_dir_path is not None:
+        sources = cls.get_sources()
+        if sources.dotenv_file_path is not None:
             # Use .env file location if found
-            return _dotenv_dir_path
-        elif _dynaconf_dir_path is not None:
+            return os.path.dirname(sources.dotenv_file_path)
+        elif sources.dynaconf_dir_path is not None:
             # Otherwise use the location of the first Dynaconf file found
             # TODO: Add a test to confirm the logic when several Dynaconf files are in different locations
-            return _dynaconf_dir_path
+            return sources.dynaconf_dir_path
         else:
             raise RuntimeError(
                 "Cannot get project root because neither .env file nor dynaconf settings file are found. "
@@ -14,71 +14,182 @@
 
 import multiprocessing
 import os
+import shutil
 from dataclasses import dataclass
+from typing import Any
+from typing import Dict
 from typing import Final
+from typing import Iterable
+from typing import List
+from typing import Tuple
 from uuid import UUID
 from celery import Celery
+from celery import Signature
+from celery import group
+from celery.signals import worker_init
+from celery.signals import worker_process_init
+from celery.signals import worker_ready
 from cl.runtime import Context
+from cl.runtime.db.db import Db
 from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.log.log_entry import LogEntry
 from cl.runtime.log.log_entry_level_enum import LogEntryLevelEnum
 from cl.runtime.log.user_log_entry import UserLogEntry
+from cl.runtime.perf.startup_profiler import StartupProfiler
 from cl.runtime.primitive.datetime_util import DatetimeUtil
 from cl.runtime.records.protocols import TDataDict
 from cl.runtime.records.protocols import is_key
 from cl.runtime.records.protocols import is_record
+from cl.runtime.schema.schema import Schema
 from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.settings.celery_settings import CelerySettings
 from cl.runtime.settings.context_settings import ContextSettings
 from cl.runtime.settings.project_settings import ProjectSettings
+from cl.runtime.settings.settings import Settings
 from cl.runtime.tasks.task import Task
 from cl.runtime.tasks.task_key import TaskKey
+from cl.runtime.tasks.task_priority_enum import TaskPriorityEnum
 from cl.runtime.tasks.task_queue import TaskQueue
 from cl.runtime.tasks.task_queue_key import TaskQueueKey
 from cl.runtime.tasks.task_status_enum import TaskStatusEnum
 
-CELERY_MAX_WORKERS = 4
-
 CELERY_RUN_COMMAND_QUEUE: Final[str] = "run_command"
 CELERY_MAX_RETRIES: Final[int] = 3
 CELERY_TIME_LIMIT: Final[int] = 3600 * 2  # TODO: 2 hours (configure)
 
+CELERY_PRIORITY_QUEUES: Final[Dict[TaskPriorityEnum, str]] = {
+    priority: f"{CELERY_RUN_COMMAND_QUEUE}.{priority.name.lower()}" for priority in TaskPriorityEnum
+}
+"""Celery queue for each task priority, workers consume from all of them so Low priority tasks do not block High."""
+
+CELERY_MAX_BATCH_SIZE: Final[int] = 100
+"""Maximum number of tasks submitted in one Celery message."""
+
+_task_serializer = DictSerializer()
+"""Serializer for task records inlined in Celery messages."""
+
 databases_dir = ProjectSettings.get_databases_dir()
 context_id = ContextSettings.instance().context_id
 
 # Get sqlite file name of celery broker based on database id in settings
 celery_file = os.path.join(databases_dir, f"{context_id}.celery.sqlite")
 
-celery_sqlite_uri = f"sqlalchemy+sqlite:///{celery_file}"
+# Get directory of filesystem celery broker based on database id in settings
+celery_dir = os.path.join(databases_dir, f"{context_id}.celery")
+
+
+def celery_get_broker(celery_settings: CelerySettings) -> Tuple[str, Dict[str, Any]]:
+    """Return broker URL and transport options for the local broker specified in settings."""
+    if celery_settings.broker == "filesystem":
+        # Producers and consumers use the same directory, messages are claimed by consumers using file locks
+        messages_dir = os.path.join(celery_dir, "messages")
+        control_dir = os.path.join(celery_dir, "control")
+        for dir_path in (messages_dir, control_dir):
+            os.makedirs(dir_path, exist_ok=True)
+        transport_options = {
+            "data_folder_in": messages_dir,
+            "data_folder_out": messages_dir,
+            "control_folder": control_dir,  # Default is relative to the current working directory
+        }
+        return "filesystem://", transport_options
+    else:
+        # Wait for the lock held by another consumer instead of failing with 'database is locked' error
+        transport_options = {"connect_args": {"timeout": celery_settings.broker_timeout_sec}}
+        return f"sqlalchemy+sqlite:///{celery_file}", transport_options
+
+
+def celery_get_worker_argv(celery_settings: CelerySettings) -> List[str]:
+    """Return command line arguments for the Celery worker using pool and worker bounds specified in settings."""
+    result = [
+        "-A",
+        "cl.runtime.tasks.celery.celery_queue",
+        "worker",
+        "--loglevel=info",
+        "--queues=" + ",".join(CELERY_PRIORITY_QUEUES.values()),  # Consume from queues for all priorities
+        f"--pool={celery_settings.pool}",
+    ]
+    if celery_settings.pool == "prefork":
+        # Start with min_workers child processes and add more up to max_workers depending on load
+        result.append(f"--autoscale={celery_settings.max_workers},{celery_settings.min_workers}")
+        result.append(f"--concurrency={celery_settings.max_workers}")
+    elif celery_settings.pool == "threads":
+        # Threads pool does not support autoscaling
+        result.append(f"--concurrency={celery_settings.max_workers}")
+    else:
+        # One concurrent task per worker
+        result.append("--concurrency=1")
+    return result
+
+
+celery_broker, celery_transport_options = celery_get_broker(CelerySettings.instance())
 
 celery_app = Celery(
     "worker",
-    broker=celery_sqlite_uri,
+    broker=celery_broker,
     broker_connection_retry_on_startup=True,
 )
 
+celery_app.conf.broker_transport_options = celery_transport_options
 celery_app.conf.task_track_started = True
 
-context_serializer = DictSerializer()
-"""Serializer for the context parameter of 'execute_task' method."""
-
 
 @celery_app.task(max_retries=0)  # Do not retry failed tasks
-def execute_task(
-    task_id: str,
+def execute_tasks(
+    compact_ref: str,
     context_data: TDataDict,
+    task_data_list: List[TDataDict],
 ) -> None:
-    """Invoke 'run_task' method of the specified task."""
+    """Invoke 'run_task' method of each task in the batch sequentially."""
+
+    # Deserialize context from 'context_data' parameter to run with the same settings as the caller context,
+    # the deserialized fields are cached by 'compact_ref' so that each worker deserializes the same context once
+    with Context.from_compact_dict(context_data, compact_ref=compact_ref) as context:
+
+        # Task data is inlined in the message, deserialize instead of loading from the database
+        tasks = [_task_serializer.deserialize_data(task_data) for task_data in task_data_list]
+
+        for task in tasks:
+            # Claim the task so that it does not run twice if the message is delivered more than once,
+            # this also skips the task if it was modified in the database after submission
+            expected_status = task.status
+            task.status = TaskStatusEnum.RUNNING
+            if not context.compare_and_save_one(task, {"status": expected_status}):
+                continue
+
+            # Run the task
+            task.run_task()
+
+
+def _get_signature(
+    compact_ref: str,
+    context_data: TDataDict,
+    tasks: List[Task],
+) -> Signature:
+    """Get 'execute_tasks' signature for a batch of tasks with the same priority using the queue for this priority."""
+
+    # Pass parameters to the Celery task signature
+    execute_tasks_signature = execute_tasks.s(
+        compact_ref,
+        context_data,
+        [_task_serializer.serialize_data(task) for task in tasks],
+    )
 
-    # Set is_deserialized flag in context data, will be used to skip some of the initialization code
-    context_data["is_deserialized"] = True
+    # Set options for submitting to Celery
+    priority = tasks[0].priority if tasks[0].priority is not None else TaskPriorityEnum.NORMAL
+    return execute_tasks_signature.set(
+        queue=CELERY_PRIORITY_QUEUES[priority],
+        retry=False,  # Do not retry in case the task fails
+        ignore_result=True,  # TODO: Do not publish to the Celery result backend
+    )
 
-    # Deserialize context from 'context_data' parameter to run with the same settings as the caller context
-    with context_serializer.deserialize_data(context_data) as context:
 
-        # Load and run the task
-        task_key = TaskKey(task_id=task_id)
-        task = context.load_one(Task, task_key)
-        task.run_task()
+def celery_get_batch_size(task_count: int, celery_settings: CelerySettings) -> int:
+    """
+    Return the number of tasks per message so that the tasks are spread across all workers,
+    subject to the limit of CELERY_MAX_BATCH_SIZE tasks per message.
+    """
+    worker_count = 1 if celery_settings.pool == "solo" else celery_settings.max_workers
+    return max(1, min(CELERY_MAX_BATCH_SIZE, -(-task_count // worker_count)))
 
 
 def celery_start_queue_callable(*, log_dir: str) -> None:
@@ -96,25 +207,40 @@ def celery_start_queue_callable(*, log_dir: str) -> None:
     #    os.dup2(log_file.fileno(), 1)  # Redirect stdout (file descriptor 1)
     #    os.dup2(log_file.fileno(), 2)  # Redirect stderr (file descriptor 2)
 
-    celery_app.worker_main(
-        argv=[
-            "-A",
-            "cl.runtime.tasks.celery.celery_queue",
-            "worker",
-            "--loglevel=info",
-            f"--autoscale={CELERY_MAX_WORKERS},1",
-            f"--pool=solo",  # One concurrent task per worker, do not switch to prefork (not supported on Windows)
-            f"--concurrency=1",  # Use only for prefork, one concurrent task per worker (similar to solo)
-        ],
-    )
+    # If startup profiling is enabled, record worker startup phase and write the profile when the worker is ready
+    if (startup_profiler := StartupProfiler.current()) is not None:
+        worker_startup_phase = StartupProfiler.phase("Celery: start worker")
+        worker_startup_phase.__enter__()
+
+        def on_worker_ready(**kwargs):
+            worker_startup_phase.__exit__(None, None, None)
+            startup_profiler.finish()
+
+        worker_ready.connect(on_worker_ready, weak=False)
+
+    # Load schema and open database connection in the worker process and in each child process (prefork pool)
+    if CelerySettings.instance().warm_up:
+        worker_init.connect(_warm_up_worker, weak=False)
+        worker_process_init.connect(_warm_up_worker, weak=False)
+
+    celery_app.worker_main(argv=celery_get_worker_argv(CelerySettings.instance()))
+
+
+def _warm_up_worker(**kwargs) -> None:
+    """Load schema and open database connection before the worker receives its first task."""
+    with StartupProfiler.phase("Celery: warm up worker"):
+        Schema.get_type_dict()
+        Db.default().open_connection()
 
 
 def celery_delete_existing_tasks() -> None:
     """Delete the existing Celery tasks (will exit when the current process exits)."""
 
-    # Remove sqlite file of celery broker if exists
+    # Remove sqlite file and directory of celery broker if exist
     if os.path.exists(celery_file):
         os.remove(celery_file)
+    if os.path.exists(celery_dir):
+        shutil.rmtree(celery_dir)
 
 
 def celery_start_queue(*, log_dir: str) -> None:
@@ -124,6 +250,9 @@ def celery_start_queue(*, log_dir: str) -> None:
     Args:
         log_dir: Directory where Celery console log file will be written
     """
+    # Worker processes will load settings from snapshot instead of parsing settings files
+    Settings.save_snapshot()
+
     worker_process = multiprocessing.Process(
         target=celery_start_queue_callable, daemon=True, kwargs={"log_dir": log_dir}
     )
@@ -132,10 +261,14 @@ def celery_start_queue(*, log_dir: str) -> None:
 
 @dataclass(slots=True, kw_only=True)
 class CeleryQueue(TaskQueue):
-    """Execute tasks using Celery."""
+    """
+    Execute tasks using Celery.
 
-    # max_workers: int = missing()  # TODO: Implement support for max_workers
-    """The maximum number of processes running concurrently."""
+    Notes:
+        - Each priority has its own Celery queue and workers consume from all of them, so that Low priority
+          tasks do not block High priority tasks, 'priority_weights' and 'max_running_per_user' are not
+          supported because Celery workers take messages from the broker without a shared scheduler
+    """
 
     # TODO: @abstractmethod
     def run_start_queue(self) -> None:
@@ -146,18 +279,55 @@ class CeleryQueue(TaskQueue):
         """Cancel all active runs and stop queue workers."""
 
     def submit_task(self, task: TaskKey):
-        # Get and serialize current context
+        self.submit_tasks([task])
+
+    def submit_tasks(self, tasks: Iterable[TaskKey]) -> None:
+        """
+        Submit tasks in batches, each message includes a reference to the context serialized once per call
+        and the task records so that workers do not load them from the database.
+        """
+
+        # Weighted scheduling and per-user limits require a shared scheduler, see 'ProcessQueue'
+        if self.priority_weights is not None or self.max_running_per_user is not None:
+            raise RuntimeError(
+                f"Fields 'priority_weights' and 'max_running_per_user' are not supported by {type(self).__name__}, "
+                "use per-priority queues or ProcessQueue instead."
+            )
+
+        # Get and serialize current context in compact form once for all tasks
         context = Context.current()
-        context_data = context_serializer.serialize_data(context)
-
-        # Pass parameters to the Celery task signature
-        execute_task_signature = execute_task.s(
-            task.task_id,
-            context_data,
-        )
-
-        # Submit task to Celery with completed and error links
-        execute_task_signature.apply_async(
-            retry=False,  # Do not retry in case the task fails
-            ignore_result=True,  # TODO: Do not publish to the Celery result backend
-        )
+        context_data = context.to_compact_dict()
+        compact_ref = Context.get_compact_ref(context_data)
+
+        # Load the tasks to get their priority, records are returned without lookup
+        task_keys = list(tasks)
+        tasks = list(context.load_many(Task, task_keys))
+        if missing_keys := [key for key, task in zip(task_keys, tasks) if task is None]:
+            raise RuntimeError(
+                f"Tasks must be saved before they are submitted to {type(self).__name__}, "
+                f"the following tasks are not found: {', '.join(str(key) for key in missing_keys)}."
+            )
+
+        # Each priority has its own Celery queue
+        tasks_per_priority = {}
+        for task in tasks:
+            priority = task.priority if task.priority is not None else TaskPriorityEnum.NORMAL
+            tasks_per_priority.setdefault(priority, []).append(task)
+
+        # Split into batches so that the tasks are spread across workers
+        celery_settings = CelerySettings.instance()
+        signatures = []
+        for priority_tasks in tasks_per_priority.values():
+            batch_size = celery_get_batch_size(len(priority_tasks), celery_settings)
+            for batch_start in range(0, len(priority_tasks), batch_size):
+                signatures.append(
+                    _get_signature(
+                        compact_ref,
+                        context_data,
+                        priority_tasks[batch_start : batch_start + batch_size],
+                    )
+                )
+
+        # Publish all batches as a group using one broker connection
+        if signatures:
+            group(signatures).apply_async()
@@ -33,6 +33,9 @@ class FunctionTask(CallableTask):
     function_name: str = missing()
     """Function name in snake_case or PascalCase format."""
 
+    def get_handler_name(self) -> str:
+        return f"{self.module}.{self.normalize_method_name(self.function_name)}"
+
     def _execute(self) -> None:
         """Invoke the specified function."""
         raise NotImplementedError()
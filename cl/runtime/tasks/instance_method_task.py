@@ -46,15 +46,16 @@ class InstanceMethodTask(CallableTask):
     method_name: str = missing()
     """The name of instance method in snake_case or PascalCase format, do not use for @classmethod or @staticmethod."""
 
+    def get_handler_name(self) -> str:
+        key_type_name = self.key_type_str.rsplit(".", 1)[-1]
+        return f"{key_type_name}.{self.normalize_method_name(self.method_name)}"
+
     def _execute(self) -> None:
         """Invoke the specified instance method."""
 
         # Get current context
         context = Context.current()
 
-        # Save self to ensure the worker process loads the same record
-        context.save_one(self)
-
         key_type = ClassInfo.get_class_type(self.key_type_str)
         key = key_serializer.deserialize_key(self.key_str, key_type)
 
@@ -12,65 +12,201 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextvars
 import datetime as dt
-import time
+import multiprocessing
+import threading
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Set
 from cl.runtime import Context
 from cl.runtime.primitive.datetime_util import DatetimeUtil
+from cl.runtime.records.protocols import TDataDict
+from cl.runtime.settings.settings import Settings
 from cl.runtime.tasks.task import Task
+from cl.runtime.tasks.task_key import TaskKey
+from cl.runtime.tasks.task_notifier import TaskNotifier
+from cl.runtime.tasks.task_priority_enum import TaskPriorityEnum
 from cl.runtime.tasks.task_queue import TaskQueue
+from cl.runtime.tasks.task_scheduler import TaskScheduler
 from cl.runtime.tasks.task_status_enum import TaskStatusEnum
 
+CANDIDATES_PER_WORKER = 8
+"""Number of queued tasks loaded for each priority per free worker, to choose from when per-user limits apply."""
+
+_stop_event_dict: Dict[str, threading.Event] = {}
+"""Events used to request the queue with queue_id key to stop, stored outside the class to avoid serialization."""
+
+
+def _run_task_in_process(task_id: str, context_data: TDataDict) -> None:
+    """Load and run the task inside a worker process using the context passed from the queue process."""
+    with Context.from_compact_dict(context_data) as context:
+        task = context.load_one(Task, TaskKey(task_id=task_id))
+        task.run_task()
+
 
 @dataclass(slots=True, kw_only=True)
 class ProcessQueue(TaskQueue):
-    """Execute tasks sequentially within the queue process."""
+    """Execute tasks within the queue process, sequentially or using a pool of worker threads or processes."""
+
+    max_workers: int | None = None
+    """Maximum number of tasks running in parallel, tasks run sequentially in the queue process if not set."""
+
+    use_processes: bool | None = None
+    """Use a pool of worker processes if True and a pool of worker threads otherwise (only when max_workers is set)."""
 
     def init(self) -> None:
         # Set default queue timeout with no tasks to 10 min
         if self.timeout_sec is None:
             self.timeout_sec = 10
 
+        # Validate the number of workers
+        if self.max_workers is not None and self.max_workers < 1:
+            raise RuntimeError(f"Field 'max_workers' of {type(self).__name__} must be positive if specified.")
+
     def run_start_queue(self) -> None:
         context = Context.current()
-        queue_id = self.queue_id
+
+        # Event that will be set by run_stop_queue
+        stop_event = _stop_event_dict.setdefault(self.queue_id, threading.Event())
+        stop_event.clear()
 
         # Set timeout
         timeout_delta = dt.timedelta(seconds=self.timeout_sec) if self.timeout_sec is not None else None
         timeout_at = DatetimeUtil.now() + timeout_delta if timeout_delta is not None else None
 
-        # Set the counter of while loop cycles with no tasks
-        no_task_cycles = 0
-        while True:
-            # Get pending tasks
-            # TODO: Use DB queries with filter by queue field
-            all_tasks = context.load_all(Task)
-            awaiting_tasks = [
-                task for task in all_tasks if task.queue.queue_id == queue_id and task.status == TaskStatusEnum.AWAITING
-            ]
-            pending_tasks = [
-                task for task in all_tasks if task.queue.queue_id == queue_id and task.status == TaskStatusEnum.PENDING
-            ]
-
-            # Awaiting tasks have priority over pending tasks
-            queued_tasks = awaiting_tasks + pending_tasks
-
-            if queued_tasks:
-                # Run found tasks sequentially
-                for task in queued_tasks:
-                    task.run_task()
-                # Reset timeout and no task cycles counter
-                timeout_at = DatetimeUtil.now() + timeout_delta if timeout_delta is not None else None
-                no_task_cycles = 0
-            else:
-                if timeout_at is not None and DatetimeUtil.now() > timeout_at:
-                    break
+        # Create worker pool if max_workers is set, otherwise run tasks sequentially in the polling loop
+        executor = self._create_executor()
+        context_data = context.to_compact_dict() if self.use_processes else None
+        running_futures: Set[Future] = set()
+        try:
+            # Set the counter of while loop cycles with no tasks
+            no_task_cycles = 0
+            while not stop_event.is_set():
+                # Get notification version before loading tasks so that a submission after loading is not missed
+                version = TaskNotifier.get_version()
+
+                # Remove completed tasks, exceptions are not expected because run_task handles them
+                running_futures = {future for future in running_futures if not future.done()}
+
+                # Claim up to the number of free workers, tasks claimed by other queue instances are skipped
+                claimed_count = 0
+                free_workers = self.max_workers - len(running_futures) if executor is not None else None
+                if free_workers != 0:
+                    for task in self._get_queued_tasks(free_workers):
+                        if stop_event.is_set():
+                            break
+                        if not self._claim_task(task):
+                            continue
+                        claimed_count = claimed_count + 1
+                        if executor is None:
+                            task.run_task()
+                        else:
+                            if context_data is not None:
+                                future = executor.submit(_run_task_in_process, task.task_id, context_data)
+                            else:
+                                # Run in a copy of contextvars.Context so the worker thread has the same current context
+                                future = executor.submit(contextvars.copy_context().run, task.run_task)
+                            # Wake up this queue and waiters in this process when a worker becomes free
+                            future.add_done_callback(lambda _: TaskNotifier.notify())
+                            running_futures.add(future)
+
+                if claimed_count > 0 or running_futures:
+                    # Reset timeout and no task cycles counter
+                    timeout_at = DatetimeUtil.now() + timeout_delta if timeout_delta is not None else None
+                    no_task_cycles = 0
                 else:
-                    no_task_cycles = no_task_cycles + 1
+                    if timeout_at is not None and DatetimeUtil.now() > timeout_at:
+                        break
+                    else:
+                        no_task_cycles = no_task_cycles + 1
 
-            # Pause for 1 sec more for each no_task_cycle up to 10 sec
-            sleep_sec = min(round(pow(2, no_task_cycles)), 8)
-            time.sleep(sleep_sec)
+                # Wake up immediately on task submission or status change in this or another process, worker
+                # becoming free, or stop request, otherwise check for tasks saved without notification
+                # after 1 sec more for each no_task_cycle up to 8 sec
+                sleep_sec = min(round(pow(2, no_task_cycles)), 8)
+                TaskNotifier.wait(version, sleep_sec)
+        finally:
+            # Drain gracefully by waiting for the tasks already claimed by this queue to complete
+            if executor is not None:
+                executor.shutdown(wait=True)
 
     def run_stop_queue(self) -> None:
-        raise NotImplementedError()
+        """Stop claiming new tasks and exit after completing running tasks (queue must run in the same process)."""
+        _stop_event_dict.setdefault(self.queue_id, threading.Event()).set()
+        TaskNotifier.notify()
+
+    def submit_task(self, task: TaskKey) -> None:
+        """Notify the queue that a saved task has been submitted so it is dispatched without waiting for next poll."""
+        TaskNotifier.notify()
+
+    def submit_tasks(self, tasks: Iterable[TaskKey]) -> None:
+        """Notify the queue once for all saved tasks, they are dispatched in batches by the queue loop."""
+        TaskNotifier.notify()
+
+    def _get_queued_tasks(self, limit: int | None) -> List[Task]:
+        """
+        Get up to 'limit' tasks to dispatch, awaiting tasks first followed by pending tasks selected
+        using weighted fair scheduling across priorities and per-user limits, see 'TaskScheduler'.
+        """
+
+        # Use indexed queries by queue, status and priority, tasks are sorted by time-ordered task_id
+        context = Context.current()
+        queue_key = self.get_key()
+        candidate_limit = limit * CANDIDATES_PER_WORKER if limit is not None else None
+
+        # Awaiting tasks have priority over pending tasks
+        awaiting_query = (Task, {"queue": queue_key, "status": TaskStatusEnum.AWAITING}, {})
+        result = list(context.load_query(awaiting_query, limit=limit))
+        if limit is not None and len(result) >= limit:
+            return result
+
+        # Get pending tasks for each priority, tasks without priority have Normal priority
+        candidates = {}
+        for priority in TaskPriorityEnum:
+            priority_condition = priority if priority != TaskPriorityEnum.NORMAL else {"$in": [priority, None]}
+            pending_query = (
+                Task,
+                {"queue": queue_key, "status": TaskStatusEnum.PENDING, "priority": priority_condition},
+                {},
+            )
+            candidates[priority] = list(context.load_query(pending_query, limit=candidate_limit))
+
+        # Select pending tasks using weighted fair scheduling
+        running_per_user = self.get_running_per_user() if self.max_running_per_user is not None else {}
+        scheduler = TaskScheduler.for_queue(
+            self.queue_id,
+            priority_weights=self.priority_weights,
+            max_running_per_user=self.max_running_per_user,
+        )
+        result.extend(
+            scheduler.select(candidates, running_per_user, limit - len(result) if limit is not None else None)
+        )
+        return result
+
+    @classmethod
+    def _claim_task(cls, task: Task) -> bool:
+        """Set task status to Running if not changed since the task was loaded, return False if claimed by another."""
+        expected_status = task.status
+        task.status = TaskStatusEnum.RUNNING
+        return Context.current().compare_and_save_one(task, {"status": expected_status})
+
+    def _create_executor(self) -> Executor | None:
+        """Create the worker pool or return None if tasks run sequentially."""
+        if self.max_workers is None:
+            return None
+        elif self.use_processes:
+            # Pass settings to worker processes without reloading them from files
+            Settings.save_snapshot()
+
+            # Spawn rather than fork to avoid sharing database connections with the worker processes
+            mp_context = multiprocessing.get_context("spawn")
+            return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp_context)
+        else:
+            return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.queue_id}.worker")
@@ -36,6 +36,10 @@ class StaticMethodTask(CallableTask):
     method_name: str = missing()
     """The name of @staticmethod in snake_case or PascalCase format."""
 
+    def get_handler_name(self) -> str:
+        type_name = self.type_str.rsplit(".", 1)[-1]
+        return f"{type_name}.{self.normalize_method_name(self.method_name)}"
+
     def _execute(self) -> None:
         """Invoke the specified @staticmethod or @classmethod."""
 
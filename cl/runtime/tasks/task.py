@@ -17,18 +17,32 @@ import time
 from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
+from typing import Dict
+from typing import List
+from typing import Tuple
+from cl.runtime.backend.core.user_key import UserKey
 from cl.runtime.context.context import Context
 from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.log.log_entry import LogEntry
 from cl.runtime.log.log_entry_level_enum import LogEntryLevelEnum
 from cl.runtime.log.user_log_entry import UserLogEntry
+from cl.runtime.perf.usage_counters import UsageCounters
 from cl.runtime.primitive.datetime_util import DatetimeUtil
 from cl.runtime.primitive.timestamp import Timestamp
 from cl.runtime.records.dataclasses_extensions import missing
 from cl.runtime.records.record_mixin import RecordMixin
 from cl.runtime.tasks.task_key import TaskKey
+from cl.runtime.tasks.task_notifier import TaskNotifier
+from cl.runtime.tasks.task_priority_enum import TaskPriorityEnum
 from cl.runtime.tasks.task_queue_key import TaskQueueKey
 from cl.runtime.tasks.task_status_enum import TaskStatusEnum
+from cl.runtime.tasks.task_subscriptions import TaskSubscriptions
+
+PROGRESS_SAVE_INTERVAL_SEC = 5.0
+"""Minimum interval between saves by 'report_progress', progress is published to subscribers on every call."""
+
+_progress_saved_at: Dict[str, float] = {}
+"""Monotonic time of the last save by 'report_progress' for each running task."""
 
 
 @dataclass(slots=True, kw_only=True)
@@ -42,6 +56,8 @@ class Task(TaskKey, RecordMixin[TaskKey], ABC):
           and must be able to acquire the resources required by its 'run_task' method in all of these cases
         - The queue updates 'status' field of the task as it progresses from its initial Pending state through
           the Running and optionally Paused state and ending in one of Completed, Failed, or Cancelled states
+        - A task waiting for its child tasks should not block the queue worker, '_execute' may instead save
+          Blocked status and return, the task is resumed with Awaiting status from 'on_child_task_finished'
     """
 
     label: str | None = None  # TODO: Make required
@@ -56,8 +72,38 @@ class Task(TaskKey, RecordMixin[TaskKey], ABC):
     progress_pct: float = missing()
     """Task progress in percent from 0 to 100."""
 
+    priority: TaskPriorityEnum | None = None
+    """Tasks with higher priority receive a larger share of queue workers, Normal priority is used if not set."""
+
+    user: UserKey | None = None
+    """User who submitted the task, used to limit the number of running tasks per user if set."""
+
+    parent: TaskKey | None = None
+    """Parent task which is completed only after all of its child tasks are completed (e.g. workflow phase)."""
+
+    batch_id: str | None = None
+    """Identifier shared by tasks submitted together, used to get their aggregate status."""
+
+    queue_wait_sec: float | None = None
+    """Time in seconds from task creation to the start of its most recent run."""
+
     elapsed_sec: float | None = None
-    """Elapsed time in seconds if available."""
+    """Wall-clock time in seconds of the most recent run."""
+
+    cpu_sec: float | None = None
+    """CPU time in seconds of the most recent run measured for the thread where the task runs."""
+
+    peak_rss_mb: float | None = None
+    """Peak resident memory in MB of the worker process at the end of the run (not specific to the task)."""
+
+    db_calls: int | None = None
+    """Number of database calls during the most recent run."""
+
+    db_bytes: int | None = None
+    """Approximate size in bytes of data sent to or received from the database during the most recent run."""
+
+    llm_tokens: int | None = None
+    """Number of LLM tokens during the most recent run, excluding responses from the completion cache."""
 
     remaining_sec: float | None = None
     """Remaining time in seconds if available."""
@@ -68,6 +114,24 @@ class Task(TaskKey, RecordMixin[TaskKey], ABC):
     def get_key(self) -> TaskKey:
         return TaskKey(task_id=self.task_id)
 
+    def get_handler_name(self) -> str:
+        """Name of the code invoked by the task used to aggregate run metrics, override to include method name."""
+        return type(self).__name__
+
+    @classmethod
+    def get_query_indexes(cls) -> List[Tuple[str, ...]]:
+        """
+        Fields of the database indexes for the queries run by task queues, workflows and task routes,
+        databases create only these indexes and not indexes for arbitrary queries.
+        """
+        return [
+            ("queue", "status", "task_id"),  # Awaiting and running tasks, compaction, metrics for the queue
+            ("queue", "status", "priority", "task_id"),  # Pending tasks for each priority
+            ("status", "task_id"),  # Metrics for all queues
+            ("batch_id",),  # Batch status
+            ("parent",),  # Workflow phases and their tasks
+        ]
+
     def init(self) -> None:
         # Set or validate task_id
         if self.task_id is None:
@@ -88,18 +152,22 @@ class Task(TaskKey, RecordMixin[TaskKey], ABC):
         """Run payload without updating status or handling exceptions (protected, callers should invoke 'run_task')."""
 
     def run_task(self) -> None:
-        """Invoke execute with task status updates and exception handling."""
+        """Invoke execute with task status updates, exception handling and recording of the run metrics."""
         # Record the start time
         start_time = DatetimeUtil.now()
 
         context = Context.current()
+        usage_counters = UsageCounters()
+        start_cpu_time = time.thread_time()
         try:
             # Set status to Running and save
             self.status = TaskStatusEnum.RUNNING
             context.save_one(self)
+            TaskSubscriptions.publish(self)
 
-            # Run the payload
-            self._execute()
+            # Run the payload counting database calls and LLM tokens
+            with usage_counters:
+                self._execute()
 
         except Exception as e:  # noqa
 
@@ -127,34 +195,93 @@ class Task(TaskKey, RecordMixin[TaskKey], ABC):
             # Update task run record to report task failure
             self.status = TaskStatusEnum.FAILED
             self.progress_pct = 100.0
-            self.elapsed_sec = 0.0  # TODO: Implement
+            self._set_run_metrics(start_time, end_time, start_cpu_time, usage_counters)
             self.remaining_sec = 0.0
             self.error_message = str(e)
             context.save_one(self)
+            TaskSubscriptions.publish(self)
         else:
+            if self.status != TaskStatusEnum.RUNNING:
+                # The task was suspended by '_execute' until its child tasks are finished and has already saved
+                # its status, it will run again when resumed
+                TaskSubscriptions.publish(self)
+                return
+
             # Record the end time
             end_time = DatetimeUtil.now()
 
             # Update task run record to report task completion
             self.status = TaskStatusEnum.COMPLETED
             self.progress_pct = 100.0
-            self.elapsed_sec = 0.0  # TODO: Implement
+            self._set_run_metrics(start_time, end_time, start_cpu_time, usage_counters)
             self.remaining_sec = 0.0
             context.save_one(self)
+            TaskSubscriptions.publish(self)
+        finally:
+            _progress_saved_at.pop(self.task_id, None)
+
+        # Let the parent task resume if it is suspended until its child tasks are finished
+        if self.parent is not None:
+            if (parent_task := context.load_one(Task, self.parent, is_record_optional=True)) is not None:
+                parent_task.on_child_task_finished()
+
+    def on_child_task_finished(self) -> None:
+        """Invoked after a child task of this task is completed or failed, override to resume a suspended task."""
+
+    def report_progress(self, progress_pct: float, *, remaining_sec: float | None = None) -> None:
+        """
+        Publish progress of the running task to subscribers in this process and save it at most once per
+        PROGRESS_SAVE_INTERVAL_SEC so that the progress is also visible to other processes.
+
+        Args:
+            progress_pct: Task progress in percent from 0 to 100
+            remaining_sec: Optional estimate of the remaining time in seconds
+        """
+        self.progress_pct = progress_pct
+        self.remaining_sec = remaining_sec
+        TaskSubscriptions.publish(self)
+
+        now = time.monotonic()
+        if now - _progress_saved_at.get(self.task_id, 0.0) >= PROGRESS_SAVE_INTERVAL_SEC:
+            _progress_saved_at[self.task_id] = now
+            Context.current().save_one(self)
+
+    def _set_run_metrics(
+        self,
+        start_time: dt.datetime,
+        end_time: dt.datetime,
+        start_cpu_time: float,
+        usage_counters: UsageCounters,
+    ) -> None:
+        """Set elapsed time and resource usage fields at the end of the run."""
+        if self.task_id is not None:
+            # Task_id is time-ordered and is generated when the task is created
+            self.queue_wait_sec = max((start_time - Timestamp.to_datetime(self.task_id)).total_seconds(), 0.0)
+        self.elapsed_sec = (end_time - start_time).total_seconds()
+        self.cpu_sec = time.thread_time() - start_cpu_time
+        self.peak_rss_mb = UsageCounters.get_peak_rss_mb()
+        self.db_calls = usage_counters.db_calls
+        self.db_bytes = usage_counters.db_bytes
+        self.llm_tokens = usage_counters.llm_tokens
 
     @classmethod
     def wait_for_completion(cls, task_key: TaskKey, timeout_sec: int = 10) -> None:  # TODO: Rename or move
         """Wait for completion of the specified task run before exiting from this method (not async/await)."""
 
         context = Context.current()
-        start_datetime = DatetimeUtil.now()
-        while DatetimeUtil.now() < start_datetime + dt.timedelta(seconds=timeout_sec):
+        timeout_at = DatetimeUtil.now() + dt.timedelta(seconds=timeout_sec)
+        while True:
+            # Get notification version before loading the task so that a status change after loading is not missed
+            version = TaskNotifier.get_version()
             task = context.load_one(Task, task_key)
             if task.status == TaskStatusEnum.COMPLETED:
                 # Test success, task has been completed
                 return
-            # TODO: Refactor to use queue-specific push communication rather than heartbeat
-            time.sleep(1)  # Sleep for 1 second to reduce CPU load
+            remaining_sec = (timeout_at - DatetimeUtil.now()).total_seconds()
+            if remaining_sec <= 0:
+                break
+            # Wake up immediately on status change in this or another process, check every 1 sec for other changes
+            TaskNotifier.wait(version, min(remaining_sec, 1.0))
 
         # Test failure
         raise RuntimeError(f"Task has not been completed after {timeout_sec} sec.")
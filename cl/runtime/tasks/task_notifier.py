@@ -0,0 +1,206 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import atexit
+import os
+import socket
+import threading
+import time
+from typing import List
+from typing import Tuple
+from cl.runtime.settings.context_settings import ContextSettings
+from cl.runtime.settings.project_settings import ProjectSettings
+
+TASK_NOTIFIER_HOST = "127.0.0.1"
+"""Processes on the same host exchange notifications using UDP datagrams sent to this address."""
+
+TASK_NOTIFIER_LISTENERS_REFRESH_SEC = 1.0
+"""Interval at which 'notify' reloads the list of processes listening for notifications."""
+
+TASK_NOTIFIER_HEARTBEAT_SEC = 10.0
+"""Interval at which a listening process updates the modification time of its listener file."""
+
+TASK_NOTIFIER_STALE_SEC = 60.0
+"""Listener files not updated for this number of seconds are removed, e.g. after the process has crashed."""
+
+_MESSAGE = b"cl.runtime.tasks.task_notifier"
+"""Datagram sent to other processes, datagrams with other content are ignored."""
+
+_condition = threading.Condition()
+"""Condition notified on task submission or status change."""
+
+_version: int = 0
+"""Incremented on each notification, waiters compare it to the value obtained before checking task status."""
+
+_listener_lock = threading.Lock()
+"""Protects the start of the listener."""
+
+_listener: Tuple[int, int] | None = None
+"""Process id and port of the listener started in this process, ignored in a process forked after it was started."""
+
+_send_socket: socket.socket | None = None
+"""Socket used to send notifications to other processes."""
+
+_listener_ports: Tuple[float, List[int]] = (0.0, [])
+"""Time of the last reload and ports of listening processes other than the current process."""
+
+
+def _get_listeners_dir() -> str:
+    """Directory with one file per listening process, shared by processes using the same settings."""
+    context_id = ContextSettings.instance().context_id
+    dir_name = f"{context_id}.task_notifier" if context_id is not None else "task_notifier"
+    return os.path.join(ProjectSettings.get_databases_dir(), dir_name)
+
+
+def _remove_listener_file(file_path: str) -> None:
+    """Remove the listener file on exit, ignore errors if it has already been removed."""
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+
+class TaskNotifier:
+    """
+    Wakes up queues and waiters immediately on task submission or status change in this or another process.
+
+    Notes:
+        - Get version before loading tasks, then wait for a version change so notifications are not missed
+        - A process starts listening for notifications from other processes on the same host on first 'wait',
+          'notify' sends a UDP datagram to each listening process found in a directory under 'databases'
+        - Changes made on other hosts or without 'notify' are not notified, waiters should pass a timeout
+          to poll for them
+    """
+
+    @classmethod
+    def get_version(cls) -> int:
+        """Return the current notification version, pass it to 'wait' to wait for subsequent notifications."""
+        return _version
+
+    @classmethod
+    def notify(cls) -> None:
+        """Notify all waiters in this and other processes that a task has been submitted or its status has changed."""
+        cls._notify_local()
+
+        global _send_socket
+        for port in cls._get_listener_ports():
+            try:
+                if _send_socket is None:
+                    _send_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                _send_socket.sendto(_MESSAGE, (TASK_NOTIFIER_HOST, port))
+            except OSError:
+                # The listener has exited, its file will be removed when it becomes stale
+                pass
+
+    @classmethod
+    def wait(cls, version: int, timeout_sec: float | None = None) -> bool:
+        """
+        Wait until notified after 'version' was obtained or until timeout, return True if notified.
+
+        Args:
+            version: Value returned by 'get_version' before the caller checked task status
+            timeout_sec: Optional timeout in seconds, wait indefinitely if not specified
+        """
+        cls.listen()
+        with _condition:
+            return _condition.wait_for(lambda: _version != version, timeout=timeout_sec)
+
+    @classmethod
+    def listen(cls) -> None:
+        """Start receiving notifications from other processes if not started yet, called by 'wait'."""
+        global _listener
+        pid = os.getpid()
+        if _listener is not None and _listener[0] == pid:
+            return
+
+        with _listener_lock:
+            if _listener is not None and _listener[0] == pid:
+                return
+
+            # Bind to a port assigned by the OS and advertise it using a file named after process id and port
+            listener_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            listener_socket.bind((TASK_NOTIFIER_HOST, 0))
+            listener_socket.settimeout(TASK_NOTIFIER_HEARTBEAT_SEC)
+            port = listener_socket.getsockname()[1]
+            listeners_dir = _get_listeners_dir()
+            os.makedirs(listeners_dir, exist_ok=True)
+            file_path = os.path.join(listeners_dir, f"{pid}.{port}")
+            with open(file_path, "w"):
+                pass
+            atexit.register(_remove_listener_file, file_path)
+
+            listener_thread = threading.Thread(
+                target=cls._run_listener, args=(listener_socket, file_path), name="task_notifier", daemon=True
+            )
+            listener_thread.start()
+            _listener = (pid, port)
+
+    @classmethod
+    def _notify_local(cls) -> None:
+        """Notify all waiters in this process."""
+        global _version
+        with _condition:
+            _version += 1
+            _condition.notify_all()
+
+    @classmethod
+    def _run_listener(cls, listener_socket: socket.socket, file_path: str) -> None:
+        """Notify waiters in this process on each datagram, update listener file modification time periodically."""
+        heartbeat_at = time.monotonic()
+        while True:
+            try:
+                if listener_socket.recv(len(_MESSAGE)) == _MESSAGE:
+                    cls._notify_local()
+            except socket.timeout:
+                pass
+
+            # Update modification time so that the file is not removed as stale
+            if (now := time.monotonic()) - heartbeat_at >= TASK_NOTIFIER_HEARTBEAT_SEC:
+                heartbeat_at = now
+                try:
+                    os.utime(file_path)
+                except OSError:
+                    # Restore the file if it was removed as stale, e.g. after the process was suspended
+                    with open(file_path, "w"):
+                        pass
+
+    @classmethod
+    def _get_listener_ports(cls) -> List[int]:
+        """Return ports of listening processes other than the current process, reloaded at most once per interval."""
+        global _listener_ports
+        now = time.monotonic()
+        loaded_at, result = _listener_ports
+        if loaded_at != 0.0 and now - loaded_at < TASK_NOTIFIER_LISTENERS_REFRESH_SEC:
+            return result
+
+        # Listener of this process is skipped, including the listener inherited by a forked process
+        own_port = _listener[1] if _listener is not None and _listener[0] == os.getpid() else None
+        result = []
+        try:
+            with os.scandir(_get_listeners_dir()) as entries:
+                for entry in entries:
+                    try:
+                        _pid, port = (int(x) for x in entry.name.split("."))
+                        if time.time() - entry.stat().st_mtime > TASK_NOTIFIER_STALE_SEC:
+                            os.remove(entry.path)
+                        elif port != own_port:
+                            result.append(port)
+                    except (ValueError, OSError):
+                        # Skip files with other names and files removed by another process
+                        pass
+        except FileNotFoundError:
+            # No process has started listening yet
+            pass
+        _listener_ports = (now, result)
+        return result
@@ -0,0 +1,28 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from enum import IntEnum
+
+
+class TaskPriorityEnum(IntEnum):
+    """Tasks with higher priority receive a larger share of queue workers, see 'TaskQueue.priority_weights'."""
+
+    HIGH = 1
+    """Interactive tasks such as handlers invoked from the UI."""
+
+    NORMAL = 2
+    """Default priority when not specified."""
+
+    LOW = 3
+    """Batch tasks that should not delay interactive tasks."""
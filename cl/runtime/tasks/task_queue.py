@@ -12,10 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime as dt
 from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
+from typing import Dict
+from typing import Iterable
+from typing import List
+from cl.runtime.context.context import Context
+from cl.runtime.db.db import Db
+from cl.runtime.primitive.datetime_util import DatetimeUtil
+from cl.runtime.primitive.timestamp import Timestamp
+from cl.runtime.tasks.task import Task
+from cl.runtime.tasks.task_key import TaskKey
 from cl.runtime.tasks.task_queue_key import TaskQueueKey
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
+
+COMPACT_TASKS_PAGE_SIZE = 1000
+"""Maximum number of tasks loaded and deleted at once by 'compact_tasks'."""
 
 
 @dataclass(slots=True, kw_only=True)
@@ -34,6 +48,12 @@ class TaskQueue(TaskQueueKey, ABC):
     timeout_sec: int = 10
     """Optional timeout in seconds, queue will stop after reaching this timeout."""
 
+    priority_weights: List[int] | None = None
+    """Relative share of dispatched tasks for High, Normal, Low priorities, 8, 4, 1 if not set (ProcessQueue only)."""
+
+    max_running_per_user: int | None = None
+    """Maximum number of running tasks per user for this queue, no limit if not set (ProcessQueue only)."""
+
     def get_key(self) -> TaskQueueKey:
         return TaskQueueKey(queue_id=self.queue_id)
 
@@ -44,3 +64,52 @@ class TaskQueue(TaskQueueKey, ABC):
     @abstractmethod
     def run_stop_queue(self) -> None:
         """Exit after completing all currently executing tasks."""
+
+    @abstractmethod
+    def submit_task(self, task: TaskKey) -> None:
+        """Submit a task that has been saved to the database for execution by this queue."""
+
+    def submit_tasks(self, tasks: Iterable[TaskKey]) -> None:
+        """Submit tasks that have been saved to the database, override to submit them in one round-trip."""
+        for task in tasks:
+            self.submit_task(task)
+
+    def get_running_per_user(self) -> Dict[str, int]:
+        """Return the number of running tasks of this queue for each username, tasks without user are not counted."""
+        result = {}
+        query = (Task, {"queue": self.get_key(), "status": TaskStatusEnum.RUNNING}, {})
+        for task in Context.current().load_query(query):
+            if task.user is not None:
+                result[task.user.username] = result.get(task.user.username, 0) + 1
+        return result
+
+    def compact_tasks(self, *, retention_sec: float, archive_db: Db | None = None) -> int:
+        """
+        Delete completed, failed or cancelled tasks of this queue submitted more than 'retention_sec' ago
+        so that task history does not grow indefinitely, return the number of deleted tasks.
+
+        Args:
+            retention_sec: Finished tasks submitted earlier than this number of seconds before now are deleted
+            archive_db: If specified, tasks are saved to this database before they are deleted
+        """
+        context = Context.current()
+        cutoff = DatetimeUtil.now() - dt.timedelta(seconds=retention_sec)
+        finished_statuses = [TaskStatusEnum.COMPLETED, TaskStatusEnum.FAILED, TaskStatusEnum.CANCELLED]
+
+        # Task_id is time-ordered, select tasks submitted before the cutoff on the database side
+        conditions = {
+            "queue": self.get_key(),
+            "status": {"$in": finished_statuses},
+            "task_id": {"$lt": Timestamp.from_datetime(cutoff)},
+        }
+
+        # Delete in pages of bounded size, deleted tasks no longer match the query so each page starts from the top
+        result = 0
+        while tasks := list(context.load_query((Task, conditions, {}), limit=COMPACT_TASKS_PAGE_SIZE)):
+            if archive_db is not None:
+                archive_db.save_many(tasks)
+            context.delete_many([task.get_key() for task in tasks])
+            result = result + len(tasks)
+            if len(tasks) < COMPACT_TASKS_PAGE_SIZE:
+                break
+        return result
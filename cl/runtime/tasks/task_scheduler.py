@@ -0,0 +1,139 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Deque
+from typing import Dict
+from typing import List
+from cl.runtime.tasks.task import Task
+from cl.runtime.tasks.task_priority_enum import TaskPriorityEnum
+
+DEFAULT_PRIORITY_WEIGHTS = (8, 4, 1)
+"""Default relative share of dispatched tasks for High, Normal and Low priorities when all have queued tasks."""
+
+_scheduler_dict: Dict[str, TaskScheduler] = {}
+"""Dict of TaskScheduler instances with queue_id key, preserves scheduling state between polls of the same queue."""
+
+
+@dataclass(slots=True, kw_only=True)
+class TaskScheduler:
+    """
+    Select queued tasks to dispatch using weighted fair scheduling across priorities and per-user limits.
+
+    Notes:
+        - Priorities share the available workers in proportion to their weights using smooth weighted round-robin,
+          so that higher priorities are dispatched first without starving lower priorities
+        - Within the same priority, tasks of the user with the fewest running tasks are dispatched first
+        - Tasks without a user are not subject to per-user limits
+    """
+
+    priority_weights: List[int] = field(default_factory=lambda: list(DEFAULT_PRIORITY_WEIGHTS))
+    """Relative share of dispatched tasks for High, Normal and Low priorities when all have queued tasks."""
+
+    max_running_per_user: int | None = None
+    """Maximum number of running tasks per user, no limit if not set."""
+
+    _current_weights: Dict[TaskPriorityEnum, int] = field(default_factory=dict)
+    """Smooth weighted round-robin state, preserved between calls to 'select'."""
+
+    @classmethod
+    def for_queue(
+        cls,
+        queue_id: str,
+        *,
+        priority_weights: List[int] | None = None,
+        max_running_per_user: int | None = None,
+    ) -> TaskScheduler:
+        """Return scheduler for the specified queue, preserving scheduling state between calls."""
+        if (result := _scheduler_dict.get(queue_id, None)) is None:
+            result = TaskScheduler()
+            _scheduler_dict[queue_id] = result
+        result.priority_weights = list(priority_weights or DEFAULT_PRIORITY_WEIGHTS)
+        result.max_running_per_user = max_running_per_user
+        return result
+
+    @classmethod
+    def get_priority(cls, task: Task) -> TaskPriorityEnum:
+        """Return task priority, Normal priority is used if not set."""
+        return task.priority if task.priority is not None else TaskPriorityEnum.NORMAL
+
+    def get_weight(self, priority: TaskPriorityEnum) -> int:
+        """Return weight for the specified priority."""
+        if len(self.priority_weights) != len(TaskPriorityEnum):
+            raise RuntimeError(
+                f"Priority weights {self.priority_weights} must have {len(TaskPriorityEnum)} elements, "
+                f"one for each of " + ", ".join(x.name for x in TaskPriorityEnum) + "."
+            )
+        if (result := self.priority_weights[priority.value - 1]) <= 0:
+            raise RuntimeError(f"Weight for {priority.name} priority must be positive.")
+        return result
+
+    def select(
+        self,
+        candidates: Dict[TaskPriorityEnum, List[Task]],
+        running_per_user: Dict[str, int],
+        count: int | None,
+    ) -> List[Task]:
+        """
+        Select up to 'count' tasks to dispatch from candidates in each priority.
+
+        Args:
+            candidates: Queued tasks for each priority in the order of submission
+            running_per_user: Number of running tasks for each username
+            count: Maximum number of tasks to select, no limit if None
+        """
+
+        result = []
+        running_per_user = dict(running_per_user)
+        queues: Dict[TaskPriorityEnum, Deque[Task]] = {k: deque(v) for k, v in candidates.items() if v}
+        while queues and (count is None or len(result) < count):
+            # Smooth weighted round-robin across priorities that have candidates, ties go to higher priority
+            total_weight = 0
+            for priority in queues.keys():
+                weight = self.get_weight(priority)
+                self._current_weights[priority] = self._current_weights.get(priority, 0) + weight
+                total_weight += weight
+            priority = min(queues.keys(), key=lambda x: (-self._current_weights[x], x.value))
+            self._current_weights[priority] -= total_weight
+
+            # Select task of the user with the fewest running tasks, skip users that reached the limit
+            if (task := self._pop_task(queues[priority], running_per_user)) is not None:
+                result.append(task)
+                if task.user is not None:
+                    username = task.user.username
+                    running_per_user[username] = running_per_user.get(username, 0) + 1
+            if task is None or not queues[priority]:
+                del queues[priority]
+        return result
+
+    def _pop_task(self, tasks: Deque[Task], running_per_user: Dict[str, int]) -> Task | None:
+        """Remove and return the task to dispatch or None if all remaining tasks are blocked by per-user limit."""
+        selected_index = None
+        selected_running = None
+        for index, task in enumerate(tasks):
+            running = running_per_user.get(task.user.username, 0) if task.user is not None else 0
+            if task.user is not None and self.max_running_per_user is not None and running >= self.max_running_per_user:
+                continue
+            if selected_running is None or running < selected_running:
+                selected_index, selected_running = index, running
+                if running == 0:
+                    break
+        if selected_index is None:
+            return None
+        result = tasks[selected_index]
+        del tasks[selected_index]
+        return result
@@ -38,3 +38,6 @@ class TaskStatusEnum(IntEnum):
 
     CANCELLED = 6
     """The task has been cancelled (this status is distinct from 'Failed')."""
+
+    BLOCKED = 7
+    """The task is saved but not submitted to the queue until its prerequisites are completed (e.g. workflow phase)."""
@@ -0,0 +1,229 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import asyncio
+import contextvars
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Final
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Set
+from typing import Tuple
+from cl.runtime.context.context import Context
+from cl.runtime.context.context import context_stack_var
+from cl.runtime.tasks.task_key import TaskKey
+from cl.runtime.tasks.task_notifier import TaskNotifier
+from cl.runtime.tasks.task_update import TaskUpdate
+
+_logger = logging.getLogger(__name__)
+
+TASK_UPDATES_MAX_SIZE: Final[int] = 10000
+"""Maximum number of tasks whose latest update is kept in memory, the least recently published are evicted first."""
+
+_lock = threading.Lock()
+"""Protects the registry, updates are published from worker threads and read from the event loop."""
+
+_updates: OrderedDict[str, TaskUpdate] = OrderedDict()
+"""Latest update published in this process for each task_id, ordered from least to most recently published."""
+
+_subscriptions: Dict[str, Set[TaskSubscription]] = {}
+"""Active subscriptions for each task_id."""
+
+TASK_STATUS_POLL_SEC: Final[float] = 1.0
+"""Interval for loading subscribed tasks without updates published in this process, e.g. run by other processes."""
+
+_polled_task_ids: Set[str] = set()
+"""Tasks whose latest update was loaded from the database by the polling thread, not published in this process."""
+
+_poll_thread: threading.Thread | None = None
+"""Thread loading subscribed tasks for all subscribers in this process, runs while there are subscriptions."""
+
+_poll_requested = threading.Event()
+"""Set to load subscribed tasks without waiting for the poll interval, e.g. on subscribing to tasks without updates."""
+
+
+@dataclass(slots=True, kw_only=True, eq=False)
+class TaskSubscription:
+    """Wakes up a coroutine when an update is published for any of the subscribed tasks."""
+
+    task_ids: tuple[str, ...]
+    """Identifiers of the subscribed tasks."""
+
+    context: Context | None = None
+    """Context for loading the subscribed tasks by the polling thread, tasks are not loaded if not set."""
+
+    _loop: asyncio.AbstractEventLoop = field(default_factory=asyncio.get_running_loop)
+    """Event loop of the subscriber, updates may be published from other threads."""
+
+    _event: asyncio.Event = field(default_factory=asyncio.Event)
+    """Set when an update is published after the last call to 'clear'."""
+
+    def clear(self) -> None:
+        """Call before getting the latest updates so that an update published after that is not missed."""
+        self._event.clear()
+
+    async def wait(self, timeout_sec: float) -> bool:
+        """Wait for an update published after the last call to 'clear' or until timeout, return True if notified."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=max(timeout_sec, 0.0))
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _notify(self) -> None:
+        """Set the event from any thread, ignored if the event loop of the subscriber is already closed."""
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass
+
+
+class TaskSubscriptions:
+    """
+    In-process registry of the latest task status updates and of the coroutines waiting for them.
+
+    Notes:
+        - Updates are published by 'Task.run_task' on each status save and by 'Task.report_progress'
+        - Updates of tasks running in other processes are loaded from the database by one polling thread
+          per process for all subscriptions with context, at most once per TASK_STATUS_POLL_SEC
+    """
+
+    @classmethod
+    def publish(cls, task) -> None:
+        """Record the current status and progress of the task and wake up its subscribers and TaskNotifier waiters."""
+        update = TaskUpdate.from_task(task)
+        with _lock:
+            _polled_task_ids.discard(update.task_id)
+            subscriptions = cls._set_update(update)
+        for subscription in subscriptions:
+            subscription._notify()  # noqa
+        TaskNotifier.notify()
+
+    @classmethod
+    def get_update(cls, task_id: str) -> TaskUpdate | None:
+        """Return the latest update published in this process or None if no update has been published."""
+        with _lock:
+            return _updates.get(task_id)
+
+    @classmethod
+    @contextmanager
+    def subscribe(cls, task_ids: Iterable[str], *, context: Context | None = None) -> Iterator[TaskSubscription]:
+        """
+        Subscribe the running coroutine to updates for the specified tasks until the context manager exits.
+
+        Args:
+            task_ids: Identifiers of the tasks
+            context: If specified, tasks without updates published in this process are loaded using this context
+        """
+        global _poll_thread
+        subscription = TaskSubscription(task_ids=tuple(task_ids), context=context)
+        with _lock:
+            for task_id in subscription.task_ids:
+                _subscriptions.setdefault(task_id, set()).add(subscription)
+            if context is not None:
+                # Load tasks without updates at once rather than after the poll interval
+                if any(task_id not in _updates for task_id in subscription.task_ids):
+                    _poll_requested.set()
+                if _poll_thread is None:
+                    _poll_thread = threading.Thread(target=cls._run_poll_thread, name="task_status_poll", daemon=True)
+                    _poll_thread.start()
+        try:
+            yield subscription
+        finally:
+            with _lock:
+                for task_id in subscription.task_ids:
+                    if (task_subscriptions := _subscriptions.get(task_id)) is not None:
+                        task_subscriptions.discard(subscription)
+                        if not task_subscriptions:
+                            del _subscriptions[task_id]
+
+    @classmethod
+    def _set_update(cls, update: TaskUpdate) -> Tuple[TaskSubscription, ...]:
+        """Record the update and return subscriptions to notify, the caller must hold the lock."""
+        _updates[update.task_id] = update
+        _updates.move_to_end(update.task_id)
+        while len(_updates) > TASK_UPDATES_MAX_SIZE:
+            evicted_task_id, _ = _updates.popitem(last=False)
+            _polled_task_ids.discard(evicted_task_id)
+        return tuple(_subscriptions.get(update.task_id, ()))
+
+    @classmethod
+    def _run_poll_thread(cls) -> None:
+        """Load subscribed tasks for all subscribers at each poll interval, exit when there are no subscriptions."""
+        global _poll_thread
+        while True:
+            _poll_requested.wait(TASK_STATUS_POLL_SEC)
+            _poll_requested.clear()
+            with _lock:
+                if not _subscriptions:
+                    _poll_thread = None
+                    return
+                polled_task_ids = cls._get_polled_task_ids()
+            for context, task_ids in polled_task_ids:
+                try:
+                    # Run in an empty contextvars.Context where the subscriber context is current
+                    updates = contextvars.Context().run(cls._load_updates, context, task_ids)
+                except Exception as e:  # noqa
+                    _logger.warning(f"Error loading task status updates: {e}")
+                    continue
+                cls._publish_polled(updates)
+
+    @classmethod
+    def _get_polled_task_ids(cls) -> List[Tuple[Context, List[str]]]:
+        """
+        Return subscribed tasks to load grouped by database and dataset, skipping tasks with updates published
+        in this process and finished tasks, the caller must hold the lock.
+        """
+        result = {}
+        for task_id, subscriptions in _subscriptions.items():
+            update = _updates.get(task_id)
+            if update is not None and (task_id not in _polled_task_ids or update.is_finished()):
+                continue
+            if (context := next((x.context for x in subscriptions if x.context is not None), None)) is not None:
+                result.setdefault((context.db.db_id, context.dataset), (context, []))[1].append(task_id)
+        return list(result.values())
+
+    @classmethod
+    def _load_updates(cls, context: Context, task_ids: List[str]) -> List[TaskUpdate]:
+        """Load tasks in one call and return their updates, tasks that are not found are skipped."""
+        from cl.runtime.tasks.task import Task  # Task module imports this module
+
+        context_stack_var.set((context,))
+        tasks = context.load_many(Task, [TaskKey(task_id=task_id) for task_id in task_ids])
+        return [TaskUpdate.from_task(task) for task in tasks if task is not None]
+
+    @classmethod
+    def _publish_polled(cls, updates: List[TaskUpdate]) -> None:
+        """
+        Record loaded updates that are new at once and notify their subscribers, skipping tasks
+        with updates published in this process after they were loaded.
+        """
+        subscriptions = set()
+        with _lock:
+            for update in updates:
+                if (previous := _updates.get(update.task_id)) is not None:
+                    if update.task_id not in _polled_task_ids or previous.get_revision() == update.get_revision():
+                        continue
+                _polled_task_ids.add(update.task_id)
+                subscriptions.update(cls._set_update(update))
+        for subscription in subscriptions:
+            subscription._notify()  # noqa
@@ -0,0 +1,59 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+from dataclasses import dataclass
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
+
+FINISHED_STATUSES = (TaskStatusEnum.COMPLETED, TaskStatusEnum.FAILED, TaskStatusEnum.CANCELLED)
+"""Statuses after which the task does not change unless it is submitted again."""
+
+
+@dataclass(slots=True, kw_only=True)
+class TaskUpdate:
+    """Status and progress of a task at the time it was published or loaded, immutable once created."""
+
+    task_id: str
+    """Unique task identifier."""
+
+    status: TaskStatusEnum
+    """Task status at the time of the update."""
+
+    progress_pct: float | None = None
+    """Task progress in percent from 0 to 100."""
+
+    remaining_sec: float | None = None
+    """Remaining time in seconds if available."""
+
+    error_message: str | None = None
+    """Error message for Failed status if available."""
+
+    @classmethod
+    def from_task(cls, task) -> TaskUpdate:
+        """Create from the current fields of a task record."""
+        return TaskUpdate(
+            task_id=task.task_id,
+            status=task.status,
+            progress_pct=task.progress_pct,
+            remaining_sec=task.remaining_sec,
+            error_message=task.error_message,
+        )
+
+    def get_revision(self) -> str:
+        """String that changes when status or progress changes, used by clients to request subsequent updates."""
+        return f"{self.status.name}:{self.progress_pct}"
+
+    def is_finished(self) -> bool:
+        """True if the task is Completed, Failed, or Cancelled."""
+        return self.status in FINISHED_STATUSES
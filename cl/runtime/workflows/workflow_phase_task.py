@@ -13,17 +13,143 @@
 # limitations under the License.
 
 from dataclasses import dataclass
+from typing import Final
+from typing import Iterable
+from typing import List
+from cl.runtime.context.context import Context
 from cl.runtime.records.dataclasses_extensions import missing
 from cl.runtime.tasks.task import Task
+from cl.runtime.tasks.task_notifier import TaskNotifier
+from cl.runtime.tasks.task_queue import TaskQueue
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
 from cl.runtime.workflows.workflow_phase_key import WorkflowPhaseKey
 
+UNFINISHED_STATUSES: Final = (
+    TaskStatusEnum.PENDING,
+    TaskStatusEnum.RUNNING,
+    TaskStatusEnum.AWAITING,
+    TaskStatusEnum.BLOCKED,
+)
+"""Statuses of tasks that are not yet finished."""
+
 
 @dataclass(slots=True, kw_only=True)
 class WorkflowPhaseTask(Task):
-    """Child of the workflow task and parent of tasks assigned to the specified workflow phase."""
+    """
+    Child of the workflow task and parent of tasks assigned to the specified workflow phase.
+
+    Notes:
+        - Child tasks are saved with Blocked status and submitted to their queues when the phase starts
+        - Tasks added while the phase is running are submitted immediately
+        - The phase is completed when all child tasks are completed, including those added while it is running,
+          and failed when all child tasks are finished and at least one of them failed or was cancelled
+        - When running independently of a workflow, the phase task is suspended with Blocked status
+          instead of waiting for its child tasks and is resumed when any of them is finished
+    """
 
     phase: WorkflowPhaseKey = missing()
     """Tasks run in parallel in the order of phases, however each phase waits until its prerequisites are completed."""
 
+    def get_child_tasks(self) -> List[Task]:
+        """Load tasks assigned to this phase, including those added after the phase has started."""
+        query = (Task, {"parent": self.get_key()}, {})
+        return list(Context.current().load_query(query))
+
+    def add_task(self, task: Task) -> None:
+        """Assign the task to this phase and save it, the task is submitted now if the phase is running."""
+        if self.status in (TaskStatusEnum.COMPLETED, TaskStatusEnum.FAILED, TaskStatusEnum.CANCELLED):
+            raise RuntimeError(
+                f"Cannot add a task to workflow phase '{self.phase.phase_id}' because it is {self.status.name.lower()}."
+            )
+        task.parent = self.get_key()
+        task.status = TaskStatusEnum.PENDING if self.status == TaskStatusEnum.RUNNING else TaskStatusEnum.BLOCKED
+        Context.current().save_one(task)
+        if task.status == TaskStatusEnum.PENDING:
+            self._submit_tasks([task])
+
+    def start_phase(self) -> None:
+        """Set status to Running and submit all child tasks to their queues at once."""
+        context = Context.current()
+        self.status = TaskStatusEnum.RUNNING
+        context.save_one(self)
+
+        blocked_tasks = [task for task in self.get_child_tasks() if task.status == TaskStatusEnum.BLOCKED]
+        for task in blocked_tasks:
+            task.status = TaskStatusEnum.PENDING
+        context.save_many(blocked_tasks)
+        self._submit_tasks(blocked_tasks)
+
+    def get_phase_status(self) -> TaskStatusEnum:
+        """Running while any child task is unfinished, then Failed if any child task failed or Completed."""
+        child_statuses = set(task.status for task in self.get_child_tasks())
+        if any(status in UNFINISHED_STATUSES for status in child_statuses):
+            return TaskStatusEnum.RUNNING
+        elif TaskStatusEnum.FAILED in child_statuses or TaskStatusEnum.CANCELLED in child_statuses:
+            return TaskStatusEnum.FAILED
+        else:
+            return TaskStatusEnum.COMPLETED
+
+    def finish_phase(self, status: TaskStatusEnum) -> None:
+        """Set the final status of the phase and cancel child tasks that have not been submitted."""
+        context = Context.current()
+        blocked_tasks = [task for task in self.get_child_tasks() if task.status == TaskStatusEnum.BLOCKED]
+        for task in blocked_tasks:
+            task.status = TaskStatusEnum.CANCELLED
+        context.save_many(blocked_tasks)
+
+        self.status = status
+        self.progress_pct = 100.0
+        context.save_one(self)
+        TaskNotifier.notify()
+
+    def on_child_task_finished(self) -> None:
+        """Resume the workflow if this phase is part of a workflow, otherwise resume this phase task if suspended."""
+        if self.parent is not None:
+            context = Context.current()
+            if (workflow_task := context.load_one(Task, self.parent, is_record_optional=True)) is not None:
+                workflow_task.on_child_task_finished()
+        else:
+            self._resume_task(self)
+
     def _execute(self) -> None:
-        raise NotImplementedError()
+        """Run the phase independently of the workflow, suspending until all child tasks are finished."""
+        self.start_phase()
+        if (status := self.get_phase_status()) == TaskStatusEnum.COMPLETED:
+            return
+        elif status == TaskStatusEnum.FAILED:
+            raise RuntimeError(f"One or more tasks in workflow phase '{self.phase.phase_id}' have failed.")
+
+        # Suspend without blocking the queue worker, a child task finished before saving the status
+        # did not resume the phase so check again after saving
+        self._suspend_task(self)
+        if self.get_phase_status() != TaskStatusEnum.RUNNING:
+            self._resume_task(self)
+
+    @classmethod
+    def _suspend_task(cls, task: Task) -> None:
+        """Save Blocked status of the running task so that it is not completed when its '_execute' method returns."""
+        task.status = TaskStatusEnum.BLOCKED
+        Context.current().save_one(task)
+
+    @classmethod
+    def _resume_task(cls, task: Task) -> None:
+        """Change status of the suspended task from Blocked to Awaiting and submit it unless already resumed."""
+        if task.status != TaskStatusEnum.BLOCKED:
+            return
+        task.status = TaskStatusEnum.AWAITING
+        if Context.current().compare_and_save_one(task, {"status": TaskStatusEnum.BLOCKED}):
+            cls._submit_tasks([task])
+
+    @classmethod
+    def _submit_tasks(cls, tasks: Iterable[Task]) -> None:
+        """Submit saved tasks to their queues, each queue receives its tasks in one call."""
+        context = Context.current()
+        tasks_per_queue = {}
+        for task in tasks:
+            tasks_per_queue.setdefault(task.queue.queue_id, []).append(task)
+        for queue_tasks in tasks_per_queue.values():
+            # Queues that are not saved run a query for pending tasks and do not require submission
+            queue = context.load_one(TaskQueue, queue_tasks[0].queue, is_record_optional=True)
+            if queue is not None:
+                queue.submit_tasks(queue_tasks)
+        TaskNotifier.notify()
@@ -13,29 +13,164 @@
 # limitations under the License.
 
 from dataclasses import dataclass
+from typing import Dict
 from typing import List
 from cl.runtime.context.context import Context
 from cl.runtime.records.dataclasses_extensions import missing
 from cl.runtime.tasks.task import Task
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
 from cl.runtime.workflows.workflow_phase import WorkflowPhase
 from cl.runtime.workflows.workflow_phase_key import WorkflowPhaseKey
+from cl.runtime.workflows.workflow_phase_task import WorkflowPhaseTask
 
 
 @dataclass(slots=True, kw_only=True)
 class WorkflowTask(Task):
-    """Parent of workflow phase tasks who are in turn parents of tasks assigned to each phase."""
+    """
+    Parent of workflow phase tasks who are in turn parents of tasks assigned to each phase.
+
+    Notes:
+        - Phases are ordered by their prerequisites, each phase starts as soon as all of its prerequisites
+          are completed rather than after the previous phase in the list
+        - Tasks of all running phases run in parallel on their queues, the workflow task only starts and
+          completes phases and is suspended with Blocked status in between so that it does not occupy
+          a queue worker, it is resumed when a task of any phase is finished
+        - Use 'add_task' to assign tasks to phases before the workflow starts or from running tasks
+    """
 
     phases: List[WorkflowPhaseKey] = missing()
     """Tasks run in parallel in the order of phases, however each phase waits until its prerequisites are completed."""
 
+    def add_task(self, task: Task, phase: WorkflowPhaseKey) -> None:
+        """
+        Assign the task to a phase of this workflow and save it, the task is submitted to its queue when the phase
+        starts or immediately if the phase is already running.
+
+        Args:
+            task: Task to add, its queue determines where it runs
+            phase: Phase of this workflow to which the task is assigned
+        """
+        if self.task_id is None:
+            raise RuntimeError("Save the workflow task before adding tasks to it.")
+        if all(phase.phase_id != x.phase_id for x in self.phases):
+            raise RuntimeError(f"Phase '{phase.phase_id}' is not one of the phases of workflow '{self.task_id}'.")
+        self._get_phase_tasks()[phase.phase_id].add_task(task)
+
+    def update_workflow(self) -> bool:
+        """
+        Complete running phases whose tasks are finished and start phases whose prerequisites are completed,
+        return True if all phases are completed and raise an error if any phase failed.
+        """
+        phases = self._get_ordered_phases()
+        phase_tasks = self._get_phase_tasks()
+
+        # Repeat until no phase changes status because a phase with no tasks is completed as soon as it starts
+        is_changed = True
+        while is_changed:
+            is_changed = False
+
+            # Complete running phases
+            for phase_task in phase_tasks.values():
+                if phase_task.status == TaskStatusEnum.RUNNING:
+                    if (status := phase_task.get_phase_status()) != TaskStatusEnum.RUNNING:
+                        phase_task.finish_phase(status)
+                        is_changed = True
+
+            # Cancel phases that have not started if any phase has failed
+            if failed_phase_ids := [k for k, v in phase_tasks.items() if v.status == TaskStatusEnum.FAILED]:
+                for phase_task in phase_tasks.values():
+                    if phase_task.status == TaskStatusEnum.BLOCKED:
+                        phase_task.finish_phase(TaskStatusEnum.CANCELLED)
+                raise RuntimeError(
+                    f"Workflow '{self.task_id}' has failed because one or more tasks in phase(s) "
+                    f"{', '.join(failed_phase_ids)} have failed."
+                )
+
+            # Start phases whose prerequisites are completed in the order of prerequisites
+            for phase in phases:
+                phase_task = phase_tasks[phase.phase_id]
+                if phase_task.status == TaskStatusEnum.BLOCKED and all(
+                    phase_tasks[x.phase_id].status == TaskStatusEnum.COMPLETED for x in phase.prerequisites or []
+                ):
+                    phase_task.start_phase()
+                    is_changed = True
+
+        # Report progress as the percentage of completed phases, it is also saved when the workflow is suspended
+        completed_count = sum(1 for x in phase_tasks.values() if x.status == TaskStatusEnum.COMPLETED)
+        progress_pct = 100.0 * completed_count / len(phase_tasks) if phase_tasks else 100.0
+        if progress_pct != self.progress_pct:
+            self.report_progress(progress_pct)
+        return completed_count == len(phase_tasks)
+
+    def on_child_task_finished(self) -> None:
+        """Resume the workflow task if suspended, invoked by phase tasks when any of their tasks is finished."""
+        WorkflowPhaseTask._resume_task(self)  # noqa
+
     def _execute(self) -> None:
-        # Get current context
+        """Start and complete phases, then suspend until a task of a running phase is finished."""
+        if self.update_workflow():
+            return
+
+        # Suspend without blocking the queue worker, a task finished before saving the status
+        # did not resume the workflow so check again after saving
+        WorkflowPhaseTask._suspend_task(self)  # noqa
+        if self._is_update_required():
+            WorkflowPhaseTask._resume_task(self)  # noqa
+
+    def _is_update_required(self) -> bool:
+        """Return True if any running phase has no unfinished tasks and should be completed by 'update_workflow'."""
+        return any(
+            phase_task.status == TaskStatusEnum.RUNNING and phase_task.get_phase_status() != TaskStatusEnum.RUNNING
+            for phase_task in self._get_phase_tasks().values()
+        )
+
+    def _get_ordered_phases(self) -> List[WorkflowPhase]:
+        """Load phases and sort them so that each phase follows its prerequisites, error if there is a cycle."""
         context = Context.current()
+        phases = list(context.load_many(WorkflowPhase, self.phases))
+        for phase_key, phase in zip(self.phases, phases):
+            if phase is None:
+                raise RuntimeError(f"Workflow phase '{phase_key.phase_id}' is not found.")
+        phase_dict = {phase.phase_id: phase for phase in phases}
+        for phase in phases:
+            for prerequisite in phase.prerequisites or []:
+                if prerequisite.phase_id not in phase_dict:
+                    raise RuntimeError(
+                        f"Prerequisite '{prerequisite.phase_id}' of workflow phase '{phase.phase_id}' "
+                        f"is not one of the phases of workflow '{self.task_id}'."
+                    )
 
-        # Check that phases do not specify prerequisites
-        phases = context.load_many(WorkflowPhase, self.phases)  # TODO: Error message if not found
-        if any(phase.prerequisites is not None for phase in phases):
-            # TODO: Support checking for prerequisites
-            raise RuntimeError("Checking for prerequisites is not yet supported.")
+        # Topological sort preserving the order of phases where prerequisites permit
+        result = []
+        visited = set()
+        remaining = list(phases)
+        while remaining:
+            ready = [x for x in remaining if all(p.phase_id in visited for p in x.prerequisites or [])]
+            if not ready:
+                cycle_str = ", ".join(x.phase_id for x in remaining)
+                raise RuntimeError(f"Prerequisites of workflow phases {cycle_str} form a cycle.")
+            result.extend(ready)
+            visited.update(x.phase_id for x in ready)
+            remaining = [x for x in remaining if x.phase_id not in visited]
+        return result
 
-        raise NotImplementedError()
+    def _get_phase_tasks(self) -> Dict[str, WorkflowPhaseTask]:
+        """Load phase tasks of this workflow, creating those that do not yet exist, indexed by phase_id."""
+        context = Context.current()
+        query = (WorkflowPhaseTask, {"parent": self.get_key()}, {})
+        result = {phase_task.phase.phase_id: phase_task for phase_task in context.load_query(query)}
+        if missing_phases := [x for x in self.phases if x.phase_id not in result]:
+            # Phase tasks are started by the workflow and must not be dispatched by the queue, save them as Blocked
+            new_phase_tasks = [
+                WorkflowPhaseTask(
+                    label=f"{self.label or self.task_id};{phase.phase_id}",
+                    queue=self.queue,
+                    parent=self.get_key(),
+                    phase=phase,
+                    status=TaskStatusEnum.BLOCKED,
+                )
+                for phase in missing_phases
+            ]
+            context.save_many(new_phase_tasks)
+            result.update((x.phase.phase_id, x) for x in new_phase_tasks)
+        return result
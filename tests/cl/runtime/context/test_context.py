@@ -13,8 +13,12 @@
 # limitations under the License.
 
 import pytest
+import asyncio
 from cl.runtime.context.context import Context
 from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.db_key import DbKey
+from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.log.exceptions.user_error import UserError
 
 
 def test_context_manager():
@@ -46,5 +50,98 @@ def test_context_manager():
         Context.current()
 
 
+def test_child_context():
+    """Test that child context shares fields of the parent context by reference unless specified."""
+
+    with TestingContext() as parent_context:
+        with Context(dataset="child_dataset") as child_context:
+            assert child_context.user is parent_context.user
+            assert child_context.log is parent_context.log
+            assert child_context.db is parent_context.db
+            assert child_context.dataset == "child_dataset"
+        assert parent_context.dataset != "child_dataset"
+
+
+def test_resolved_db():
+    """Test that database specified as a key is loaded once and loaded again after it is saved."""
+
+    with TestingContext() as testing_context:
+        db_key = DbKey(db_id="test_context.test_resolved_db")
+        testing_context.save_one(SqliteDb(db_id=db_key.db_id))
+        db = Context(db=db_key).db
+        assert isinstance(db, SqliteDb)
+        assert Context(db=db_key).db is db
+
+        # Saving the database record removes it from the cache
+        testing_context.save_one(SqliteDb(db_id=db_key.db_id))
+        assert Context(db=db_key).db is not db
+
+        # Saving or deleting using a generator also removes it from the cache
+        db = Context(db=db_key).db
+        testing_context.save_many(x for x in [SqliteDb(db_id=db_key.db_id)])
+        assert Context(db=db_key).db is not db
+        Context(db=db_key).db
+        testing_context.delete_many(x for x in [db_key])
+        with pytest.raises(UserError):
+            Context(db=db_key).db
+
+
+def test_async_isolation():
+    """Test that contexts entered inside asyncio tasks do not affect the context stack of other tasks."""
+
+    async def enter_context(parent_context: Context):
+        assert Context.current() is parent_context
+        with Context() as task_context:
+            await asyncio.sleep(0)
+            assert Context.current() is task_context
+        assert Context.current() is parent_context
+
+    async def run_tasks(parent_context: Context):
+        await asyncio.gather(*(enter_context(parent_context) for _ in range(3)))
+
+    with TestingContext() as testing_context:
+        asyncio.run(run_tasks(testing_context))
+        assert Context.current() is testing_context
+
+
+def test_compact_dict():
+    """Test compact serialization of context."""
+
+    with TestingContext() as context:
+        context_data = context.to_compact_dict()
+        assert context_data["user"] == context.user.username
+        assert "is_deserialized" not in context_data
+
+        deserialized = Context.from_compact_dict(context_data)
+        assert type(deserialized) is type(context)
+        assert deserialized.is_deserialized
+        assert deserialized.context_id == context.context_id
+        assert deserialized.user == context.user
+        assert deserialized.dataset == context.dataset
+        assert type(deserialized.db) is type(context.db)
+        assert deserialized.db.db_id == context.db.db_id
+
+
+def test_compact_ref():
+    """Test deserializing compact context by reference."""
+
+    with TestingContext() as context:
+        context_data = context.to_compact_dict()
+        compact_ref = Context.get_compact_ref(context_data)
+        assert compact_ref.startswith(f"{context.context_id}:")
+        assert compact_ref == Context.get_compact_ref(context.to_compact_dict())
+
+        # Different content has a different reference
+        other_data = dict(context_data, dataset="other")
+        assert Context.get_compact_ref(other_data) != compact_ref
+
+        # Deserialized fields are reused when the same reference is passed
+        first = Context.from_compact_dict(context_data, compact_ref=compact_ref)
+        second = Context.from_compact_dict(context_data, compact_ref=compact_ref)
+        assert first is not second
+        assert first.db is second.db
+        assert first.dataset == second.dataset == context.dataset
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -25,6 +25,13 @@ def _test_env_dir_and_name(*, expected_name: str):
     assert os.path.normpath(EnvUtil.get_env_dir()) == os.path.normpath(expected_dir)
 
 
+def test_is_inside_test():
+    """Test for EnvUtil.is_inside_test."""
+    assert EnvUtil.is_inside_test()
+    assert EnvUtil._is_test_module_in_stack("test_")  # noqa
+    assert not EnvUtil._is_test_module_in_stack("no_such_module_prefix_")  # noqa
+
+
 def test_env_util():
     """Method name matches module name, shortened path"""
     _test_env_dir_and_name(expected_name="test_env_util")
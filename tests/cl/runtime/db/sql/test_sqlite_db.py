@@ -17,8 +17,12 @@ import time
 from typing import Any
 from typing import Iterable
 from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.db import Db
 from cl.runtime.db.sql.sqlite_db import SqliteDb
 from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.tasks.task_priority_enum import TaskPriorityEnum
+from cl.runtime.tasks.task_queue_key import TaskQueueKey
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
 from stubs.cl.runtime import StubDataclassComposite
 from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
 from stubs.cl.runtime import StubDataclassDerivedRecord
@@ -32,6 +36,7 @@ from stubs.cl.runtime import StubDataclassOtherDerivedRecord
 from stubs.cl.runtime import StubDataclassPrimitiveFields
 from stubs.cl.runtime import StubDataclassRecord
 from stubs.cl.runtime import StubDataclassSingleton
+from stubs.cl.runtime.tasks.stub_task import StubTask
 
 
 def _assert_equals_iterable_without_ordering(iterable: Iterable[Any], other_iterable: Iterable[Any]) -> bool:
@@ -149,6 +154,134 @@ def test_record_upsert():
         assert loaded_record == override_sample
 
 
+def test_compare_and_save_one():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        task = StubTask(label="test_compare_and_save_one", queue=TaskQueueKey(queue_id="test_queue"))
+        task.init()
+
+        # Not saved if the record does not exist
+        task.status = TaskStatusEnum.RUNNING
+        assert not context.compare_and_save_one(task, {"status": TaskStatusEnum.PENDING})
+
+        # Saved if the stored value matches, not saved on the second attempt because the stored value has changed
+        task.status = TaskStatusEnum.PENDING
+        context.save_one(task)
+        task.status = TaskStatusEnum.RUNNING
+        assert context.compare_and_save_one(task, {"status": TaskStatusEnum.PENDING})
+        assert not context.compare_and_save_one(task, {"status": TaskStatusEnum.PENDING})
+        assert context.load_one(StubTask, task.get_key()).status == TaskStatusEnum.RUNNING
+
+
+def test_load_query():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        queue_1 = TaskQueueKey(queue_id="queue_1")
+        queue_2 = TaskQueueKey(queue_id="queue_2")
+        statuses = [TaskStatusEnum.PENDING, TaskStatusEnum.COMPLETED, TaskStatusEnum.AWAITING]
+        tasks = [
+            StubTask(label=f"{i}", queue=queue, status=status)
+            for queue in (queue_1, queue_2)
+            for status in statuses
+            for i in range(2)
+        ]
+        for task in tasks:
+            task.init()
+            # Priority is None for some of the tasks
+            task.priority = TaskPriorityEnum.HIGH if task.label == "0" else None
+        context.save_many(tasks)
+
+        # Compare indexed query with the default implementation that filters the result of load_all
+        queries = [
+            (StubTask, {"queue": queue_1, "status": TaskStatusEnum.PENDING}, {}),
+            (StubTask, {"queue": queue_2, "status": {"$in": [TaskStatusEnum.PENDING, TaskStatusEnum.AWAITING]}}, {}),
+            (StubTask, {"queue": queue_1}, {"task_id": -1}),
+            (StubTask, {"task_id": {"$gte": tasks[1].task_id, "$lt": tasks[5].task_id}}, {}),
+            (StubTask, {"queue": queue_2}, {"priority": 1, "task_id": 1}),
+            (StubTask, {"queue": queue_2}, {"priority": -1, "task_id": 1}),
+        ]
+        for query in queries:
+            expected = list(Db.load_query(context.db, query))
+            assert len(expected) > 0
+            assert list(context.load_query(query)) == expected
+            assert list(context.load_query(query, limit=1)) == expected[:1]
+            assert list(context.load_query(query, limit=1, skip=1)) == expected[1:2]
+            assert list(context.load_query(query, skip=1)) == list(Db.load_query(context.db, query, skip=1))
+            assert context.count_query(query) == Db.count_query(context.db, query) == len(expected)
+
+        # Result is sorted by key when order is not specified
+        pending_tasks = list(context.load_query(queries[0]))
+        assert [task.task_id for task in pending_tasks] == sorted(task.task_id for task in pending_tasks)
+
+
+def test_load_query_paging():
+    """Test paging using skip over records with equal values of the order field."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        queue = TaskQueueKey(queue_id="queue")
+        tasks = [StubTask(label=f"{i}", queue=queue, status=TaskStatusEnum.PENDING) for i in range(10)]
+        for task in tasks:
+            task.init()
+
+        # Save in reverse key order so that the order of rows in the table differs from the key order
+        context.save_many(reversed(tasks))
+
+        # Records with equal values are ordered by key
+        for order in ({"status": 1}, {"status": -1}):
+            query = (StubTask, {"queue": queue}, order)
+            pages = [list(context.load_query(query, limit=3, skip=skip)) for skip in range(0, len(tasks), 3)]
+            assert [task.task_id for page in pages for task in page] == [task.task_id for task in tasks]
+
+
+def test_load_query_batches():
+    """Test reading query result in batches from a cursor held open between batches."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        queue = TaskQueueKey(queue_id="queue")
+        tasks = [StubTask(label=f"{i}", queue=queue, status=TaskStatusEnum.PENDING) for i in range(10)]
+        for task in tasks:
+            task.init()
+        context.save_many(tasks)
+
+        query = (StubTask, {"queue": queue}, {"status": 1})
+        for limit, skip in ((None, None), (7, None), (None, 2), (5, 4)):
+            expected = list(context.load_query(query, limit=limit, skip=skip))
+            batches = list(context.load_query_batches(query, batch_size=3, limit=limit, skip=skip))
+            assert all(0 < len(batch) <= 3 for batch in batches)
+            assert [record for batch in batches for record in batch] == expected
+            assert list(Db.load_query_batches(context.db, query, batch_size=3, limit=limit, skip=skip)) == batches
+
+        # Records can be saved while the cursor is open, closing before the end releases the cursor
+        batches = context.load_query_batches(query, batch_size=3)
+        assert next(batches) == tasks[:3]
+        context.save_one(tasks[0])
+        assert next(batches) == tasks[3:6]
+        batches.close()
+        assert list(context.load_query(query)) == tasks
+
+
+def test_query_indexes():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        context.save_many([StubDataclassRecord(id=f"{i}") for i in range(2)])
+        task = StubTask(label="test_query_indexes", queue=TaskQueueKey(queue_id="test_queue"))
+        task.init()
+        context.save_one(task)
+
+        # Query on a type that does not declare indexes does not create an index
+        assert len(list(context.load_query((StubDataclassRecord, {"id": "1"}, {"id": -1})))) == 1
+        assert len(list(context.load_query((StubTask, {"label": "test_query_indexes"}, {})))) == 1
+
+        # Indexes declared by the task type are created on first query, key indexes are created with the table
+        cursor = context.db._get_connection().cursor()  # noqa
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name NOT LIKE '%key_index';")
+        index_names = set(row["name"] for row in cursor.fetchall() if not row["name"].startswith("sqlite_"))
+        assert len(index_names) == len(StubTask.get_query_indexes())
+        assert not any("label" in x or "StubDataclassRecord" in x for x in index_names)
+
+
 def test_load_all():
     db_class = ClassInfo.get_class_path(SqliteDb)
     with TestingContext(db_class=db_class) as context:
@@ -226,5 +359,36 @@ def test_singleton():
         assert all_records[0] == other_singleton_sample
 
 
+def test_dataset_registry():
+    """Test that datasets where records are saved by this process are added to the registry."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    Db.clear_dataset_registry()
+    try:
+        with TestingContext(db_class=db_class) as context:
+            # Root dataset is always present
+            version, datasets = context.db.get_registered_datasets()
+            assert datasets == ["\\"]
+
+            # Parent datasets are registered together with the dataset, names are normalized
+            context.save_one(StubDataclassRecord(), dataset="abc\\def")
+            context.db.register_dataset(["xyz"])
+            version, datasets = context.db.get_registered_datasets()
+            assert datasets == ["\\", "\\abc", "\\abc\\def", "\\xyz"]
+
+            # Version does not change when registered datasets are saved again in any format
+            context.db.register_dataset("abc")
+            context.db.register_dataset("\\abc\\def")
+            context.db.register_dataset("abc")
+            context.db.register_dataset(None)
+            assert context.db.get_registered_datasets()[0] == version
+
+            # Registries are separate for each db_id
+            other_db = SqliteDb(db_id=context.db.db_id + "_other")
+            assert other_db.get_registered_datasets()[1] == ["\\"]
+    finally:
+        Db.clear_dataset_registry()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
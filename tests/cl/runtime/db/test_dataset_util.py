@@ -89,5 +89,13 @@ def test_lookup_list():
     assert DatasetUtil.to_lookup_list("\\abc\\def") == ["\\abc\\def", "\\abc", "\\"]
 
 
+def test_get_parent():
+    """Test DatasetUtil.get_parent."""
+
+    assert DatasetUtil.get_parent("\\abc\\def") == "\\abc"
+    assert DatasetUtil.get_parent("\\abc") == "\\"
+    assert DatasetUtil.get_parent("\\") is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,111 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import csv
+import os
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.file.csv_file_reader import CsvFileReader
+from cl.runtime.file.record_file_writer import RecordFileWriter
+from stubs.cl.runtime import StubDataclassComposite
+from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassNestedFields
+from stubs.cl.runtime import StubDataclassOptionalFields
+from stubs.cl.runtime import StubDataclassRecord
+
+stub_entries = [
+    [StubDataclassRecord(id=f"abc1_n{i}") for i in range(5)],
+    [StubDataclassNestedFields(id=f"abc2_n{i}") for i in range(5)],
+    [StubDataclassComposite(primitive=f"abc{i}") for i in range(5)],
+    [StubDataclassDerivedRecord(id=f"abc3_n{i}") for i in range(5)],
+    [StubDataclassOptionalFields(id=f"abc7_n{i}") for i in range(5)],
+]
+"""Stub entries for testing."""
+
+
+def test_csv_roundtrip(tmp_path):
+    """Test writing records in batches and reading them back using CsvFileReader."""
+
+    with TestingContext() as context:
+        for entries in stub_entries:
+            record_type = type(entries[0])
+            file_path = os.path.join(tmp_path, f"{record_type.__name__}.csv")
+            with RecordFileWriter(file_path=file_path, record_type=record_type) as writer:
+                writer.write_records(entries[:2])
+                writer.write_records(entries[2:])
+            assert writer.record_count == len(entries)
+
+            CsvFileReader(file_path=file_path).read_and_save()
+            assert list(context.load_all(record_type)) == entries
+
+        # Only target files remain after commit
+        assert sorted(os.listdir(tmp_path)) == sorted(f"{type(x[0]).__name__}.csv" for x in stub_entries)
+
+
+def test_parquet(tmp_path):
+    """Test writing records in batches to Parquet, values are stored as strings in the same format as CSV."""
+
+    pq = pytest.importorskip("pyarrow.parquet")
+    entries = stub_entries[0]
+    record_type = type(entries[0])
+    csv_path = os.path.join(tmp_path, f"{record_type.__name__}.csv")
+    parquet_path = os.path.join(tmp_path, f"{record_type.__name__}.parquet")
+    with RecordFileWriter(file_path=csv_path, record_type=record_type) as writer:
+        writer.write_records(entries)
+    with RecordFileWriter(file_path=parquet_path, record_type=record_type, file_format="parquet") as writer:
+        writer.write_records(entries[:2])
+        writer.write_records(entries[2:])
+    assert writer.record_count == len(entries)
+
+    # Compare with CSV, None is written as Parquet null and as empty CSV value
+    with open(csv_path, encoding="utf-8", newline="") as file:
+        csv_rows = list(csv.reader(file))
+    table = pq.read_table(parquet_path)
+    assert table.column_names == csv_rows[0]
+    parquet_rows = [["" if x is None else x for x in row.values()] for row in table.to_pylist()]
+    assert parquet_rows == csv_rows[1:]
+
+
+def test_file_mode(tmp_path):
+    """Test that the target file has default permissions rather than those of a temporary file."""
+
+    file_path = os.path.join(tmp_path, "StubDataclassRecord.csv")
+    with RecordFileWriter(file_path=file_path, record_type=StubDataclassRecord) as writer:
+        writer.write_records([StubDataclassRecord()])
+
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(file_path).st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_abort(tmp_path):
+    """Test that the target file is not modified if an error occurs while writing."""
+
+    file_path = os.path.join(tmp_path, "StubDataclassRecord.csv")
+    with RecordFileWriter(file_path=file_path, record_type=StubDataclassRecord) as writer:
+        writer.write_records([StubDataclassRecord(id="before")])
+
+    with pytest.raises(RuntimeError):
+        with RecordFileWriter(file_path=file_path, record_type=StubDataclassRecord) as writer:
+            writer.write_records([StubDataclassRecord(id="after")])
+            # Records of other types including subtypes are not accepted
+            writer.write_records([StubDataclassDerivedRecord(id="derived")])
+
+    assert os.listdir(tmp_path) == ["StubDataclassRecord.csv"]
+    with open(file_path, encoding="utf-8") as file:
+        assert file.read().splitlines() == ["id", "before"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,85 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.perf.request_tracer import RequestTrace
+from cl.runtime.perf.request_tracer import RequestTracer
+from stubs.cl.runtime import StubDataclassRecord
+
+
+def test_no_trace():
+    """Test that spans are no-op outside of a traced request."""
+
+    assert RequestTracer.current() is None
+    with RequestTracer.span("db") as span:
+        assert span is None
+
+
+def test_spans():
+    """Test recording spans and reporting them in Server-Timing and OpenTelemetry formats."""
+
+    with TestingContext() as context:
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(3)]
+        context.save_many(records)
+
+        with RequestTrace(method="GET", path="/test") as trace:
+            assert RequestTracer.current() is trace
+            list(context.load_many(StubDataclassRecord, [x.get_key() for x in records]))
+            context.load_one(StubDataclassRecord, records[0].get_key())
+            with RequestTracer.span("serialize"):
+                pass
+        assert RequestTracer.current() is None
+
+        # Database spans include operation, type and row count
+        db_spans = [x for x in trace.spans if x.name == "db"]
+        assert [x.attributes["operation"] for x in db_spans] == ["load_many", "load_one"]
+        assert [x.attributes["rows"] for x in db_spans] == [3, 1]
+        assert all(x.attributes["type"] == "StubDataclassRecord" for x in db_spans)
+
+        # Spans with the same name are combined in Server-Timing header
+        server_timing = trace.get_server_timing()
+        assert "db;dur=" in server_timing
+        assert 'desc="2 calls, 4 rows"' in server_timing
+        assert "serialize;dur=" in server_timing
+        assert "total;dur=" in server_timing
+
+        # Spans are children of the request span in OpenTelemetry format
+        otel_spans = trace.to_otel_dict()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert len(otel_spans) == 4
+        assert otel_spans[0]["name"] == "GET (unmatched)"
+        assert all(x["parentSpanId"] == trace.span_id for x in otel_spans[1:])
+        assert all(x["traceId"] == trace.trace_id for x in otel_spans)
+
+
+def test_summary():
+    """Test latency percentiles per route."""
+
+    RequestTracer.clear_summary()
+    try:
+        for duration_ms in range(1, 101):
+            trace = RequestTrace(method="GET", path="/test", route="/test", duration_ns=duration_ms * 1_000_000)
+            RequestTracer.record(trace)
+        summary = RequestTracer.get_summary()["GET /test"]
+        assert summary["count"] == 100
+        assert summary["p50"] == 50.0
+        assert summary["p90"] == 90.0
+        assert summary["p99"] == 99.0
+        assert summary["max"] == 100.0
+    finally:
+        RequestTracer.clear_summary()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,78 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import importlib
+import json
+import os
+import sys
+from cl.runtime.perf.startup_profiler import STARTUP_PROFILE_ENVVAR
+from cl.runtime.perf.startup_profiler import STARTUP_TRACE_ENVVAR
+from cl.runtime.perf.startup_profiler import StartupProfiler
+
+
+def test_disabled():
+    """Test that profiling is not started and phases are no-op unless enabled."""
+
+    if os.environ.get(STARTUP_PROFILE_ENVVAR) or os.environ.get(STARTUP_TRACE_ENVVAR):
+        pytest.skip("Startup profiling is enabled for the test process.")
+
+    assert StartupProfiler.start_if_enabled(argv=[]) is None
+    assert StartupProfiler.current() is None
+    with StartupProfiler.phase("Not recorded") as phase:
+        assert phase is None
+
+
+def test_smoke(tmp_path):
+    """Test recording phases and imports, then writing the report and trace."""
+
+    if StartupProfiler.current() is not None:
+        pytest.skip("Startup profiling is enabled for the test process.")
+
+    profiler = StartupProfiler.start()
+    try:
+        with StartupProfiler.phase("Test: outer phase"):
+            # Import a module that is not yet imported so the import hook records it
+            sys.modules.pop("colorsys", None)
+            importlib.import_module("colorsys")
+    finally:
+        profiler.stop()
+
+    # Phase and import spans are recorded
+    phases = [x for x in profiler.spans if x.category == "phase"]
+    imports = [x for x in profiler.spans if x.category == "import"]
+    assert [x.name for x in phases] == ["Test: outer phase"]
+    assert "colorsys" in [x.name for x in imports]
+    assert all(0 <= x.self_ns <= x.duration_ns for x in imports)
+
+    # Import hook is removed after stop
+    assert StartupProfiler.current() is None
+    assert StartupProfiler.phase("Not recorded").__enter__() is None
+
+    # Report lists phases and imports
+    report = profiler.get_report()
+    assert "Test: outer phase" in report
+    assert "colorsys" in report
+
+    # Trace is in Chrome trace event format
+    trace_path = os.path.join(tmp_path, "startup.{pid}.json")
+    profiler.write_trace(trace_path.replace("{pid}", str(os.getpid())))
+    with open(trace_path.replace("{pid}", str(os.getpid()))) as trace_file:
+        trace = json.load(trace_file)
+    assert {x["name"] for x in trace["traceEvents"]} >= {"Test: outer phase", "colorsys"}
+    assert all(x["ph"] == "X" for x in trace["traceEvents"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
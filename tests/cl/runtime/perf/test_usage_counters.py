@@ -0,0 +1,57 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.perf.usage_counters import UsageCounters
+from stubs.cl.runtime import StubDataclassRecord
+
+
+def test_nested():
+    """Test that usage counted by nested counters is added to the outer counters."""
+
+    assert UsageCounters.current() is None
+    UsageCounters.add_db_call(["abc"])  # Not counted
+    with UsageCounters() as outer:
+        UsageCounters.add_llm_tokens(10)
+        UsageCounters.add_llm_tokens(None)
+        with UsageCounters() as inner:
+            assert UsageCounters.current() is inner
+            UsageCounters.add_db_call(["abc", b"de", None, 1])
+        assert UsageCounters.current() is outer
+    assert UsageCounters.current() is None
+
+    assert (inner.db_calls, inner.db_bytes, inner.llm_tokens) == (1, 13, 0)
+    assert (outer.db_calls, outer.db_bytes, outer.llm_tokens) == (1, 13, 10)
+
+
+def test_db_usage():
+    """Test counting database calls and bytes."""
+
+    with TestingContext() as context:
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(3)]
+        with UsageCounters() as save_counters:
+            context.save_many(records)
+        assert save_counters.db_calls >= 1
+        assert save_counters.db_bytes > 0
+
+        with UsageCounters() as load_counters:
+            loaded = list(context.load_many(StubDataclassRecord, [x.get_key() for x in records]))
+        assert loaded == records
+        assert load_counters.db_calls == 1
+        assert load_counters.db_bytes > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -83,8 +83,14 @@ def test_get_class_type():
         ClassInfo.get_class_type(path_with_unknown_class)
 
     # Call one more time and confirm that method results are cached
+    misses = ClassInfo.get_cache_stats()["class_type_misses"]
     assert ClassInfo.get_class_type(class_info_path) == ClassInfo
-    assert ClassInfo.get_class_type.cache_info().hits > 0
+    assert ClassInfo.get_cache_stats()["class_type_misses"] == misses
+
+    # Errors are not cached
+    with pytest.raises(RuntimeError):
+        ClassInfo.get_class_type(path_with_unknown_class)
+    assert ClassInfo.get_cache_stats()["class_type_misses"] == misses + 1
 
 
 def test_get_inheritance_chain():
@@ -104,8 +110,9 @@ def test_get_inheritance_chain():
         ClassInfo.get_inheritance_chain(StubDataclassData)
 
     # Call one more time and confirm that method results are cached
+    misses = ClassInfo.get_cache_stats()["inheritance_chain_misses"]
     assert ClassInfo.get_inheritance_chain(StubDataclassRecord) == [base_class]
-    assert ClassInfo.get_inheritance_chain.cache_info().hits > 0
+    assert ClassInfo.get_cache_stats()["inheritance_chain_misses"] == misses
 
 
 if __name__ == "__main__":
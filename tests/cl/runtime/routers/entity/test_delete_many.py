@@ -84,5 +84,23 @@ def test_api():
                 assert non_deleted_record.derived_str_field == record_in_db.derived_str_field
 
 
+def test_errors():
+    """Test that invalid keys are reported for each item and the remaining keys are deleted."""
+
+    with TestingContext() as context:
+        existing_records = [StubDataclassDerivedRecord(id=f"existing_record_{i}") for i in range(3)]
+        context.save_many(existing_records)
+
+        delete_records_payload = [
+            {"_key": "existing_record_0", "_t": "StubDataclassDerivedRecord"},
+            {"_key": "existing_record_1", "_t": "UnknownType"},
+            {"_key": "existing_record_2", "_t": "StubDataclassDerivedRecord"},
+        ]
+        result = DeleteResponse.delete_many(DeleteRequest(record_keys=delete_records_payload))
+
+        assert [x.index for x in result.errors] == [1]
+        assert [x.id for x in context.load_all(StubDataclassDerivedRecord)] == ["existing_record_1"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
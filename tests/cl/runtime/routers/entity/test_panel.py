@@ -19,6 +19,7 @@ from cl.runtime.context.testing_context import TestingContext
 from cl.runtime.routers.entity import entity_router
 from cl.runtime.routers.entity.panel_request import PanelRequest
 from cl.runtime.routers.entity.panel_response_util import PanelResponseUtil
+from cl.runtime.routers.http_cache_util import PANEL_CACHE_CONTROL
 from cl.runtime.serialization.string_serializer import StringSerializer
 from stubs.cl.runtime import StubDataViewers
 
@@ -98,5 +99,34 @@ def test_api():
                 assert result == expected_result
 
 
+def test_etag():
+    """Test ETag and If-None-Match for /entity/panel route."""
+
+    with TestingContext() as context:
+        context.save_one(stub_viewers)
+
+        test_app = FastAPI()
+        test_app.include_router(entity_router.router, prefix="/entity", tags=["Entity"])
+        with TestClient(test_app) as test_client:
+            request_params = {"type": "StubDataViewers", "panel_id": "Self", "key": key_str}
+
+            # First request returns ETag and Cache-Control
+            response = test_client.get("/entity/panel", params=request_params)
+            assert response.status_code == 200
+            etag = response.headers["ETag"]
+            assert response.headers["Cache-Control"] == PANEL_CACHE_CONTROL
+
+            # Request with the same ETag returns Not Modified without body
+            response = test_client.get("/entity/panel", params=request_params, headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.content == b""
+
+            # Different panel content has a different ETag
+            request_params = {"type": "StubDataViewers", "panel_id": "None", "key": key_str}
+            response = test_client.get("/entity/panel", params=request_params, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.headers["ETag"] != etag
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,94 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.perf.usage_counters import UsageCounters
+from cl.runtime.routers.entity import entity_router
+from cl.runtime.routers.entity.panel_response_util import PanelResponseUtil
+from cl.runtime.routers.entity.panels_request import PanelsRequest
+from cl.runtime.routers.entity.panels_response_item import PanelsResponseItem
+from cl.runtime.serialization.string_serializer import StringSerializer
+from cl.runtime.views.key_view import KeyView
+from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataViewers
+
+stub_viewers = StubDataViewers()
+key_serializer = StringSerializer()
+key_str = key_serializer.serialize_key(stub_viewers.get_key())
+
+
+def test_method():
+    """Test coroutine for /entity/panels route."""
+
+    with TestingContext() as context:
+        context.save_one(stub_viewers)
+
+        # All panels in declaration order
+        request_obj = PanelsRequest(type="StubDataViewers", key=key_str)
+        result = asyncio.run(PanelsResponseItem.get_panels(request_obj))
+        assert [x.name for x in result] == [x.label for x in PanelResponseUtil.get_viewers(StubDataViewers)]
+
+        # Selected panels in the order of request, content is the same as for /entity/panel route
+        request_obj = PanelsRequest(type="StubDataViewers", key=key_str, panel_ids=["None", "Self"])
+        result = asyncio.run(PanelsResponseItem.get_panels(request_obj))
+        assert [(x.name, x.type) for x in result] == [("None", None), ("Self", "Primary")]
+        assert result[0].view_of is None
+        assert result[1].view_of == {"Id": "nested_1", "_t": "StubDataclassRecordKey"}
+
+        # Error for unknown panel
+        with pytest.raises(RuntimeError):
+            request_obj = PanelsRequest(type="StubDataViewers", key=key_str, panel_ids=["Unknown"])
+            asyncio.run(PanelsResponseItem.get_panels(request_obj))
+
+
+def test_api():
+    """Test REST API for /entity/panels route."""
+
+    with TestingContext() as context:
+        context.save_one(stub_viewers)
+
+        test_app = FastAPI()
+        test_app.include_router(entity_router.router, prefix="/entity", tags=["Entity"])
+        with TestClient(test_app) as test_client:
+            request_params = {"type": "StubDataViewers", "key": key_str, "panel_ids": ["Self", "None"]}
+            response = test_client.get("/entity/panels", params=request_params)
+            assert response.status_code == 200
+            assert response.json() == [
+                {"Name": "Self", "Type": "Primary", "ViewOf": {"Id": "nested_1", "_t": "StubDataclassRecordKey"}},
+                {"Name": "None", "Type": None, "ViewOf": None},
+            ]
+
+
+def test_prefetch():
+    """Test that records referenced by views are loaded using one database call per type."""
+
+    with TestingContext() as context:
+        records = [StubDataclassRecord(id=f"prefetch_{i}") for i in range(3)]
+        context.save_many(records)
+
+        # One view is a list of views
+        views = [KeyView(key=records[0].get_key()), [KeyView(key=x.get_key()) for x in records[1:]]]
+        with UsageCounters() as counters:
+            result = PanelResponseUtil.render_views(views)
+        assert counters.db_calls == 1
+        assert result[0]["Id"] == "prefetch_0"
+        assert [x["Id"] for x in result[1]] == ["prefetch_1", "prefetch_2"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
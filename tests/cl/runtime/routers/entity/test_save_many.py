@@ -0,0 +1,102 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.routers.entity import entity_router
+from cl.runtime.routers.entity.save_many_request import SaveManyItem
+from cl.runtime.routers.entity.save_many_request import SaveManyRequest
+from cl.runtime.routers.entity.save_many_response import SaveManyResponse
+from stubs.cl.runtime import StubDataclassDerivedRecord
+
+# Test save many payloads with new, updated, renamed, existing, repeated and invalid records
+save_many_payload = [
+    {"Record": {"Id": "new_record", "DerivedStrField": "new", "_t": "StubDataclassDerivedRecord"}},
+    {
+        "Record": {"Id": "updated_record", "DerivedStrField": "updated", "_t": "StubDataclassDerivedRecord"},
+        "OldRecordKey": "updated_record",
+    },
+    {
+        "Record": {"Id": "renamed_record", "DerivedStrField": "renamed", "_t": "StubDataclassDerivedRecord"},
+        "OldRecordKey": "old_record",
+    },
+    {"Record": {"Id": "existing_record", "DerivedStrField": "existing", "_t": "StubDataclassDerivedRecord"}},
+    {"Record": {"Id": "new_record", "DerivedStrField": "repeated", "_t": "StubDataclassDerivedRecord"}},
+    {"Record": {"Id": "invalid_record", "_t": "UnknownType"}},
+]
+
+
+def _save_existing_records(context):
+    """Save records that exist before the request."""
+    context.save_many(
+        [
+            StubDataclassDerivedRecord(id=x, derived_str_field="before")
+            for x in ["updated_record", "old_record", "existing_record"]
+        ]
+    )
+
+
+def _check_records(context):
+    """Check records after the request."""
+    records = {x.id: x.derived_str_field for x in context.load_all(StubDataclassDerivedRecord)}
+    assert records == {
+        "new_record": "new",
+        "updated_record": "updated",
+        "renamed_record": "renamed",
+        "existing_record": "before",
+    }
+
+
+def test_method():
+    """Test coroutine for /entity/save_many route."""
+
+    with TestingContext() as context:
+        _save_existing_records(context)
+
+        request_obj = SaveManyRequest(items=[SaveManyItem(**x) for x in save_many_payload])
+        result = SaveManyResponse.save_many(request_obj)
+
+        # Valid items are saved and errors are reported for the remaining items
+        assert result.keys == ["new_record", "updated_record", "renamed_record", None, None, None]
+        assert [x.index for x in result.errors] == [3, 4, 5]
+        assert "already exists" in result.errors[0].message
+        _check_records(context)
+
+
+def test_api():
+    """Test REST API for /entity/save_many route."""
+
+    with TestingContext() as context:
+        test_app = FastAPI()
+        test_app.include_router(entity_router.router, prefix="/entity", tags=["Entity"])
+        with TestClient(test_app) as test_client:
+            _save_existing_records(context)
+
+            response = test_client.post("/entity/save_many", json=save_many_payload)
+            assert response.status_code == 200
+            result = response.json()
+            assert result["Keys"] == ["new_record", "updated_record", "renamed_record", None, None, None]
+            assert [x["Index"] for x in result["Errors"]] == [3, 4, 5]
+            _check_records(context)
+
+            # Errors are omitted when all items are saved
+            response = test_client.post("/entity/save_many", json=save_many_payload[1:2])
+            assert response.status_code == 200
+            assert response.json() == {"Keys": ["updated_record"]}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -15,9 +15,12 @@
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.db import Db
 from cl.runtime.routers.storage import storage_router
 from cl.runtime.routers.storage.dataset_response import DatasetResponse
 from cl.runtime.routers.storage.datasets_request import DatasetsRequest
+from stubs.cl.runtime import StubDataclassRecord
 
 requests = [{"type": "StubClass"}, {"type": "StubClass", "user": "TestUser"}]
 
@@ -32,19 +35,20 @@ expected_result = [
 def test_method():
     """Test coroutine for /storage/get_envs route."""
 
-    for request in requests:
-        # Run the coroutine wrapper added by the FastAPI decorator and get the result
-        request_obj = DatasetsRequest(**request)
-        result = DatasetResponse.get_datasets(request_obj)
+    with TestingContext():
+        for request in requests:
+            # Run the coroutine wrapper added by the FastAPI decorator and get the result
+            request_obj = DatasetsRequest(**request)
+            result = DatasetResponse.get_datasets(request_obj)
 
-        # Check if the result is a list
-        assert isinstance(result, list)
+            # Check if the result is a list
+            assert isinstance(result, list)
 
-        # Check if each item in the result is a DatasetResponse instance
-        assert all(isinstance(x, DatasetResponse) for x in result)
+            # Check if each item in the result is a DatasetResponse instance
+            assert all(isinstance(x, DatasetResponse) for x in result)
 
-        # Check if each item in the result is a valid DatasetResponse instance
-        assert result == [DatasetResponse(**x) for x in expected_result]
+            # Check if each item in the result is a valid DatasetResponse instance
+            assert result == [DatasetResponse(**x) for x in expected_result]
 
 
 def test_api():
@@ -52,23 +56,55 @@ def test_api():
 
     test_app = FastAPI()
     test_app.include_router(storage_router.router, prefix="/storage", tags=["Storage"])
-    with TestClient(test_app) as test_client:
-        for request in requests:
-            # Split request headers and query
-            request_headers = {"user": request.get("user")}
-            request_params = {"type": request.get("type"), "module": request.get("module")}
+    with TestingContext():
+        with TestClient(test_app) as test_client:
+            for request in requests:
+                # Split request headers and query
+                request_headers = {"user": request.get("user")}
+                request_params = {"type": request.get("type"), "module": request.get("module")}
+
+                # Eliminate empty keys
+                request_headers = {k: v for k, v in request_headers.items() if v is not None}
+                request_params = {k: v for k, v in request_params.items() if v is not None}
+
+                # Get response
+                response = test_client.get("/storage/get_datasets", headers=request_headers, params=request_params)
+                assert response.status_code == 200
+                result = response.json()
 
-            # Eliminate empty keys
-            request_headers = {k: v for k, v in request_headers.items() if v is not None}
-            request_params = {k: v for k, v in request_params.items() if v is not None}
+                # Check result
+                assert result == expected_result
 
-            # Get response
-            response = test_client.get("/storage/get_datasets", headers=request_headers, params=request_params)
-            assert response.status_code == 200
-            result = response.json()
 
-            # Check result
-            assert result == expected_result
+def test_registry():
+    """Test that datasets where records are saved are listed and change ETag."""
+
+    test_app = FastAPI()
+    test_app.include_router(storage_router.router, prefix="/storage", tags=["Storage"])
+    Db.clear_dataset_registry()
+    try:
+        with TestingContext() as context:
+            with TestClient(test_app) as test_client:
+                response = test_client.get("/storage/get_datasets", params={"type": "StubClass"})
+                etag = response.headers["ETag"]
+                assert response.json() == expected_result
+
+                # Unchanged response is not sent again
+                response = test_client.get(
+                    "/storage/get_datasets", params={"type": "StubClass"}, headers={"If-None-Match": etag}
+                )
+                assert response.status_code == 304
+
+                # Saving into a new dataset adds it to the response
+                context.save_one(StubDataclassRecord(), dataset="\\abc")
+                response = test_client.get(
+                    "/storage/get_datasets", params={"type": "StubClass"}, headers={"If-None-Match": etag}
+                )
+                assert response.status_code == 200
+                assert response.headers["ETag"] != etag
+                assert response.json() == expected_result + [{"Name": "\\abc", "Parent": None}]
+    finally:
+        Db.clear_dataset_registry()
 
 
 if __name__ == "__main__":
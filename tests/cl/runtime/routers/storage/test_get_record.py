@@ -16,10 +16,12 @@ import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.routers.http_cache_util import RECORD_CACHE_CONTROL
 from cl.runtime.routers.storage import storage_router
 from cl.runtime.routers.storage.record_request import RecordRequest
 from cl.runtime.routers.storage.record_response import RecordResponse
 from cl.runtime.testing.regression_guard import RegressionGuard
+from stubs.cl.runtime import StubDataclassDerivedRecord
 from stubs.cl.runtime import StubDataclassRecord
 
 
@@ -80,5 +82,48 @@ def test_api():
             guard.verify()
 
 
+def test_etag():
+    """Test ETag and If-None-Match for /storage/record route."""
+
+    with TestingContext() as context:
+        test_app = FastAPI()
+        test_app.include_router(storage_router.router, prefix="/storage", tags=["Storage"])
+        with TestClient(test_app) as test_client:
+            record = StubDataclassRecord(id=__name__)
+            context.save_one(record)
+            request_params = {"type": "StubDataclassRecord", "key": record.id}
+
+            # First request returns ETag and Cache-Control
+            response = test_client.get("/storage/record", params=request_params)
+            assert response.status_code == 200
+            etag = response.headers["ETag"]
+            assert response.headers["Cache-Control"] == RECORD_CACHE_CONTROL
+
+            # Request with the same ETag returns Not Modified without body
+            response = test_client.get("/storage/record", params=request_params, headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.headers["ETag"] == etag
+            assert response.content == b""
+
+            # Weak and list forms of If-None-Match also match
+            response = test_client.get(
+                "/storage/record", params=request_params, headers={"If-None-Match": f'"other", W/{etag}'}
+            )
+            assert response.status_code == 304
+
+            # ETag changes after the record is saved with different data
+            context.save_one(StubDataclassDerivedRecord(id=__name__, derived_str_field="modified"))
+            response = test_client.get("/storage/record", params=request_params, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.headers["ETag"] != etag
+            assert response.json()["data"]["DerivedStrField"] == "modified"
+
+            # ETag does not change when the record is saved with the same data
+            new_etag = response.headers["ETag"]
+            context.save_one(StubDataclassDerivedRecord(id=__name__, derived_str_field="modified"))
+            response = test_client.get("/storage/record", params=request_params, headers={"If-None-Match": new_etag})
+            assert response.status_code == 304
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
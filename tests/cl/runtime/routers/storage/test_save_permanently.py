@@ -0,0 +1,62 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import os
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.file.csv_file_reader import CsvFileReader
+from cl.runtime.routers.storage import save_permanently_response
+from cl.runtime.routers.storage import storage_router
+from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassRecord
+
+
+def test_api(tmp_path):
+    """Test REST API for /storage/record/save_permanently route."""
+
+    records = [StubDataclassRecord(id=f"base_{i}") for i in range(5)]
+    records += [StubDataclassDerivedRecord(id=f"derived_{i}") for i in range(3)]
+
+    # Files are saved to the current directory, use small batches to test streaming
+    batch_size = save_permanently_response.SAVE_PERMANENTLY_BATCH_SIZE
+    current_dir = os.getcwd()
+    try:
+        os.chdir(tmp_path)
+        save_permanently_response.SAVE_PERMANENTLY_BATCH_SIZE = 3
+        with TestingContext() as context:
+            context.save_many(records)
+            test_app = FastAPI()
+            test_app.include_router(storage_router.router, prefix="/storage", tags=["Storage"])
+            with TestClient(test_app) as test_client:
+                request_body = {"type": "StubDataclassRecord", "keys": [x.id for x in records] + ["not_found"]}
+                response = test_client.post("/storage/record/save_permanently", json=request_body)
+                assert response.status_code == 200
+    finally:
+        save_permanently_response.SAVE_PERMANENTLY_BATCH_SIZE = batch_size
+        os.chdir(current_dir)
+
+    # One file per record type
+    assert sorted(os.listdir(tmp_path)) == ["StubDataclassDerivedRecord.csv", "StubDataclassRecord.csv"]
+
+    # Read records back
+    with TestingContext() as context:
+        for file_name in os.listdir(tmp_path):
+            CsvFileReader(file_path=os.path.join(tmp_path, file_name)).read_and_save()
+        assert list(context.load_all(StubDataclassRecord)) == records
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
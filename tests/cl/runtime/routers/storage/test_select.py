@@ -0,0 +1,137 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import json
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from cl.runtime import Context
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.routers.storage import select_response
+from cl.runtime.routers.storage import storage_router
+from cl.runtime.routers.storage.select_request import SelectRequest
+from cl.runtime.routers.storage.select_response import SelectResponse
+from stubs.cl.runtime import StubDataclassDerivedRecord
+
+_module = StubDataclassDerivedRecord.__module__
+"""Module of the selected record type."""
+
+
+def _save_records() -> None:
+    """Save records with alternating values of derived_str_field."""
+    records = [StubDataclassDerivedRecord(id=f"id{i}", derived_str_field="ab"[i % 2]) for i in range(5)]
+    Context.current().save_many(records)
+
+
+def test_method():
+    """Test coroutine for /storage/select route."""
+
+    with TestingContext():
+        _save_records()
+
+        # All records sorted by key when limit is not specified
+        request = SelectRequest(type_="StubDataclassDerivedRecord", module=_module)
+        result = SelectResponse.get_records(request)
+        assert [x["_key"] for x in result["data"]] == [f"id{i}" for i in range(5)]
+        assert result["total_count"] == 5
+        assert result["continuation_token"] is None
+
+        # Paging with continuation token, sorting and filtering on the database side
+        request = SelectRequest(
+            type_="StubDataclassDerivedRecord",
+            module=_module,
+            query_dict={"DerivedStrField": "a"},
+            sort="-id",
+            threshold=2,
+        )
+        first_page = SelectResponse.get_records(request)
+        assert [x["_key"] for x in first_page["data"]] == ["id4", "id2"]
+        assert first_page["total_count"] == 3
+        request.continuation_token = first_page["continuation_token"]
+        second_page = SelectResponse.get_records(request)
+        assert [x["_key"] for x in second_page["data"]] == ["id0"]
+        assert second_page["total_count"] == 3
+        assert second_page["continuation_token"] is None
+
+        # Only the requested columns are serialized
+        request = SelectRequest(type_="StubDataclassDerivedRecord", module=_module, columns=["Id"], threshold=1)
+        result = SelectResponse.get_records(request)
+        assert "DerivedStrField" not in result["data"][0]
+        assert result["data"][0]["Id"] == "id0"
+
+        # Token for another type is rejected
+        request = SelectRequest(type_="StubDataclassRecord", continuation_token=first_page["continuation_token"])
+        with pytest.raises(RuntimeError):
+            SelectResponse.get_records(request)
+
+
+def test_api():
+    """Test REST API for /storage/select route."""
+
+    with TestingContext():
+        test_app = FastAPI()
+        test_app.include_router(storage_router.router, prefix="/storage", tags=["Storage"])
+        with TestClient(test_app) as test_client:
+            _save_records()
+
+            params = {"type": "StubDataclassDerivedRecord", "module": _module, "limit": 3, "sort": "Id"}
+            response = test_client.post("/storage/select", params=params)
+            assert response.status_code == 200
+            result = response.json()
+            assert [x["_key"] for x in result["data"]] == ["id0", "id1", "id2"]
+            assert result["total_count"] == 5
+
+            params["continuation_token"] = result["continuation_token"]
+            response = test_client.post("/storage/select", params=params)
+            assert response.status_code == 200
+            assert [x["_key"] for x in response.json()["data"]] == ["id3", "id4"]
+
+
+def test_stream():
+    """Test /storage/select route in streaming mode with several batches."""
+
+    with TestingContext():
+        test_app = FastAPI()
+        test_app.include_router(storage_router.router, prefix="/storage", tags=["Storage"])
+        with TestClient(test_app) as test_client:
+            _save_records()
+
+            batch_size = select_response.SELECT_STREAM_BATCH_SIZE
+            select_response.SELECT_STREAM_BATCH_SIZE = 2
+            try:
+                params = {"type": "StubDataclassDerivedRecord", "module": _module}
+                expected = test_client.post("/storage/select", params=params).json()
+
+                # Chunked JSON has the same schema and data as the response that is not streamed
+                response = test_client.post("/storage/select", params={**params, "stream": "json"})
+                assert response.status_code == 200
+                assert response.headers["content-type"] == "application/json"
+                result = response.json()
+                assert result["schema"] == expected["schema"]
+                assert result["data"] == expected["data"]
+
+                # NDJSON has schema in the first line followed by one line per record, limit and skip are applied
+                response = test_client.post(
+                    "/storage/select", params={**params, "stream": "ndjson", "limit": 3, "skip": 1}
+                )
+                assert response.status_code == 200
+                lines = [json.loads(x) for x in response.iter_lines() if x]
+                assert lines[0] == {"schema": expected["schema"]}
+                assert lines[1:] == expected["data"][1:4]
+            finally:
+                select_response.SELECT_STREAM_BATCH_SIZE = batch_size
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -20,7 +20,10 @@ from cl.runtime.routers.tasks import tasks_router
 from cl.runtime.routers.tasks.run_error_response_item import RunErrorResponseItem
 from cl.runtime.routers.tasks.run_request import RunRequest
 from cl.runtime.routers.tasks.run_response_item import RunResponseItem
+from cl.runtime.routers.tasks.task_batch_status_request import TaskBatchStatusRequest
+from cl.runtime.routers.tasks.task_batch_status_response import TaskBatchStatusResponse
 from cl.runtime.serialization.string_serializer import StringSerializer
+from cl.runtime.tasks.celery.celery_queue import celery_app
 from cl.runtime.tasks.task import Task
 from cl.runtime.tasks.task_key import TaskKey
 from cl.runtime.testing.pytest.pytest_fixtures import celery_test_queue_fixture
@@ -90,6 +93,37 @@ def test_method(celery_test_queue_fixture):
             assert actual_records == expected_records
 
 
+def test_batch():
+    """Test that tasks for all keys in request are saved and submitted as one batch."""
+
+    with TestingContext() as context:
+        records = [StubHandlers(stub_id=f"test_batch_{i}") for i in range(5)]
+        context.save_many(records)
+        request = {
+            "dataset": "",
+            "table": "StubHandlers",
+            "keys": [key_serializer.serialize_key(x.get_key()) for x in records],
+            "method": "run_instance_method_1b",
+        }
+
+        # Run Celery tasks in-process
+        celery_app.conf.task_always_eager = True
+        try:
+            result = RunResponseItem.run_tasks(RunRequest(**request))
+        finally:
+            celery_app.conf.task_always_eager = False
+
+        # All tasks have the same batch id
+        assert [x.key for x in result] == request["keys"]
+        batch_ids = set(x.batch_id for x in result)
+        assert len(batch_ids) == 1
+
+        # Aggregate status of the batch
+        batch_status = TaskBatchStatusResponse.get_batch_status(TaskBatchStatusRequest(batch_id=batch_ids.pop()))
+        assert batch_status.task_count == len(records)
+        assert batch_status.status_code == "Completed"
+
+
 @pytest.mark.skip("Celery tasks lock sqlite db file.")  # TODO (Roman): resolve conflict
 def test_api(celery_test_queue_fixture):
     """Test REST API for /tasks/run route."""
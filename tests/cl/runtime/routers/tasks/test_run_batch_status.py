@@ -0,0 +1,106 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+from cl.runtime import Context
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.primitive.timestamp import Timestamp
+from cl.runtime.routers.tasks import tasks_router
+from cl.runtime.routers.tasks.run_response_item import handler_queue
+from cl.runtime.routers.tasks.task_batch_status_request import TaskBatchStatusRequest
+from cl.runtime.routers.tasks.task_batch_status_response import TaskBatchStatusResponse
+from cl.runtime.tasks.instance_method_task import InstanceMethodTask
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
+from stubs.cl.runtime import StubHandlers
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_handlers_key import StubHandlersKey
+
+
+def _save_batch(statuses: list[TaskStatusEnum]) -> str:
+    """Create and save tasks with the specified statuses in one batch, return batch id."""
+
+    batch_id = Timestamp.create()
+    tasks = [
+        InstanceMethodTask.create(
+            queue=handler_queue.get_key(),
+            record_or_key=StubHandlersKey(stub_id=f"{i}"),
+            method_callable=StubHandlers.run_instance_method_1a,
+        )
+        for i in range(len(statuses))
+    ]
+    for task, status in zip(tasks, statuses):
+        task.batch_id = batch_id
+        task.status = status
+        task.progress_pct = 100.0 if status == TaskStatusEnum.COMPLETED else 0.0
+    Context.current().save_many(tasks)
+    return batch_id
+
+
+def test_method():
+    """Test coroutine for /tasks/run/batch_status route."""
+
+    with TestingContext():
+
+        # Batch is running while any of its tasks is running
+        batch_id = _save_batch([TaskStatusEnum.COMPLETED, TaskStatusEnum.RUNNING, TaskStatusEnum.PENDING])
+        result = TaskBatchStatusResponse.get_batch_status(TaskBatchStatusRequest(batch_id=batch_id))
+        assert result.batch_id == batch_id
+        assert result.status_code == "Running"
+        assert result.task_count == 3
+        assert result.status_counts == {"Completed": 1, "Running": 1, "Submitted": 1}
+        assert result.progress_pct == pytest.approx(100.0 / 3)
+
+        # Counts of statuses with the same legacy name are added up
+        batch_id = _save_batch([TaskStatusEnum.PENDING, TaskStatusEnum.BLOCKED, TaskStatusEnum.PENDING])
+        result = TaskBatchStatusResponse.get_batch_status(TaskBatchStatusRequest(batch_id=batch_id))
+        assert result.status_code == "Submitted"
+        assert result.status_counts == {"Submitted": 3}
+
+        # Batch is failed when all tasks are finished and at least one has failed
+        batch_id = _save_batch([TaskStatusEnum.COMPLETED, TaskStatusEnum.FAILED])
+        result = TaskBatchStatusResponse.get_batch_status(TaskBatchStatusRequest(batch_id=batch_id))
+        assert result.status_code == "Failed"
+
+        # Batch is completed when all tasks are completed
+        batch_id = _save_batch([TaskStatusEnum.COMPLETED, TaskStatusEnum.COMPLETED])
+        result = TaskBatchStatusResponse.get_batch_status(TaskBatchStatusRequest(batch_id=batch_id))
+        assert result.status_code == "Completed"
+        assert result.progress_pct == 100.0
+
+        # Unknown batch has no tasks
+        result = TaskBatchStatusResponse.get_batch_status(TaskBatchStatusRequest(batch_id=Timestamp.create()))
+        assert result.status_code is None
+        assert result.task_count == 0
+
+
+def test_api():
+    """Test REST API for /tasks/run/batch_status route."""
+
+    with TestingContext():
+        batch_id = _save_batch([TaskStatusEnum.COMPLETED, TaskStatusEnum.PENDING])
+
+        test_app = FastAPI()
+        test_app.include_router(tasks_router.router, prefix="/tasks", tags=["Tasks"])
+        with TestClient(test_app) as test_client:
+            response = test_client.post("/tasks/run/batch_status", json={"batch_id": batch_id})
+            assert response.status_code == 200
+            result = TaskBatchStatusResponse(**response.json())
+            assert result.batch_id == batch_id
+            assert result.status_code == "Submitted"
+            assert result.task_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,127 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import asyncio
+import contextvars
+import json
+import threading
+import time
+from typing import List
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+from cl.runtime import Context
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.routers.tasks import tasks_router
+from cl.runtime.routers.tasks.run_response_item import handler_queue
+from cl.runtime.routers.tasks.task_status_update_item import TaskStatusUpdateItem
+from cl.runtime.routers.tasks.task_status_wait_request import TaskStatusWaitRequest
+from cl.runtime.tasks.static_method_task import StaticMethodTask
+from cl.runtime.tasks.task import Task
+from stubs.cl.runtime import StubHandlers
+
+
+def _save_tasks() -> List[Task]:
+    """Create and save tasks that complete successfully."""
+    tasks = [
+        StaticMethodTask.create(
+            queue=handler_queue.get_key(),
+            record_type=StubHandlers,
+            method_callable=StubHandlers.run_static_method_1a,
+        )
+        for _ in range(2)
+    ]
+    Context.current().save_many(tasks)
+    return tasks
+
+
+def _run_task_later(task: Task, delay_sec: float) -> threading.Thread:
+    """Run the task in a separate thread after a delay."""
+
+    def run_task():
+        time.sleep(delay_sec)
+        task.run_task()
+
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(run_task,))
+    thread.start()
+    return thread
+
+
+def test_method():
+    """Test long-poll for task status updates."""
+
+    with TestingContext():
+        tasks = _save_tasks()
+        task_run_ids = [str(task.task_id) for task in tasks]
+
+        # Without revisions the current status is returned immediately
+        request = TaskStatusWaitRequest(task_run_ids=task_run_ids, timeout_sec=10.0)
+        result = asyncio.run(TaskStatusUpdateItem.wait_for_updates(request))
+        assert [x.task_run_id for x in result] == task_run_ids
+        assert all(x.status_code == "Submitted" for x in result)
+        revisions = {x.task_run_id: x.revision for x in result}
+
+        # With the current revisions an empty list is returned on timeout
+        request = TaskStatusWaitRequest(task_run_ids=task_run_ids, revisions=revisions, timeout_sec=0.1)
+        assert asyncio.run(TaskStatusUpdateItem.wait_for_updates(request)) == []
+
+        # Update published by run_task in another thread is returned without waiting for the timeout
+        thread = _run_task_later(tasks[0], 0.2)
+        try:
+            request = TaskStatusWaitRequest(task_run_ids=task_run_ids, revisions=revisions, timeout_sec=30.0)
+            start_time = time.monotonic()
+            result = asyncio.run(TaskStatusUpdateItem.wait_for_updates(request))
+            assert time.monotonic() - start_time < 10.0
+        finally:
+            thread.join()
+        assert [x.task_run_id for x in result] == task_run_ids[:1]
+        assert result[0].status_code in ("Running", "Completed")
+
+
+def test_api():
+    """Test REST API for /tasks/run/status/wait and /tasks/run/status/events routes."""
+
+    with TestingContext():
+        test_app = FastAPI()
+        test_app.include_router(tasks_router.router, prefix="/tasks", tags=["Tasks"])
+        with TestClient(test_app) as test_client:
+            tasks = _save_tasks()
+            task_run_ids = [str(task.task_id) for task in tasks]
+
+            # Long-poll
+            request = {"task_run_ids": task_run_ids, "timeout_sec": 10.0}
+            response = test_client.post("/tasks/run/status/wait", json=request)
+            assert response.status_code == 200
+            result = [TaskStatusUpdateItem(**x) for x in response.json()]
+            assert [x.task_run_id for x in result] == task_run_ids
+
+            # Event stream includes updates as tasks run and is closed when all tasks are finished
+            threads = [_run_task_later(task, 0.2) for task in tasks]
+            try:
+                params = {"task_run_ids": task_run_ids, "timeout_sec": 30.0}
+                with test_client.stream("GET", "/tasks/run/status/events", params=params) as response:
+                    assert response.status_code == 200
+                    assert response.headers["content-type"].startswith("text/event-stream")
+                    data_lines = [x for x in response.iter_lines() if x.startswith("data: ")]
+            finally:
+                for thread in threads:
+                    thread.join()
+            events = [TaskStatusUpdateItem(**json.loads(x.removeprefix("data: "))) for x in data_lines]
+            assert events[0].status_code == "Submitted"
+            for task_run_id in task_run_ids:
+                assert [x.status_code for x in events if x.task_run_id == task_run_id][-1] == "Completed"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
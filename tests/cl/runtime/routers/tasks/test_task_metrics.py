@@ -0,0 +1,105 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+from cl.runtime import Context
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.routers.tasks import tasks_router
+from cl.runtime.routers.tasks.task_metrics_request import TaskMetricsRequest
+from cl.runtime.routers.tasks.task_metrics_response_item import TaskMetricsPercentiles
+from cl.runtime.routers.tasks.task_metrics_response_item import TaskMetricsResponseItem
+from cl.runtime.tasks.instance_method_task import InstanceMethodTask
+from cl.runtime.tasks.process_queue import ProcessQueue
+from cl.runtime.tasks.task import Task
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
+from stubs.cl.runtime import StubHandlers
+
+
+def _run_tasks(queue_id: str) -> None:
+    """Run instance method tasks in-process to record their metrics."""
+
+    context = Context.current()
+    queue = ProcessQueue(queue_id=queue_id)
+    records = [StubHandlers(stub_id=f"{queue_id}.{i}") for i in range(3)]
+    context.save_many(records)
+    for record in records:
+        task = InstanceMethodTask.create(
+            queue=queue.get_key(),
+            record_or_key=record.get_key(),
+            method_callable=StubHandlers.run_instance_method_1a,
+        )
+        context.save_one(task)
+        task.run_task()
+
+
+def test_percentiles():
+    """Test nearest-rank percentiles."""
+
+    assert TaskMetricsPercentiles.from_values([]) is None
+    result = TaskMetricsPercentiles.from_values(list(range(100, 0, -1)))
+    assert (result.p50, result.p90, result.p99, result.max) == (50.0, 90.0, 99.0, 100.0)
+
+
+def test_method():
+    """Test coroutine for /tasks/metrics route."""
+
+    with TestingContext() as context:
+        queue_id = "test_task_metrics.test_method"
+        _run_tasks(queue_id)
+
+        # Metrics are recorded on the task
+        tasks = list(context.load_query((Task, {"status": TaskStatusEnum.COMPLETED}, {})))
+        assert len(tasks) == 3
+        for task in tasks:
+            assert task.queue_wait_sec >= 0.0
+            assert task.elapsed_sec >= 0.0
+            assert task.cpu_sec >= 0.0
+            assert task.db_calls >= 1  # Record is loaded by the handler
+            assert task.db_bytes > 0
+            assert task.llm_tokens == 0
+
+        # Aggregated per handler
+        result = TaskMetricsResponseItem.get_task_metrics(TaskMetricsRequest(queue_id=queue_id))
+        assert len(result) == 1
+        assert result[0].handler == "StubHandlersKey.run_instance_method_1a"
+        assert result[0].task_count == 3
+        assert result[0].failed_count == 0
+        assert result[0].elapsed_sec.max >= result[0].elapsed_sec.p50
+
+        # Other queues are excluded
+        assert TaskMetricsResponseItem.get_task_metrics(TaskMetricsRequest(queue_id="other")) == []
+
+
+def test_api():
+    """Test REST API for /tasks/metrics route."""
+
+    with TestingContext():
+        queue_id = "test_task_metrics.test_api"
+        _run_tasks(queue_id)
+
+        test_app = FastAPI()
+        test_app.include_router(tasks_router.router, prefix="/tasks", tags=["Tasks"])
+        with TestClient(test_app) as test_client:
+            response = test_client.get("/tasks/metrics", params={"queue_id": queue_id, "limit": 2})
+            assert response.status_code == 200
+            result = [TaskMetricsResponseItem(**x) for x in response.json()]
+            assert len(result) == 1
+            assert result[0].task_count == 2
+            assert result[0].db_calls is not None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
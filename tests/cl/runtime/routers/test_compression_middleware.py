@@ -0,0 +1,137 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import orjson
+from fastapi import FastAPI
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from cl.runtime.routers.compression_middleware import CompressionMiddleware
+from cl.runtime.routers.http_cache_util import HttpCacheUtil
+
+_large_content = {"Values": [f"Value{i}" for i in range(1000)]}
+"""Content large enough to be compressed."""
+
+_large_body = orjson.dumps(_large_content)
+"""Serialized large content."""
+
+
+def _create_client() -> TestClient:
+    """Create test client for an app with the routes used in tests."""
+
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @test_app.get("/large")
+    async def get_large():
+        return Response(content=_large_body, media_type="application/json")
+
+    @test_app.get("/small")
+    async def get_small():
+        return {"Value": "Small"}
+
+    @test_app.get("/image")
+    async def get_image():
+        return Response(content=b"\x89PNG" + bytes(4096), media_type="image/png")
+
+    @test_app.get("/etag")
+    async def get_etag():
+        headers = {"ETag": HttpCacheUtil.get_etag((_large_body,))}
+        return Response(content=_large_body, media_type="application/json", headers=headers)
+
+    @test_app.get("/stream")
+    async def get_stream():
+        chunks = (orjson.dumps(x) + b"\n" for x in _large_content["Values"])
+        return StreamingResponse(chunks, media_type="application/x-ndjson")
+
+    @test_app.get("/events")
+    async def get_events():
+        chunks = (f"data: {x}\n\n".encode() for x in _large_content["Values"])
+        return StreamingResponse(chunks, media_type="text/event-stream")
+
+    return TestClient(test_app)
+
+
+def test_select_encoding():
+    """Test Accept-Encoding negotiation."""
+
+    assert CompressionMiddleware.select_encoding(None) is None
+    assert CompressionMiddleware.select_encoding("identity") is None
+    assert CompressionMiddleware.select_encoding("gzip") == "gzip"
+    assert CompressionMiddleware.select_encoding("deflate, GZIP;q=0.5") == "gzip"
+    assert CompressionMiddleware.select_encoding("gzip;q=0") is None
+    assert CompressionMiddleware.select_encoding("*") is not None
+    assert CompressionMiddleware.select_encoding("*;q=0") is None
+    assert CompressionMiddleware.select_encoding("*, gzip;q=0") != "gzip"
+
+
+def test_compression():
+    """Test compression of complete and streaming responses."""
+
+    client = _create_client()
+    gzip_headers = {"Accept-Encoding": "gzip"}
+
+    # Large body is compressed with Content-Length of the compressed body
+    response = client.get("/large", headers=gzip_headers)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) < len(_large_body)
+    assert response.json() == _large_content
+
+    # Not compressed when the client does not accept it
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.content == _large_body
+
+    # Small body and incompressible media type are not compressed
+    assert "Content-Encoding" not in client.get("/small", headers=gzip_headers).headers
+    assert "Content-Encoding" not in client.get("/image", headers=gzip_headers).headers
+
+    # Streaming body is compressed chunk by chunk
+    response = client.get("/stream", headers=gzip_headers)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert [orjson.loads(x) for x in response.text.splitlines()] == _large_content["Values"]
+
+    # Server-Sent Events are not compressed so that each event is delivered without delay
+    response = client.get("/events", headers=gzip_headers)
+    assert "Content-Encoding" not in response.headers
+
+
+def test_cache():
+    """Test that compressed body of a response with ETag is cached."""
+
+    client = _create_client()
+    gzip_headers = {"Accept-Encoding": "gzip"}
+    CompressionMiddleware.clear_cache()
+    try:
+        response = client.get("/etag", headers=gzip_headers)
+        assert response.headers["ETag"].startswith('W/"')
+        cache_size = CompressionMiddleware.get_cache_size()
+        assert cache_size == int(response.headers["Content-Length"])
+
+        # The second response uses the cached body
+        response = client.get("/etag", headers=gzip_headers)
+        assert CompressionMiddleware.get_cache_size() == cache_size
+        assert response.json() == _large_content
+
+        # Responses without ETag are not cached
+        client.get("/large", headers=gzip_headers)
+        assert CompressionMiddleware.get_cache_size() == cache_size
+    finally:
+        CompressionMiddleware.clear_cache()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,70 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import asyncio
+import time
+from cl.runtime import Context
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.routers.db_executor import DbExecutor
+from cl.runtime.settings.api_settings import ApiSettings
+
+
+def _get_context_id() -> str:
+    """Return context_id of the current context."""
+    return Context.current().context_id
+
+
+def _fail() -> None:
+    """Raise an error."""
+    raise RuntimeError("Test error.")
+
+
+def test_context():
+    """Test that the current context is propagated to the pool thread and exceptions to the caller."""
+
+    with TestingContext() as context:
+        assert asyncio.run(DbExecutor.run(_get_context_id)) == context.context_id
+
+        failed_before = DbExecutor.get_stats().failed
+        with pytest.raises(RuntimeError, match="Test error."):
+            asyncio.run(DbExecutor.run(_fail))
+        assert DbExecutor.get_stats().failed == failed_before + 1
+
+
+def test_event_loop_not_blocked():
+    """Test that the event loop keeps running while a slow call runs in the pool."""
+
+    async def run_slow_call_and_count_ticks() -> int:
+        slow_call = asyncio.ensure_future(DbExecutor.run(time.sleep, 0.5))
+        ticks = 0
+        while not slow_call.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+        await slow_call
+        return ticks
+
+    completed_before = DbExecutor.get_stats().completed
+    assert asyncio.run(run_slow_call_and_count_ticks()) > 10
+
+    stats = DbExecutor.get_stats()
+    assert stats.max_workers == ApiSettings.instance().db_executor_max_workers
+    assert stats.completed == completed_before + 1
+    assert stats.running == 0
+    assert stats.get_queued() == 0
+    assert stats.total_run_sec >= 0.5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,76 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import json
+import os
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from cl.runtime.context.context import Context
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.perf.request_tracer import RequestTracer
+from cl.runtime.routers.db_executor import DbExecutor
+from cl.runtime.routers.health import health_router
+from cl.runtime.routers.tracing_middleware import TracingMiddleware
+from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataclassRecordKey
+
+
+def test_smoke(tmp_path):
+    """Test Server-Timing header, /health/perf summary and trace file."""
+
+    trace_path = os.path.join(tmp_path, "traces.{pid}.jsonl")
+    test_app = FastAPI()
+    test_app.add_middleware(TracingMiddleware, trace_path=trace_path)
+    test_app.include_router(health_router.router, prefix="", tags=["Health Check"])
+
+    @test_app.get("/records/{record_id}")
+    async def get_record(record_id: str):
+        # Database spans are recorded in executor threads
+        record = await DbExecutor.run(
+            Context.current().load_one, StubDataclassRecord, StubDataclassRecordKey(id=record_id)
+        )
+        return {"Id": record.id}
+
+    RequestTracer.clear_summary()
+    try:
+        with TestingContext() as context:
+            context.save_one(StubDataclassRecord(id="abc"))
+            with TestClient(test_app) as test_client:
+                for _ in range(3):
+                    response = test_client.get("/records/abc")
+                    assert response.status_code == 200
+                    assert "db;dur=" in response.headers["Server-Timing"]
+                    assert 'desc="1 calls, 1 rows"' in response.headers["Server-Timing"]
+
+                # Summary groups requests by route template
+                response = test_client.get("/health/perf")
+                assert response.status_code == 200
+                routes = {x["Route"]: x for x in response.json()["Routes"]}
+                assert routes["GET /records/{record_id}"]["Count"] == 3
+                latency_ms = routes["GET /records/{record_id}"]["LatencyMs"]
+                assert latency_ms["Max"] >= latency_ms["P99"] >= latency_ms["P50"] > 0
+
+        # One line per request in OpenTelemetry JSON format
+        with open(trace_path.replace("{pid}", str(os.getpid()))) as trace_file:
+            traces = [json.loads(line) for line in trace_file]
+        spans = traces[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert spans[0]["name"] == "GET /records/{record_id}"
+        assert [x["name"] for x in spans[1:]] == ["db"]
+    finally:
+        RequestTracer.clear_summary()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,44 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from cl.runtime.records.record_util import RecordUtil
+from cl.runtime.settings.celery_settings import CelerySettings
+
+
+def test_defaults():
+    """Test defaults for CelerySettings class."""
+
+    celery_settings = CelerySettings.instance()
+    assert celery_settings.pool in ["solo", "prefork", "threads"]
+    assert celery_settings.broker in ["sqlite", "filesystem"]
+    assert 1 <= celery_settings.min_workers <= celery_settings.max_workers
+
+
+def test_validation():
+    """Test validation of pool, broker and worker bounds."""
+
+    RecordUtil.init_all(CelerySettings(pool="prefork", min_workers=2, max_workers=8))
+    with pytest.raises(RuntimeError):
+        RecordUtil.init_all(CelerySettings(pool="eventlet"))
+    with pytest.raises(RuntimeError):
+        RecordUtil.init_all(CelerySettings(broker="redis"))
+    with pytest.raises(RuntimeError):
+        RecordUtil.init_all(CelerySettings(min_workers=0))
+    with pytest.raises(RuntimeError):
+        RecordUtil.init_all(CelerySettings(min_workers=4, max_workers=2))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
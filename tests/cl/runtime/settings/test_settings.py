@@ -0,0 +1,78 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import json
+import os
+import subprocess
+import sys
+from cl.runtime.settings.context_settings import ContextSettings
+from cl.runtime.settings.project_settings import ProjectSettings
+from cl.runtime.settings.settings import SETTINGS_SNAPSHOT_ENVVAR
+from cl.runtime.settings.settings import Settings
+
+_child_script = """
+import json
+import sys
+from cl.runtime.settings.context_settings import ContextSettings
+from cl.runtime.settings.settings import Settings
+imported_before = "dynaconf" in sys.modules
+packages = ContextSettings.instance().packages
+print(json.dumps({
+    "imported_before": imported_before,
+    "imported_after": "dynaconf" in sys.modules,
+    "is_inside_test": Settings.get_is_inside_test(),
+    "packages": packages,
+}))
+"""
+
+
+def _run_child(env: dict) -> dict:
+    """Run child script in a separate process and return its output."""
+    output = subprocess.check_output(
+        [sys.executable, "-c", _child_script], env=env, cwd=ProjectSettings.get_project_root(), text=True
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_lazy_load():
+    """Test that settings files are not read on import."""
+
+    # Remove the envvar set by pytest so the child process is not detected as running inside a test
+    env = {k: v for k, v in os.environ.items() if k not in (SETTINGS_SNAPSHOT_ENVVAR, "PYTEST_VERSION")}
+    result = _run_child(env)
+    assert not result["imported_before"]
+    assert result["imported_after"]
+    assert not result["is_inside_test"]
+
+
+def test_snapshot():
+    """Test that a child process loads settings from the snapshot written by the parent."""
+
+    snapshot_path = Settings.save_snapshot()
+    try:
+        assert snapshot_path is not None and os.path.exists(snapshot_path)
+        assert os.environ[SETTINGS_SNAPSHOT_ENVVAR] == snapshot_path
+
+        result = _run_child(dict(os.environ))
+        assert not result["imported_after"]
+        assert result["is_inside_test"]
+        assert result["packages"] == ContextSettings.instance().packages
+    finally:
+        # Other tests do not expect the envvar to be set, the file will be deleted on exit
+        del os.environ[SETTINGS_SNAPSHOT_ENVVAR]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -16,18 +16,20 @@ import pytest
 from cl.runtime import Context
 from cl.runtime.context.testing_context import TestingContext
 from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.settings.celery_settings import CelerySettings
 from cl.runtime.tasks.celery.celery_queue import CeleryQueue
-from cl.runtime.tasks.celery.celery_queue import execute_task
+from cl.runtime.tasks.celery.celery_queue import celery_get_batch_size
+from cl.runtime.tasks.celery.celery_queue import celery_get_broker
+from cl.runtime.tasks.celery.celery_queue import celery_get_worker_argv
+from cl.runtime.tasks.celery.celery_queue import execute_tasks
 from cl.runtime.tasks.static_method_task import StaticMethodTask
 from cl.runtime.tasks.task import Task
 from cl.runtime.tasks.task_key import TaskKey
 from cl.runtime.tasks.task_queue_key import TaskQueueKey
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
 from cl.runtime.testing.pytest.pytest_fixtures import celery_test_queue_fixture
 from stubs.cl.runtime import StubHandlers
 
-context_serializer = DictSerializer()
-"""Serializer for the context parameter of 'execute_task' method."""
-
 
 def _create_task(queue: TaskQueueKey) -> TaskKey:
     """Create a test task."""
@@ -40,7 +42,7 @@ def _create_task(queue: TaskQueueKey) -> TaskKey:
 
 @pytest.mark.skip("Celery tasks lock sqlite db file.")  # TODO (Roman): resolve conflict
 def test_method(celery_test_queue_fixture):
-    """Test calling 'execute_task' method in-process."""
+    """Test calling 'execute_tasks' method in-process."""
 
     with TestingContext() as context:
 
@@ -52,11 +54,13 @@ def test_method(celery_test_queue_fixture):
         # Create task
         task_key = _create_task(queue.get_key())
 
-        # Call 'execute_task' method in-process
-        context_data = context_serializer.serialize_data(context)
-        execute_task(
-            task_key.task_id,
+        # Call 'execute_tasks' method in-process
+        context_data = context.to_compact_dict()
+        task = context.load_one(Task, task_key)
+        execute_tasks(
+            Context.get_compact_ref(context_data),
             context_data,
+            [DictSerializer().serialize_data(task)],
         )
 
 
@@ -78,5 +82,88 @@ def test_api(celery_test_queue_fixture):
         Task.wait_for_completion(task_key)
 
 
+def test_execute_tasks():
+    """Test running a batch of tasks inlined in the message in-process without loading them from the database."""
+
+    with TestingContext() as context:
+        # Create queue
+        queue_id = "test_celery_queue.test_execute_tasks"
+        queue = CeleryQueue(queue_id=queue_id)
+        context.save_one(queue)
+
+        # Create tasks and serialize them as they are sent in the message
+        task_keys = [_create_task(queue.get_key()) for _ in range(3)]
+        task_data_list = [DictSerializer().serialize_data(x) for x in context.load_many(Task, task_keys)]
+        context_data = context.to_compact_dict()
+        compact_ref = Context.get_compact_ref(context_data)
+
+        # Run the batch in-process
+        execute_tasks(compact_ref, context_data, task_data_list)
+        assert all(x.status == TaskStatusEnum.COMPLETED for x in context.load_many(Task, task_keys))
+
+        # Message delivered more than once does not run the tasks again
+        execute_tasks(compact_ref, context_data, task_data_list)
+        assert all(x.status == TaskStatusEnum.COMPLETED for x in context.load_many(Task, task_keys))
+
+
+def test_submit_missing_tasks():
+    """Test that submitting tasks that are not saved raises an error naming the missing tasks."""
+
+    with TestingContext():
+        queue = CeleryQueue(queue_id="test_celery_queue.test_submit_missing_tasks")
+        with pytest.raises(RuntimeError, match="missing_task_id"):
+            queue.submit_tasks([TaskKey(task_id="missing_task_id")])
+
+
+def test_unsupported_fields():
+    """Test that scheduling fields not supported by Celery raise an error on submit."""
+
+    with TestingContext():
+        for queue in [
+            CeleryQueue(queue_id="test_celery_queue.test_unsupported_fields", priority_weights=[8, 4, 1]),
+            CeleryQueue(queue_id="test_celery_queue.test_unsupported_fields", max_running_per_user=2),
+        ]:
+            with pytest.raises(RuntimeError, match="not supported"):
+                queue.submit_tasks([])
+
+
+def test_batch_size():
+    """Test that tasks are spread across workers in batches."""
+
+    assert celery_get_batch_size(1000, CelerySettings(pool="solo")) == 100
+    assert celery_get_batch_size(8, CelerySettings(pool="solo")) == 8
+    assert celery_get_batch_size(8, CelerySettings(pool="threads", max_workers=4)) == 2
+    assert celery_get_batch_size(3, CelerySettings(pool="prefork", max_workers=4)) == 1
+
+
+def test_worker_argv():
+    """Test worker command line arguments for each pool."""
+
+    solo_argv = celery_get_worker_argv(CelerySettings(pool="solo"))
+    assert "--pool=solo" in solo_argv
+    assert "--concurrency=1" in solo_argv
+
+    prefork_argv = celery_get_worker_argv(CelerySettings(pool="prefork", min_workers=2, max_workers=6))
+    assert "--pool=prefork" in prefork_argv
+    assert "--autoscale=6,2" in prefork_argv
+
+    threads_argv = celery_get_worker_argv(CelerySettings(pool="threads", max_workers=3))
+    assert "--pool=threads" in threads_argv
+    assert "--concurrency=3" in threads_argv
+    assert not any(x.startswith("--autoscale") for x in threads_argv)
+
+
+def test_broker():
+    """Test broker URL and transport options for each local broker."""
+
+    sqlite_url, sqlite_options = celery_get_broker(CelerySettings(broker="sqlite", broker_timeout_sec=5))
+    assert sqlite_url.startswith("sqlalchemy+sqlite:///")
+    assert sqlite_options["connect_args"]["timeout"] == 5
+
+    filesystem_url, filesystem_options = celery_get_broker(CelerySettings(broker="filesystem"))
+    assert filesystem_url == "filesystem://"
+    assert filesystem_options["data_folder_in"] == filesystem_options["data_folder_out"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
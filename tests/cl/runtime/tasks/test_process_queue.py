@@ -13,9 +13,16 @@
 # limitations under the License.
 
 import pytest
+import contextvars
+import threading
+import time
 from cl.runtime.context.testing_context import TestingContext
 from cl.runtime.tasks.process_queue import ProcessQueue
+from cl.runtime.tasks.static_method_task import StaticMethodTask
+from cl.runtime.tasks.task import Task
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
 from cl.runtime.testing.regression_guard import RegressionGuard
+from stubs.cl.runtime import StubHandlers
 from stubs.cl.runtime.tasks.stub_task import StubTask
 
 
@@ -45,5 +52,65 @@ def test_process_queue():
         guard.verify()
 
 
+def test_worker_pool():
+    """Test ProcessQueue class with a pool of worker threads."""
+
+    with TestingContext() as context:
+
+        # Create queue
+        queue = ProcessQueue(queue_id="test_worker_pool", max_workers=2)
+        queue.timeout_sec = 1
+        queue.init()
+        queue_key = queue.get_key()
+
+        # Create and save tasks
+        task_count = 4
+        method_callable = StubHandlers.run_static_method_1a
+        tasks = [
+            StaticMethodTask.create(queue=queue_key, record_type=StubHandlers, method_callable=method_callable)
+            for _ in range(task_count)
+        ]
+        context.save_many(tasks)
+
+        # Start queue, it will exit after timeout once all tasks are completed
+        queue.run_start_queue()
+
+        # Check that all tasks have been completed
+        loaded_tasks = context.load_many(Task, [task.get_key() for task in tasks])
+        assert all(task.status == TaskStatusEnum.COMPLETED for task in loaded_tasks)
+
+
+def test_event_driven_dispatch():
+    """Test that a task submitted to a running ProcessQueue is dispatched and waited for without polling delay."""
+
+    with TestingContext() as context:
+
+        # Start queue in a separate thread with the same current context
+        queue = ProcessQueue(queue_id="test_event_driven_dispatch", max_workers=1)
+        queue.timeout_sec = 10
+        queue.init()
+        queue_thread = threading.Thread(target=contextvars.copy_context().run, args=(queue.run_start_queue,))
+        queue_thread.start()
+        try:
+            # Allow the queue to complete the first poll and start waiting
+            time.sleep(0.5)
+
+            # Submit task and wait for its completion
+            start_time = time.perf_counter()
+            method_callable = StubHandlers.run_static_method_1a
+            task = StaticMethodTask.create(
+                queue=queue.get_key(), record_type=StubHandlers, method_callable=method_callable
+            )
+            context.save_one(task)
+            queue.submit_task(task.get_key())
+            Task.wait_for_completion(task.get_key())
+
+            # Polling interval after the first poll with no tasks is 2 sec
+            assert time.perf_counter() - start_time < 1.0
+        finally:
+            queue.run_stop_queue()
+            queue_thread.join()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,56 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import multiprocessing
+import threading
+from cl.runtime.tasks.task_notifier import TaskNotifier
+
+
+def test_task_notifier():
+    """Test TaskNotifier class."""
+
+    # Times out if there is no notification
+    version = TaskNotifier.get_version()
+    assert not TaskNotifier.wait(version, 0.01)
+
+    # Returns immediately if notified after version was obtained
+    TaskNotifier.notify()
+    assert TaskNotifier.wait(version, 0.01)
+
+    # Wakes up on notification from another thread
+    version = TaskNotifier.get_version()
+    notifier_thread = threading.Timer(0.01, TaskNotifier.notify)
+    notifier_thread.start()
+    assert TaskNotifier.wait(version, 10.0)
+    notifier_thread.join()
+
+
+def test_other_process():
+    """Test that notification from another process wakes up waiters in this process."""
+
+    # Start listening before the other process looks for listeners
+    TaskNotifier.listen()
+    version = TaskNotifier.get_version()
+    notifier_process = multiprocessing.get_context("spawn").Process(target=TaskNotifier.notify)
+    notifier_process.start()
+    try:
+        assert TaskNotifier.wait(version, 60.0)
+    finally:
+        notifier_process.join()
+    assert notifier_process.exitcode == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,56 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import time
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.tasks import task_queue
+from cl.runtime.tasks.process_queue import ProcessQueue
+from cl.runtime.tasks.task import Task
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
+from stubs.cl.runtime.tasks.stub_task import StubTask
+
+
+def test_compact_tasks():
+    """Test deleting finished tasks of the queue."""
+
+    with TestingContext() as context:
+        queue = ProcessQueue(queue_id="test_compact_tasks")
+        other_queue = ProcessQueue(queue_id="test_compact_tasks.other")
+
+        # Create and save tasks
+        statuses = [TaskStatusEnum.PENDING, TaskStatusEnum.COMPLETED, TaskStatusEnum.FAILED]
+        tasks = [StubTask(queue=x.get_key(), status=status) for x in (queue, other_queue) for status in statuses]
+        for task in tasks:
+            task.init()
+        context.save_many(tasks)
+
+        # Tasks submitted within retention period are not deleted
+        assert queue.compact_tasks(retention_sec=3600) == 0
+
+        # Finished tasks of this queue are deleted in pages, pending tasks and tasks of other queues remain
+        time.sleep(0.01)
+        page_size = task_queue.COMPACT_TASKS_PAGE_SIZE
+        try:
+            task_queue.COMPACT_TASKS_PAGE_SIZE = 1
+            assert queue.compact_tasks(retention_sec=0) == 2
+        finally:
+            task_queue.COMPACT_TASKS_PAGE_SIZE = page_size
+        remaining_tasks = context.load_all(Task)
+        assert len(remaining_tasks) == 4
+        assert all(x.status == TaskStatusEnum.PENDING or x.queue == other_queue.get_key() for x in remaining_tasks)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
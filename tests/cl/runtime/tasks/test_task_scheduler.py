@@ -0,0 +1,73 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from cl.runtime.backend.core.user_key import UserKey
+from cl.runtime.tasks.task_priority_enum import TaskPriorityEnum
+from cl.runtime.tasks.task_queue_key import TaskQueueKey
+from cl.runtime.tasks.task_scheduler import TaskScheduler
+from stubs.cl.runtime.tasks.stub_task import StubTask
+
+
+def _create_tasks(priority: TaskPriorityEnum, count: int, *, username: str | None = None):
+    """Create tasks with the specified priority and user."""
+    user = UserKey(username=username) if username is not None else None
+    queue = TaskQueueKey(queue_id="test_task_scheduler")
+    return [StubTask(label=f"{priority.name}.{i}", queue=queue, priority=priority, user=user) for i in range(count)]
+
+
+def test_weighted_fair_scheduling():
+    """Test that priorities share dispatched tasks in proportion to their weights."""
+
+    scheduler = TaskScheduler(priority_weights=[8, 4, 1])
+    candidates = {priority: _create_tasks(priority, 20) for priority in TaskPriorityEnum}
+    selected = scheduler.select(candidates, {}, 13)
+    selected_priorities = [task.priority for task in selected]
+    assert selected_priorities[0] == TaskPriorityEnum.HIGH
+    assert selected_priorities.count(TaskPriorityEnum.HIGH) == 8
+    assert selected_priorities.count(TaskPriorityEnum.NORMAL) == 4
+    assert selected_priorities.count(TaskPriorityEnum.LOW) == 1
+
+    # Tasks of the same priority are selected in the order of submission
+    high_labels = [task.label for task in selected if task.priority == TaskPriorityEnum.HIGH]
+    assert high_labels == [f"HIGH.{i}" for i in range(8)]
+
+    # When only low priority tasks are queued, they receive all workers
+    selected = scheduler.select({TaskPriorityEnum.LOW: _create_tasks(TaskPriorityEnum.LOW, 5)}, {}, 3)
+    assert len(selected) == 3
+
+
+def test_per_user_limit():
+    """Test per-user limit and fairness across users within the same priority."""
+
+    scheduler = TaskScheduler(max_running_per_user=2)
+    candidates = {
+        TaskPriorityEnum.NORMAL: _create_tasks(TaskPriorityEnum.NORMAL, 5, username="a")
+        + _create_tasks(TaskPriorityEnum.NORMAL, 5, username="b")
+        + _create_tasks(TaskPriorityEnum.NORMAL, 2)
+    }
+
+    # User 'a' already has one running task, tasks without user are not limited
+    selected = scheduler.select(candidates, {"a": 1}, None)
+    usernames = [task.user.username if task.user is not None else None for task in selected]
+    assert usernames.count("a") == 1
+    assert usernames.count("b") == 2
+    assert usernames.count(None) == 2
+
+    # User with fewer running tasks goes first
+    assert usernames[0] in ("b", None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,108 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import asyncio
+from cl.runtime import Context
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.tasks import task_subscriptions
+from cl.runtime.tasks.task_queue_key import TaskQueueKey
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
+from cl.runtime.tasks.task_subscriptions import TaskSubscription
+from cl.runtime.tasks.task_subscriptions import TaskSubscriptions
+from cl.runtime.tasks.task_update import TaskUpdate
+from stubs.cl.runtime.tasks.stub_task import StubTask
+
+
+def _publish(task_id: str, status: TaskStatusEnum, progress_pct: float = 0.0) -> None:
+    """Publish an update using a task stand-in with the fields of TaskUpdate."""
+    TaskSubscriptions.publish(TaskUpdate(task_id=task_id, status=status, progress_pct=progress_pct))
+
+
+def test_publish():
+    """Test that the latest update is kept for each task."""
+
+    _publish("test_task_subscriptions.test_publish", TaskStatusEnum.RUNNING)
+    _publish("test_task_subscriptions.test_publish", TaskStatusEnum.RUNNING, 50.0)
+    update = TaskSubscriptions.get_update("test_task_subscriptions.test_publish")
+    assert update.status == TaskStatusEnum.RUNNING
+    assert update.progress_pct == 50.0
+    assert update.get_revision() == "RUNNING:50.0"
+    assert not update.is_finished()
+    assert TaskSubscriptions.get_update("test_task_subscriptions.not_published") is None
+
+
+def test_subscribe():
+    """Test that subscribers are notified only for the subscribed tasks."""
+
+    async def wait_for_updates():
+        with TaskSubscriptions.subscribe(["test_task_subscriptions.test_subscribe"]) as subscription:
+            subscription.clear()
+            _publish("test_task_subscriptions.other", TaskStatusEnum.RUNNING)
+            assert not await subscription.wait(0.1)
+            subscription.clear()
+            _publish("test_task_subscriptions.test_subscribe", TaskStatusEnum.COMPLETED)
+            assert await subscription.wait(10.0)
+
+    asyncio.run(wait_for_updates())
+
+    # Subscription is removed on exit
+    assert "test_task_subscriptions.test_subscribe" not in task_subscriptions._subscriptions  # noqa
+
+
+def test_poll():
+    """Test that updates of tasks saved without publishing, e.g. by other processes, are loaded by polling."""
+
+    async def wait_for_update(subscription: TaskSubscription, task_id: str, status: TaskStatusEnum) -> None:
+        while (update := TaskSubscriptions.get_update(task_id)) is None or update.status != status:
+            subscription.clear()
+            assert await subscription.wait(10.0)
+
+    async def wait_for_updates(context: Context, task: StubTask):
+        # Two subscribers for the same task share the polling thread
+        with TaskSubscriptions.subscribe([task.task_id], context=context) as subscription:
+            with TaskSubscriptions.subscribe([task.task_id], context=context) as other_subscription:
+                await wait_for_update(subscription, task.task_id, TaskStatusEnum.PENDING)
+
+                # Save without publishing
+                task.status = TaskStatusEnum.RUNNING
+                context.save_one(task)
+                await asyncio.gather(
+                    wait_for_update(subscription, task.task_id, TaskStatusEnum.RUNNING),
+                    wait_for_update(other_subscription, task.task_id, TaskStatusEnum.RUNNING),
+                )
+
+    with TestingContext() as context:
+        task = StubTask(label="test_task_subscriptions.test_poll", queue=TaskQueueKey(queue_id="test_poll"))
+        task.init()
+        context.save_one(task)
+        asyncio.run(wait_for_updates(context, task))
+
+
+def test_max_size():
+    """Test that the least recently published updates are evicted."""
+
+    max_size = task_subscriptions.TASK_UPDATES_MAX_SIZE
+    task_subscriptions.TASK_UPDATES_MAX_SIZE = 2
+    try:
+        for i in range(3):
+            _publish(f"test_task_subscriptions.test_max_size.{i}", TaskStatusEnum.PENDING)
+    finally:
+        task_subscriptions.TASK_UPDATES_MAX_SIZE = max_size
+    assert TaskSubscriptions.get_update("test_task_subscriptions.test_max_size.0") is None
+    assert TaskSubscriptions.get_update("test_task_subscriptions.test_max_size.2") is not None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
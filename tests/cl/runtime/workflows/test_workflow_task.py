@@ -0,0 +1,208 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import contextvars
+import threading
+import time
+from typing import List
+from cl.runtime import Context
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.tasks.instance_method_task import InstanceMethodTask
+from cl.runtime.tasks.process_queue import ProcessQueue
+from cl.runtime.tasks.static_method_task import StaticMethodTask
+from cl.runtime.tasks.task import Task
+from cl.runtime.tasks.task_notifier import TaskNotifier
+from cl.runtime.tasks.task_queue_key import TaskQueueKey
+from cl.runtime.tasks.task_status_enum import TaskStatusEnum
+from cl.runtime.workflows.workflow_phase import WorkflowPhase
+from cl.runtime.workflows.workflow_phase_key import WorkflowPhaseKey
+from cl.runtime.workflows.workflow_phase_task import UNFINISHED_STATUSES
+from cl.runtime.workflows.workflow_task import WorkflowTask
+from stubs.cl.runtime import StubHandlers
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_handlers_key import StubHandlersKey
+
+
+def _create_workflow(queue: TaskQueueKey) -> WorkflowTask:
+    """Create and save workflow where b depends on a and d depends on b and c, phases are listed out of order."""
+    a = WorkflowPhase(phase_id="a")
+    b = WorkflowPhase(phase_id="b", prerequisites=[a.get_key()])
+    c = WorkflowPhase(phase_id="c")
+    d = WorkflowPhase(phase_id="d", prerequisites=[b.get_key(), c.get_key()])
+    phases = [d, b, a, c]
+    Context.current().save_many(phases)
+
+    result = WorkflowTask(queue=queue, phases=[x.get_key() for x in phases])
+    Context.current().save_one(result)
+    return result
+
+
+def _create_task(queue: TaskQueueKey) -> Task:
+    """Create a task that completes successfully."""
+    method_callable = StubHandlers.run_static_method_1a
+    return StaticMethodTask.create(queue=queue, record_type=StubHandlers, method_callable=method_callable)
+
+
+def _get_tasks(workflow: WorkflowTask, phase_id: str) -> List[Task]:
+    """Get child tasks of the phase."""
+    return workflow._get_phase_tasks()[phase_id].get_child_tasks()  # noqa
+
+
+def _get_phase_statuses(workflow: WorkflowTask) -> List[TaskStatusEnum]:
+    """Get statuses of phases a, b, c, d."""
+    phase_tasks = workflow._get_phase_tasks()  # noqa
+    return [phase_tasks[x].status for x in ("a", "b", "c", "d")]
+
+
+def _run_pending_tasks(workflow: WorkflowTask, phase_id: str) -> None:
+    """Run pending child tasks of the phase in-process."""
+    for task in _get_tasks(workflow, phase_id):
+        if task.status == TaskStatusEnum.PENDING:
+            task.run_task()
+
+
+def test_update_workflow():
+    """Test starting and completing phases in the order of prerequisites, including dynamically added tasks."""
+
+    with TestingContext():
+        queue = TaskQueueKey(queue_id="test_workflow_task.test_update_workflow")
+        workflow = _create_workflow(queue)
+        workflow.add_task(_create_task(queue), WorkflowPhaseKey(phase_id="a"))
+        workflow.add_task(_create_task(queue), WorkflowPhaseKey(phase_id="a"))
+        workflow.add_task(_create_task(queue), WorkflowPhaseKey(phase_id="b"))
+        workflow.add_task(_create_task(queue), WorkflowPhaseKey(phase_id="c"))
+
+        # Phases a and c have no prerequisites and start at once, tasks of the other phases are blocked
+        assert not workflow.update_workflow()
+        running, blocked = TaskStatusEnum.RUNNING, TaskStatusEnum.BLOCKED
+        assert _get_phase_statuses(workflow) == [running, blocked, running, blocked]
+        assert all(x.status == TaskStatusEnum.PENDING for x in _get_tasks(workflow, "a") + _get_tasks(workflow, "c"))
+        assert all(x.status == TaskStatusEnum.BLOCKED for x in _get_tasks(workflow, "b"))
+
+        # Phase b starts when phase a is completed without waiting for phase c
+        _run_pending_tasks(workflow, "a")
+        assert not workflow.update_workflow()
+        completed = TaskStatusEnum.COMPLETED
+        assert _get_phase_statuses(workflow) == [completed, running, running, blocked]
+        assert all(x.status == TaskStatusEnum.PENDING for x in _get_tasks(workflow, "b"))
+
+        # Task added to a running phase is pending, task added to a phase that has not started is blocked
+        workflow.add_task(_create_task(queue), WorkflowPhaseKey(phase_id="b"))
+        workflow.add_task(_create_task(queue), WorkflowPhaseKey(phase_id="d"))
+        assert [x.status for x in _get_tasks(workflow, "b")] == [TaskStatusEnum.PENDING] * 2
+        assert [x.status for x in _get_tasks(workflow, "d")] == [TaskStatusEnum.BLOCKED]
+
+        # Phase d starts when both b and c are completed
+        _run_pending_tasks(workflow, "b")
+        assert not workflow.update_workflow()
+        assert _get_phase_statuses(workflow) == [completed, completed, running, blocked]
+        _run_pending_tasks(workflow, "c")
+        assert not workflow.update_workflow()
+        assert _get_phase_statuses(workflow) == [completed, completed, completed, running]
+        _run_pending_tasks(workflow, "d")
+        assert workflow.update_workflow()
+        assert workflow.progress_pct == 100.0
+
+        # Cannot add tasks to a completed phase
+        with pytest.raises(RuntimeError):
+            workflow.add_task(_create_task(queue), WorkflowPhaseKey(phase_id="a"))
+
+
+def test_failed_phase():
+    """Test that the workflow fails and phases that have not started are cancelled when a task fails."""
+
+    with TestingContext():
+        queue = TaskQueueKey(queue_id="test_workflow_task.test_failed_phase")
+        workflow = _create_workflow(queue)
+
+        # Task fails because the record is not found
+        failing_task = InstanceMethodTask.create(
+            queue=queue,
+            record_or_key=StubHandlersKey(stub_id="test_workflow_task.not_found"),
+            method_callable=StubHandlers.run_instance_method_1a,
+        )
+        workflow.add_task(failing_task, WorkflowPhaseKey(phase_id="a"))
+        workflow.add_task(_create_task(queue), WorkflowPhaseKey(phase_id="b"))
+
+        assert not workflow.update_workflow()
+        _run_pending_tasks(workflow, "a")
+        with pytest.raises(RuntimeError, match="phase\\(s\\) a have failed"):
+            workflow.update_workflow()
+
+        # Phases and tasks that have not started are cancelled
+        statuses = _get_phase_statuses(workflow)
+        assert statuses[0] == TaskStatusEnum.FAILED
+        assert statuses[1] == TaskStatusEnum.CANCELLED
+        assert all(x.status == TaskStatusEnum.CANCELLED for x in _get_tasks(workflow, "b"))
+
+
+def test_invalid_prerequisites():
+    """Test errors for prerequisites that are not in the workflow or form a cycle."""
+
+    with TestingContext() as context:
+        queue = TaskQueueKey(queue_id="test_workflow_task.test_invalid_prerequisites")
+        x = WorkflowPhase(phase_id="x", prerequisites=[WorkflowPhaseKey(phase_id="y")])
+        y = WorkflowPhase(phase_id="y", prerequisites=[WorkflowPhaseKey(phase_id="x")])
+        z = WorkflowPhase(phase_id="z", prerequisites=[WorkflowPhaseKey(phase_id="unknown")])
+        context.save_many([x, y, z])
+
+        cycle_workflow = WorkflowTask(queue=queue, phases=[x.get_key(), y.get_key()])
+        context.save_one(cycle_workflow)
+        with pytest.raises(RuntimeError, match="form a cycle"):
+            cycle_workflow.update_workflow()
+
+        unknown_workflow = WorkflowTask(queue=queue, phases=[z.get_key()])
+        context.save_one(unknown_workflow)
+        with pytest.raises(RuntimeError, match="is not one of the phases"):
+            unknown_workflow.update_workflow()
+
+
+@pytest.mark.parametrize("max_workers", [None, 1, 2])
+def test_process_queue(max_workers: int | None):
+    """Test running the workflow task and tasks of its phases on the same ProcessQueue, including one worker."""
+
+    with TestingContext() as context:
+        queue = ProcessQueue(queue_id=f"test_workflow_task.test_process_queue.{max_workers}", max_workers=max_workers)
+        queue.timeout_sec = 10
+        queue.init()
+        context.save_one(queue)
+
+        # The workflow task is saved with Pending status and runs on the same queue as its tasks
+        workflow = _create_workflow(queue.get_key())
+        for phase_id in ("a", "a", "b", "c", "c", "d"):
+            workflow.add_task(_create_task(queue.get_key()), WorkflowPhaseKey(phase_id=phase_id))
+
+        # Run queue in a separate thread and wait until the workflow task is finished
+        queue_thread = threading.Thread(target=contextvars.copy_context().run, args=(queue.run_start_queue,))
+        queue_thread.start()
+        try:
+            deadline = time.monotonic() + 30
+            while time.monotonic() < deadline:
+                version = TaskNotifier.get_version()
+                if context.load_one(Task, workflow.get_key()).status not in UNFINISHED_STATUSES:
+                    break
+                TaskNotifier.wait(version, 1.0)
+        finally:
+            queue.run_stop_queue()
+            queue_thread.join()
+
+        # Workflow, phases and all tasks are completed
+        assert context.load_one(Task, workflow.get_key()).status == TaskStatusEnum.COMPLETED
+        assert _get_phase_statuses(workflow) == [TaskStatusEnum.COMPLETED] * 4
+        for phase_id in ("a", "b", "c", "d"):
+            assert all(x.status == TaskStatusEnum.COMPLETED for x in _get_tasks(workflow, phase_id))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])